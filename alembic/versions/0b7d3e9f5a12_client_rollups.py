@@ -0,0 +1,67 @@
+"""client rollups
+
+Revision ID: 0b7d3e9f5a12
+Revises: f2c6a8e1d734
+Create Date: 2026-10-19 18:00:00.000000
+
+Per-client daily and weekly training facts, maintained incrementally by the
+rollup job from a high-water mark in rollup_state. The tables start empty;
+the job's first run (or `python -m app.services.rollup_service`) builds them.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b7d3e9f5a12'
+down_revision = 'f2c6a8e1d734'
+branch_labels = None
+depends_on = None
+
+
+def _facts():
+    return [
+        sa.Column('client_id', sa.Integer(), nullable=False),
+        sa.Column('workouts_completed', sa.Integer(), nullable=False),
+        sa.Column('workouts_skipped', sa.Integer(), nullable=False),
+        sa.Column('duration_minutes', sa.Integer(), nullable=False),
+        sa.Column('duration_count', sa.Integer(), nullable=False),
+        sa.Column('rpe_sum', sa.Integer(), nullable=False),
+        sa.Column('rpe_count', sa.Integer(), nullable=False),
+        sa.Column('tonnage', sa.Float(), nullable=False),
+        sa.Column('exercises_assigned', sa.Integer(), nullable=False),
+        sa.Column('exercises_completed', sa.Integer(), nullable=False),
+        sa.Column('exercises_skipped', sa.Integer(), nullable=False),
+        sa.Column('weight', sa.Float(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['client_id'], ['clients.id']),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'client_daily_rollups',
+        sa.Column('day', sa.Date(), nullable=False),
+        *_facts(),
+        sa.PrimaryKeyConstraint('client_id', 'day'),
+    )
+    op.create_table(
+        'client_weekly_rollups',
+        sa.Column('week_start', sa.Date(), nullable=False),
+        *_facts(),
+        sa.PrimaryKeyConstraint('client_id', 'week_start'),
+    )
+    op.create_table(
+        'rollup_state',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('high_water_mark', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('covered_until', sa.Date(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('rollup_state')
+    op.drop_table('client_weekly_rollups')
+    op.drop_table('client_daily_rollups')
@@ -0,0 +1,47 @@
+"""exercise log sets
+
+Revision ID: 3c8e5f1a9b27
+Revises: 0b7d3e9f5a12
+Create Date: 2026-10-19 20:00:00.000000
+
+Numeric (reps, kg, e1RM) copies of the loaded sets in exercise_logs.actual_sets,
+for progression charts. The table starts empty; index existing logs with
+`python -m app.services.progression_service`.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c8e5f1a9b27'
+down_revision = '0b7d3e9f5a12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'exercise_log_sets',
+        sa.Column('exercise_log_id', sa.Integer(), nullable=False),
+        sa.Column('set_number', sa.Integer(), nullable=False),
+        sa.Column('client_id', sa.Integer(), nullable=False),
+        sa.Column('exercise_id', sa.Integer(), nullable=False),
+        sa.Column('performed_at', sa.DateTime(), nullable=False),
+        sa.Column('reps', sa.Integer(), nullable=False),
+        sa.Column('weight_kg', sa.Float(), nullable=False),
+        sa.Column('e1rm', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['exercise_log_id'], ['exercise_logs.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['client_id'], ['clients.id']),
+        sa.ForeignKeyConstraint(['exercise_id'], ['exercises.id']),
+        sa.PrimaryKeyConstraint('exercise_log_id', 'set_number'),
+    )
+    op.create_index(
+        'ix_exercise_log_sets_client_exercise',
+        'exercise_log_sets',
+        ['client_id', 'exercise_id', 'performed_at'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_exercise_log_sets_client_exercise', table_name='exercise_log_sets')
+    op.drop_table('exercise_log_sets')
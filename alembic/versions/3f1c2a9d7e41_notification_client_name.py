@@ -0,0 +1,44 @@
+"""notification client_name + inbox index
+
+Revision ID: 3f1c2a9d7e41
+Revises: b6a9b6b127cf
+Create Date: 2026-10-19 09:00:00.000000
+
+Denormalizes the related client's name onto notifications so the inbox
+renders without a clients lookup, backfills existing rows from clients, and
+indexes (user_id, created_at) for the inbox's ORDER BY created_at DESC page.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7e41'
+down_revision = 'b6a9b6b127cf'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('notifications', sa.Column('client_name', sa.String(length=255), nullable=True))
+    op.create_index(
+        'ix_notifications_user_id_created_at', 'notifications', ['user_id', 'created_at'], unique=False
+    )
+
+    # Backfill: one set-based UPDATE, portable across Postgres and SQLite.
+    op.execute(
+        """
+        UPDATE notifications
+        SET client_name = (
+            SELECT clients.first_name || ' ' || clients.last_name
+            FROM clients
+            WHERE clients.id = notifications.related_client_id
+        )
+        WHERE related_client_id IS NOT NULL AND client_name IS NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notifications_user_id_created_at', table_name='notifications')
+    op.drop_column('notifications', 'client_name')
@@ -0,0 +1,38 @@
+"""roster completion due index
+
+Revision ID: 4f7b2d9e6c13
+Revises: b8e3f6a1d492
+Create Date: 2026-10-20 13:00:00.000000
+
+Roster completion counts weekly exercises by due date, not by the date
+they were generated, so its per-trainer index moves from
+(trainer_id, assigned_date) to (trainer_id, due_date).
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '4f7b2d9e6c13'
+down_revision = 'b8e3f6a1d492'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_weekly_exercise_assignments_trainer_assigned', table_name='weekly_exercise_assignments')
+    op.create_index(
+        'ix_weekly_exercise_assignments_trainer_due',
+        'weekly_exercise_assignments',
+        ['trainer_id', 'due_date'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_weekly_exercise_assignments_trainer_due', table_name='weekly_exercise_assignments')
+    op.create_index(
+        'ix_weekly_exercise_assignments_trainer_assigned',
+        'weekly_exercise_assignments',
+        ['trainer_id', 'assigned_date'],
+        unique=False,
+    )
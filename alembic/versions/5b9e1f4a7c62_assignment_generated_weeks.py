@@ -0,0 +1,45 @@
+"""program_assignments.generated_weeks
+
+Revision ID: 5b9e1f4a7c62
+Revises: e7a3d5c9b218
+Create Date: 2026-10-19 12:00:00.000000
+
+Weekly exercise rows are now generated a few weeks ahead instead of for the
+whole program up front; the column records how far each assignment has
+been materialized. Existing assignments were generated in full, so they
+start at their program's length.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b9e1f4a7c62'
+down_revision = 'e7a3d5c9b218'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'program_assignments',
+        sa.Column('generated_weeks', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE program_assignments
+        SET generated_weeks = COALESCE(
+            (SELECT programs.duration_weeks FROM programs
+             WHERE programs.id = program_assignments.program_id),
+            4
+        )
+        WHERE EXISTS (
+            SELECT 1 FROM weekly_exercise_assignments
+            WHERE weekly_exercise_assignments.program_assignment_id = program_assignments.id
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('program_assignments', 'generated_weeks')
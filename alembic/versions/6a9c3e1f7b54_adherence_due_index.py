@@ -0,0 +1,38 @@
+"""adherence due index
+
+Revision ID: 6a9c3e1f7b54
+Revises: 4f7b2d9e6c13
+Create Date: 2026-10-20 14:00:00.000000
+
+Adherence windows select weekly exercises by due date, not by the date
+they were generated, so the roster-wide index from 7d2a4c6e8f10 moves from
+assigned_date to due_date.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '6a9c3e1f7b54'
+down_revision = '4f7b2d9e6c13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_weekly_exercise_assignments_assigned_date', table_name='weekly_exercise_assignments')
+    op.create_index(
+        'ix_weekly_exercise_assignments_due_date',
+        'weekly_exercise_assignments',
+        ['due_date'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_weekly_exercise_assignments_due_date', table_name='weekly_exercise_assignments')
+    op.create_index(
+        'ix_weekly_exercise_assignments_assigned_date',
+        'weekly_exercise_assignments',
+        ['assigned_date'],
+        unique=False,
+    )
@@ -0,0 +1,58 @@
+"""adherence scores
+
+Revision ID: 7d2a4c6e8f10
+Revises: 3c8e5f1a9b27
+Create Date: 2026-10-19 22:00:00.000000
+
+Churn-risk scores per active program assignment, rewritten by the adherence
+job; the CLIENT_AT_RISK notification type it raises; and an index on
+weekly_exercise_assignments.assigned_date for its roster-wide window scan.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2a4c6e8f10'
+down_revision = '3c8e5f1a9b27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'adherence_scores',
+        sa.Column('assignment_id', sa.Integer(), nullable=False),
+        sa.Column('client_id', sa.Integer(), nullable=False),
+        sa.Column('trainer_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('level', sa.String(length=10), nullable=False),
+        sa.Column('recent_miss_rate', sa.Float(), nullable=False),
+        sa.Column('miss_rate_trend', sa.Float(), nullable=False),
+        sa.Column('days_since_workout', sa.Integer(), nullable=False),
+        sa.Column('days_since_completion', sa.Integer(), nullable=False),
+        sa.Column('scored_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['assignment_id'], ['program_assignments.id']),
+        sa.ForeignKeyConstraint(['client_id'], ['clients.id']),
+        sa.ForeignKeyConstraint(['trainer_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('assignment_id'),
+    )
+    op.create_index('ix_adherence_scores_trainer_score', 'adherence_scores', ['trainer_id', 'score'])
+    op.create_index(
+        'ix_weekly_exercise_assignments_assigned_date',
+        'weekly_exercise_assignments',
+        ['assigned_date'],
+    )
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # ADD VALUE can't run inside the migration's transaction block
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE notificationtype ADD VALUE IF NOT EXISTS 'CLIENT_AT_RISK'")
+
+
+def downgrade() -> None:
+    # Postgres can't drop an enum value; CLIENT_AT_RISK stays in the type.
+    op.execute("DELETE FROM notifications WHERE notification_type = 'CLIENT_AT_RISK'")
+    op.drop_index('ix_weekly_exercise_assignments_assigned_date', table_name='weekly_exercise_assignments')
+    op.drop_index('ix_adherence_scores_trainer_score', table_name='adherence_scores')
+    op.drop_table('adherence_scores')
@@ -0,0 +1,66 @@
+"""appointment overlap guard
+
+Revision ID: 8d2e6b4c1a90
+Revises: 3f1c2a9d7e41
+Create Date: 2026-10-19 12:00:00.000000
+
+Indexes appointments by (trainer_id, start_time) for windowed conflict
+checks and calendar reads. On Postgres it also adds the
+appointments_no_overlap exclusion constraint. The constraint is a GiST index
+over (trainer_id, tsrange(start_time, end_time)) and needs the btree_gist
+extension. Existing double-bookings would make the constraint fail, so they
+are listed first and the upgrade stops until they are resolved (not in
+offline `--sql` mode, which only emits the DDL).
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2e6b4c1a90'
+down_revision = '3f1c2a9d7e41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_appointments_trainer_id_start_time', 'appointments', ['trainer_id', 'start_time'], unique=False
+    )
+
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    if not context.is_offline_mode():
+        overlaps = bind.execute(sa.text(
+            """
+            SELECT a.id, b.id
+            FROM appointments a
+            JOIN appointments b
+              ON a.trainer_id = b.trainer_id
+             AND a.id < b.id
+             AND tsrange(a.start_time, a.end_time, '[)') && tsrange(b.start_time, b.end_time, '[)')
+            WHERE a.status IS DISTINCT FROM 'cancelled'
+              AND b.status IS DISTINCT FROM 'cancelled'
+            LIMIT 20
+            """
+        )).all()
+        if overlaps:
+            pairs = ', '.join(f'{a}/{b}' for a, b in overlaps)
+            raise RuntimeError(
+                f'Overlapping appointments must be cancelled or moved before this migration: {pairs}'
+            )
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    op.execute(
+        "ALTER TABLE appointments ADD CONSTRAINT appointments_no_overlap "
+        "EXCLUDE USING gist (trainer_id WITH =, tsrange(start_time, end_time) WITH &&) "
+        "WHERE (status IS DISTINCT FROM 'cancelled')"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('ALTER TABLE appointments DROP CONSTRAINT IF EXISTS appointments_no_overlap')
+    op.drop_index('ix_appointments_trainer_id_start_time', table_name='appointments')
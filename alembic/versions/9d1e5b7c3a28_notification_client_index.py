@@ -0,0 +1,30 @@
+"""notification client index
+
+Revision ID: 9d1e5b7c3a28
+Revises: 6a9c3e1f7b54
+Create Date: 2026-10-21 10:00:00.000000
+
+Renaming a client rewrites the client_name copied onto its notifications,
+selected by related_client_id.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9d1e5b7c3a28'
+down_revision = '6a9c3e1f7b54'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_notifications_related_client_id',
+        'notifications',
+        ['related_client_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notifications_related_client_id', table_name='notifications')
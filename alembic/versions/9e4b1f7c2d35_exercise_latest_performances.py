@@ -0,0 +1,64 @@
+"""exercise latest performances
+
+Revision ID: 9e4b1f7c2d35
+Revises: 7d2a4c6e8f10
+Create Date: 2026-10-19 23:00:00.000000
+
+Each client's most recent session per exercise, summarised from
+exercise_log_sets, for progressing next week's prescriptions. Filled from
+the indexed sets on upgrade; kept current as sets are indexed.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e4b1f7c2d35'
+down_revision = '7d2a4c6e8f10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'exercise_latest_performances',
+        sa.Column('client_id', sa.Integer(), nullable=False),
+        sa.Column('exercise_id', sa.Integer(), nullable=False),
+        sa.Column('exercise_log_id', sa.Integer(), nullable=False),
+        sa.Column('performed_at', sa.DateTime(), nullable=False),
+        sa.Column('sets', sa.Integer(), nullable=False),
+        sa.Column('top_weight_kg', sa.Float(), nullable=False),
+        sa.Column('reps_at_top', sa.Integer(), nullable=False),
+        sa.Column('best_e1rm', sa.Float(), nullable=False),
+        sa.Column('rpe', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['client_id'], ['clients.id']),
+        sa.ForeignKeyConstraint(['exercise_id'], ['exercises.id']),
+        sa.ForeignKeyConstraint(['exercise_log_id'], ['exercise_logs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('client_id', 'exercise_id'),
+    )
+    op.execute(
+        """
+        INSERT INTO exercise_latest_performances
+            (client_id, exercise_id, exercise_log_id, performed_at, sets,
+             top_weight_kg, reps_at_top, best_e1rm, rpe)
+        SELECT client_id, exercise_id, MAX(exercise_log_id), MAX(performed_at), COUNT(*),
+               MAX(top), MIN(CASE WHEN weight_kg = top THEN reps END), MAX(e1rm), MAX(rpe)
+        FROM (
+            SELECT s.*, MAX(s.weight_kg) OVER (PARTITION BY s.client_id, s.exercise_id) AS top
+            FROM (
+                SELECT els.client_id, els.exercise_id, els.exercise_log_id, els.performed_at,
+                       els.reps, els.weight_kg, els.e1rm, wl.perceived_exertion AS rpe,
+                       MAX(els.performed_at) OVER (PARTITION BY els.client_id, els.exercise_id) AS last
+                FROM exercise_log_sets els
+                JOIN exercise_logs el ON el.id = els.exercise_log_id
+                JOIN workout_logs wl ON wl.id = el.workout_log_id
+            ) s
+            WHERE s.performed_at = s.last
+        ) latest
+        GROUP BY client_id, exercise_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('exercise_latest_performances')
@@ -0,0 +1,64 @@
+"""food search indexes
+
+Revision ID: a2c8f0d3b611
+Revises: 5b9e1f4a7c62
+Create Date: 2026-10-19 12:00:00.000000
+
+Adds a unique index on foods.barcode for scans and an index on category for
+facets. On Postgres it also adds the pg_trgm GIN index over the lower-cased
+"name brand" document and a text_pattern_ops prefix index on lower(name)
+(see app.models.nutrition). Blank barcodes become NULL first; duplicate
+barcodes would make the unique index fail, so they are listed and the
+upgrade stops until they are merged (not in offline `--sql` mode, which
+only emits the DDL).
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a2c8f0d3b611'
+down_revision = '5b9e1f4a7c62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    op.execute("UPDATE foods SET barcode = NULL WHERE trim(barcode) = ''")
+    if not context.is_offline_mode():
+        duplicates = bind.execute(sa.text(
+            """
+            SELECT barcode, count(*)
+            FROM foods
+            WHERE barcode IS NOT NULL
+            GROUP BY barcode
+            HAVING count(*) > 1
+            LIMIT 20
+            """
+        )).all()
+        if duplicates:
+            codes = ', '.join(f'{code} ({count})' for code, count in duplicates)
+            raise RuntimeError(
+                f'Foods sharing a barcode must be merged before this migration: {codes}'
+            )
+
+    op.create_index('ix_foods_barcode', 'foods', ['barcode'], unique=True)
+    op.create_index('ix_foods_category', 'foods', ['category'], unique=False)
+
+    if bind.dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute(
+        "CREATE INDEX ix_foods_search_trgm ON foods "
+        "USING gin ((lower(name || ' ' || coalesce(brand, ''))) gin_trgm_ops)"
+    )
+    op.execute("CREATE INDEX ix_foods_name_prefix ON foods (lower(name) text_pattern_ops)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_foods_name_prefix')
+        op.execute('DROP INDEX IF EXISTS ix_foods_search_trgm')
+    op.drop_index('ix_foods_category', table_name='foods')
+    op.drop_index('ix_foods_barcode', table_name='foods')
@@ -0,0 +1,32 @@
+"""goal manual completion
+
+Revision ID: b8e3f6a1d492
+Revises: c5f2a8d4e613
+Create Date: 2026-10-20 12:00:00.000000
+
+Records which goals the trainer marked complete, so body-metric sync only
+derives completion for the others. Goals already completed are kept as
+manual completions; clear `completed_manually` on any that should follow
+their measurements again, then run `python -m app.services.goal_progress_service`.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e3f6a1d492'
+down_revision = 'c5f2a8d4e613'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'goal_milestones',
+        sa.Column('completed_manually', sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+    op.execute("UPDATE goal_milestones SET completed_manually = is_completed WHERE is_completed")
+
+
+def downgrade() -> None:
+    op.drop_column('goal_milestones', 'completed_manually')
@@ -0,0 +1,27 @@
+"""body_metrics.updated_at
+
+Revision ID: c41e7b2f9a13
+Revises: 8d2e6b4c1a90
+Create Date: 2026-10-19 12:00:00.000000
+
+Edits to a body metric didn't leave a trace on the row, so the body-metrics
+view had nothing to derive an ETag version from. Like the other tables,
+the column stays NULL until the row's first edit.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41e7b2f9a13'
+down_revision = '8d2e6b4c1a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('body_metrics', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('body_metrics', 'updated_at')
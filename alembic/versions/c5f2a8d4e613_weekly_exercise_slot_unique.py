@@ -0,0 +1,73 @@
+"""weekly exercise slot unique
+
+Revision ID: c5f2a8d4e613
+Revises: 9e4b1f7c2d35
+Create Date: 2026-10-20 09:00:00.000000
+
+One weekly exercise row per (assignment, week, day, order), so a program
+week generated twice by concurrent horizon runs is rejected.
+
+Existing slots can collide without being duplicates: the old generator
+restarted the order for every `workout_structure` entry sharing a day
+number, so those entries' exercises share orders 1, 2, ... These days are
+renumbered 1..n in generation order (row id), which is the order the
+generator and `_structure_entry` now use. Only rows that also share the
+exercise are true duplicates: of those, pending rows are dropped when
+another copy has progress or is older. Rebuild the schedule documents
+afterwards with `python -m app.services.schedule_document_service`.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5f2a8d4e613'
+down_revision = '9e4b1f7c2d35'
+branch_labels = None
+depends_on = None
+
+SLOT = ('program_assignment_id', 'week_number', 'day_number', 'exercise_order')
+
+
+def upgrade() -> None:
+    same_slot = ' AND '.join(f'other.{column} = weekly_exercise_assignments.{column}' for column in SLOT)
+    op.execute(
+        f"""
+        DELETE FROM weekly_exercise_assignments
+        WHERE status = 'PENDING'
+          AND EXISTS (
+            SELECT 1 FROM weekly_exercise_assignments other
+            WHERE {same_slot}
+              AND other.exercise_id = weekly_exercise_assignments.exercise_id
+              AND (other.status <> 'PENDING' OR other.id < weekly_exercise_assignments.id)
+          )
+        """
+    )
+    # Ranked by id alone, so rows renumbered earlier in the statement don't
+    # shift the ranks of the rest (SQLite reads them back mid-update).
+    op.execute(
+        f"""
+        UPDATE weekly_exercise_assignments
+        SET exercise_order = (
+            SELECT ranked.position FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY program_assignment_id, week_number, day_number ORDER BY id
+                ) AS position
+                FROM weekly_exercise_assignments
+            ) ranked
+            WHERE ranked.id = weekly_exercise_assignments.id
+        )
+        WHERE EXISTS (
+            SELECT 1 FROM weekly_exercise_assignments a
+            JOIN weekly_exercise_assignments b
+              ON {' AND '.join(f'b.{column} = a.{column}' for column in SLOT)} AND b.id <> a.id
+            WHERE a.program_assignment_id = weekly_exercise_assignments.program_assignment_id
+              AND a.week_number = weekly_exercise_assignments.week_number
+              AND a.day_number = weekly_exercise_assignments.day_number
+          )
+        """
+    )
+    op.create_index('uq_weekly_exercise_assignments_slot', 'weekly_exercise_assignments', list(SLOT), unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_weekly_exercise_assignments_slot', table_name='weekly_exercise_assignments')
@@ -0,0 +1,48 @@
+"""import jobs
+
+Revision ID: d9f4b7e2a305
+Revises: a2c8f0d3b611
+Create Date: 2026-10-19 12:00:00.000000
+
+Job state for bulk imports of clients, exercises and workout history, so an
+interrupted upload resumes after its last committed chunk.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9f4b7e2a305'
+down_revision = 'a2c8f0d3b611'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'import_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('trainer_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('file_format', sa.String(length=10), nullable=False),
+        sa.Column('file_path', sa.String(length=500), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('rows_processed', sa.Integer(), nullable=False),
+        sa.Column('rows_imported', sa.Integer(), nullable=False),
+        sa.Column('rows_failed', sa.Integer(), nullable=False),
+        sa.Column('errors', sa.JSON(), nullable=False),
+        sa.Column('failure', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['trainer_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_import_jobs_id'), 'import_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_import_jobs_trainer_id'), 'import_jobs', ['trainer_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_import_jobs_trainer_id'), table_name='import_jobs')
+    op.drop_index(op.f('ix_import_jobs_id'), table_name='import_jobs')
+    op.drop_table('import_jobs')
@@ -0,0 +1,47 @@
+"""goal progress
+
+Revision ID: e5a1c7d9b420
+Revises: d9f4b7e2a305
+Create Date: 2026-10-19 14:00:00.000000
+
+Stores goal progress instead of recomputing it per request, and indexes the
+lookups that keep it in sync with body metrics. Existing rows get progress
+from their current value here; run `python -m app.services.goal_progress_service`
+afterwards to pull current values from body metrics.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a1c7d9b420'
+down_revision = 'd9f4b7e2a305'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'goal_milestones',
+        sa.Column('progress_pct', sa.Float(), server_default='0', nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE goal_milestones SET progress_pct = CASE
+            WHEN current_value IS NULL THEN 0
+            WHEN target_value = start_value THEN
+                CASE WHEN is_completed OR current_value = target_value THEN 100 ELSE 0 END
+            WHEN (current_value - start_value) / (target_value - start_value) >= 1 THEN 100
+            WHEN (current_value - start_value) / (target_value - start_value) <= 0 THEN 0
+            ELSE ROUND(CAST((current_value - start_value) / (target_value - start_value) * 100 AS NUMERIC), 1)
+        END
+        """
+    )
+    op.create_index('ix_goal_milestones_client_metric', 'goal_milestones', ['client_id', 'metric'], unique=False)
+    op.create_index('ix_body_metrics_client_measured', 'body_metrics', ['client_id', 'measured_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_body_metrics_client_measured', table_name='body_metrics')
+    op.drop_index('ix_goal_milestones_client_metric', table_name='goal_milestones')
+    op.drop_column('goal_milestones', 'progress_pct')
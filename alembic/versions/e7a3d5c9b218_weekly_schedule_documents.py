@@ -0,0 +1,35 @@
+"""weekly schedule documents
+
+Revision ID: e7a3d5c9b218
+Revises: c41e7b2f9a13
+Create Date: 2026-10-19 12:00:00.000000
+
+Materialized per-(client, week) schedules for the current-week view. The
+table starts empty; documents are built on first read, or all at once with
+`python -m app.services.schedule_document_service`.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a3d5c9b218'
+down_revision = 'c41e7b2f9a13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'weekly_schedule_documents',
+        sa.Column('client_id', sa.Integer(), nullable=False),
+        sa.Column('week_start', sa.Date(), nullable=False),
+        sa.Column('exercises', sa.JSON(), nullable=False),
+        sa.Column('built_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['client_id'], ['clients.id']),
+        sa.PrimaryKeyConstraint('client_id', 'week_start'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('weekly_schedule_documents')
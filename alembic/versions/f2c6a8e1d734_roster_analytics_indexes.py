@@ -0,0 +1,41 @@
+"""roster analytics indexes
+
+Revision ID: f2c6a8e1d734
+Revises: e5a1c7d9b420
+Create Date: 2026-10-19 16:00:00.000000
+
+Indexes for the grouped per-trainer queries behind the roster analytics
+endpoint (and for a client's latest workout).
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c6a8e1d734'
+down_revision = 'e5a1c7d9b420'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_clients_trainer_id', 'clients', ['trainer_id'], unique=False)
+    op.create_index(
+        'ix_weekly_exercise_assignments_trainer_assigned',
+        'weekly_exercise_assignments',
+        ['trainer_id', 'assigned_date'],
+        unique=False,
+    )
+    op.create_index('ix_workout_logs_client_date', 'workout_logs', ['client_id', 'workout_date'], unique=False)
+    op.create_index(
+        'ix_performance_records_trainer_recorded',
+        'performance_records',
+        ['trainer_id', 'recorded_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_performance_records_trainer_recorded', table_name='performance_records')
+    op.drop_index('ix_workout_logs_client_date', table_name='workout_logs')
+    op.drop_index('ix_weekly_exercise_assignments_trainer_assigned', table_name='weekly_exercise_assignments')
+    op.drop_index('ix_clients_trainer_id', table_name='clients')
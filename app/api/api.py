@@ -7,11 +7,16 @@ from app.api.endpoints import notifications
 from app.api.endpoints import body_metrics
 from app.api.endpoints import workout_stats
 from app.api.endpoints import workout_completion
+from app.api.endpoints import training_load
+from app.api.endpoints import progression
+from app.api.endpoints import adherence
 from app.api.endpoints import performance_records
 from app.api.endpoints import goal_milestones
 from app.api.endpoints import session_notes
 from app.api.endpoints.client_dashboard import dashboard as client_dashboard
 from app.api.endpoints import dashboard
+from app.api.endpoints import nutrition
+from app.api.endpoints import imports
 
 api_router = APIRouter()
 
@@ -27,12 +32,17 @@ api_router.include_router(appointments_simple.router, prefix="/appointments", ta
 api_router.include_router(body_metrics.router, prefix="/progress", tags=["progress"])
 api_router.include_router(workout_stats.router, prefix="/progress", tags=["progress"])
 api_router.include_router(workout_completion.router, prefix="/progress", tags=["progress"])
+api_router.include_router(training_load.router, prefix="/progress", tags=["progress"])
+api_router.include_router(progression.router, prefix="/progress", tags=["progress"])
+api_router.include_router(adherence.router, prefix="/progress", tags=["progress"])
 api_router.include_router(performance_records.router, prefix="/progress", tags=["progress"])
 api_router.include_router(goal_milestones.router, prefix="/progress", tags=["progress"])
 api_router.include_router(session_notes.router, prefix="/progress", tags=["progress"])
 api_router.include_router(client_endpoint.router, tags=["client-access"])
 api_router.include_router(client_dashboard.router, prefix="/client-dashboard", tags=["client-dashboard"])
 api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
+api_router.include_router(nutrition.router, prefix="/nutrition", tags=["nutrition"])
+api_router.include_router(imports.router, prefix="/imports", tags=["imports"])
 
 
 @api_router.get("/health")
@@ -0,0 +1,23 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.models.user import User
+from app.schemas.analytics import ClientRisk
+from app.services.adherence_service import AdherenceService
+from app.utils.deps import get_current_trainer
+
+router = APIRouter()
+
+
+@router.get("/at-risk", response_model=List[ClientRisk])
+async def get_at_risk_clients(
+    min_level: str = Query("medium", pattern="^(low|medium|high)$"),
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(get_current_trainer),
+    db: AsyncSession = Depends(get_db),
+):
+    """Clients by churn risk from the last scoring run, riskiest first."""
+    return await AdherenceService.for_trainer(db, current_user.id, min_level, limit)
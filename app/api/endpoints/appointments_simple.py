@@ -1,15 +1,27 @@
-from datetime import date, datetime
+from datetime import date, datetime, time, timedelta
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel, validator
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, validator
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.core.conditional import is_not_modified, not_modified, validator_headers
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.responses import render
 from app.models.client import Client
 from app.models.schedule import Appointment
-from app.models.user import User
+from app.models.user import User, UserRole
+from app.services.appointment_service import (
+    AppointmentService,
+    WorkingHours,
+    weekly_occurrences,
+)
+from app.services.calendar_feed_service import CalendarFeedService, FeedScope
 from app.utils.deps import get_current_trainer, get_current_user
 
 router = APIRouter()
@@ -84,13 +96,104 @@ class StatusUpdate(BaseModel):
     status: str
 
 
+class RecurringAppointmentCreate(AppointmentCreate):
+    """A weekly session: `start_time`/`end_time` describe the first one."""
+
+    weeks: int = Field(..., ge=1, le=52, description="Number of occurrences")
+    interval_weeks: int = Field(1, ge=1, le=4)
+    skip_conflicts: bool = Field(
+        False, description="Book the free occurrences instead of rejecting the series"
+    )
+
+
+class AppointmentConflict(BaseModel):
+    index: int
+    start_time: datetime
+    end_time: datetime
+    conflicting_appointment_id: int
+    conflicting_title: str
+    conflicting_start_time: datetime
+    conflicting_end_time: datetime
+
+
+class RecurringAppointmentResponse(BaseModel):
+    created: List[AppointmentResponse]
+    conflicts: List[AppointmentConflict]
+
+
+class TimeSlot(BaseModel):
+    start_time: datetime
+    end_time: datetime
+
+
+class AvailabilityResponse(BaseModel):
+    date_from: date
+    date_to: date
+    duration_minutes: int
+    buffer_minutes: int
+    client_ids: List[int]
+    windows: List[TimeSlot]
+    slots: List[TimeSlot]
+
+
+class CalendarFeedLink(BaseModel):
+    url: str
+    scope: str
+    expires_in_days: int
+
+
+MAX_AVAILABILITY_DAYS = 93
+
+
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
+async def _get_client_or_404(client_id: int, trainer_id: int, db: AsyncSession) -> Client:
+    client = (
+        await db.execute(
+            select(Client).where(and_(Client.id == client_id, Client.trainer_id == trainer_id))
+        )
+    ).scalar_one_or_none()
+    if not client:
+        raise HTTPException(
+            status_code=404, detail="Client not found or does not belong to you"
+        )
+    return client
+
+
+def _build_appointment(
+    data: AppointmentCreate, client: Client, trainer_id: int, start_time: datetime, end_time: datetime
+) -> Appointment:
+    title = (
+        data.title.strip()
+        if data.title.strip()
+        else f"{data.appointment_type} - {client.first_name} {client.last_name}"
+    )
+    appointment = Appointment(
+        trainer_id=trainer_id,
+        client_id=client.id,
+        title=title,
+        description=data.description,
+        appointment_type=data.appointment_type,
+        status=data.status,
+        start_time=start_time,
+        end_time=end_time,
+        duration_minutes=data.duration_minutes,
+        location=data.location,
+        notes=data.notes,
+    )
+    # Attach the already-loaded client without a lazy load (or a backref
+    # append to client.appointments) so the response can embed it.
+    set_committed_value(appointment, "client", client)
+    return appointment
+
+
 async def _get_appointment_or_404(
     appointment_id: int, trainer_id: int, db: AsyncSession
 ) -> Appointment:
-    stmt = select(Appointment).where(
-        and_(Appointment.id == appointment_id, Appointment.trainer_id == trainer_id)
+    stmt = (
+        select(Appointment)
+        .options(selectinload(Appointment.client))
+        .where(and_(Appointment.id == appointment_id, Appointment.trainer_id == trainer_id))
     )
     appt = (await db.execute(stmt)).scalar_one_or_none()
     if not appt:
@@ -110,6 +213,7 @@ async def get_today_appointments(
     day_end = datetime(today.year, today.month, today.day, 23, 59, 59)
     stmt = (
         select(Appointment)
+        .options(selectinload(Appointment.client))
         .where(
             and_(
                 Appointment.trainer_id == current_user.id,
@@ -122,6 +226,154 @@ async def get_today_appointments(
     return list((await db.execute(stmt)).scalars().all())
 
 
+@router.get("/availability", response_model=AvailabilityResponse)
+async def get_availability(
+    date_from: date,
+    date_to: date,
+    duration_minutes: int = Query(60, ge=5, le=24 * 60),
+    step_minutes: Optional[int] = Query(None, ge=5, le=24 * 60),
+    buffer_minutes: Optional[int] = Query(None, ge=0, le=240),
+    day_start: Optional[str] = Query(None, description="HH:MM, defaults to AVAILABILITY_DAY_START"),
+    day_end: Optional[str] = Query(None, description="HH:MM, defaults to AVAILABILITY_DAY_END"),
+    weekdays: Optional[str] = Query(None, description="Comma-separated, 0=Mon..6=Sun"),
+    client_ids: List[int] = Query([], description="Also avoid these clients' bookings"),
+    limit: int = Query(200, ge=1, le=2000),
+    current_user: User = Depends(get_current_trainer),
+    db: AsyncSession = Depends(get_db),
+):
+    """Free slots of `duration_minutes` between `date_from` and `date_to`.
+
+    Working hours and the buffer kept around appointments default to the
+    AVAILABILITY_* / APPOINTMENT_BUFFER_MINUTES settings. With `client_ids`
+    the result is the common free time of the trainer and those clients.
+    `windows` are the maximal free stretches; `slots` are bookable starts on
+    a `step_minutes` grid (default: the duration), capped at `limit`.
+    """
+    if date_to < date_from or (date_to - date_from).days >= MAX_AVAILABILITY_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"date_to must be on or after date_from and within {MAX_AVAILABILITY_DAYS} days",
+        )
+    defaults = WorkingHours.from_settings()
+    try:
+        hours = WorkingHours(
+            day_start=time.fromisoformat(day_start) if day_start else defaults.day_start,
+            day_end=time.fromisoformat(day_end) if day_end else defaults.day_end,
+            weekdays=(
+                frozenset(int(d) for d in weekdays.split(",") if d.strip())
+                if weekdays is not None
+                else defaults.weekdays
+            ),
+            buffer=(
+                timedelta(minutes=buffer_minutes) if buffer_minutes is not None else defaults.buffer
+            ),
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid working hours")
+
+    client_ids = sorted(set(client_ids))
+    if client_ids:
+        owned = (
+            await db.execute(
+                select(Client.id).where(
+                    and_(Client.id.in_(client_ids), Client.trainer_id == current_user.id)
+                )
+            )
+        ).scalars().all()
+        if len(owned) != len(client_ids):
+            raise HTTPException(
+                status_code=404, detail="Client not found or does not belong to you"
+            )
+
+    windows, slots = await AppointmentService(db).find_free_slots(
+        current_user.id,
+        datetime.combine(date_from, time.min),
+        datetime.combine(date_to + timedelta(days=1), time.min),
+        duration=timedelta(minutes=duration_minutes),
+        hours=hours,
+        step=timedelta(minutes=step_minutes) if step_minutes else None,
+        client_ids=client_ids,
+        limit=limit,
+    )
+    # Can be thousands of slots: render the plain dicts without re-validation.
+    return render(
+        {
+            "date_from": date_from,
+            "date_to": date_to,
+            "duration_minutes": duration_minutes,
+            "buffer_minutes": int(hours.buffer.total_seconds() // 60),
+            "client_ids": client_ids,
+            "windows": [{"start_time": s, "end_time": e} for s, e in windows],
+            "slots": [{"start_time": s, "end_time": e} for s, e in slots],
+        }
+    )
+
+
+@router.get("/feed-url", response_model=CalendarFeedLink)
+async def get_calendar_feed_url(
+    request: Request,
+    client_id: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Subscription URL of an iCalendar feed.
+
+    Trainers get their own feed, or one of their clients' with `client_id`
+    (to hand to a client without an account); a client account gets its
+    own. The URL embeds a feed-only token, valid for
+    CALENDAR_FEED_TOKEN_EXPIRE_DAYS.
+    """
+    is_trainer = current_user.role in (UserRole.TRAINER, UserRole.ADMIN)
+    if client_id is not None:
+        if not is_trainer:
+            raise HTTPException(status_code=403, detail="Not enough permissions")
+        scope = FeedScope("client", (await _get_client_or_404(client_id, current_user.id, db)).id)
+    elif is_trainer:
+        scope = FeedScope("trainer", current_user.id)
+    else:
+        own_id = (
+            await db.execute(select(Client.id).where(Client.user_id == current_user.id))
+        ).scalar_one_or_none()
+        if own_id is None:
+            raise HTTPException(status_code=404, detail="No client profile for this account")
+        scope = FeedScope("client", own_id)
+    token = CalendarFeedService.token_for(scope)
+    return {
+        "url": str(request.url_for("get_calendar_feed", token=token)),
+        "scope": scope.subject,
+        "expires_in_days": settings.calendar_feed_token_expire_days,
+    }
+
+
+@router.get(
+    "/feed/{token}.ics",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/calendar": {}}}, 304: {"description": "Not Modified"}},
+)
+async def get_calendar_feed(token: str, request: Request, db: AsyncSession = Depends(get_db)):
+    """iCalendar feed for calendar-app subscriptions (no bearer header).
+
+    Carries an ETag only; a poll whose If-None-Match still matches gets a
+    304 after one aggregate query. If-Modified-Since alone is never enough
+    (see `CalendarFeedService`), so such polls get the full feed.
+    """
+    scope = CalendarFeedService.scope_from_token(token)
+    if scope is None:
+        raise HTTPException(status_code=404, detail="Calendar feed not found")
+    state = await CalendarFeedService.state(db, scope)
+    if is_not_modified(request, state.etag, None):
+        return not_modified(state.etag, None)
+    return StreamingResponse(
+        await CalendarFeedService.stream(db, scope),
+        media_type="text/calendar; charset=utf-8",
+        headers={
+            **validator_headers(state.etag, None),
+            "Cache-Control": "private, no-cache",
+            "Content-Disposition": f'inline; filename="{scope.kind}-{scope.id}.ics"',
+        },
+    )
+
+
 @router.get("/my", response_model=List[AppointmentResponse])
 async def get_my_appointments(
     upcoming_only: bool = False,
@@ -151,7 +403,11 @@ async def list_appointments(
     current_user: User = Depends(get_current_trainer),
     db: AsyncSession = Depends(get_db),
 ):
-    stmt = select(Appointment).where(Appointment.trainer_id == current_user.id)
+    stmt = (
+        select(Appointment)
+        .options(selectinload(Appointment.client))
+        .where(Appointment.trainer_id == current_user.id)
+    )
     if date_from:
         stmt = stmt.where(Appointment.start_time >= date_from)
     if date_to:
@@ -168,40 +424,40 @@ async def create_appointment(
     current_user: User = Depends(get_current_trainer),
     db: AsyncSession = Depends(get_db),
 ):
-    client = (
-        await db.execute(
-            select(Client).where(
-                and_(Client.id == data.client_id, Client.trainer_id == current_user.id)
-            )
-        )
-    ).scalar_one_or_none()
-    if not client:
+    client = await _get_client_or_404(data.client_id, current_user.id, db)
+    appt = _build_appointment(data, client, current_user.id, data.start_time, data.end_time)
+    await AppointmentService(db).book(current_user.id, [appt])
+    return appt
+
+
+@router.post("/recurring", response_model=RecurringAppointmentResponse, status_code=201)
+async def create_recurring_appointments(
+    data: RecurringAppointmentCreate,
+    current_user: User = Depends(get_current_trainer),
+    db: AsyncSession = Depends(get_db),
+):
+    """Book a weekly series in one transaction.
+
+    Every occurrence is checked for conflicts with a single query. Clashes
+    reject the whole series with a 409 listing each one, unless
+    `skip_conflicts` is set, in which case the free occurrences are booked
+    and the clashes are returned alongside them.
+    """
+    if data.end_time - data.start_time >= timedelta(weeks=data.interval_weeks):
         raise HTTPException(
-            status_code=404, detail="Client not found or does not belong to you"
+            status_code=400, detail="A session can't be longer than the repeat interval"
         )
-
-    title = (
-        data.title.strip()
-        if data.title.strip()
-        else f"{data.appointment_type} - {client.first_name} {client.last_name}"
-    )
-    appt = Appointment(
-        trainer_id=current_user.id,
-        client_id=data.client_id,
-        title=title,
-        description=data.description,
-        appointment_type=data.appointment_type,
-        status=data.status,
-        start_time=data.start_time,
-        end_time=data.end_time,
-        duration_minutes=data.duration_minutes,
-        location=data.location,
-        notes=data.notes,
+    client = await _get_client_or_404(data.client_id, current_user.id, db)
+    appointments = [
+        _build_appointment(data, client, current_user.id, start, end)
+        for start, end in weekly_occurrences(
+            data.start_time, data.end_time, data.weeks, data.interval_weeks
+        )
+    ]
+    created, conflicts = await AppointmentService(db).book(
+        current_user.id, appointments, skip_conflicts=data.skip_conflicts
     )
-    db.add(appt)
-    await db.commit()
-    await db.refresh(appt)
-    return appt
+    return {"created": created, "conflicts": conflicts}
 
 
 # ── Dynamic /{appointment_id} routes ─────────────────────────────────────────
@@ -226,8 +482,7 @@ async def update_appointment(
     for field, value in data.dict(exclude_unset=True).items():
         setattr(appt, field, value)
     appt.updated_at = datetime.utcnow()
-    await db.commit()
-    await db.refresh(appt)
+    await AppointmentService(db).reschedule_checked(appt)
     return appt
 
 
@@ -241,8 +496,7 @@ async def update_status(
     appt = await _get_appointment_or_404(appointment_id, current_user.id, db)
     appt.status = data.status
     appt.updated_at = datetime.utcnow()
-    await db.commit()
-    await db.refresh(appt)
+    await AppointmentService(db).reschedule_checked(appt)
     return appt
 
 
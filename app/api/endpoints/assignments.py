@@ -6,7 +6,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
-from app.models import User
+from app.core.http_cache import conditional, path_int, register_version, table_version
+from app.models import Client, Exercise, Program, User
 from app.models.program_assignment import (
     AssignmentStatus,
     ProgramAssignment as ProgramAssignmentModel,
@@ -17,16 +18,50 @@ from app.schemas.program_assignment import (
     ProgramAssignmentUpdate,
     ProgramAssignmentWithDetails,
 )
+from app.services import program_structure_cache
 from app.services.program_assignment_service import ProgramAssignmentService
 from app.utils.deps import get_current_trainer
 
 router = APIRouter(tags=["program-assignments"])
 
 
-async def _enrich(db: AsyncSession, assignment: ProgramAssignmentModel) -> ProgramAssignmentWithDetails:
-    enhanced_structure = await ProgramAssignmentService.enhance_workout_structure_with_exercise_names(
-        db, assignment.program.workout_structure or []
+@register_version("assignment")
+async def _assignment_version(request, db: AsyncSession, user: User):
+    # The detail view embeds the program, the client and exercise names.
+    assignment_id = path_int(request, "assignment_id")
+    if assignment_id is None:
+        return None
+    stmt = (
+        select(
+            ProgramAssignmentModel.updated_at,
+            Program.updated_at,
+            Client.updated_at,
+            *table_version(Exercise),
+        )
+        .join(Program, Program.id == ProgramAssignmentModel.program_id)
+        .join(Client, Client.id == ProgramAssignmentModel.client_id)
+        .where(
+            ProgramAssignmentModel.id == assignment_id,
+            ProgramAssignmentModel.trainer_id == user.id,
+        )
     )
+    row = (await db.execute(stmt)).one_or_none()
+    return tuple(row) if row is not None else None
+
+
+async def _enrich_all(
+    db: AsyncSession, assignments: List[ProgramAssignmentModel]
+) -> List[ProgramAssignmentWithDetails]:
+    # Programs are shared across assignments: expand each version once.
+    structures = await program_structure_cache.get_structures(
+        db, (a.program for a in assignments)
+    )
+    return [_enrich(a, structures[a.program_id]) for a in assignments]
+
+
+def _enrich(
+    assignment: ProgramAssignmentModel, enhanced_structure: list
+) -> ProgramAssignmentWithDetails:
     return ProgramAssignmentWithDetails(
         id=assignment.id,
         program_id=assignment.program_id,
@@ -96,10 +131,14 @@ async def get_trainer_assignments(
     stmt = stmt.order_by(ProgramAssignmentModel.created_at.desc())
     assignments = list((await db.execute(stmt)).scalars().all())
 
-    return [await _enrich(db, a) for a in assignments]
+    return await _enrich_all(db, assignments)
 
 
-@router.get("/{assignment_id}", response_model=ProgramAssignmentWithDetails)
+@router.get(
+    "/{assignment_id}",
+    response_model=ProgramAssignmentWithDetails,
+    dependencies=[conditional("assignment", get_current_trainer)],
+)
 async def get_assignment_details(
     assignment_id: int,
     current_user: User = Depends(get_current_trainer),
@@ -121,7 +160,7 @@ async def get_assignment_details(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Assignment not found"
         )
-    return await _enrich(db, assignment)
+    return (await _enrich_all(db, [assignment]))[0]
 
 
 @router.put("/{assignment_id}", response_model=ProgramAssignmentSchema)
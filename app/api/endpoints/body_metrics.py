@@ -7,9 +7,17 @@ from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.http_cache import (
+    conditional,
+    fetch_version,
+    path_int,
+    register_version,
+    table_version,
+)
 from app.models.body_metric import BodyMetric
 from app.models.client import Client
 from app.models.user import User
+from app.services.goal_progress_service import GoalProgressService, changed_metrics
 from app.utils.deps import get_current_trainer, get_current_user
 
 router = APIRouter()
@@ -73,10 +81,23 @@ async def _verify_client(client_id: int, trainer_id: int, db: AsyncSession) -> C
     return client
 
 
+@register_version("body-metrics")
+async def _body_metrics_version(request, db: AsyncSession, user: User):
+    client_id = path_int(request, "client_id")
+    if client_id is None:
+        return None
+    owned = select(Client.id).where(Client.id == client_id, Client.trainer_id == user.id)
+    return await fetch_version(
+        db, *table_version(BodyMetric, BodyMetric.client_id == client_id), guard=owned.exists()
+    )
+
+
 # ── Trainer endpoints ─────────────────────────────────────────────────────────
 
 @router.get(
-    "/clients/{client_id}/body-metrics", response_model=List[BodyMetricResponse]
+    "/clients/{client_id}/body-metrics",
+    response_model=List[BodyMetricResponse],
+    dependencies=[conditional("body-metrics", get_current_trainer)],
 )
 async def get_body_metrics(
     client_id: int,
@@ -106,6 +127,7 @@ async def create_body_metric(
     await _verify_client(client_id, current_user.id, db)
     metric = BodyMetric(client_id=client_id, **data.dict())
     db.add(metric)
+    await GoalProgressService.sync(db, client_id, changed_metrics(metric))
     await db.commit()
     await db.refresh(metric)
     return metric
@@ -128,8 +150,10 @@ async def update_body_metric(
     metric = (await db.execute(stmt)).scalar_one_or_none()
     if not metric:
         raise HTTPException(status_code=404, detail="Metric not found")
-    for field, value in data.dict(exclude_unset=True).items():
+    changes = data.dict(exclude_unset=True)
+    for field, value in changes.items():
         setattr(metric, field, value)
+    await GoalProgressService.sync(db, client_id, changed_metrics(metric, changes))
     await db.commit()
     await db.refresh(metric)
     return metric
@@ -152,6 +176,7 @@ async def delete_body_metric(
     if not metric:
         raise HTTPException(status_code=404, detail="Metric not found")
     await db.delete(metric)
+    await GoalProgressService.sync(db, client_id, changed_metrics(metric))
     await db.commit()
 
 
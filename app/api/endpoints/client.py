@@ -5,6 +5,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.responses import render
 from app.models import ProgramAssignment
 from app.schemas.client_schemas import (
     ClientDashboardResponse,
@@ -16,7 +17,8 @@ from app.schemas.client_schemas import (
 )
 from app.services.client_auth_service import client_auth_service
 from app.services.client_dashboard_service import client_dashboard_service
-from app.services.workout_tracking_service import workout_tracking_service
+from app.services.workout_tracking_service import WORKOUT_FIELDS, workout_tracking_service
+from app.utils.fields import FieldSet, sparse_fields
 
 router = APIRouter(prefix="/client", tags=["client"])
 security = HTTPBearer()
@@ -64,7 +66,7 @@ async def get_client_dashboard(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Client data not found"
         )
-    return dashboard
+    return render(dashboard)
 
 
 @router.get("/program", response_model=ProgramTemplateForClient)
@@ -107,11 +109,16 @@ async def log_workout(
 @router.get("/workouts", response_model=List[WorkoutLogResponse])
 async def get_workout_history(
     limit: int = 20,
+    fields: FieldSet = Depends(sparse_fields(WORKOUT_FIELDS)),
     assignment: ProgramAssignment = Depends(get_current_client_assignment),
     db: AsyncSession = Depends(get_db),
 ):
-    return await workout_tracking_service.get_workout_logs_for_assignment(
-        db, assignment.id, assignment.client_id, limit
+    """Newest first. `fields` trims each workout; the exercise logs are only
+    loaded when `exercises` is among them."""
+    return render(
+        await workout_tracking_service.get_workout_logs_for_assignment(
+            db, assignment.id, assignment.client_id, limit, fields=fields
+        )
     )
 
 
@@ -128,7 +135,7 @@ async def get_workout_details(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Workout not found"
         )
-    return workout
+    return render(workout)
 
 
 @router.put("/workout/{workout_id}", response_model=WorkoutLogResponse)
@@ -4,6 +4,8 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.http_cache import conditional, fetch_version, register_version, table_version
+from app.models.program import Exercise as ExerciseModel
 from app.models.user import User
 from app.schemas.exercise import (
     Exercise,
@@ -18,6 +20,13 @@ from app.utils.deps import get_current_user
 router = APIRouter()
 
 
+@register_version("exercises")
+async def _exercises_version(request, db: AsyncSession, user):
+    # One version for the whole library: lists mix public and own exercises
+    # and the table is small, so any write invalidates every listing.
+    return await fetch_version(db, *table_version(ExerciseModel))
+
+
 @router.post("/", response_model=Exercise, status_code=status.HTTP_201_CREATED)
 async def create_exercise(
     exercise_data: ExerciseCreate,
@@ -33,7 +42,11 @@ async def create_exercise(
         )
 
 
-@router.get("/", response_model=List[ExerciseList])
+@router.get(
+    "/",
+    response_model=List[ExerciseList],
+    dependencies=[conditional("exercises", get_current_user)],
+)
 async def get_exercises(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
@@ -59,7 +72,9 @@ async def get_exercises(
     )
 
 
-@router.get("/public", response_model=List[ExerciseList])
+@router.get(
+    "/public", response_model=List[ExerciseList], dependencies=[conditional("exercises")]
+)
 async def get_public_exercises(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
@@ -148,9 +163,5 @@ async def get_exercises_by_ids(
     current_user: User = Depends(get_current_user),
 ):
     """Fetch multiple exercises by their IDs (useful for program building)."""
-    out = []
-    for eid in exercise_ids:
-        ex = await ExerciseService.get_exercise(db, eid)
-        if ex and (ex.is_public or ex.created_by == current_user.id):
-            out.append(ex)
-    return out
+    exercises = await ExerciseService.get_exercises_by_ids(db, exercise_ids)
+    return [ex for ex in exercises if ex.is_public or ex.created_by == current_user.id]
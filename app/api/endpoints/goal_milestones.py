@@ -10,6 +10,7 @@ from app.core.database import get_db
 from app.models.client import Client
 from app.models.goal_milestone import GoalMilestone
 from app.models.user import User
+from app.services.goal_progress_service import METRIC_COLUMNS, GoalProgressService
 from app.utils.deps import get_current_trainer, get_current_user
 
 router = APIRouter()
@@ -80,28 +81,12 @@ class GoalResponse(BaseModel):
     is_completed: bool
     completed_date: Optional[date]
     notes: Optional[str]
-    progress_pct: float = 0.0
+    progress_pct: float = 0.0  # Stored; see app.services.goal_progress_service
 
     class Config:
         from_attributes = True
 
 
-def _compute_progress(goal: GoalMilestone) -> float:
-    if goal.current_value is None:
-        return 0.0
-    total = abs(goal.target_value - goal.start_value)
-    if total == 0:
-        return 100.0 if goal.is_completed else 0.0
-    done = abs(goal.current_value - goal.start_value)
-    return round(min(done / total * 100, 100), 1)
-
-
-def _to_response(goal: GoalMilestone) -> GoalResponse:
-    data = GoalResponse.model_validate(goal)
-    data.progress_pct = _compute_progress(goal)
-    return data
-
-
 async def _verify_client(
     client_id: int, trainer_id: int, db: AsyncSession
 ) -> Client:
@@ -127,7 +112,7 @@ async def get_goals(
         .order_by(GoalMilestone.created_at.desc())
     )
     goals = list((await db.execute(stmt)).scalars().all())
-    return [_to_response(g) for g in goals]
+    return goals
 
 
 @router.post(
@@ -143,10 +128,14 @@ async def create_goal(
     goal = GoalMilestone(
         client_id=client_id, trainer_id=current_user.id, **data.dict()
     )
+    GoalProgressService.recompute(goal)
     db.add(goal)
+    if goal.metric in METRIC_COLUMNS:
+        await db.flush()
+        await GoalProgressService.sync(db, client_id, goal_id=goal.id)
     await db.commit()
     await db.refresh(goal)
-    return _to_response(goal)
+    return goal
 
 
 @router.put(
@@ -166,11 +155,19 @@ async def update_goal(
     goal = (await db.execute(stmt)).scalar_one_or_none()
     if not goal:
         raise HTTPException(status_code=404, detail="Goal not found")
-    for field, value in data.dict(exclude_unset=True).items():
+    changes = data.dict(exclude_unset=True)
+    for field, value in changes.items():
         setattr(goal, field, value)
+    if "is_completed" in changes:
+        goal.completed_manually = bool(goal.is_completed)
+    GoalProgressService.recompute(goal)
+    # A redefined goal re-reads its metric; a manual value stands until the next measurement
+    redefined = changes.keys() & {"metric", "start_date", "start_value", "target_value"}
+    if goal.metric in METRIC_COLUMNS and redefined:
+        await GoalProgressService.sync(db, client_id, goal_id=goal.id)
     await db.commit()
     await db.refresh(goal)
-    return _to_response(goal)
+    return goal
 
 
 @router.delete("/clients/{client_id}/goals/{goal_id}", status_code=204)
@@ -207,4 +204,4 @@ async def get_my_goals(
         .order_by(GoalMilestone.created_at.desc())
     )
     goals = list((await db.execute(stmt)).scalars().all())
-    return [_to_response(g) for g in goals]
+    return goals
@@ -0,0 +1,90 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.models.import_job import ImportKind, ImportStatus
+from app.models.user import User
+from app.schemas.imports import ImportJob
+from app.services.import_service import FORMATS, ImportClaimLost, ImportService
+from app.utils.deps import get_current_trainer
+
+router = APIRouter()
+
+
+def _file_format(file_format: Optional[str], filename: Optional[str]) -> str:
+    if file_format is None and filename:
+        suffix = filename.rsplit(".", 1)[-1].lower()
+        file_format = "ndjson" if suffix in ("ndjson", "jsonl") else suffix
+    if file_format not in FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported format; use one of: {', '.join(FORMATS)}",
+        )
+    return file_format
+
+
+async def _run(db: AsyncSession, job) -> ImportJob:
+    try:
+        return await ImportService.run(db, job)
+    except ImportClaimLost:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Import is already being loaded by another request",
+        )
+
+
+@router.post("/{kind}", response_model=ImportJob, status_code=status.HTTP_201_CREATED)
+async def create_import(
+    kind: ImportKind,
+    file: UploadFile = File(...),
+    file_format: Optional[str] = Query(
+        None, alias="format", description="csv or ndjson (default: from the file name)"
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_trainer),
+):
+    """Import clients, exercises or workout history from a CSV (header row)
+    or NDJSON upload. Rows are validated and written in chunks; rejected
+    rows are listed in `errors` with their row number and the others are
+    imported. If the job stops part-way, `POST /imports/{job_id}/resume`
+    continues after the last committed chunk."""
+    file_format = _file_format(file_format, file.filename)
+    job = await ImportService.create_job(db, current_user.id, kind, file_format, file)
+    return await _run(db, job)
+
+
+@router.get("/", response_model=List[ImportJob])
+async def get_imports(
+    limit: int = Query(50, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_trainer),
+):
+    return await ImportService.get_jobs(db, current_user.id, limit=limit)
+
+
+@router.get("/{job_id}", response_model=ImportJob)
+async def get_import(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_trainer),
+):
+    job = await ImportService.get_job(db, job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import job not found")
+    return job
+
+
+@router.post("/{job_id}/resume", response_model=ImportJob)
+async def resume_import(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_trainer),
+):
+    job = await ImportService.get_job(db, job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import job not found")
+    if job.status == ImportStatus.COMPLETED.value:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Import already completed")
+    return await _run(db, job)
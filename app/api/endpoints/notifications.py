@@ -32,9 +32,7 @@ async def get_notifications(
         offset=offset,
         unread_only=unread_only,
     )
-    enriched = [
-        await NotificationService.enrich_notification_response(n, db) for n in notifications
-    ]
+    enriched = await NotificationService.enrich_notifications(notifications, db)
     return NotificationListResponse(
         notifications=enriched, unread_count=unread_count, total_count=total_count
     )
@@ -93,9 +91,7 @@ async def check_appointment_reminders(
     notifications = await NotificationService.check_and_create_appointment_reminders(
         db=db, trainer_id=current_user.id
     )
-    enriched = [
-        await NotificationService.enrich_notification_response(n, db) for n in notifications
-    ]
+    enriched = await NotificationService.enrich_notifications(notifications, db)
     return {"created_count": len(notifications), "notifications": enriched}
 
 
@@ -142,6 +138,7 @@ async def create_sample_notifications(
             title=title,
             message=message,
             related_client_id=client.id if client else None,
+            client_name=f"{client.first_name} {client.last_name}" if client else None,
         )
         created.append(await NotificationService.enrich_notification_response(n, db))
 
@@ -0,0 +1,128 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.responses import render
+from app.models.user import User
+from app.schemas.nutrition import (
+    Food,
+    FoodSearchResults,
+    NutritionPlan,
+    NutritionPlanCreate,
+    NutritionPlanUpdate,
+    PlanMacros,
+)
+from app.services.food_search_service import FoodSearchService
+from app.services.nutrition_service import NutritionService
+from app.utils.deps import get_current_trainer, get_current_user
+
+router = APIRouter()
+
+
+def _not_found():
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND, detail="Nutrition plan not found"
+    )
+
+
+@router.post("/plans", response_model=NutritionPlan, status_code=status.HTTP_201_CREATED)
+async def create_nutrition_plan(
+    plan_data: NutritionPlanCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_trainer),
+):
+    return await NutritionService.create_plan(db, plan_data, current_user.id)
+
+
+@router.get("/plans", response_model=List[NutritionPlan])
+async def get_nutrition_plans(
+    client_id: Optional[int] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_trainer),
+):
+    return await NutritionService.get_plans(
+        db, current_user.id, client_id=client_id, skip=skip, limit=limit
+    )
+
+
+@router.get("/plans/{plan_id}", response_model=NutritionPlan)
+async def get_nutrition_plan(
+    plan_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_trainer),
+):
+    plan = await NutritionService.get_plan(db, plan_id, current_user.id)
+    if not plan:
+        raise _not_found()
+    return plan
+
+
+@router.put("/plans/{plan_id}", response_model=NutritionPlan)
+async def update_nutrition_plan(
+    plan_id: int,
+    plan_data: NutritionPlanUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_trainer),
+):
+    plan = await NutritionService.update_plan(db, plan_id, plan_data, current_user.id)
+    if not plan:
+        raise _not_found()
+    return plan
+
+
+@router.delete("/plans/{plan_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_nutrition_plan(
+    plan_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_trainer),
+):
+    if not await NutritionService.delete_plan(db, plan_id, current_user.id):
+        raise _not_found()
+
+
+@router.get("/plans/{plan_id}/macros", response_model=PlanMacros)
+async def get_nutrition_plan_macros(
+    plan_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_trainer),
+):
+    """Per-meal and per-day calorie and macro totals, with each day's share
+    of the plan's targets. Food ids no longer in the catalog count as zero
+    and are listed in `missing_food_ids`."""
+    plan = await NutritionService.get_plan(db, plan_id, current_user.id)
+    if not plan:
+        raise _not_found()
+    return render(await NutritionService.get_macros(db, plan))
+
+
+@router.get("/foods/search", response_model=FoodSearchResults)
+async def search_foods(
+    q: str = Query(..., min_length=1, max_length=100),
+    category: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Type-ahead over food names and brands: every word of `q` must start a
+    word of the food ("gre yog" finds "Greek Yogurt"), with typo tolerance
+    for longer words. `facets` counts matches per category before the
+    `category` filter applies."""
+    return await FoodSearchService.search(
+        db, q, user_id=current_user.id, category=category, limit=limit
+    )
+
+
+@router.get("/foods/barcode/{barcode}", response_model=Food)
+async def get_food_by_barcode(
+    barcode: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    food = await FoodSearchService.get_by_barcode(db, barcode, current_user.id)
+    if not food:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Food not found")
+    return food
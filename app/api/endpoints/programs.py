@@ -4,6 +4,9 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.responses import render
+from app.core.http_cache import conditional, fetch_version, register_version, table_version
+from app.models.program import Program as ProgramModel
 from app.models.user import User
 from app.schemas.program import Program, ProgramCreate, ProgramList, ProgramUpdate
 from app.schemas.program_assignment import (
@@ -12,12 +15,20 @@ from app.schemas.program_assignment import (
     ProgramAssignment,
 )
 from app.services.program_assignment_service import ProgramAssignmentService
-from app.services.program_service import ProgramService
+from app.services.program_service import PROGRAM_FIELDS, ProgramService
 from app.utils.deps import get_current_trainer
+from app.utils.fields import FieldSet, sparse_fields
 
 router = APIRouter()
 
 
+@register_version("programs")
+async def _programs_version(request, db: AsyncSession, user: User):
+    # Mirrors the list's filter, so a soft delete drops the count.
+    listed = (ProgramModel.trainer_id == user.id, ProgramModel.is_active.is_(True))
+    return await fetch_version(db, *table_version(ProgramModel, *listed))
+
+
 @router.post("/", response_model=Program, status_code=status.HTTP_201_CREATED)
 async def create_program(
     program_data: ProgramCreate,
@@ -33,17 +44,24 @@ async def create_program(
         )
 
 
-@router.get("/", response_model=List[ProgramList])
+@router.get(
+    "/",
+    response_model=List[ProgramList],
+    dependencies=[conditional("programs", get_current_trainer)],
+)
 async def get_programs(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     program_type: Optional[str] = Query(None),
     difficulty_level: Optional[str] = Query(None),
     is_template: Optional[bool] = Query(None),
+    fields: FieldSet = Depends(sparse_fields(PROGRAM_FIELDS)),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_trainer),
 ):
-    return await ProgramService.get_programs(
+    """Active programs. `fields` selects any `Program` attributes instead of
+    the default summary, e.g. `?fields=name,workout_structure`."""
+    listing = dict(
         db=db,
         trainer_id=current_user.id,
         skip=skip,
@@ -52,6 +70,9 @@ async def get_programs(
         difficulty_level=difficulty_level,
         is_template=is_template,
     )
+    if fields is not None:
+        return render(await ProgramService.get_program_fields(fields=fields, **listing))
+    return await ProgramService.get_programs(**listing)
 
 
 @router.get("/search")
@@ -0,0 +1,55 @@
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.models.client import Client
+from app.models.user import User
+from app.schemas.analytics import ExerciseProgression, ExerciseProgressionSummary
+from app.services.progression_service import ProgressionService
+from app.utils.deps import get_current_trainer
+
+router = APIRouter()
+
+
+async def _verify_client(db: AsyncSession, client_id: int, trainer_id: int) -> None:
+    stmt = select(Client.id).where(
+        and_(Client.id == client_id, Client.trainer_id == trainer_id)
+    )
+    if (await db.execute(stmt)).scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Client not found")
+
+
+@router.get(
+    "/clients/{client_id}/progression", response_model=List[ExerciseProgressionSummary]
+)
+async def get_client_progression(
+    client_id: int,
+    current_user: User = Depends(get_current_trainer),
+    db: AsyncSession = Depends(get_db),
+):
+    """Exercises the client has loaded sets for, most recently trained first."""
+    await _verify_client(db, client_id, current_user.id)
+    return await ProgressionService.exercises(db, client_id)
+
+
+@router.get(
+    "/clients/{client_id}/progression/{exercise_id}", response_model=ExerciseProgression
+)
+async def get_exercise_progression(
+    client_id: int,
+    exercise_id: int,
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    points: Optional[int] = Query(
+        None, ge=2, le=1000, description="Downsample to at most this many points"
+    ),
+    current_user: User = Depends(get_current_trainer),
+    db: AsyncSession = Depends(get_db),
+):
+    """e1RM, best set and volume per session (or per bucket with `points`)."""
+    await _verify_client(db, client_id, current_user.id)
+    return await ProgressionService.series(db, client_id, exercise_id, start, end, points)
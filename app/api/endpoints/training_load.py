@@ -0,0 +1,60 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.models.client import Client
+from app.models.user import User
+from app.schemas.analytics import ClientTrainingLoad, RosterTrainingLoad
+from app.services.training_load_service import TrainingLoadService
+from app.utils.deps import get_current_trainer, get_current_user
+
+router = APIRouter()
+
+
+@router.get("/training-load", response_model=RosterTrainingLoad)
+async def get_roster_training_load(
+    day: Optional[date] = Query(None, description="Defaults to today"),
+    zone: Optional[str] = Query(None, pattern="^(low|optimal|high|danger)$"),
+    include_inactive: bool = Query(False),
+    current_user: User = Depends(get_current_trainer),
+    db: AsyncSession = Depends(get_db),
+):
+    """Every client's ACWR, monotony and strain on `day`, highest ACWR first."""
+    return await TrainingLoadService.roster(
+        db, current_user.id, day or date.today(), zone=zone, include_inactive=include_inactive
+    )
+
+
+@router.get("/clients/{client_id}/training-load", response_model=ClientTrainingLoad)
+async def get_client_training_load(
+    client_id: int,
+    end: Optional[date] = Query(None, description="Last day; defaults to today"),
+    days: int = Query(28, ge=1, le=1096),
+    current_user: User = Depends(get_current_trainer),
+    db: AsyncSession = Depends(get_db),
+):
+    stmt = select(Client.id).where(
+        and_(Client.id == client_id, Client.trainer_id == current_user.id)
+    )
+    if (await db.execute(stmt)).scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Client not found")
+    return await TrainingLoadService.client_series(db, client_id, end or date.today(), days)
+
+
+@router.get("/my/training-load", response_model=ClientTrainingLoad)
+async def get_my_training_load(
+    end: Optional[date] = Query(None, description="Last day; defaults to today"),
+    days: int = Query(28, ge=1, le=1096),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    client_id = (
+        await db.execute(select(Client.id).where(Client.user_id == current_user.id))
+    ).scalar_one_or_none()
+    if client_id is None:
+        raise HTTPException(status_code=404, detail="Client not found")
+    return await TrainingLoadService.client_series(db, client_id, end or date.today(), days)
@@ -1,4 +1,3 @@
-import json
 from datetime import date, timedelta
 from typing import List, Optional
 
@@ -8,7 +7,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
+from app.core.http_cache import (
+    conditional,
+    fetch_version,
+    path_int,
+    register_version,
+    table_version,
+)
+from app.core.responses import render
 from app.models.client import Client
+from app.models.program import Exercise
 from app.models.user import User
 from app.models.weekly_exercise import (
     WeeklyExerciseAssignment,
@@ -20,55 +28,48 @@ from app.schemas.weekly_exercise import (
     WeeklyExerciseWithDetails,
     WeeklySchedule,
 )
+from app.schemas.analytics import RosterAnalytics
 from app.services.notification_service import NotificationService
-from app.services.weekly_exercise_service import WeeklyExerciseService
+from app.services.roster_analytics_service import SORT_KEYS, RosterAnalyticsService
+from app.services.schedule_document_service import ScheduleDocumentService
+from app.services.weekly_exercise_service import (
+    SCHEDULE_FIELDS,
+    WeeklyExerciseService,
+    enrich_exercise,
+    parse_muscle_groups,
+)
 from app.utils.deps import get_current_trainer, get_current_user
+from app.utils.fields import FieldSet, sparse_fields, trim
 
 router = APIRouter()
 
 
-def _parse_muscle_groups(raw) -> list:
-    if not raw:
-        return []
-    if isinstance(raw, str):
-        try:
-            return json.loads(raw)
-        except (json.JSONDecodeError, TypeError):
-            return []
-    return raw
-
-
-def _enrich_exercise(exercise: WeeklyExerciseAssignment) -> WeeklyExerciseWithDetails:
-    muscle_groups = (
-        _parse_muscle_groups(exercise.exercise.muscle_groups)
-        if exercise.exercise
-        else []
+def _week_start(week_start: Optional[date]) -> date:
+    if week_start:
+        return week_start
+    today = date.today()
+    return today - timedelta(days=today.weekday())
+
+
+@register_version("weekly-schedule")
+async def _weekly_schedule_version(request, db: AsyncSession, user: User):
+    client_id = path_int(request, "client_id")
+    raw_week = request.query_params.get("week_start")
+    try:
+        week_start = _week_start(date.fromisoformat(raw_week) if raw_week else None)
+    except ValueError:
+        return None
+    if client_id is None:
+        return None
+    w = WeeklyExerciseAssignment
+    week = (
+        w.client_id == client_id,
+        w.due_date >= week_start,
+        w.due_date <= week_start + timedelta(days=6),
     )
-    program_name = (
-        exercise.program_assignment.program.name
-        if exercise.program_assignment and exercise.program_assignment.program
-        else ""
-    )
-    payload = {
-        **exercise.__dict__,
-        "exercise_name": exercise.exercise.name if exercise.exercise else "Unknown Exercise",
-        "exercise_description": exercise.exercise.description if exercise.exercise else "",
-        "exercise_video_url": exercise.exercise.video_url if exercise.exercise else "",
-        "exercise_instructions": exercise.exercise.instructions if exercise.exercise else "",
-        "muscle_groups": muscle_groups,
-        "program_name": program_name,
-        "client_name": (
-            f"{exercise.client.first_name} {exercise.client.last_name}"
-            if exercise.client
-            else ""
-        ),
-        "trainer_name": (
-            f"{exercise.trainer.first_name} {exercise.trainer.last_name}"
-            if exercise.trainer
-            else ""
-        ),
-    }
-    return WeeklyExerciseWithDetails(**payload)
+    # The resolved week is part of the version so the default rolls over on Monday.
+    version = await fetch_version(db, *table_version(w, *week), *table_version(Exercise))
+    return (week_start, *version)
 
 
 @router.get(
@@ -80,8 +81,8 @@ async def get_client_current_week_exercises(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    exercises = await WeeklyExerciseService.get_current_week_exercises(db, client_id)
-    return [_enrich_exercise(ex) for ex in exercises]
+    """Served from the client's stored schedule document for this week."""
+    return render(await ScheduleDocumentService.get_week(db, client_id, _week_start(None)))
 
 
 @router.get(
@@ -94,10 +95,13 @@ async def get_client_week_exercises(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    if status is None and week_start.weekday() == 0:
+        # A whole Monday-to-Sunday week is exactly one stored document.
+        return render(await ScheduleDocumentService.get_week(db, client_id, week_start))
     exercises = await WeeklyExerciseService.get_client_weekly_exercises(
         db=db, client_id=client_id, week_start=week_start, status=status
     )
-    return [_enrich_exercise(ex) for ex in exercises]
+    return [enrich_exercise(ex) for ex in exercises]
 
 
 @router.put("/{exercise_id}/status", response_model=WeeklyExerciseResponse)
@@ -208,91 +212,127 @@ async def update_exercise_status(
     return exercise
 
 
-@router.get("/client/{client_id}/schedule", response_model=WeeklySchedule)
+@router.get(
+    "/client/{client_id}/schedule",
+    response_model=WeeklySchedule,
+    dependencies=[conditional("weekly-schedule", get_current_user)],
+)
 async def get_client_weekly_schedule(
     client_id: int,
     week_start: Optional[date] = Query(None),
+    fields: FieldSet = Depends(sparse_fields(SCHEDULE_FIELDS)),
+    normalized: bool = Query(
+        False, description="Rows reference `exercise_id`; details are in `exercises`"
+    ),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    if not week_start:
-        today = date.today()
-        week_start = today - timedelta(days=today.weekday())
+    """A client's week grouped by day. `fields` trims each exercise row,
+    e.g. `?fields=exercise_name,sets,reps,status` skips the descriptions,
+    instructions and video URLs.
+
+    With `normalized=true` the exercise-library fields move out of the rows
+    into one `exercises` map keyed by exercise id, so an exercise repeated
+    across days is sent (and read) once.
+    """
+    week_start = _week_start(week_start)
     week_end = week_start + timedelta(days=6)
 
-    exercises = await WeeklyExerciseService.get_client_weekly_exercises(
-        db=db, client_id=client_id, week_start=week_start
+    rows = await WeeklyExerciseService.get_week_schedule_rows(
+        db, client_id, week_start, fields, normalized=normalized
     )
 
+    # Normalized rows keep their key into the `exercises` map.
+    row_fields = fields | {"exercise_id"} if normalized and fields is not None else fields
     days: dict = {}
-    total_exercises = len(exercises)
     completed_exercises = 0
-
-    for exercise in exercises:
-        day_key = f"day_{exercise.day_number}"
-        days.setdefault(day_key, [])
-
-        muscle_groups = (
-            _parse_muscle_groups(exercise.exercise.muscle_groups)
-            if exercise.exercise
-            else []
-        )
-        days[day_key].append(
-            {
-                "id": exercise.id,
-                "exercise_id": exercise.exercise_id,
-                "exercise_name": exercise.exercise.name
-                if exercise.exercise
-                else "Unknown Exercise",
-                "exercise_description": exercise.exercise.description
-                if exercise.exercise
-                else "",
-                "exercise_video_url": exercise.exercise.video_url
-                if exercise.exercise
-                else "",
-                "exercise_instructions": exercise.exercise.instructions
-                if exercise.exercise
-                else "",
-                "sets": exercise.sets,
-                "reps": exercise.reps,
-                "weight": exercise.weight,
-                "rest_seconds": exercise.rest_seconds,
-                "exercise_notes": exercise.exercise_notes,
-                "status": exercise.status.value,
-                "completion_percentage": exercise.completion_percentage,
-                "due_date": exercise.due_date,
-                "exercise_order": exercise.exercise_order,
-                "day_number": exercise.day_number,
-                "client_feedback": exercise.client_feedback,
-                "trainer_feedback": exercise.trainer_feedback,
-                "muscle_groups": muscle_groups,
-            }
-        )
-
-        if exercise.status == WeeklyExerciseStatus.COMPLETED:
+    for row in rows:
+        if "muscle_groups" in row:
+            row["muscle_groups"] = parse_muscle_groups(row["muscle_groups"])
+        if row["status"] == WeeklyExerciseStatus.COMPLETED:
             completed_exercises += 1
+        row["status"] = row["status"].value
+        days.setdefault(f"day_{row['day_number']}", []).append(trim(row, row_fields))
 
-    for day in days.values():
-        day.sort(key=lambda x: x["exercise_order"])
-
+    total_exercises = len(rows)
     completion_percentage = (
         int(completed_exercises / total_exercises * 100) if total_exercises > 0 else 0
     )
 
-    return WeeklySchedule(
-        week_start=week_start,
-        week_end=week_end,
-        total_exercises=total_exercises,
-        completed_exercises=completed_exercises,
-        completion_percentage=completion_percentage,
-        days=days,
-    )
+    schedule = {
+        "week_start": week_start,
+        "week_end": week_end,
+        "total_exercises": total_exercises,
+        "completed_exercises": completed_exercises,
+        "completion_percentage": completion_percentage,
+        "days": days,
+    }
+    if normalized:
+        exercises = await WeeklyExerciseService.get_exercise_details(
+            db, (row["exercise_id"] for row in rows), fields
+        )
+        for detail in exercises.values():
+            if "muscle_groups" in detail:
+                detail["muscle_groups"] = parse_muscle_groups(detail["muscle_groups"])
+        schedule["exercises"] = {str(key): value for key, value in exercises.items()}
+    return render(schedule)
+
+
+@router.get("/assignment/{assignment_id}/preview", response_model=List[dict])
+async def preview_assignment_week(
+    assignment_id: int,
+    week: int = Query(..., ge=1, description="Program week to preview"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_trainer),
+):
+    """A program week as it will be scheduled, computed from the workout
+    structure. Works for weeks past the generated horizon; nothing is
+    written."""
+    preview = await WeeklyExerciseService.preview_week(db, assignment_id, current_user.id, week)
+    if preview is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Assignment not found"
+        )
+    return render(preview)
 
 
-@router.get("/trainer/clients-summary", response_model=List[dict])
+@router.get("/trainer/clients-summary", response_model=RosterAnalytics)
 async def get_trainer_clients_weekly_summary(
-    week_start: Optional[date] = Query(None),
+    week_start: Optional[date] = Query(None, description="Last week of the window"),
+    weeks: int = Query(8, ge=1, le=52, description="Window length in weeks"),
+    sort: str = Query("name", description=f"One of: {', '.join(SORT_KEYS)}"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    include_inactive: bool = Query(False),
+    search: Optional[str] = Query(None, description="Match first or last name"),
+    min_completion: Optional[float] = Query(None, ge=0, le=100),
+    max_completion: Optional[float] = Query(None, ge=0, le=100),
+    inactive_days: Optional[int] = Query(
+        None, ge=0, description="Only clients with no workout in this many days"
+    ),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_trainer),
 ):
-    return [{"message": "Feature coming soon"}]
+    """Completion rate, streak, last workout, weight trend and PR count for
+    every client on the roster, sorted and filtered server-side."""
+    if sort not in SORT_KEYS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"sort must be one of: {', '.join(SORT_KEYS)}",
+        )
+    return await RosterAnalyticsService.summary(
+        db,
+        current_user.id,
+        _week_start(week_start),
+        weeks=weeks,
+        sort=sort,
+        descending=order == "desc",
+        include_inactive=include_inactive,
+        search=search,
+        min_completion=min_completion,
+        max_completion=max_completion,
+        inactive_days=inactive_days,
+        limit=limit,
+        offset=offset,
+    )
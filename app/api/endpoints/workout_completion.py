@@ -1,5 +1,5 @@
 from datetime import date, timedelta
-from typing import List
+from typing import Dict, List
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
@@ -10,6 +10,7 @@ from app.core.database import get_db
 from app.models.client import Client
 from app.models.user import User
 from app.models.weekly_exercise import WeeklyExerciseAssignment, WeeklyExerciseStatus
+from app.services.rollup_service import Facts, RollupService
 from app.utils.deps import get_current_trainer, get_current_user
 
 router = APIRouter()
@@ -55,28 +56,16 @@ async def _streak(client_id: int, db: AsyncSession) -> int:
     return streak
 
 
-async def _weekly_breakdown(
-    client_id: int, db: AsyncSession, weeks: int = 8
-) -> List[WeekSummary]:
+def _weekly_breakdown(weeks_facts: Dict[date, Facts], weeks: int = 8) -> List[WeekSummary]:
     result: List[WeekSummary] = []
     today = date.today()
     monday = today - timedelta(days=today.weekday()) - timedelta(weeks=weeks - 1)
 
     for i in range(weeks):
         week_start = monday + timedelta(weeks=i)
-        week_end = week_start + timedelta(days=6)
-        stmt = select(WeeklyExerciseAssignment).where(
-            and_(
-                WeeklyExerciseAssignment.client_id == client_id,
-                WeeklyExerciseAssignment.assigned_date >= week_start,
-                WeeklyExerciseAssignment.assigned_date <= week_end,
-            )
-        )
-        rows = list((await db.execute(stmt)).scalars().all())
-
-        total = len(rows)
-        completed = sum(1 for r in rows if r.status == WeeklyExerciseStatus.COMPLETED)
-        skipped = sum(1 for r in rows if r.status == WeeklyExerciseStatus.SKIPPED)
+        facts = weeks_facts.get(week_start, Facts())
+        total = facts.exercises_assigned
+        completed = facts.exercises_completed
         rate = round(completed / total * 100, 1) if total > 0 else 0.0
 
         result.append(
@@ -85,7 +74,7 @@ async def _weekly_breakdown(
                 week_start=week_start.isoformat(),
                 total=total,
                 completed=completed,
-                skipped=skipped,
+                skipped=facts.exercises_skipped,
                 completion_rate=rate,
             )
         )
@@ -95,26 +84,21 @@ async def _weekly_breakdown(
 async def _summarise(
     client_id: int, db: AsyncSession, weeks: int
 ) -> CompletionStats:
-    rows = list(
-        (
-            await db.execute(
-                select(WeeklyExerciseAssignment).where(
-                    WeeklyExerciseAssignment.client_id == client_id
-                )
-            )
-        ).scalars().all()
-    )
-    total = len(rows)
-    completed = sum(1 for r in rows if r.status == WeeklyExerciseStatus.COMPLETED)
-    skipped = sum(1 for r in rows if r.status == WeeklyExerciseStatus.SKIPPED)
+    # Weekly exercise counts by assigned week, from the rollups where covered
+    weeks_facts = await RollupService.weekly_facts(db, client_id, parts=("exercises",))
+    totals = Facts()
+    for facts in weeks_facts.values():
+        totals.add(facts)
+    total = totals.exercises_assigned
+    completed = totals.exercises_completed
 
     return CompletionStats(
         total_assigned=total,
         total_completed=completed,
-        total_skipped=skipped,
+        total_skipped=totals.exercises_skipped,
         overall_rate=round(completed / total * 100, 1) if total > 0 else 0.0,
         current_streak=await _streak(client_id, db),
-        weekly_breakdown=await _weekly_breakdown(client_id, db, weeks),
+        weekly_breakdown=_weekly_breakdown(weeks_facts, weeks),
     )
 
 
@@ -1,7 +1,7 @@
 from datetime import date, timedelta
-from typing import List
+from typing import Dict, List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -9,7 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.models.client import Client
 from app.models.user import User
-from app.models.weekly_exercise import WeeklyExerciseAssignment, WeeklyExerciseStatus
+from app.services.rollup_service import Facts, RollupService
 from app.utils.deps import get_current_trainer, get_current_user
 
 router = APIRouter()
@@ -39,25 +39,17 @@ def _get_monday(d: date) -> date:
     return d - timedelta(days=d.weekday())
 
 
-def _build_weekly_breakdown(exercises: list, num_weeks: int = 8) -> List[WeekSummary]:
+def _build_weekly_breakdown(days: Dict[date, Facts], num_weeks: int = 8) -> List[WeekSummary]:
     today = date.today()
     weeks: List[WeekSummary] = []
     for i in range(num_weeks - 1, -1, -1):
         week_start = _get_monday(today) - timedelta(weeks=i)
-        week_end = week_start + timedelta(days=6)
-        week_exercises = [
-            e
-            for e in exercises
-            if e.assigned_date and week_start <= e.assigned_date <= week_end
-        ]
-        total = len(week_exercises)
-        completed = sum(
-            1 for e in week_exercises if e.status == WeeklyExerciseStatus.COMPLETED
-        )
-        skipped = sum(
-            1 for e in week_exercises if e.status == WeeklyExerciseStatus.SKIPPED
-        )
-        pending = total - completed - skipped
+        week = Facts()
+        for offset in range(7):
+            week.add(days.get(week_start + timedelta(days=offset), Facts()))
+        total = week.exercises_assigned
+        completed = week.exercises_completed
+        skipped = week.exercises_skipped
         weeks.append(
             WeekSummary(
                 week_start=week_start.isoformat(),
@@ -65,21 +57,15 @@ def _build_weekly_breakdown(exercises: list, num_weeks: int = 8) -> List[WeekSum
                 total=total,
                 completed=completed,
                 skipped=skipped,
-                pending=pending,
+                pending=total - completed - skipped,
                 completion_rate=round(completed / total * 100, 1) if total > 0 else 0.0,
             )
         )
     return weeks
 
 
-def _calc_streak(exercises: list) -> tuple[int, int]:
-    completed_dates = sorted(
-        {
-            e.assigned_date
-            for e in exercises
-            if e.status == WeeklyExerciseStatus.COMPLETED and e.assigned_date
-        }
-    )
+def _calc_streak(days: Dict[date, Facts]) -> tuple[int, int]:
+    completed_dates = sorted(d for d, f in days.items() if f.exercises_completed)
     if not completed_dates:
         return 0, 0
 
@@ -103,22 +89,29 @@ def _calc_streak(exercises: list) -> tuple[int, int]:
     return streak, longest
 
 
-def _stats(exercises: list) -> WorkoutStatsResponse:
-    total = len(exercises)
-    completed = sum(1 for e in exercises if e.status == WeeklyExerciseStatus.COMPLETED)
-    skipped = sum(1 for e in exercises if e.status == WeeklyExerciseStatus.SKIPPED)
-    streak, longest = _calc_streak(exercises)
+def _stats(days: Dict[date, Facts]) -> WorkoutStatsResponse:
+    """Stats from a client's per-day exercise facts (by assigned date)."""
+    totals = Facts()
+    for facts in days.values():
+        totals.add(facts)
+    total = totals.exercises_assigned
+    completed = totals.exercises_completed
+    streak, longest = _calc_streak(days)
     return WorkoutStatsResponse(
         total_assigned=total,
         total_completed=completed,
-        total_skipped=skipped,
+        total_skipped=totals.exercises_skipped,
         overall_rate=round(completed / total * 100, 1) if total > 0 else 0.0,
         current_streak=streak,
         longest_streak=longest,
-        weekly_breakdown=_build_weekly_breakdown(exercises),
+        weekly_breakdown=_build_weekly_breakdown(days),
     )
 
 
+async def _exercise_days(db: AsyncSession, client_id: int) -> Dict[date, Facts]:
+    return await RollupService.daily_facts(db, client_id, parts=("exercises",))
+
+
 @router.get(
     "/clients/{client_id}/workout-stats", response_model=WorkoutStatsResponse
 )
@@ -127,14 +120,12 @@ async def get_client_workout_stats(
     current_user: User = Depends(get_current_trainer),
     db: AsyncSession = Depends(get_db),
 ):
-    stmt = select(WeeklyExerciseAssignment).where(
-        and_(
-            WeeklyExerciseAssignment.client_id == client_id,
-            WeeklyExerciseAssignment.trainer_id == current_user.id,
-        )
+    stmt = select(Client.id).where(
+        and_(Client.id == client_id, Client.trainer_id == current_user.id)
     )
-    exercises = list((await db.execute(stmt)).scalars().all())
-    return _stats(exercises)
+    if (await db.execute(stmt)).scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Client not found")
+    return _stats(await _exercise_days(db, client_id))
 
 
 @router.get("/my/workout-stats", response_model=WorkoutStatsResponse)
@@ -146,10 +137,5 @@ async def get_my_workout_stats(
         await db.execute(select(Client).where(Client.user_id == current_user.id))
     ).scalar_one_or_none()
     if not client:
-        return _stats([])
-
-    stmt = select(WeeklyExerciseAssignment).where(
-        WeeklyExerciseAssignment.client_id == client.id
-    )
-    exercises = list((await db.execute(stmt)).scalars().all())
-    return _stats(exercises)
+        return _stats({})
+    return _stats(await _exercise_days(db, client.id))
@@ -0,0 +1,163 @@
+"""Response compression (Brotli or gzip) above a size threshold.
+
+Picks the best encoding the client accepts — Brotli when the optional
+`brotli` package is installed, otherwise gzip — for text-like responses
+(JSON, text/*, calendars). Bodies under `minimum_size` are sent as-is,
+since the framing would outweigh the savings; longer streamed responses
+(e.g. the .ics feeds) are compressed chunk by chunk and flushed so data
+keeps flowing.
+
+A compressed body is a different representation, so a strong ETag is
+weakened (`W/`) on the way out; `app.core.conditional` compares weakly, so
+revalidation keeps working.
+"""
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional, gzip is used instead
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """The preferred supported coding in an Accept-Encoding header, or None.
+
+    Honors q-values (`q=0` refuses a coding); ties go to Brotli.
+    """
+    supported = ("br", "gzip") if brotli is not None else ("gzip",)
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding == "*":
+            for candidate in supported:
+                weights.setdefault(candidate, q)
+        elif coding in supported:
+            weights[coding] = q
+    ranked = [c for c in supported if weights.get(c, 0.0) > 0]
+    return max(ranked, key=lambda c: weights[c]) if ranked else None
+
+
+class _Encoder:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int) -> None:
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+            self._zlib = None
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # 31: gzip framing
+
+    def chunk(self, data: bytes) -> bytes:
+        """Compress and flush so the client can decode what was sent so far."""
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        encoder: Optional[_Encoder] = None
+        passthrough = False
+        buffered = b""
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, encoder, passthrough, buffered
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                passthrough = (
+                    message["status"] in (204, 304)
+                    or "content-encoding" in headers
+                    or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    headers.add_vary_header("Accept-Encoding")
+                    start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is not None:
+                data = encoder.chunk(body) if more_body else encoder.finish(body)
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+                return
+
+            # Undecided: bodies can arrive in pieces (streaming responses, or
+            # re-chunked by BaseHTTPMiddleware), so buffer up to the threshold.
+            buffered += body
+            if more_body and len(buffered) < self.minimum_size:
+                return
+            headers = MutableHeaders(raw=start["headers"])
+            if not more_body and len(buffered) < self.minimum_size:
+                passthrough = True
+                headers["Content-Length"] = str(len(buffered))
+                await send(start)
+                await send({"type": "http.response.body", "body": buffered})
+                return
+
+            encoder = _Encoder(encoding, self.gzip_level, self.brotli_quality)
+            headers["Content-Encoding"] = encoding
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            if more_body:
+                del headers["Content-Length"]
+                data = encoder.chunk(buffered)
+            else:
+                data = encoder.finish(buffered)
+                headers["Content-Length"] = str(len(data))
+            buffered = b""
+            await send(start)
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
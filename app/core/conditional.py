@@ -0,0 +1,66 @@
+"""Conditional GET (RFC 9110 §13): validators and `304 Not Modified`.
+
+A handler computes its validators from a cheap query (typically a count and
+`max(updated_at)`), asks `is_not_modified()` whether the client's copy is
+still current, and only builds the body when it is not.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts: object, weak: bool = False) -> str:
+    """Entity tag derived from the values that determine the body.
+
+    Weak (`W/"..."`) when it stands for "same data" rather than the exact
+    bytes, e.g. a version of the rows a JSON view is built from.
+    """
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'{"W/" if weak else ""}"{digest[:32]}"'
+
+
+def http_date(value: datetime) -> str:
+    """IMF-fixdate; naive datetimes are taken to be UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """True when the request's validators still match.
+
+    `If-None-Match` wins when present (weak comparison, `*` matches);
+    `If-Modified-Since` is only consulted without it, at one-second
+    resolution like the header itself.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def not_modified(etag: str, last_modified: Optional[datetime]) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
@@ -35,6 +35,61 @@ class Settings(BaseSettings):
     # Rate limiting (requests per minute per IP for sensitive endpoints)
     auth_rate_limit_per_minute: int = 10
 
+    # Instrumentation — statements slower than this are logged, and a request
+    # that runs the same statement more than `n_plus_one_threshold` times is
+    # reported as a probable N+1 loop.
+    slow_query_ms: int = 200
+    n_plus_one_threshold: int = 10
+    metrics_enabled: bool = True
+
+    # Startup — sample exercises are loaded in the background once the worker
+    # is ready; turn off and run `python -m app.core.sample_data` instead when
+    # several workers share a database.
+    seed_sample_data: bool = True
+
+    # Scheduling — default bookable hours for the availability search (local
+    # wall-clock, like appointment times), weekdays as 0=Mon..6=Sun, and the
+    # gap kept free before and after every appointment.
+    availability_day_start: str = "08:00"
+    availability_day_end: str = "20:00"
+    availability_weekdays: str = "0,1,2,3,4,5"
+    appointment_buffer_minutes: int = 0
+
+    # Calendar feeds — how long a subscription URL stays valid and how much
+    # past history a feed carries alongside upcoming appointments.
+    calendar_feed_token_expire_days: int = 365
+    calendar_feed_past_days: int = 90
+
+    # Compression — responses smaller than this many bytes go out as-is;
+    # Brotli is used when the optional `brotli` package is installed.
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+
+    # Weekly exercises — program weeks kept materialized ahead of the current
+    # one, and how often the background job extends every active assignment.
+    weekly_horizon_weeks: int = 2
+    weekly_horizon_job_interval_minutes: int = 360
+
+    # Progressive overload — rule for exercises whose workout structure
+    # doesn't set one (double, rpe, e1rm or none), the load step in kg and
+    # the session RPE the rpe rule aims for.
+    progression_default_rule: str = "double"
+    progression_increment_kg: float = 2.5
+    progression_target_rpe: float = 8.0
+
+    # Rollups — how often the background job folds new and edited activity
+    # into the per-client daily/weekly rollup tables.
+    rollup_job_interval_minutes: int = 60
+
+    # Adherence — how often every active assignment is re-scored for churn
+    # risk; trainers are notified when a client first scores high.
+    adherence_job_interval_minutes: int = 360
+
+    # Imports — uploads are spooled here until their job completes, so an
+    # interrupted job can resume from the file.
+    import_upload_dir: str = "uploads/imports"
+
     @field_validator("secret_key")
     @classmethod
     def secret_key_must_be_strong(cls, v: str, info) -> str:
@@ -1,15 +1,19 @@
 """Async SQLAlchemy engine + session factories.
 
 We keep one async engine for runtime (FastAPI request handlers) and one sync
-engine for tooling that doesn't speak async — Alembic migrations and the
-startup data seeder. Psycopg 3 supports both modes via the same DBAPI, so the
-async URL is built by swapping the driver token in the configured DATABASE_URL.
+engine, created on first use, for tooling that doesn't speak async — the
+sample-data seeder (Alembic builds its own from DATABASE_URL_SYNC). Psycopg 3
+supports both modes via the same DBAPI, so the async URL is built by swapping
+the driver token in the configured DATABASE_URL.
 """
-from sqlalchemy import create_engine
+from functools import lru_cache
+
+from sqlalchemy import Engine, create_engine
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from app.core.config import settings
+from app.core.instrumentation import TimedAsyncAdaptedQueuePool, instrument_engine
 
 
 def _async_url(url: str) -> str:
@@ -24,13 +28,21 @@ def _async_url(url: str) -> str:
 DATABASE_URL_ASYNC = _async_url(settings.database_url)
 DATABASE_URL_SYNC = settings.database_url
 
-# Async engine — used by the FastAPI app at request time.
+# Async engine — used by the FastAPI app at request time. On Postgres the
+# pool is swapped for a subclass that times checkouts, so pool starvation
+# shows up in /metrics; other dialects keep their default pool.
 async_engine = create_async_engine(
     DATABASE_URL_ASYNC,
     pool_pre_ping=True,
     pool_recycle=300,
     echo=settings.environment == "development",
+    poolclass=(
+        TimedAsyncAdaptedQueuePool
+        if DATABASE_URL_ASYNC.startswith("postgresql")
+        else None
+    ),
 )
+instrument_engine(async_engine)
 AsyncSessionLocal = async_sessionmaker(
     bind=async_engine,
     class_=AsyncSession,
@@ -38,17 +50,37 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
-# Sync engine — used by Alembic and the startup seeder.
-sync_engine = create_engine(
-    DATABASE_URL_SYNC,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=False,
-)
-SyncSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+# Sync engine — used by tooling that isn't async (the sample-data seeder).
+# Built on first use: the API process never needs it, so it shouldn't pay
+# for a second pool at import time.
+@lru_cache(maxsize=None)
+def get_sync_engine() -> Engine:
+    return create_engine(
+        DATABASE_URL_SYNC,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        echo=False,
+    )
+
+
+SyncSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+
+def sync_session() -> Session:
+    """A sync Session bound to the (lazily created) sync engine."""
+    return SyncSessionLocal(bind=get_sync_engine())
+
+
+# SessionLocal kept as an alias so any tooling that still calls it works.
+SessionLocal = sync_session
+
+
+def __getattr__(name: str):
+    # `from app.core.database import sync_engine` keeps working, lazily.
+    if name == "sync_engine":
+        return get_sync_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# SessionLocal kept as an alias so any tooling that still imports it works.
-SessionLocal = SyncSessionLocal
 
 Base = declarative_base()
 
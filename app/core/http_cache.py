@@ -0,0 +1,180 @@
+"""Conditional GET for read-heavy JSON endpoints.
+
+The SPA re-fetches lists and detail views on every navigation even when
+nothing changed. A resource registers a *version function* that derives a
+cheap token from its tables — typically `count`, `max(id)` and
+`max(updated_at)` of the rows the view reads, in a single statement — and
+its GET routes add the `conditional()` dependency:
+
+    @register_version("programs")
+    async def _programs_version(request, db, user):
+        return await fetch_version(db, *table_version(Program, Program.trainer_id == user.id))
+
+    @router.get("/", dependencies=[conditional("programs", get_current_trainer)])
+
+The dependency runs after authentication and before the handler. The ETag
+covers the resource, the user, the path and query string, and the version;
+when the request's `If-None-Match` matches, it raises `NotModified` and the
+handler (and its queries) never run. Otherwise the ETag is stashed on the
+request state and `ETagMiddleware` adds it to the 200 response, whatever
+response class the handler used.
+
+Count catches deletes, `max(id)` inserts (updated_at is NULL until a row's
+first edit) and `max(updated_at)` edits. A version function returning None
+opts the request out, e.g. when the resource doesn't exist for this user, so
+the handler produces its own 404.
+
+Hits and misses per resource are kept in the metrics registry
+(`http_cache_requests_total`, `http_cache_hit_ratio`).
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Tuple
+
+from fastapi import Depends, Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.conditional import is_not_modified, make_etag
+from app.core.database import get_db
+from app.core.instrumentation import metrics
+
+VersionFunction = Callable[[Request, AsyncSession, Any], Awaitable[Optional[Sequence[Any]]]]
+
+_versions: Dict[str, VersionFunction] = {}
+_STATE_KEY = "http_cache_etag"
+
+metrics.describe(
+    "http_cache_requests_total",
+    "counter",
+    "Conditional-GET requests by resource and result (hit = 304, miss = full response).",
+)
+metrics.describe(
+    "http_cache_hit_ratio", "gauge", "Share of conditional-GET requests answered with 304."
+)
+
+
+class NotModified(Exception):
+    def __init__(self, etag: str) -> None:
+        self.etag = etag
+
+
+def register_version(resource: str) -> Callable[[VersionFunction], VersionFunction]:
+    """Register `fn(request, db, user) -> tuple | None` as `resource`'s version."""
+
+    def decorator(fn: VersionFunction) -> VersionFunction:
+        _versions[resource] = fn
+        return fn
+
+    return decorator
+
+
+def table_version(model, *criteria) -> Tuple:
+    """count / max(id) / max(updated_at) of `model`'s matching rows, as
+    scalar subqueries so several tables fit in one `fetch_version` call."""
+    columns = [func.count(model.id), func.max(model.id)]
+    if hasattr(model, "updated_at"):
+        columns.append(func.max(model.updated_at))
+    return tuple(select(column).where(*criteria).scalar_subquery() for column in columns)
+
+
+async def fetch_version(db: AsyncSession, *columns, guard=None) -> Optional[Tuple]:
+    """Run the version columns as one statement; None when `guard` (e.g. an
+    ownership EXISTS) is false."""
+    stmt = select(*columns)
+    if guard is not None:
+        stmt = stmt.where(guard)
+    row = (await db.execute(stmt)).one_or_none()
+    return tuple(row) if row is not None else None
+
+
+def path_int(request: Request, name: str) -> Optional[int]:
+    """An int path parameter, or None if malformed (the route's own
+    validation then answers 422 as usual)."""
+    value = request.path_params.get(name, "")
+    return int(value) if str(value).isdigit() else None
+
+
+def _record(resource: str, result: str) -> None:
+    metrics.inc("http_cache_requests_total", resource=resource, result=result)
+    hits = metrics.get("http_cache_requests_total", resource=resource, result="hit")
+    misses = metrics.get("http_cache_requests_total", resource=resource, result="miss")
+    metrics.set("http_cache_hit_ratio", hits / (hits + misses), resource=resource)
+
+
+def hit_ratio(resource: str) -> float:
+    return metrics.get("http_cache_hit_ratio", resource=resource)
+
+
+async def _check(resource: str, request: Request, db: AsyncSession, user: Any) -> None:
+    if request.method not in ("GET", "HEAD"):
+        return
+    version = await _versions[resource](request, db, user)
+    if version is None:
+        return
+    etag = make_etag(
+        resource,
+        getattr(user, "id", "-"),
+        request.url.path,
+        sorted(request.query_params.multi_items()),
+        *version,
+        weak=True,
+    )
+    if is_not_modified(request, etag, None):
+        _record(resource, "hit")
+        raise NotModified(etag)
+    _record(resource, "miss")
+    setattr(request.state, _STATE_KEY, etag)
+
+
+def conditional(resource: str, auth: Optional[Callable] = None) -> Any:
+    """Route dependency: 304 when `resource`'s version still matches.
+
+    `auth` is the route's own user dependency, so FastAPI resolves it once
+    for both; leave it out for public routes.
+    """
+    if resource not in _versions:
+        raise KeyError(f"No version function registered for {resource!r}")
+
+    if auth is None:
+
+        async def dependency(request: Request, db: AsyncSession = Depends(get_db)) -> None:
+            await _check(resource, request, db, None)
+
+    else:
+
+        async def dependency(
+            request: Request, db: AsyncSession = Depends(get_db), user: Any = Depends(auth)
+        ) -> None:
+            await _check(resource, request, db, user)
+
+    return Depends(dependency)
+
+
+async def not_modified_handler(request: Request, exc: NotModified) -> Response:
+    return Response(
+        status_code=304, headers={"ETag": exc.etag, "Cache-Control": "private, no-cache"}
+    )
+
+
+class ETagMiddleware:
+    """Stamp the ETag `conditional()` computed onto the handler's 200."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                etag = scope.get("state", {}).get(_STATE_KEY)
+                if etag is not None:
+                    headers = MutableHeaders(scope=message)
+                    headers.setdefault("ETag", etag)
+                    headers.setdefault("Cache-Control", "private, no-cache")
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -0,0 +1,354 @@
+"""Database and request instrumentation.
+
+Hooks SQLAlchemy engine/pool events to measure every statement, and a small
+ASGI middleware that scopes those measurements to the HTTP request that
+issued them. Per-request numbers are returned to the caller as `Server-Timing`
+and `X-DB-Query-Count` headers; aggregates are kept in an in-process registry
+that `/metrics` renders in the Prometheus text exposition format.
+
+Per-request state travels in a ContextVar. SQLAlchemy runs sync event hooks
+inside greenlets that inherit the caller's context, so the hooks see the
+`QueryStats` object the middleware installed for the current request.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+@dataclass
+class QueryStats:
+    """Statements executed within one tracked scope (usually a request)."""
+
+    count: int = 0
+    db_time: float = 0.0
+    pool_wait: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+    def repeated(self, threshold: int) -> Dict[str, int]:
+        """Statements executed more than `threshold` times — likely N+1 loops."""
+        return {sql: n for sql, n in self.statements.items() if n > threshold}
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "query_stats", default=None
+)
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect statement counts/timings for everything executed in the block."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+# ── Metrics registry ─────────────────────────────────────────────────────────
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Minimal counter/gauge/histogram store with Prometheus text output.
+
+    We only need a handful of series, so this avoids pulling in
+    prometheus_client. Writes can come from the sync engine (threadpool) as
+    well as the event loop, hence the lock.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[LabelSet, float]] = defaultdict(dict)
+        self._gauges: Dict[str, Dict[LabelSet, float]] = defaultdict(dict)
+        self._histograms: Dict[str, Dict[LabelSet, _Histogram]] = defaultdict(dict)
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+
+    def describe(self, name: str, kind: str, help_text: str, buckets=None) -> None:
+        self._help[name] = (kind, help_text)
+        if buckets is not None:
+            self._buckets[name] = buckets
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        with self._lock:
+            self._gauges[name][tuple(sorted(labels.items()))] = value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms[name]
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = _Histogram(self._buckets.get(name, REQUEST_BUCKETS))
+            hist.observe(value)
+
+    def get(self, name: str, **labels: str) -> float:
+        key = tuple(sorted(labels.items()))
+        store = self._gauges if self._help.get(name, ("",))[0] == "gauge" else self._counters
+        return store.get(name, {}).get(key, 0.0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, (kind, help_text) in self._help.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                if kind == "histogram":
+                    for labels, hist in self._histograms.get(name, {}).items():
+                        cumulative = 0
+                        for bound, n in zip(hist.buckets, hist.counts):
+                            cumulative += n
+                            le = labels + (("le", _fmt(bound)),)
+                            lines.append(f"{name}_bucket{_labels(le)} {cumulative}")
+                        le = labels + (("le", "+Inf"),)
+                        lines.append(f"{name}_bucket{_labels(le)} {hist.count}")
+                        lines.append(f"{name}_sum{_labels(labels)} {_fmt(hist.total)}")
+                        lines.append(f"{name}_count{_labels(labels)} {hist.count}")
+                else:
+                    store = self._counters if kind == "counter" else self._gauges
+                    for labels, value in store.get(name, {}).items():
+                        lines.append(f"{name}{_labels(labels)} {_fmt(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _fmt(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _labels(labels: LabelSet) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in labels
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+metrics = MetricsRegistry()
+metrics.describe("http_requests_total", "counter", "HTTP requests by route and status.")
+metrics.describe(
+    "http_request_duration_seconds", "histogram", "HTTP request latency by route."
+)
+metrics.describe("db_queries_total", "counter", "SQL statements executed, by route.")
+metrics.describe(
+    "db_query_duration_seconds_total", "counter", "Time spent in SQL statements, by route."
+)
+metrics.describe(
+    "db_pool_wait_seconds_total", "counter", "Time spent waiting for a pooled connection."
+)
+metrics.describe(
+    "db_queries_per_request",
+    "histogram",
+    "SQL statements issued per HTTP request.",
+    buckets=QUERY_COUNT_BUCKETS,
+)
+metrics.describe("db_slow_queries_total", "counter", "Statements slower than SLOW_QUERY_MS.")
+metrics.describe(
+    "db_n_plus_one_total", "counter", "Requests that repeated one statement too often."
+)
+metrics.describe("db_pool_checkouts_total", "counter", "Pool connection checkouts.")
+metrics.describe("db_pool_checkins_total", "counter", "Pool connection checkins.")
+metrics.describe("db_pool_size", "gauge", "Configured pool size.")
+metrics.describe("db_pool_checked_out", "gauge", "Connections currently checked out.")
+metrics.describe("db_pool_overflow", "gauge", "Connections open beyond pool_size.")
+
+
+# ── Engine / pool hooks ──────────────────────────────────────────────────────
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a slot."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            stats = _current_stats.get()
+            if stats is not None:
+                stats.pool_wait += waited
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.db_time += elapsed
+        stats.statements[statement] += 1
+    if elapsed * 1000 >= settings.slow_query_ms:
+        metrics.inc("db_slow_queries_total")
+        logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, statement)
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    starts = conn.info.get("query_start_time") if conn is not None else None
+    if starts:
+        starts.pop()
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    metrics.inc("db_pool_checkouts_total")
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    metrics.inc("db_pool_checkins_total")
+
+
+_instrumented_engines: list = []
+
+
+def instrument_engine(engine) -> None:
+    """Attach statement and pool listeners to an Engine or AsyncEngine."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+    event.listen(sync_engine.pool, "checkout", _on_checkout)
+    event.listen(sync_engine.pool, "checkin", _on_checkin)
+    _instrumented_engines.append(sync_engine)
+
+
+def _refresh_pool_gauges() -> None:
+    for sync_engine in _instrumented_engines:
+        pool = sync_engine.pool
+        if not hasattr(pool, "checkedout"):
+            continue
+        labels = {"engine": sync_engine.url.get_backend_name()}
+        metrics.set("db_pool_size", pool.size(), **labels)
+        metrics.set("db_pool_checked_out", pool.checkedout(), **labels)
+        metrics.set("db_pool_overflow", max(pool.overflow(), 0), **labels)
+
+
+def render_metrics() -> str:
+    _refresh_pool_gauges()
+    return metrics.render()
+
+
+# ── Request middleware ───────────────────────────────────────────────────────
+
+def route_name(scope: Scope) -> str:
+    """Route template (`/api/v1/clients/{client_id}`) rather than the raw path,
+    so label cardinality stays bounded."""
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return route.path
+    return "unmatched"
+
+
+class QueryMetricsMiddleware:
+    """Scope `QueryStats` to each HTTP request and publish the results."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        with track_queries() as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    headers = MutableHeaders(scope=message)
+                    headers.append("X-DB-Query-Count", str(stats.count))
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.count} queries", '
+                        f"db-pool;dur={stats.pool_wait * 1000:.1f}",
+                    )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                self._record(scope, stats, status_code, time.perf_counter() - start)
+
+    @staticmethod
+    def _record(scope: Scope, stats: QueryStats, status_code: int, elapsed: float) -> None:
+        route = route_name(scope)
+        method = scope.get("method", "")
+        metrics.inc("http_requests_total", method=method, route=route, status=str(status_code))
+        metrics.observe("http_request_duration_seconds", elapsed, route=route)
+        metrics.observe("db_queries_per_request", stats.count, route=route)
+        if stats.count:
+            metrics.inc("db_queries_total", stats.count, route=route)
+            metrics.inc("db_query_duration_seconds_total", stats.db_time, route=route)
+        if stats.pool_wait:
+            metrics.inc("db_pool_wait_seconds_total", stats.pool_wait, route=route)
+
+        repeated = stats.repeated(settings.n_plus_one_threshold)
+        if repeated:
+            metrics.inc("db_n_plus_one_total", route=route)
+            for statement, times in repeated.items():
+                logger.warning(
+                    "Possible N+1 on %s %s: statement ran %d times: %s",
+                    method,
+                    route,
+                    times,
+                    " ".join(statement.split())[:300],
+                )
@@ -0,0 +1,123 @@
+"""Startup warmup and readiness.
+
+`/api/v1/health` only says the process is up. `/ready` says it can take
+traffic: it returns 503 until `warm_up()` has opened the pool's connections
+and run every registered warmup hook (cache priming and the like), so a load
+balancer or Kubernetes readiness probe never routes requests to a cold worker.
+
+Modules register hooks with `@on_warmup`; hooks receive the async engine.
+A failing hook is logged and recorded but does not keep the worker unready
+forever — a cold cache is slower, not broken. A database that can't be
+reached yet is retried with backoff until it can.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+WarmupHook = Callable[[AsyncEngine], Awaitable[None]]
+
+_hooks: List[WarmupHook] = []
+
+MAX_BACKOFF_S = 30.0
+
+
+@dataclass
+class ReadinessState:
+    ready: bool = False
+    started_at: Optional[float] = None
+    warmup_ms: Optional[float] = None
+    connections: int = 0
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return {
+            "status": "ready" if self.ready else "starting",
+            "warmup_ms": self.warmup_ms,
+            "pool_connections": self.connections,
+            "warmup_errors": self.errors,
+        }
+
+
+state = ReadinessState()
+
+
+def on_warmup(hook: WarmupHook) -> WarmupHook:
+    """Register a coroutine to run (once) before the worker reports ready."""
+    _hooks.append(hook)
+    return hook
+
+
+async def _prefill_pool(engine: AsyncEngine) -> int:
+    """Open up to pool_size connections at once and hand them back."""
+    size = engine.pool.size() if hasattr(engine.pool, "size") else 1
+    barrier = asyncio.Barrier(size)
+
+    async def _touch() -> None:
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                # Hold the connection until all are open so each task gets its own.
+                await barrier.wait()
+        except asyncio.BrokenBarrierError:
+            raise
+        except BaseException:
+            # Release the tasks already holding a connection at the barrier.
+            await barrier.abort()
+            raise
+
+    results = await asyncio.gather(*(_touch() for _ in range(size)), return_exceptions=True)
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        raise next((e for e in errors if not isinstance(e, asyncio.BrokenBarrierError)), errors[0])
+    return size
+
+
+async def warm_up(
+    engine: AsyncEngine, attempts: Optional[int] = None, backoff_s: float = 1.0
+) -> ReadinessState:
+    """Fill the pool and run the hooks. The pool is retried `attempts` times
+    (default: until it succeeds), waiting `backoff_s` doubling up to
+    MAX_BACKOFF_S in between; the worker stays unready meanwhile."""
+    state.ready = False
+    state.errors = {}
+    state.started_at = time.perf_counter()
+    attempt, delay = 0, backoff_s
+    while True:
+        attempt += 1
+        try:
+            state.connections = await _prefill_pool(engine)
+            break
+        except Exception as e:
+            # Without a database there is nothing to serve; stay unready.
+            logger.error("Warmup could not reach the database (attempt %d): %s", attempt, e)
+            state.errors["pool"] = str(e)
+            if attempts is not None and attempt >= attempts:
+                return state
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, MAX_BACKOFF_S)
+    state.errors.pop("pool", None)
+
+    for hook in _hooks:
+        name = getattr(hook, "__qualname__", repr(hook))
+        try:
+            await hook(engine)
+        except Exception as e:
+            logger.warning("Warmup hook %s failed: %s", name, e)
+            state.errors[name] = str(e)
+
+    state.warmup_ms = round((time.perf_counter() - state.started_at) * 1000, 1)
+    state.ready = True
+    logger.info(
+        "Ready after %.1f ms warmup (%d pool connections, %d hooks)",
+        state.warmup_ms,
+        state.connections,
+        len(_hooks),
+    )
+    return state
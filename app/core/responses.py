@@ -0,0 +1,68 @@
+"""JSON response rendering.
+
+`ORJSONResponse` is the app's default response class: the same output as
+Starlette's `JSONResponse`, encoded with orjson when it is installed (it
+falls back to the stdlib encoder otherwise).
+
+`render()` is for handlers whose payload is already shaped by our own code —
+plain dicts built from SQL rows, or models we constructed ourselves. FastAPI
+would otherwise validate the returned value against `response_model` a
+second time and run it through `jsonable_encoder` before encoding; returning
+a response object skips both. The route keeps its `response_model` so the
+OpenAPI schema is unchanged.
+"""
+import json
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+if orjson is not None:
+    # Match pydantic's output: UTC datetimes end in "Z", naive ones carry no
+    # offset, and non-string dict keys (e.g. day numbers) are stringified.
+    _ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def dumps(content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+else:
+
+    def dumps(content: Any) -> bytes:
+        return json.dumps(
+            jsonable_encoder(content),
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+
+class ORJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def render(
+    content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None
+) -> ORJSONResponse:
+    """Encode trusted, already-shaped content without re-validation."""
+    return ORJSONResponse(content, status_code=status_code, headers=headers)
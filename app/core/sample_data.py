@@ -136,3 +136,12 @@ def seed_sample_exercises(db: Session):
     
     db.commit()
     print(f"Successfully seeded {len(sample_exercises)} sample exercises!")
+
+
+if __name__ == "__main__":
+    # One-shot seeding: `python -m app.core.sample_data` (after `alembic upgrade head`).
+    import app.models  # noqa: F401 — register every mapper before querying
+    from app.core.database import sync_session
+
+    with sync_session() as session:
+        seed_sample_exercises(session)
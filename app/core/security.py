@@ -1,7 +1,9 @@
 """Password hashing + JWT helpers.
 
-Tokens carry a `type` claim (`"access"` or `"refresh"`) so a refresh token
-can never be silently substituted for an access token at a protected route.
+Tokens carry a `type` claim (`"access"`, `"refresh"` or `"feed"`) so a
+refresh token can never be silently substituted for an access token at a
+protected route. Feed tokens are long-lived and only open a read-only
+calendar feed; their subject names the feed (`trainer:<id>`/`client:<id>`).
 """
 from datetime import datetime, timedelta, timezone
 from typing import Any, Literal, Optional
@@ -11,7 +13,7 @@ from passlib.context import CryptContext
 
 from app.core.config import settings
 
-TokenType = Literal["access", "refresh"]
+TokenType = Literal["access", "refresh", "feed"]
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -37,6 +39,11 @@ def create_refresh_token(subject: Any, expires_delta: Optional[timedelta] = None
     return _create_token(subject, "refresh", delta)
 
 
+def create_feed_token(subject: Any, expires_delta: Optional[timedelta] = None) -> str:
+    delta = expires_delta or timedelta(days=settings.calendar_feed_token_expire_days)
+    return _create_token(subject, "feed", delta)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -1,30 +1,100 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 
 from app.api.api import api_router
+from app.core import readiness
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.database import async_engine
+from app.core.http_cache import ETagMiddleware, NotModified, not_modified_handler
+from app.core.instrumentation import QueryMetricsMiddleware, render_metrics
 from app.core.rate_limit import limiter
+from app.core.responses import ORJSONResponse
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Import all models so SQLAlchemy registers their tables before engines connect.
-from app.models.user import User  # noqa: E402,F401
-from app.models.client import Client  # noqa: E402,F401
-from app.models.program import Exercise, Program  # noqa: E402,F401
-from app.models.program_assignment import ProgramAssignment  # noqa: E402,F401
-from app.models.workout_tracking import ExerciseLog, WorkoutLog  # noqa: E402,F401
-from app.models.weekly_exercise import WeeklyExerciseAssignment  # noqa: E402,F401
-from app.models.nutrition import Food, NutritionPlan  # noqa: E402,F401
-from app.models.schedule import Appointment  # noqa: E402,F401
-from app.models.notification import Notification  # noqa: E402,F401
+# Register every mapper (and its relationships) before the first query.
+import app.models  # noqa: E402,F401
+
+
+def _seed_sample_data() -> None:
+    # Sync seeder on the lazily-built sync engine, run in a worker thread.
+    from app.core.database import sync_session
+    from app.core.sample_data import seed_sample_exercises
+
+    with sync_session() as db:
+        seed_sample_exercises(db)
+
+
+async def _start_background() -> None:
+    await readiness.warm_up(async_engine)
+    if settings.seed_sample_data:
+        try:
+            await asyncio.to_thread(_seed_sample_data)
+        except Exception as e:
+            logger.error("Error seeding sample data: %s", e)
+
+
+async def _extend_weekly_horizons() -> None:
+    # Keep active assignments' weekly rows WEEKLY_HORIZON_WEEKS ahead. Reads
+    # of a week past the horizon extend it too, so a missed run only costs
+    # that first read a little more. The coming week's rows then get their
+    # loads progressed from each client's latest sessions.
+    from app.core.database import AsyncSessionLocal
+    from app.services.overload_service import OverloadService
+    from app.services.weekly_exercise_service import WeeklyExerciseService
+
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                await WeeklyExerciseService.extend_horizons(db)
+                await OverloadService.rollover(db)
+                await db.commit()
+        except Exception as e:
+            logger.error("Error extending weekly exercise horizons: %s", e)
+        await asyncio.sleep(settings.weekly_horizon_job_interval_minutes * 60)
+
+
+async def _refresh_rollups() -> None:
+    # Fold activity created or edited since the last run into the per-client
+    # rollups. Reads serve days before the last run from them, so a missed
+    # run only delays back-dated edits.
+    from app.core.database import AsyncSessionLocal
+    from app.services.rollup_service import RollupService
+
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                await RollupService.refresh(db)
+        except Exception as e:
+            logger.error("Error refreshing rollups: %s", e)
+        await asyncio.sleep(settings.rollup_job_interval_minutes * 60)
+
+
+async def _score_adherence() -> None:
+    # Re-score every active assignment for churn risk. Trainers are notified
+    # once when a client first reaches "high", so reruns don't repeat alerts;
+    # every worker runs this loop, and a run is skipped while another holds
+    # the scoring lock.
+    from app.core.database import AsyncSessionLocal
+    from app.services.adherence_service import AdherenceService
+
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                await AdherenceService.score_all(db)
+        except Exception as e:
+            logger.error("Error scoring adherence: %s", e)
+        await asyncio.sleep(settings.adherence_job_interval_minutes * 60)
 
 
 @asynccontextmanager
@@ -37,21 +107,22 @@ async def lifespan(app: FastAPI):
         db_url.split("@", 1)[1] if "@" in db_url else "Not configured",
     )
 
-    # Schema is owned by Alembic — run `alembic upgrade head` before starting.
-    # We do, however, seed sample exercises on first boot so a fresh DB has
-    # something to demo. The seeder is sync; the async engine isn't suitable
-    # for one-off blocking startup work, so we use the sync SessionLocal here.
-    try:
-        from app.core.database import SessionLocal
-        from app.core.sample_data import seed_sample_exercises
-
-        with SessionLocal() as db:
-            seed_sample_exercises(db)
-    except Exception as e:
-        logger.error("Error seeding sample data: %s", e)
+    # Schema is owned by Alembic — run `alembic upgrade head` before starting,
+    # and `python -m app.core.sample_data` once to load demo exercises.
+    # Nothing here blocks startup: warmup (pool pre-fill, cache priming) and
+    # the optional SEED_SAMPLE_DATA run happen in the background while /ready
+    # reports 503.
+    background = asyncio.create_task(_start_background())
+    horizons = asyncio.create_task(_extend_weekly_horizons())
+    rollups = asyncio.create_task(_refresh_rollups())
+    adherence = asyncio.create_task(_score_adherence())
 
     yield
 
+    background.cancel()
+    horizons.cancel()
+    rollups.cancel()
+    adherence.cancel()
     logger.info("FitnessCoach API shutting down...")
 
 
@@ -62,6 +133,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Rate limiter — slowapi attaches the limiter to app.state and registers a
@@ -70,6 +142,21 @@ app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 app.add_middleware(SlowAPIMiddleware)
 
+# Conditional GET — routes with the `conditional()` dependency answer a
+# matching If-None-Match with 304 before their handler runs; the middleware
+# puts the ETag on full responses.
+app.add_exception_handler(NotModified, not_modified_handler)
+app.add_middleware(ETagMiddleware)
+
+# Brotli/gzip for text-like responses above COMPRESSION_MINIMUM_SIZE. Outside
+# the ETag middleware so it sees (and weakens) the final validators.
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality,
+)
+
 # CORS — origins are configurable via ALLOWED_ORIGINS in .env
 app.add_middleware(
     CORSMiddleware,
@@ -77,8 +164,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-DB-Query-Count", "ETag"],
 )
 
+# Per-request query count / DB time / pool wait. Added last so it is the
+# outermost middleware and sees the full request, including CORS and limiter.
+if settings.metrics_enabled:
+    app.add_middleware(QueryMetricsMiddleware)
+
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
@@ -110,6 +203,23 @@ async def read_root():
     }
 
 
+@app.get("/ready", include_in_schema=False)
+async def ready():
+    """Readiness probe: 503 until the pool is warm and warmup hooks have run."""
+    return JSONResponse(
+        status_code=200 if readiness.state.ready else 503,
+        content=readiness.state.as_dict(),
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint (text exposition format 0.0.4)."""
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4"
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -3,8 +3,10 @@ from .user import User, UserRole, SpecializationType, ExperienceLevel
 from .client import Client, Gender, ActivityLevel, GoalType
 from .program import Program, Exercise, ProgramType, DifficultyLevel
 from .program_assignment import ProgramAssignment, AssignmentStatus
-from .workout_tracking import WorkoutLog, ExerciseLog
-from .weekly_exercise import WeeklyExerciseAssignment, WeeklyExerciseStatus
+from .workout_tracking import WorkoutLog, ExerciseLog, ExerciseLogSet, ExerciseLatestPerformance
+from .weekly_exercise import (
+    WeeklyExerciseAssignment, WeeklyExerciseStatus, WeeklyScheduleDocument
+)
 from .nutrition import NutritionPlan, Food
 from .schedule import Appointment, AppointmentType, AppointmentStatus
 from .notification import Notification, NotificationType
@@ -12,15 +14,20 @@ from .body_metric import BodyMetric
 from .performance_record import PerformanceRecord
 from .goal_milestone import GoalMilestone
 from .session_note import SessionNote
+from .import_job import ImportJob, ImportKind, ImportStatus
+from .rollup import ClientDailyRollup, ClientWeeklyRollup, RollupState
+from .adherence import AdherenceScore
 
 __all__ = [
     "User", "Client", "Program", "Exercise", "ProgramAssignment",
-    "WorkoutLog", "ExerciseLog", "WeeklyExerciseAssignment",
+    "WorkoutLog", "ExerciseLog", "ExerciseLogSet", "ExerciseLatestPerformance",
+    "WeeklyExerciseAssignment", "WeeklyScheduleDocument",
     "NutritionPlan", "Food", "Appointment", "Notification",
-    "BodyMetric", "PerformanceRecord", "GoalMilestone", "SessionNote",
+    "BodyMetric", "PerformanceRecord", "GoalMilestone", "SessionNote", "ImportJob",
+    "ClientDailyRollup", "ClientWeeklyRollup", "RollupState", "AdherenceScore",
     "UserRole", "SpecializationType", "ExperienceLevel",
     "Gender", "ActivityLevel", "GoalType",
     "ProgramType", "DifficultyLevel", "AssignmentStatus",
     "WeeklyExerciseStatus", "AppointmentType", "AppointmentStatus",
-    "NotificationType",
+    "NotificationType", "ImportKind", "ImportStatus",
 ]
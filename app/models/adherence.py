@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class AdherenceScore(Base):
+    """Latest churn-risk score of an active program assignment; rewritten
+    on every run of `app.services.adherence_service`."""
+    __tablename__ = "adherence_scores"
+    __table_args__ = (Index("ix_adherence_scores_trainer_score", "trainer_id", "score"),)
+
+    assignment_id = Column(Integer, ForeignKey("program_assignments.id"), primary_key=True)
+    client_id = Column(Integer, ForeignKey("clients.id"), nullable=False)
+    trainer_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    score = Column(Float, nullable=False)  # 0-1, probability-like
+    level = Column(String(10), nullable=False)  # low, medium, high
+
+    # Features the score was computed from
+    recent_miss_rate = Column(Float, nullable=False)  # Missed share of the last 2 weeks' exercises
+    miss_rate_trend = Column(Float, nullable=False)  # ... minus that of the 4 weeks before
+    days_since_workout = Column(Integer, nullable=False)
+    days_since_completion = Column(Integer, nullable=False)  # Since the last completed exercise
+
+    scored_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<AdherenceScore assignment={self.assignment_id} {self.level} {self.score:.2f}>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, String, Date, ForeignKey, Text, DateTime
+from sqlalchemy import Column, Integer, Float, String, Date, ForeignKey, Text, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -6,6 +6,7 @@ from app.core.database import Base
 
 class BodyMetric(Base):
     __tablename__ = "body_metrics"
+    __table_args__ = (Index("ix_body_metrics_client_measured", "client_id", "measured_at"),)
 
     id = Column(Integer, primary_key=True, index=True)
     client_id = Column(Integer, ForeignKey("clients.id"), nullable=False)
@@ -29,6 +30,7 @@ class BodyMetric(Base):
     notes = Column(Text, nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationship
     client = relationship("Client", back_populates="body_metrics")
@@ -1,11 +1,12 @@
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Text, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import false, func
 from app.core.database import Base
 
 
 class GoalMilestone(Base):
     __tablename__ = "goal_milestones"
+    __table_args__ = (Index("ix_goal_milestones_client_metric", "client_id", "metric"),)
 
     id = Column(Integer, primary_key=True, index=True)
     client_id = Column(Integer, ForeignKey("clients.id"), nullable=False)
@@ -21,6 +22,7 @@ class GoalMilestone(Base):
     start_value = Column(Float, nullable=False)
     target_value = Column(Float, nullable=False)
     current_value = Column(Float, nullable=True)          # updated manually or from body metrics
+    progress_pct = Column(Float, nullable=False, default=0.0, server_default="0")  # kept by goal_progress_service
 
     # Timeline
     start_date = Column(Date, nullable=False)
@@ -29,6 +31,8 @@ class GoalMilestone(Base):
     # Status
     is_completed = Column(Boolean, default=False)
     completed_date = Column(Date, nullable=True)
+    # Marked complete by the trainer; otherwise metric-backed goals follow their measurements
+    completed_manually = Column(Boolean, nullable=False, default=False, server_default=false())
     notes = Column(Text, nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy.sql import func
+from app.core.database import Base
+import enum
+
+
+class ImportKind(enum.Enum):
+    CLIENTS = "clients"
+    EXERCISES = "exercises"
+    WORKOUTS = "workouts"
+
+
+class ImportStatus(enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ImportJob(Base):
+    """A bulk upload being loaded chunk by chunk.
+
+    `rows_processed` advances in the same transaction as each chunk's rows,
+    so a job interrupted mid-file resumes exactly after its last committed
+    chunk; maintained by `app.services.import_service`.
+    """
+    __tablename__ = "import_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    trainer_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+
+    kind = Column(String(20), nullable=False)  # ImportKind value
+    file_format = Column(String(10), nullable=False)  # "csv" or "ndjson"
+    file_path = Column(String(500), nullable=False)  # Spooled upload
+    status = Column(String(20), nullable=False, default=ImportStatus.PENDING.value)
+
+    # Progress — data rows read, written and rejected so far
+    rows_processed = Column(Integer, nullable=False, default=0)
+    rows_imported = Column(Integer, nullable=False, default=0)
+    rows_failed = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON, nullable=False, default=list)  # [{"row": n, "errors": [...]}], capped
+    failure = Column(Text, nullable=True)  # Why the job stopped, if it did
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<ImportJob {self.id} {self.kind} {self.status}>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -11,6 +11,7 @@ class NotificationType(enum.Enum):
     EXERCISE_NOT_COMPLETED = "exercise_not_completed"
     APPOINTMENT_UPCOMING = "appointment_upcoming"
     APPOINTMENT_REMINDER = "appointment_reminder"
+    CLIENT_AT_RISK = "client_at_risk"
     # Future types for client notifications
     NEW_ASSIGNMENT = "new_assignment"
     WEEKLY_EXERCISE_UPDATE = "weekly_exercise_update"
@@ -33,6 +34,10 @@ class Notification(Base):
     related_client_id = Column(Integer, ForeignKey("clients.id"), nullable=True)
     related_appointment_id = Column(Integer, ForeignKey("appointments.id"), nullable=True)
     related_workout_log_id = Column(Integer, ForeignKey("workout_logs.id"), nullable=True)
+
+    # Denormalized at creation so the inbox renders without a clients lookup;
+    # NULL on rows written before it existed (resolved in batch on read).
+    client_name = Column(String(255), nullable=True)
     
     # Status
     is_read = Column(Boolean, default=False)
@@ -47,5 +52,10 @@ class Notification(Base):
     related_appointment = relationship("Appointment", foreign_keys=[related_appointment_id])
     related_workout_log = relationship("WorkoutLog", foreign_keys=[related_workout_log_id])
     
+    __table_args__ = (
+        Index("ix_notifications_user_id_created_at", "user_id", "created_at"),
+        Index("ix_notifications_related_client_id", "related_client_id"),
+    )
+
     def __repr__(self):
         return f"<Notification {self.id}: {self.notification_type.value} for user {self.user_id}>"
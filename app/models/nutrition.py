@@ -1,6 +1,6 @@
 from sqlalchemy import (
     Column, Integer, String, Text, DateTime, Boolean, 
-    Float, ForeignKey, JSON
+    Float, ForeignKey, JSON, DDL, Index, event
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -80,11 +80,38 @@ class Food(Base):
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        # A scan is one unique-index probe; NULLs (no barcode) may repeat.
+        Index("ix_foods_barcode", "barcode", unique=True),
+        Index("ix_foods_category", "category"),
+    )
     
     def __repr__(self):
         return f"<Food {self.name}>"
 
 
+# Type-ahead on Postgres: a trigram GIN index over the lower-cased
+# "name brand" document serves substring and fuzzy (`%`) matches, and a
+# text_pattern_ops B-tree on lower(name) serves the short prefixes trigrams
+# can't. The search service builds the same expressions; other dialects use
+# its in-memory prefix trie instead. Mirrored by the alembic revision.
+FOOD_SEARCH_DOCUMENT = "lower(name || ' ' || coalesce(brand, ''))"
+FOOD_SEARCH_DDL = (
+    "CREATE INDEX ix_foods_search_trgm ON foods "
+    f"USING gin (({FOOD_SEARCH_DOCUMENT}) gin_trgm_ops)",
+    "CREATE INDEX ix_foods_name_prefix ON foods (lower(name) text_pattern_ops)",
+)
+
+event.listen(
+    Food.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+for _ddl in FOOD_SEARCH_DDL:
+    event.listen(Food.__table__, "after_create", DDL(_ddl).execute_if(dialect="postgresql"))
+
+
 # Add relationships to existing models
 from app.models.user import User
 from app.models.client import Client
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Text, DateTime
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Text, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -6,6 +6,7 @@ from app.core.database import Base
 
 class PerformanceRecord(Base):
     __tablename__ = "performance_records"
+    __table_args__ = (Index("ix_performance_records_trainer_recorded", "trainer_id", "recorded_at"),)
 
     id = Column(Integer, primary_key=True, index=True)
     client_id = Column(Integer, ForeignKey("clients.id"), nullable=False)
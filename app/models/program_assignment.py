@@ -49,6 +49,9 @@ class ProgramAssignment(Base):
     completed_workouts = Column(Integer, default=0)
     last_workout_date = Column(DateTime, nullable=True)
     
+    # Program weeks materialized as weekly exercise rows so far (rolling horizon)
+    generated_weeks = Column(Integer, nullable=False, default=0, server_default="0")
+    
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
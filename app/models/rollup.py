@@ -0,0 +1,66 @@
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, PrimaryKeyConstraint
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class _ClientFacts:
+    """Per-client training facts for one period; maintained by
+    `app.services.rollup_service`."""
+
+    client_id = Column(Integer, ForeignKey("clients.id"), primary_key=True)
+
+    # Workout logs (by workout date)
+    workouts_completed = Column(Integer, nullable=False, default=0)
+    workouts_skipped = Column(Integer, nullable=False, default=0)
+    duration_minutes = Column(Integer, nullable=False, default=0)  # Completed workouts
+    duration_count = Column(Integer, nullable=False, default=0)  # ... that recorded a duration
+    rpe_sum = Column(Integer, nullable=False, default=0)
+    rpe_count = Column(Integer, nullable=False, default=0)
+    tonnage = Column(Float, nullable=False, default=0.0)  # Σ reps × kg over completed sets
+
+    # Weekly exercises (by assigned date)
+    exercises_assigned = Column(Integer, nullable=False, default=0)
+    exercises_completed = Column(Integer, nullable=False, default=0)
+    exercises_skipped = Column(Integer, nullable=False, default=0)
+
+    # Body metrics — the period's last recorded weight
+    weight = Column(Float, nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class ClientDailyRollup(_ClientFacts, Base):
+    __tablename__ = "client_daily_rollups"
+    __table_args__ = (PrimaryKeyConstraint("client_id", "day"),)
+
+    day = Column(Date, primary_key=True)
+
+    def __repr__(self):
+        return f"<ClientDailyRollup client={self.client_id} day={self.day}>"
+
+
+class ClientWeeklyRollup(_ClientFacts, Base):
+    __tablename__ = "client_weekly_rollups"
+    __table_args__ = (PrimaryKeyConstraint("client_id", "week_start"),)
+
+    week_start = Column(Date, primary_key=True)  # Monday
+
+    def __repr__(self):
+        return f"<ClientWeeklyRollup client={self.client_id} week={self.week_start}>"
+
+
+class RollupState(Base):
+    """High-water mark of the rollup job.
+
+    Rows created or updated before `high_water_mark` are folded into the
+    rollups, so they are authoritative for days before `covered_until`.
+    """
+    __tablename__ = "rollup_state"
+
+    name = Column(String(50), primary_key=True)
+    high_water_mark = Column(DateTime(timezone=True), nullable=False)
+    covered_until = Column(Date, nullable=False)  # First day not served from rollups
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<RollupState {self.name} {self.high_water_mark}>"
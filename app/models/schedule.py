@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import DDL, Column, Integer, String, DateTime, ForeignKey, Index, Text, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -51,5 +51,33 @@ class Appointment(Base):
     trainer = relationship("User", back_populates="appointments")
     client = relationship("Client", back_populates="appointments")
 
+    # Conflict lookups and calendar reads are "this trainer, this time window".
+    __table_args__ = (
+        Index("ix_appointments_trainer_id_start_time", "trainer_id", "start_time"),
+    )
+
     def __repr__(self):
-        return f"<Appointment(id={self.id}, client={self.client.name if self.client else 'Unknown'}, start_time={self.start_time})>"
\ No newline at end of file
+        return f"<Appointment(id={self.id}, client={self.client.name if self.client else 'Unknown'}, start_time={self.start_time})>"
+
+
+# On Postgres the database itself refuses double-booking: a GiST exclusion
+# constraint over (trainer_id, tsrange(start_time, end_time)) for every
+# appointment that isn't cancelled. It closes the race between the service's
+# conflict check and its insert; other dialects rely on the check alone.
+# Mirrored by the alembic revision that adds it to existing databases.
+APPOINTMENT_EXCLUSION_DDL = (
+    "ALTER TABLE appointments ADD CONSTRAINT appointments_no_overlap "
+    "EXCLUDE USING gist (trainer_id WITH =, tsrange(start_time, end_time) WITH &&) "
+    "WHERE (status IS DISTINCT FROM 'cancelled')"
+)
+
+event.listen(
+    Appointment.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
+event.listen(
+    Appointment.__table__,
+    "after_create",
+    DDL(APPOINTMENT_EXCLUSION_DDL).execute_if(dialect="postgresql"),
+)
@@ -1,7 +1,7 @@
 # Weekly Exercise Assignment Model
 from sqlalchemy import (
     Column, Integer, String, Text, DateTime, Boolean, 
-    ForeignKey, Enum as SQLEnum, Date
+    ForeignKey, Enum as SQLEnum, Date, JSON, Index
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -20,6 +20,17 @@ class WeeklyExerciseStatus(enum.Enum):
 class WeeklyExerciseAssignment(Base):
     """Individual exercise assignments broken down from program assignments"""
     __tablename__ = "weekly_exercise_assignments"
+    __table_args__ = (
+        # One row per slot: weeks generated twice are rejected
+        Index(
+            "uq_weekly_exercise_assignments_slot",
+            "program_assignment_id", "week_number", "day_number", "exercise_order",
+            unique=True,
+        ),
+        Index("ix_weekly_exercise_assignments_trainer_due", "trainer_id", "due_date"),
+        # Roster-wide windows (adherence scoring)
+        Index("ix_weekly_exercise_assignments_due_date", "due_date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
@@ -67,6 +78,23 @@ class WeeklyExerciseAssignment(Base):
         return f"<WeeklyExerciseAssignment {self.exercise_id} for {self.client_id} on day {self.day_number}>"
 
 
+class WeeklyScheduleDocument(Base):
+    """One client's week of exercises, pre-rendered for the current-week view.
+
+    Keyed by (client, Monday) so a read is a single primary-key lookup;
+    maintained by `app.services.schedule_document_service`.
+    """
+    __tablename__ = "weekly_schedule_documents"
+
+    client_id = Column(Integer, ForeignKey("clients.id"), primary_key=True)
+    week_start = Column(Date, primary_key=True)  # Monday
+    exercises = Column(JSON, nullable=False)  # WeeklyExerciseWithDetails payloads, in order
+    built_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<WeeklyScheduleDocument client={self.client_id} week={self.week_start}>"
+
+
 # Add relationships to existing models
 from app.models.program_assignment import ProgramAssignment
 from app.models.client import Client
@@ -1,6 +1,6 @@
 from sqlalchemy import (
     Column, Integer, String, Text, DateTime, Boolean, 
-    Float, ForeignKey, Enum as SQLEnum, JSON
+    Float, ForeignKey, Enum as SQLEnum, JSON, Index
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -10,6 +10,7 @@ from app.core.database import Base
 class WorkoutLog(Base):
     """Individual workout session log"""
     __tablename__ = "workout_logs"
+    __table_args__ = (Index("ix_workout_logs_client_date", "client_id", "workout_date"),)
     
     id = Column(Integer, primary_key=True, index=True)
     assignment_id = Column(Integer, ForeignKey("program_assignments.id"), nullable=False)
@@ -81,3 +82,58 @@ class ExerciseLog(Base):
     
     def __repr__(self):
         return f"<ExerciseLog {self.exercise_name} in workout {self.workout_log_id}>"
+
+
+class ExerciseLogSet(Base):
+    """Numeric copy of one loaded set from `ExerciseLog.actual_sets`.
+
+    Kept in step with the JSON by `app.services.progression_service`, so
+    progression charts read indexed numbers instead of parsing every log.
+    """
+    __tablename__ = "exercise_log_sets"
+    __table_args__ = (
+        Index("ix_exercise_log_sets_client_exercise", "client_id", "exercise_id", "performed_at"),
+    )
+
+    exercise_log_id = Column(
+        Integer, ForeignKey("exercise_logs.id", ondelete="CASCADE"), primary_key=True
+    )
+    set_number = Column(Integer, primary_key=True)  # Position in actual_sets, from 1
+
+    # Copied from the exercise and workout logs
+    client_id = Column(Integer, ForeignKey("clients.id"), nullable=False)
+    exercise_id = Column(Integer, ForeignKey("exercises.id"), nullable=False)
+    performed_at = Column(DateTime, nullable=False)
+
+    reps = Column(Integer, nullable=False)
+    weight_kg = Column(Float, nullable=False)
+    e1rm = Column(Float, nullable=False)  # Estimated one-rep max (Epley), kg
+
+    def __repr__(self):
+        return f"<ExerciseLogSet log={self.exercise_log_id} #{self.set_number} {self.reps}x{self.weight_kg}>"
+
+
+class ExerciseLatestPerformance(Base):
+    """A client's most recent session of an exercise, summarised from
+    `exercise_log_sets` for next week's prescriptions.
+
+    Recomputed by `app.services.progression_service` whenever that
+    client's sets of the exercise are indexed.
+    """
+    __tablename__ = "exercise_latest_performances"
+
+    client_id = Column(Integer, ForeignKey("clients.id"), primary_key=True)
+    exercise_id = Column(Integer, ForeignKey("exercises.id"), primary_key=True)
+    exercise_log_id = Column(
+        Integer, ForeignKey("exercise_logs.id", ondelete="CASCADE"), nullable=False
+    )
+    performed_at = Column(DateTime, nullable=False)
+
+    sets = Column(Integer, nullable=False)  # Loaded sets that session
+    top_weight_kg = Column(Float, nullable=False)
+    reps_at_top = Column(Integer, nullable=False)  # Fewest reps over the sets at top weight
+    best_e1rm = Column(Float, nullable=False)
+    rpe = Column(Integer, nullable=True)  # The workout's perceived exertion, 1-10
+
+    def __repr__(self):
+        return f"<ExerciseLatestPerformance client={self.client_id} exercise={self.exercise_id} {self.reps_at_top}x{self.top_weight_kg}>"
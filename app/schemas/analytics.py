@@ -0,0 +1,101 @@
+"""Pydantic schemas for trainer analytics: roster, training load, progression, adherence."""
+from datetime import date, datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class ClientAnalytics(BaseModel):
+    client_id: int
+    first_name: str
+    last_name: str
+    is_active: bool
+    # Weekly exercises assigned within the window
+    assigned: int = 0
+    completed: int = 0
+    skipped: int = 0
+    completion_rate: float = 0.0  # % of assigned
+    current_streak: int = 0  # consecutive days with a completed exercise, ending today
+    last_workout_date: Optional[datetime] = None
+    days_since_last_workout: Optional[int] = None
+    weight_trend: Optional[float] = None  # kg/week, least-squares over the window
+    pr_count: int = 0  # personal records within the window
+
+
+class RosterAnalytics(BaseModel):
+    window_start: date
+    window_end: date
+    total: int  # clients matching the filters, before limit/offset
+    clients: List[ClientAnalytics]
+
+
+class LoadPoint(BaseModel):
+    day: date
+    load: float  # Σ duration × RPE of the day's completed workouts
+    acute: float  # mean daily load, last 7 days
+    chronic: float  # mean daily load, last 28 days
+    acwr: Optional[float] = None  # acute / chronic
+    monotony: Optional[float] = None  # 7-day mean / 7-day standard deviation
+    strain: Optional[float] = None  # 7-day total × monotony
+    zone: Optional[str] = None  # ACWR band: low, optimal, high, danger
+
+
+class ClientTrainingLoad(BaseModel):
+    client_id: int
+    start: date
+    end: date
+    points: List[LoadPoint]
+
+
+class ClientLoadSummary(BaseModel):
+    client_id: int
+    first_name: str
+    last_name: str
+    latest: LoadPoint
+
+
+class RosterTrainingLoad(BaseModel):
+    day: date
+    total: int
+    clients: List[ClientLoadSummary]
+
+
+class ExerciseProgressionSummary(BaseModel):
+    exercise_id: int
+    exercise_name: str
+    sessions: int  # days with a loaded set
+    best_e1rm: float
+    top_weight: float  # heaviest set, kg
+    first_session: date
+    last_session: date
+
+
+class ProgressionPoint(BaseModel):
+    day: date  # last session in the point
+    sessions: int = 1  # more than 1 when downsampled
+    e1rm: float  # best estimated 1RM, kg
+    best_reps: int  # the set that produced it
+    best_weight: float
+    volume: float  # Σ reps × kg per session (mean when downsampled)
+    running_best: float  # best e1RM to date, including before the range
+    is_pr: bool  # beat every earlier session
+
+
+class ExerciseProgression(BaseModel):
+    client_id: int
+    exercise_id: int
+    points: List[ProgressionPoint]
+
+
+class ClientRisk(BaseModel):
+    assignment_id: int
+    client_id: int
+    first_name: str
+    last_name: str
+    score: float  # 0-1
+    level: str  # low, medium, high
+    recent_miss_rate: float
+    miss_rate_trend: float
+    days_since_workout: int
+    days_since_completion: int
+    scored_at: Optional[datetime] = None
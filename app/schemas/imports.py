@@ -0,0 +1,80 @@
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, EmailStr, Field, model_validator, validator
+
+from app.schemas.client import ClientCreate
+from app.schemas.client_schemas import ExerciseLogCreate
+from app.schemas.exercise import ExerciseCreate
+
+
+# ── Row schemas ──────────────────────────────────────────────────────────────
+# One per import kind. CSV cells arrive as strings, so list fields also
+# accept "a;b" and nested fields a JSON string.
+
+class ClientImportRow(ClientCreate):
+    pass
+
+
+class ExerciseImportRow(ExerciseCreate):
+    @validator('muscle_groups', 'equipment', pre=True)
+    def split_list(cls, v):
+        if isinstance(v, str):
+            return [item.strip() for item in v.split(';') if item.strip()]
+        return v
+
+
+class WorkoutImportRow(BaseModel):
+    # The client, by id or by email (within the importing trainer's clients)
+    client_id: Optional[int] = None
+    client_email: Optional[EmailStr] = None
+    # Defaults to the client's most recent program assignment
+    assignment_id: Optional[int] = None
+    workout_date: datetime
+    day_number: int = Field(ge=1)
+    workout_name: Optional[str] = None
+    total_duration_minutes: Optional[int] = Field(None, ge=0)
+    perceived_exertion: Optional[int] = Field(None, ge=1, le=10)
+    client_notes: Optional[str] = None
+    is_completed: bool = True
+    is_skipped: bool = False
+    skip_reason: Optional[str] = None
+    exercises: List[ExerciseLogCreate] = []
+
+    @validator('exercises', pre=True)
+    def parse_exercises(cls, v):
+        if isinstance(v, str):
+            return json.loads(v) if v.strip() else []
+        return v
+
+    @model_validator(mode="after")
+    def identifies_client(self):
+        if self.client_id is None and self.client_email is None:
+            raise ValueError("Give client_id or client_email")
+        return self
+
+
+# ── Jobs ─────────────────────────────────────────────────────────────────────
+
+class ImportRowError(BaseModel):
+    row: int  # 1-based data row (CSV: after the header; NDJSON: line)
+    errors: List[Dict[str, Any]]  # [{"field": "email", "message": "..."}]
+
+
+class ImportJob(BaseModel):
+    id: int
+    kind: str
+    file_format: str
+    status: str
+    rows_processed: int
+    rows_imported: int
+    rows_failed: int
+    errors: List[ImportRowError] = []
+    failure: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -10,6 +10,7 @@ class NotificationTypeEnum(str, Enum):
     EXERCISE_NOT_COMPLETED = "exercise_not_completed"
     APPOINTMENT_UPCOMING = "appointment_upcoming"
     APPOINTMENT_REMINDER = "appointment_reminder"
+    CLIENT_AT_RISK = "client_at_risk"
     NEW_ASSIGNMENT = "new_assignment"
     WEEKLY_EXERCISE_UPDATE = "weekly_exercise_update"
 
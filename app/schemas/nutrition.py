@@ -0,0 +1,142 @@
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field, model_validator
+from datetime import datetime
+
+
+# A food in a meal: a catalog reference and an amount
+class MealFood(BaseModel):
+    food_id: int
+    grams: float = Field(100, gt=0, description="Amount in grams")
+
+
+class Meal(BaseModel):
+    name: str = Field(min_length=1, max_length=100)
+    time: Optional[str] = None  # "08:00"
+    foods: List[MealFood] = []
+
+
+class MealPlanDay(BaseModel):
+    day: int = Field(ge=1, description="Day number in the plan")
+    meals: List[Meal] = []
+
+
+# Either one day's `meals` (repeated every day) or explicit `days`
+class MealPlan(BaseModel):
+    meals: Optional[List[Meal]] = None
+    days: Optional[List[MealPlanDay]] = None
+
+    @model_validator(mode="after")
+    def one_layout(self):
+        if self.meals is not None and self.days is not None:
+            raise ValueError("Give either 'meals' or 'days', not both")
+        return self
+
+
+class NutritionPlanBase(BaseModel):
+    name: str = Field(min_length=1, max_length=200)
+    description: Optional[str] = None
+    client_id: Optional[int] = None
+    daily_calories: Optional[int] = Field(None, gt=0)
+    protein_grams: Optional[float] = Field(None, ge=0)
+    carbs_grams: Optional[float] = Field(None, ge=0)
+    fat_grams: Optional[float] = Field(None, ge=0)
+    fiber_grams: Optional[float] = Field(None, ge=0)
+    meal_plan: Optional[MealPlan] = None
+    guidelines: Optional[str] = None
+    restrictions: Optional[str] = None
+    notes: Optional[str] = None
+    is_template: bool = True
+
+
+class NutritionPlanCreate(NutritionPlanBase):
+    pass
+
+
+class NutritionPlanUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=1, max_length=200)
+    description: Optional[str] = None
+    client_id: Optional[int] = None
+    daily_calories: Optional[int] = Field(None, gt=0)
+    protein_grams: Optional[float] = Field(None, ge=0)
+    carbs_grams: Optional[float] = Field(None, ge=0)
+    fat_grams: Optional[float] = Field(None, ge=0)
+    fiber_grams: Optional[float] = Field(None, ge=0)
+    meal_plan: Optional[MealPlan] = None
+    guidelines: Optional[str] = None
+    restrictions: Optional[str] = None
+    notes: Optional[str] = None
+    is_template: Optional[bool] = None
+    is_active: Optional[bool] = None
+
+
+class NutritionPlan(NutritionPlanBase):
+    id: int
+    trainer_id: int
+    is_active: bool
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+# Totals in the Food catalog's units (kcal for calories, grams for macros)
+class MacroTotals(BaseModel):
+    calories: float = 0
+    protein: float = 0
+    carbs: float = 0
+    fat: float = 0
+    fiber: float = 0
+    sugar: float = 0
+    sodium: float = 0
+
+
+class MealMacros(BaseModel):
+    name: str
+    time: Optional[str] = None
+    totals: MacroTotals
+
+
+class DayMacros(BaseModel):
+    day: int
+    totals: MacroTotals
+    meals: List[MealMacros]
+    # Share of each set target reached, in percent
+    target_pct: Dict[str, float] = {}
+
+
+class PlanMacros(BaseModel):
+    plan_id: int
+    days: List[DayMacros]
+    daily_average: MacroTotals
+    missing_food_ids: List[int] = []
+
+
+class Food(BaseModel):
+    id: int
+    name: str
+    brand: Optional[str] = None
+    category: Optional[str] = None
+    calories_per_100g: Optional[float] = None
+    protein_per_100g: Optional[float] = None
+    carbs_per_100g: Optional[float] = None
+    fat_per_100g: Optional[float] = None
+    fiber_per_100g: Optional[float] = None
+    sugar_per_100g: Optional[float] = None
+    sodium_per_100g: Optional[float] = None
+    serving_size: Optional[str] = None
+    barcode: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class CategoryFacet(BaseModel):
+    category: Optional[str] = None
+    count: int
+
+
+class FoodSearchResults(BaseModel):
+    items: List[Food]
+    # Matches per category, before the `category` filter is applied
+    facets: List[CategoryFacet]
@@ -1,9 +1,26 @@
+from enum import Enum
 from typing import List, Optional, Dict, Any, Union
 from pydantic import BaseModel, Field, validator
 from datetime import datetime
 from app.models.program import ProgramType, DifficultyLevel
 
 
+class ProgressionRule(str, Enum):
+    DOUBLE = "double"  # Add load once every set reaches the top of the rep range
+    RPE = "rpe"  # Adjust load by how hard the last session felt
+    E1RM = "e1rm"  # A percentage of the estimated one-rep max
+    NONE = "none"
+
+
+# How an exercise's load progresses week to week; unset fields use the
+# PROGRESSION_* settings.
+class ExerciseProgressionRule(BaseModel):
+    rule: ProgressionRule
+    increment_kg: Optional[float] = Field(None, gt=0)
+    target_rpe: Optional[float] = Field(None, ge=1, le=10)
+    percent_e1rm: Optional[float] = Field(None, gt=0, le=100)
+
+
 # Exercise within a workout day
 class WorkoutExercise(BaseModel):
     exercise_id: int
@@ -12,6 +29,7 @@ class WorkoutExercise(BaseModel):
     weight: str = Field(description="Weight specification (e.g., 'bodyweight', '60kg', '80%')")
     rest_seconds: int = Field(ge=0, description="Rest time in seconds")
     notes: Optional[str] = None
+    progression: Optional[ExerciseProgressionRule] = None
 
 
 # Workout day structure
@@ -97,6 +97,7 @@ class WeeklySchedule(BaseModel):
     completed_exercises: int
     completion_percentage: int
     days: dict  # Day number -> List of exercises
+    exercises: Optional[dict] = None  # Exercise id -> details (normalized=true only)
     
     class Config:
         from_attributes = True
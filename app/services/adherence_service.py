@@ -0,0 +1,257 @@
+"""Churn-risk scores for active program assignments.
+
+A periodic job scores every active assignment of an active client from four
+features, each extracted for all assignments at once (three queries in
+total, however many assignments there are):
+
+  recent_miss_rate       skipped or still-pending share of the weekly
+                         exercises due in the last 2 weeks
+  miss_rate_trend        that rate minus the rate of the 4 weeks before
+                         (only increases count towards risk)
+  days_since_workout     since `last_workout_date` (or the program start)
+  days_since_completion  since the last completed weekly exercise (or the
+                         program start): a broken streak
+
+The score is a logistic model, sigmoid(bias + Σ weight × feature), with
+hand-set weights (there are no churn labels to fit on), computed over the
+feature columns with NumPy when it's installed and in plain Python otherwise.
+Each run replaces `adherence_scores`; assignments that newly reach "high"
+notify their trainer, all in one INSERT. Every API worker runs the job, so
+on Postgres a run first takes a transaction-level advisory lock and is
+skipped while another worker's run holds it (two overlapping runs would
+both see the old levels and alert twice).
+
+    python -m app.services.adherence_service
+"""
+import asyncio
+import logging
+import math
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import and_, case, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.adherence import AdherenceScore
+from app.models.client import Client
+from app.models.program_assignment import AssignmentStatus, ProgramAssignment
+from app.models.weekly_exercise import WeeklyExerciseAssignment, WeeklyExerciseStatus
+from app.schemas.analytics import ClientRisk
+from app.services.notification_service import NotificationService
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional, plain Python is used instead
+    np = None
+
+logger = logging.getLogger(__name__)
+
+RECENT_DAYS = 14
+PRIOR_DAYS = 28  # Before the recent window
+GAP_CAP_DAYS = 42  # Longer gaps add no more risk
+WORKOUT_CAP_DAYS = 28
+
+BIAS = -3.0
+WEIGHTS = {
+    "recent_miss_rate": 3.0,
+    "miss_rate_trend": 1.5,
+    "days_since_workout": 0.15,
+    "days_since_completion": 0.08,
+}
+FEATURES = tuple(WEIGHTS)
+# Lower bounds of each level
+LEVELS = (("high", 0.7), ("medium", 0.4))
+# pg_try_advisory_xact_lock key serializing scoring runs across workers
+LOCK_KEY = 0x61646865
+
+
+def level(score: float) -> str:
+    for name, lower in LEVELS:
+        if score >= lower:
+            return name
+    return "low"
+
+
+def _score_numpy(columns: Dict[str, Sequence[float]]) -> List[float]:
+    z = np.full(len(columns[FEATURES[0]]), BIAS)
+    for name in FEATURES:
+        values = np.asarray(columns[name], dtype=float)
+        if name == "miss_rate_trend":
+            values = np.maximum(values, 0.0)
+        z += WEIGHTS[name] * values
+    return (1.0 / (1.0 + np.exp(-z))).tolist()
+
+
+def _score_python(columns: Dict[str, Sequence[float]]) -> List[float]:
+    scores = []
+    for row in zip(*(columns[name] for name in FEATURES)):
+        z = BIAS
+        for name, value in zip(FEATURES, row):
+            z += WEIGHTS[name] * (max(value, 0.0) if name == "miss_rate_trend" else value)
+        scores.append(1.0 / (1.0 + math.exp(-z)))
+    return scores
+
+
+def score(columns: Dict[str, Sequence[float]]) -> List[float]:
+    """Risk in [0, 1] per row of the feature columns (no I/O)."""
+    if not columns[FEATURES[0]]:
+        return []
+    return (_score_numpy if np is not None else _score_python)(columns)
+
+
+def _days(since: Optional[datetime], today: date, cap: int) -> int:
+    if since is None:
+        return cap
+    return max(0, min(cap, (today - since.date()).days))
+
+
+class AdherenceService:
+
+    @staticmethod
+    async def _lock(db: AsyncSession) -> bool:
+        """Take the run's lock until the transaction ends; False when another
+        run holds it. Other databases run one process: always True."""
+        if db.get_bind().dialect.name != "postgresql":
+            return True
+        return bool(await db.scalar(select(func.pg_try_advisory_xact_lock(LOCK_KEY))))
+
+    @staticmethod
+    async def _assignments(db: AsyncSession):
+        pa = ProgramAssignment
+        stmt = (
+            select(
+                pa.id,
+                pa.client_id,
+                pa.trainer_id,
+                pa.last_workout_date,
+                func.coalesce(pa.start_date, pa.assigned_date),
+                Client.first_name,
+                Client.last_name,
+            )
+            .join(Client, Client.id == pa.client_id)
+            .where(pa.status == AssignmentStatus.ACTIVE, Client.is_active.is_(True))
+            .order_by(pa.id)
+        )
+        return (await db.execute(stmt)).all()
+
+    @staticmethod
+    async def _exercise_windows(db: AsyncSession, today: date) -> Dict[int, tuple]:
+        """(recent due, recent missed, prior due, prior missed, last completed) per assignment."""
+        wea = WeeklyExerciseAssignment
+        recent = wea.due_date >= today - timedelta(days=RECENT_DAYS)
+        missed = wea.status.in_([WeeklyExerciseStatus.SKIPPED, WeeklyExerciseStatus.PENDING])
+        stmt = (
+            select(
+                wea.program_assignment_id,
+                func.count(case((recent, 1))),
+                func.count(case((and_(recent, missed), 1))),
+                func.count(case((~recent, 1))),
+                func.count(case((and_(~recent, missed), 1))),
+                func.max(case((wea.status == WeeklyExerciseStatus.COMPLETED, wea.completed_date))),
+            )
+            .where(
+                wea.due_date >= today - timedelta(days=RECENT_DAYS + PRIOR_DAYS),
+                wea.due_date < today,
+            )
+            .group_by(wea.program_assignment_id)
+        )
+        return {row[0]: tuple(row[1:]) for row in await db.execute(stmt)}
+
+    @staticmethod
+    async def score_all(db: AsyncSession, today: Optional[date] = None) -> Optional[Dict[str, int]]:
+        """Score every active assignment, replace the stored scores and
+        notify trainers of newly high-risk clients. Commits; returns None
+        without doing anything while another worker's run is in progress."""
+        today = today or date.today()
+        if not await AdherenceService._lock(db):
+            await db.rollback()
+            logger.info("Adherence scoring already running in another worker; skipped")
+            return None
+        assignments = await AdherenceService._assignments(db)
+        windows = await AdherenceService._exercise_windows(db, today)
+        previous = dict((await db.execute(select(AdherenceScore.assignment_id, AdherenceScore.level))).all())
+
+        columns: Dict[str, List[float]] = {name: [] for name in FEATURES}
+        for assignment_id, _, _, last_workout, started, _, _ in assignments:
+            due, missed, prior_due, prior_missed, completed = windows.get(assignment_id, (0, 0, 0, 0, None))
+            recent_rate = missed / due if due else 0.0
+            prior_rate = prior_missed / prior_due if prior_due else recent_rate
+            columns["recent_miss_rate"].append(recent_rate)
+            columns["miss_rate_trend"].append(recent_rate - prior_rate)
+            columns["days_since_workout"].append(_days(last_workout or started, today, WORKOUT_CAP_DAYS))
+            columns["days_since_completion"].append(_days(completed or started, today, GAP_CAP_DAYS))
+        scores = score(columns)
+
+        rows, notifications = [], []
+        for i, (assignment_id, client_id, trainer_id, _, _, first_name, last_name) in enumerate(assignments):
+            row = {
+                "assignment_id": assignment_id,
+                "client_id": client_id,
+                "trainer_id": trainer_id,
+                "score": round(scores[i], 4),
+                "level": level(scores[i]),
+                **{name: columns[name][i] for name in FEATURES},
+            }
+            rows.append(row)
+            if row["level"] == "high" and previous.get(assignment_id) != "high":
+                notifications.append(
+                    NotificationService.at_risk_notification(
+                        trainer_id,
+                        client_id,
+                        f"{first_name} {last_name}",
+                        row["recent_miss_rate"],
+                        row["days_since_workout"],
+                    )
+                )
+
+        await db.execute(delete(AdherenceScore))
+        if rows:
+            await db.execute(insert(AdherenceScore), rows)
+        notified = await NotificationService.create_notifications(db, notifications)
+        await db.commit()
+        return {
+            "scored": len(rows),
+            "high": sum(1 for row in rows if row["level"] == "high"),
+            "notified": notified,
+        }
+
+    @staticmethod
+    async def for_trainer(
+        db: AsyncSession, trainer_id: int, min_level: str = "medium", limit: int = 50
+    ) -> List[ClientRisk]:
+        """The trainer's riskiest clients, at `min_level` or above."""
+        order = ("low", "medium", "high")
+        stmt = (
+            select(AdherenceScore, Client.first_name, Client.last_name)
+            .join(Client, Client.id == AdherenceScore.client_id)
+            .where(
+                AdherenceScore.trainer_id == trainer_id,
+                AdherenceScore.level.in_(order[order.index(min_level):]),
+            )
+            .order_by(AdherenceScore.score.desc())
+            .limit(limit)
+        )
+        return [
+            ClientRisk(
+                first_name=first_name,
+                last_name=last_name,
+                **{column: getattr(risk, column) for column in ClientRisk.model_fields if hasattr(risk, column)},
+            )
+            for risk, first_name, last_name in await db.execute(stmt)
+        ]
+
+
+async def _main() -> None:
+    import app.models  # noqa: F401 — register every mapper before querying
+    from app.core.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        result = await AdherenceService.score_all(db)
+    if result is None:
+        print("Another scoring run is in progress; skipped")
+        return
+    print(f"Scored {result['scored']} assignments: {result['high']} high risk, {result['notified']} newly notified")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -1,20 +1,323 @@
-from datetime import date, datetime, timedelta
-from typing import List, Optional, Tuple
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
 
 from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy import and_, asc, func, or_, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.config import settings
 from app.models.client import Client
 from app.models.schedule import Appointment, AppointmentStatus
 from app.schemas.schedule import AppointmentCreate, AppointmentUpdate
+from app.utils.intervals import IntervalTree
+
+# Longest bookable appointment. Bounds the B-tree conflict probe from below:
+# nothing starting earlier than this before a slot can still be running.
+MAX_APPOINTMENT_LENGTH = timedelta(hours=24)
+
+# Postgres SQLSTATE for an exclusion-constraint violation.
+_EXCLUSION_VIOLATION = "23P01"
+
+Slot = Tuple[datetime, datetime]
+
+
+def weekly_occurrences(
+    start_time: datetime, end_time: datetime, weeks: int, interval_weeks: int = 1
+) -> List[Slot]:
+    """Start/end pairs for a session repeated every `interval_weeks` weeks."""
+    step = timedelta(weeks=interval_weeks)
+    return [(start_time + i * step, end_time + i * step) for i in range(weeks)]
+
+
+@dataclass(frozen=True)
+class WorkingHours:
+    """When a trainer takes bookings, and the gap kept around each one."""
+
+    day_start: time
+    day_end: time
+    weekdays: FrozenSet[int]  # date.weekday(): Monday is 0
+    buffer: timedelta = timedelta(0)
+
+    @classmethod
+    def from_settings(cls) -> "WorkingHours":
+        return cls(
+            day_start=time.fromisoformat(settings.availability_day_start),
+            day_end=time.fromisoformat(settings.availability_day_end),
+            weekdays=frozenset(int(d) for d in settings.availability_weekdays.split(",") if d.strip()),
+            buffer=timedelta(minutes=settings.appointment_buffer_minutes),
+        )
+
+
+def _merge(busy: Iterable[Slot]) -> List[Slot]:
+    merged: List[Slot] = []
+    for start, end in sorted(busy):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def free_windows(
+    busy: Iterable[Slot],
+    window_start: datetime,
+    window_end: datetime,
+    hours: WorkingHours,
+    min_length: timedelta,
+) -> List[Slot]:
+    """Working-hours gaps of at least `min_length` between busy intervals.
+
+    A single sweep: busy intervals are padded by the buffer, sorted and
+    merged, then walked once alongside the working days in the window.
+    """
+    merged = _merge((start - hours.buffer, end + hours.buffer) for start, end in busy)
+    free: List[Slot] = []
+    i = 0
+    day = window_start.date()
+    while day <= window_end.date():
+        if day.weekday() in hours.weekdays:
+            cursor = max(datetime.combine(day, hours.day_start), window_start)
+            day_end = min(datetime.combine(day, hours.day_end), window_end)
+            # Busy intervals that ended before today can never matter again.
+            while i < len(merged) and merged[i][1] <= cursor:
+                i += 1
+            j = i
+            while cursor < day_end:
+                if j < len(merged) and merged[j][0] < day_end:
+                    gap_end = min(merged[j][0], day_end)
+                    if gap_end - cursor >= min_length:
+                        free.append((cursor, gap_end))
+                    cursor = max(cursor, merged[j][1])
+                    j += 1
+                else:
+                    if day_end - cursor >= min_length:
+                        free.append((cursor, day_end))
+                    break
+        day += timedelta(days=1)
+    return free
+
+
+def slot_starts(
+    windows: Iterable[Slot], duration: timedelta, step: timedelta, limit: int
+) -> List[Slot]:
+    """Bookable `duration` slots inside `windows`, starting every `step`."""
+    slots: List[Slot] = []
+    for start, end in windows:
+        # Align to the step grid (e.g. :00/:30) measured from midnight.
+        midnight = datetime.combine(start.date(), time.min)
+        offset = (start - midnight) % step
+        cursor = start if not offset else start + (step - offset)
+        while cursor + duration <= end:
+            slots.append((cursor, cursor + duration))
+            if len(slots) >= limit:
+                return slots
+            cursor += step
+    return slots
 
 
 class AppointmentService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
+    # ── Conflict detection ───────────────────────────────────────────────────
+
+    def _window_filter(self, window_start: datetime, window_end: datetime):
+        if self.db.get_bind().dialect.name == "postgresql":
+            # Served by the GiST index behind the appointments_no_overlap
+            # exclusion constraint; the expression must match it exactly
+            # (two-argument tsrange, i.e. '[)' bounds).
+            return func.tsrange(Appointment.start_time, Appointment.end_time).op("&&")(
+                func.tsrange(window_start, window_end)
+            )
+        # B-tree fallback: a bounded range scan on (trainer_id, start_time).
+        return and_(
+            Appointment.start_time >= window_start - MAX_APPOINTMENT_LENGTH,
+            Appointment.start_time < window_end,
+            Appointment.end_time > window_start,
+        )
+
+    async def find_conflicts(
+        self,
+        trainer_id: int,
+        slots: Sequence[Slot],
+        exclude_id: Optional[int] = None,
+    ) -> List[Dict]:
+        """Every existing booking that overlaps any of `slots`.
+
+        One windowed query loads the trainer's non-cancelled appointments
+        spanning all the slots, then an interval tree answers each slot, so a
+        whole recurring series costs one round trip. Returns one entry per
+        (slot, appointment) clash; `index` is the slot's position.
+        """
+        if not slots:
+            return []
+        stmt = select(
+            Appointment.id, Appointment.title, Appointment.start_time, Appointment.end_time
+        ).where(
+            Appointment.trainer_id == trainer_id,
+            Appointment.status.is_distinct_from(AppointmentStatus.CANCELLED.value),
+            self._window_filter(min(s for s, _ in slots), max(e for _, e in slots)),
+        )
+        if exclude_id is not None:
+            stmt = stmt.where(Appointment.id != exclude_id)
+        booked = IntervalTree(
+            (row.start_time, row.end_time, row) for row in (await self.db.execute(stmt)).all()
+        )
+
+        conflicts: List[Dict] = []
+        for index, (start, end) in enumerate(slots):
+            for row in booked.overlapping(start, end):
+                conflicts.append(
+                    {
+                        "index": index,
+                        "start_time": start,
+                        "end_time": end,
+                        "conflicting_appointment_id": row.id,
+                        "conflicting_title": row.title,
+                        "conflicting_start_time": row.start_time,
+                        "conflicting_end_time": row.end_time,
+                    }
+                )
+        return conflicts
+
+    async def find_free_slots(
+        self,
+        trainer_id: int,
+        window_start: datetime,
+        window_end: datetime,
+        duration: timedelta,
+        hours: WorkingHours,
+        step: Optional[timedelta] = None,
+        client_ids: Sequence[int] = (),
+        limit: int = 200,
+    ) -> Tuple[List[Slot], List[Slot]]:
+        """Free (windows, slots) for the trainer and, optionally, clients.
+
+        One range query fetches every non-cancelled booking that can touch
+        the window: the trainer's own, plus any the given clients hold
+        (with this or another trainer). The rest is an in-memory sweep.
+        """
+        padded_start = window_start - hours.buffer
+        padded_end = window_end + hours.buffer
+        owner = Appointment.trainer_id == trainer_id
+        if client_ids:
+            owner = or_(owner, Appointment.client_id.in_(client_ids))
+        stmt = select(Appointment.start_time, Appointment.end_time).where(
+            owner,
+            Appointment.status.is_distinct_from(AppointmentStatus.CANCELLED.value),
+            Appointment.start_time >= padded_start - MAX_APPOINTMENT_LENGTH,
+            Appointment.start_time < padded_end,
+            Appointment.end_time > padded_start,
+        )
+        busy = [(row.start_time, row.end_time) for row in (await self.db.execute(stmt)).all()]
+        windows = free_windows(busy, window_start, window_end, hours, duration)
+        return windows, slot_starts(windows, duration, step or duration, limit)
+
+    @staticmethod
+    def _check_length(start_time: datetime, end_time: datetime) -> None:
+        if end_time - start_time > MAX_APPOINTMENT_LENGTH:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Appointments can't be longer than {MAX_APPOINTMENT_LENGTH}",
+            )
+
+    @staticmethod
+    def _conflict_error(message: str, conflicts: List[Dict]) -> HTTPException:
+        return HTTPException(
+            status_code=409,
+            detail={"message": message, "conflicts": jsonable_encoder(conflicts)},
+        )
+
+    async def ensure_free(
+        self,
+        trainer_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        exclude_id: Optional[int] = None,
+    ) -> None:
+        self._check_length(start_time, end_time)
+        conflicts = await self.find_conflicts(trainer_id, [(start_time, end_time)], exclude_id)
+        if conflicts:
+            raise self._conflict_error(
+                f"Time conflict with existing appointment at {conflicts[0]['conflicting_start_time']}",
+                conflicts,
+            )
+
+    async def commit_bookings(
+        self, trainer_id: int, slots: Sequence[Slot], exclude_id: Optional[int] = None
+    ) -> None:
+        """Commit pending bookings, turning a lost race into a 409.
+
+        On Postgres the exclusion constraint rejects an overlap that slipped
+        in between our check and this commit.
+        """
+        try:
+            await self.db.commit()
+        except IntegrityError as e:
+            await self.db.rollback()
+            if getattr(e.orig, "sqlstate", None) != _EXCLUSION_VIOLATION:
+                raise
+            raise self._conflict_error(
+                "Time slot was booked concurrently",
+                await self.find_conflicts(trainer_id, slots, exclude_id),
+            )
+
+    async def reschedule_checked(self, appointment: Appointment) -> None:
+        """Commit edits to an existing appointment, refusing new overlaps."""
+        if appointment.status != AppointmentStatus.CANCELLED.value:
+            await self.ensure_free(
+                appointment.trainer_id,
+                appointment.start_time,
+                appointment.end_time,
+                exclude_id=appointment.id,
+            )
+        await self.commit_bookings(
+            appointment.trainer_id,
+            [(appointment.start_time, appointment.end_time)],
+            exclude_id=appointment.id,
+        )
+
+    async def book(
+        self,
+        trainer_id: int,
+        appointments: List[Appointment],
+        skip_conflicts: bool = False,
+    ) -> Tuple[List[Appointment], List[Dict]]:
+        """Validate and insert a batch of appointments in one transaction.
+
+        All occurrences are checked up front and every clash is reported.
+        With `skip_conflicts` the free occurrences are still booked;
+        otherwise any clash rejects the whole batch with a 409.
+        """
+        for appointment in appointments:
+            self._check_length(appointment.start_time, appointment.end_time)
+        slots = [(a.start_time, a.end_time) for a in appointments]
+        blocking = [
+            i for i, a in enumerate(appointments) if a.status != AppointmentStatus.CANCELLED.value
+        ]
+        conflicts = await self.find_conflicts(trainer_id, [slots[i] for i in blocking])
+        for conflict in conflicts:
+            conflict["index"] = blocking[conflict["index"]]
+
+        if conflicts and not skip_conflicts:
+            clashing = len({c["index"] for c in conflicts})
+            raise self._conflict_error(
+                f"{clashing} of {len(appointments)} occurrence(s) conflict with existing appointments",
+                conflicts,
+            )
+
+        clashing = {c["index"] for c in conflicts}
+        created = [a for i, a in enumerate(appointments) if i not in clashing]
+        if created:
+            self.db.add_all(created)
+            await self.commit_bookings(trainer_id, [(a.start_time, a.end_time) for a in created])
+        return created, conflicts
+
     async def create_appointment(
         self, appointment_data: AppointmentCreate, trainer_id: int
     ) -> Appointment:
@@ -32,37 +335,8 @@ class AppointmentService:
                 detail="Client not found or not assigned to this trainer",
             )
 
-        # Time-conflict check
-        conflict_stmt = select(Appointment).where(
-            and_(
-                Appointment.trainer_id == trainer_id,
-                Appointment.status != AppointmentStatus.CANCELLED.value,
-                or_(
-                    and_(
-                        Appointment.start_time <= appointment_data.start_time,
-                        Appointment.end_time > appointment_data.start_time,
-                    ),
-                    and_(
-                        Appointment.start_time < appointment_data.end_time,
-                        Appointment.end_time >= appointment_data.end_time,
-                    ),
-                    and_(
-                        Appointment.start_time >= appointment_data.start_time,
-                        Appointment.end_time <= appointment_data.end_time,
-                    ),
-                ),
-            )
-        )
-        conflict = (await self.db.execute(conflict_stmt)).scalar_one_or_none()
-        if conflict:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Time conflict with existing appointment at {conflict.start_time}",
-            )
-
         appointment = Appointment(trainer_id=trainer_id, **appointment_data.model_dump())
-        self.db.add(appointment)
-        await self.db.commit()
+        await self.book(trainer_id, [appointment])
         await self.db.refresh(appointment)
         return appointment
 
@@ -159,7 +433,7 @@ class AppointmentService:
             setattr(appointment, field, value)
         appointment.updated_at = datetime.utcnow()
 
-        await self.db.commit()
+        await self.reschedule_checked(appointment)
         await self.db.refresh(appointment)
         return appointment
 
@@ -0,0 +1,157 @@
+"""iCalendar subscription feeds of a trainer's or a client's appointments.
+
+Calendar apps can't send a bearer header, so a feed is addressed by a
+long-lived signed token (`type: "feed"`) naming its scope, e.g.
+`trainer:12` or `client:34`. Apps poll every few minutes; the feed's
+validators come from one aggregate query (row count and the latest
+`updated_at`) so an unchanged calendar costs a single statement and a 304,
+and the body itself is streamed from a server-side cursor. Feeds carry an
+ETag but no Last-Modified: deletions, client renames and the sliding window
+don't move any timestamp, so a date alone can't tell a poller it is current.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+
+from app.core.conditional import make_etag
+from app.core.config import settings
+from app.core.security import create_feed_token, verify_token
+from app.models.client import Client
+from app.models.schedule import Appointment, AppointmentStatus
+from app.utils import ical
+
+FEED_KINDS = ("trainer", "client")
+CHUNK_EVENTS = 100
+
+# Appointment status -> iCalendar STATUS.
+_ICAL_STATUS = {
+    AppointmentStatus.SCHEDULED.value: "CONFIRMED",
+    AppointmentStatus.CONFIRMED.value: "CONFIRMED",
+    AppointmentStatus.COMPLETED.value: "CONFIRMED",
+    AppointmentStatus.PENDING.value: "TENTATIVE",
+    AppointmentStatus.CANCELLED.value: "CANCELLED",
+    AppointmentStatus.NO_SHOW.value: "CANCELLED",
+}
+
+
+@dataclass(frozen=True)
+class FeedScope:
+    kind: str  # "trainer" | "client"
+    id: int
+
+    @property
+    def subject(self) -> str:
+        return f"{self.kind}:{self.id}"
+
+
+@dataclass(frozen=True)
+class FeedState:
+    count: int
+    etag: str
+
+
+class CalendarFeedService:
+    @staticmethod
+    def token_for(scope: FeedScope) -> str:
+        return create_feed_token(scope.subject)
+
+    @staticmethod
+    def scope_from_token(token: str) -> Optional[FeedScope]:
+        payload = verify_token(token, expected_type="feed")
+        if payload is None:
+            return None
+        kind, _, raw_id = str(payload.get("sub", "")).partition(":")
+        if kind not in FEED_KINDS or not raw_id.isdigit():
+            return None
+        return FeedScope(kind, int(raw_id))
+
+    @staticmethod
+    def window_start(today: Optional[date] = None) -> datetime:
+        """Feeds carry everything upcoming plus CALENDAR_FEED_PAST_DAYS of history."""
+        today = today or datetime.utcnow().date()
+        return datetime.combine(
+            today - timedelta(days=settings.calendar_feed_past_days), datetime.min.time()
+        )
+
+    @staticmethod
+    def _filters(scope: FeedScope, since: datetime) -> Tuple:
+        owner = Appointment.trainer_id if scope.kind == "trainer" else Appointment.client_id
+        return owner == scope.id, Appointment.start_time >= since
+
+    @staticmethod
+    async def state(db: AsyncSession, scope: FeedScope) -> FeedState:
+        """Validators for the feed's current contents, from one aggregate query.
+
+        The count catches deletions, `max(updated_at)` catches inserts and
+        edits, and for trainer feeds the clients' `updated_at` catches a
+        renamed client (names appear in the event summaries).
+        """
+        since = CalendarFeedService.window_start()
+        columns = [func.count(Appointment.id), func.max(Appointment.updated_at)]
+        stmt = select(*columns).where(*CalendarFeedService._filters(scope, since))
+        if scope.kind == "trainer":
+            stmt = stmt.add_columns(func.max(Client.updated_at)).outerjoin(
+                Client, Client.id == Appointment.client_id
+            )
+        count, last_modified, *extra = (await db.execute(stmt)).one()
+        etag = make_etag(scope.subject, since.date(), count, last_modified, *extra)
+        return FeedState(count=count, etag=etag)
+
+    @staticmethod
+    async def stream(db: AsyncSession, scope: FeedScope) -> AsyncIterator[str]:
+        """Open the feed's cursor and return an iterator of text chunks.
+
+        The query runs here, before the response starts, so a database
+        error is still a 500 rather than a truncated body; rows are then
+        rendered into chunks of whole events as they arrive.
+        """
+        since = CalendarFeedService.window_start()
+        columns = [
+            Appointment.id,
+            Appointment.title,
+            Appointment.status,
+            Appointment.start_time,
+            Appointment.end_time,
+            Appointment.location,
+            Appointment.description,
+            Appointment.updated_at,
+            Appointment.created_at,
+        ]
+        stmt = select(*columns).where(*CalendarFeedService._filters(scope, since))
+        if scope.kind == "trainer":
+            stmt = stmt.add_columns(Client.first_name, Client.last_name).outerjoin(
+                Client, Client.id == Appointment.client_id
+            )
+        stmt = stmt.order_by(Appointment.start_time, Appointment.id)
+        result = await db.stream(stmt.execution_options(yield_per=500))
+        return CalendarFeedService._render(scope, result)
+
+    @staticmethod
+    async def _render(scope: FeedScope, rows: AsyncResult) -> AsyncIterator[str]:
+        yield ical.calendar_header(f"FitnessCoach {scope.kind} appointments")
+        chunk = []
+        async for row in rows:
+            summary = row.title
+            if scope.kind == "trainer" and row.first_name:
+                summary = f"{row.title} - {row.first_name} {row.last_name or ''}".rstrip()
+            chunk.append(
+                ical.event(
+                    uid=f"appointment-{row.id}@fitnesscoach",
+                    start=row.start_time,
+                    end=row.end_time,
+                    summary=summary,
+                    stamp=row.updated_at or row.created_at or row.start_time,
+                    status=_ICAL_STATUS.get(row.status),
+                    location=row.location,
+                    description=row.description,
+                )
+            )
+            if len(chunk) >= CHUNK_EVENTS:
+                yield "".join(chunk)
+                chunk = []
+        if chunk:
+            yield "".join(chunk)
+        yield ical.calendar_footer()
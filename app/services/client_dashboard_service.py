@@ -1,11 +1,13 @@
-from datetime import datetime
-from typing import List, Optional
+import json
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy import desc, func, select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.models import (
+    AssignmentStatus,
     Client,
     Exercise,
     ExerciseLog,  # noqa: F401
@@ -17,12 +19,52 @@ from app.schemas.client_schemas import (
     ClientDashboardProgram,
     ClientDashboardResponse,
     ClientProgressStats,
-    ExerciseLogResponse,
     ProgramTemplateForClient,
     WorkoutDayTemplate,
     WorkoutExerciseTemplate,
-    WorkoutLogResponse,
 )
+from app.services.rollup_service import Facts, RollupService
+from app.services.workout_tracking_service import workout_tracking_service
+
+
+def _json_list(raw) -> list:
+    """Exercise muscle_groups/equipment are stored as JSON text."""
+    if not raw:
+        return []
+    if isinstance(raw, str):
+        try:
+            return json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            return []
+    return raw
+
+
+def _current_streak(worked: List[Tuple[date, int]]) -> int:
+    """Workouts back from today with no gap longer than two days.
+
+    `worked` is (day, workouts completed) in ascending day order.
+    """
+    streak = 0
+    current_date = datetime.now().date()
+    for day, count in reversed(worked):
+        if (current_date - day).days > 2:
+            break
+        streak += count
+        current_date = day
+    return streak
+
+
+def _longest_streak(worked: List[Tuple[date, int]]) -> int:
+    """Most workouts in a run with no gap longer than two days."""
+    longest = current = 0
+    prev_date = None
+    for day, count in worked:
+        if prev_date is not None and (day - prev_date).days > 2:
+            longest = max(longest, current)
+            current = 0
+        current += count
+        prev_date = day
+    return max(longest, current)
 
 
 class ClientDashboardService:
@@ -55,9 +97,10 @@ class ClientDashboardService:
             .options(selectinload(ProgramAssignment.program))
             .join(Program)
             .where(ProgramAssignment.client_id == client_id)
-            .where(ProgramAssignment.status == "active")
+            .where(ProgramAssignment.status == AssignmentStatus.ACTIVE)
         )
         assignments = list((await db.execute(stmt)).scalars().all())
+        next_workout_days = await self._get_next_workout_days(db, assignments)
 
         programs: List[ClientDashboardProgram] = []
         for assignment in assignments:
@@ -69,7 +112,7 @@ class ClientDashboardService:
                     assignment.completed_workouts / assignment.total_workouts
                 ) * 100
 
-            next_workout_day = await self._get_next_workout_day(db, assignment.id)
+            next_workout_day = next_workout_days[assignment.id]
 
             programs.append(
                 ClientDashboardProgram(
@@ -79,7 +122,7 @@ class ClientDashboardService:
                     program_description=program.description,
                     program_type=program.program_type.value,
                     difficulty_level=program.difficulty_level.value,
-                    start_date=assignment.start_date,
+                    start_date=assignment.start_date or assignment.assigned_date,
                     end_date=assignment.end_date,
                     status=assignment.status,
                     total_workouts=assignment.total_workouts,
@@ -93,56 +136,10 @@ class ClientDashboardService:
 
     async def _get_recent_workouts(
         self, db: AsyncSession, client_id: int, limit: int = 10
-    ) -> List[WorkoutLogResponse]:
-        stmt = (
-            select(WorkoutLog)
-            .options(selectinload(WorkoutLog.exercise_logs))
-            .where(WorkoutLog.client_id == client_id)
-            .order_by(desc(WorkoutLog.workout_date))
-            .limit(limit)
+    ) -> List[dict]:
+        return await workout_tracking_service.workout_payloads(
+            db, WorkoutLog.client_id == client_id, limit=limit
         )
-        workout_logs = list((await db.execute(stmt)).scalars().all())
-
-        workouts: List[WorkoutLogResponse] = []
-        for log in workout_logs:
-            exercises = [
-                ExerciseLogResponse(
-                    id=ex_log.id,
-                    exercise_name=ex_log.exercise_name,
-                    exercise_id=ex_log.exercise_id,
-                    exercise_order=ex_log.exercise_order,
-                    planned_sets=ex_log.planned_sets,
-                    planned_reps=ex_log.planned_reps,
-                    planned_weight=ex_log.planned_weight,
-                    planned_rest_seconds=ex_log.planned_rest_seconds,
-                    actual_sets=ex_log.actual_sets or [],
-                    difficulty_rating=ex_log.difficulty_rating,
-                    exercise_notes=ex_log.exercise_notes,
-                    form_rating=ex_log.form_rating,
-                    created_at=ex_log.created_at,
-                )
-                for ex_log in sorted(log.exercise_logs, key=lambda x: x.exercise_order)
-            ]
-            workouts.append(
-                WorkoutLogResponse(
-                    id=log.id,
-                    assignment_id=log.assignment_id,
-                    client_id=log.client_id,
-                    workout_date=log.workout_date,
-                    day_number=log.day_number,
-                    workout_name=log.workout_name,
-                    total_duration_minutes=log.total_duration_minutes,
-                    perceived_exertion=log.perceived_exertion,
-                    client_notes=log.client_notes,
-                    trainer_feedback=log.trainer_feedback,
-                    is_completed=log.is_completed,
-                    is_skipped=log.is_skipped,
-                    skip_reason=log.skip_reason,
-                    exercises=exercises,
-                    created_at=log.created_at,
-                )
-            )
-        return workouts
 
     async def _get_progress_stats(
         self, db: AsyncSession, client_id: int
@@ -160,7 +157,7 @@ class ClientDashboardService:
             .select_from(ProgramAssignment)
             .where(
                 ProgramAssignment.client_id == client_id,
-                ProgramAssignment.status == "active",
+                ProgramAssignment.status == AssignmentStatus.ACTIVE,
             )
         )
         completed_programs = await _scalar_count(
@@ -168,131 +165,58 @@ class ClientDashboardService:
             .select_from(ProgramAssignment)
             .where(
                 ProgramAssignment.client_id == client_id,
-                ProgramAssignment.status == "completed",
+                ProgramAssignment.status == AssignmentStatus.COMPLETED,
             )
         )
-        total_workouts_completed = await _scalar_count(
-            select(func.count())
-            .select_from(WorkoutLog)
-            .where(
-                WorkoutLog.client_id == client_id,
-                WorkoutLog.is_completed.is_(True),
-            )
-        )
-
-        current_streak = await self._calculate_current_streak(db, client_id)
-        longest_streak = await self._calculate_longest_streak(db, client_id)
-
+        days = await RollupService.daily_facts(db, client_id, parts=("workouts",))
+        workouts = Facts()
+        for facts in days.values():
+            workouts.add(facts)
+        worked = [(day, f.workouts_completed) for day, f in days.items() if f.workouts_completed]
         avg_duration = (
-            await db.execute(
-                select(func.avg(WorkoutLog.total_duration_minutes)).where(
-                    WorkoutLog.client_id == client_id,
-                    WorkoutLog.is_completed.is_(True),
-                    WorkoutLog.total_duration_minutes.isnot(None),
-                )
-            )
-        ).scalar()
-        avg_exertion = (
-            await db.execute(
-                select(func.avg(WorkoutLog.perceived_exertion)).where(
-                    WorkoutLog.client_id == client_id,
-                    WorkoutLog.is_completed.is_(True),
-                    WorkoutLog.perceived_exertion.isnot(None),
-                )
-            )
-        ).scalar()
+            workouts.duration_minutes / workouts.duration_count if workouts.duration_count else None
+        )
+        avg_exertion = workouts.rpe_sum / workouts.rpe_count if workouts.rpe_count else None
 
         return ClientProgressStats(
             total_programs=total_programs,
             active_programs=active_programs,
             completed_programs=completed_programs,
-            total_workouts_completed=total_workouts_completed,
-            current_streak=current_streak,
-            longest_streak=longest_streak,
+            total_workouts_completed=workouts.workouts_completed,
+            current_streak=_current_streak(worked),
+            longest_streak=_longest_streak(worked),
             average_workout_duration=round(avg_duration, 1) if avg_duration else None,
             average_perceived_exertion=round(avg_exertion, 1) if avg_exertion else None,
         )
 
-    async def _get_next_workout_day(
-        self, db: AsyncSession, assignment_id: int
-    ) -> Optional[int]:
-        latest_workout = (
-            await db.execute(
-                select(WorkoutLog)
-                .where(WorkoutLog.assignment_id == assignment_id)
-                .order_by(desc(WorkoutLog.day_number))
-                .limit(1)
-            )
-        ).scalar_one_or_none()
-        if not latest_workout:
-            return 1
-
-        assignment = (
-            await db.execute(
-                select(ProgramAssignment)
-                .options(selectinload(ProgramAssignment.program))
-                .where(ProgramAssignment.id == assignment_id)
-            )
-        ).scalar_one_or_none()
-        if not assignment or not assignment.program.workout_structure:
-            return None
-
-        total_days = len(assignment.program.workout_structure)
-        if latest_workout.day_number >= total_days:
-            return 1
-        return latest_workout.day_number + 1
-
-    async def _calculate_current_streak(self, db: AsyncSession, client_id: int) -> int:
-        result = await db.execute(
-            select(WorkoutLog.workout_date)
-            .where(
-                WorkoutLog.client_id == client_id,
-                WorkoutLog.is_completed.is_(True),
-            )
-            .order_by(desc(WorkoutLog.workout_date))
+    async def _get_next_workout_days(
+        self, db: AsyncSession, assignments: List[ProgramAssignment]
+    ) -> Dict[int, Optional[int]]:
+        """Next program day per assignment, from one grouped max(day_number).
+
+        `assignments` must have `program` loaded.
+        """
+        if not assignments:
+            return {}
+        rows = await db.execute(
+            select(WorkoutLog.assignment_id, func.max(WorkoutLog.day_number))
+            .where(WorkoutLog.assignment_id.in_([a.id for a in assignments]))
+            .group_by(WorkoutLog.assignment_id)
         )
-        workouts = list(result.all())
-        if not workouts:
-            return 0
-
-        streak = 0
-        current_date = datetime.now().date()
-        for (workout_date,) in workouts:
-            d = workout_date.date()
-            days_diff = (current_date - d).days
-            if days_diff <= 2:
-                streak += 1
-                current_date = d
-            else:
-                break
-        return streak
+        latest_day = dict(rows.all())
 
-    async def _calculate_longest_streak(self, db: AsyncSession, client_id: int) -> int:
-        result = await db.execute(
-            select(WorkoutLog.workout_date)
-            .where(
-                WorkoutLog.client_id == client_id,
-                WorkoutLog.is_completed.is_(True),
-            )
-            .order_by(WorkoutLog.workout_date)
-        )
-        workouts = [row[0] for row in result.all()]
-        if not workouts:
-            return 0
-
-        max_streak = 0
-        current_streak = 1
-        prev_date = workouts[0].date()
-        for i in range(1, len(workouts)):
-            d = workouts[i].date()
-            days_diff = (d - prev_date).days
-            if days_diff <= 2:
-                current_streak += 1
+        next_days: Dict[int, Optional[int]] = {}
+        for assignment in assignments:
+            latest = latest_day.get(assignment.id)
+            if latest is None:
+                next_days[assignment.id] = 1
+            elif not assignment.program.workout_structure:
+                next_days[assignment.id] = None
+            elif latest >= len(assignment.program.workout_structure):
+                next_days[assignment.id] = 1
             else:
-                max_streak = max(max_streak, current_streak)
-                current_streak = 1
-            prev_date = d
-        return max(max_streak, current_streak)
+                next_days[assignment.id] = latest + 1
+        return next_days
 
     async def get_program_template_for_client(
         self, db: AsyncSession, assignment_id: int
@@ -309,32 +233,41 @@ class ClientDashboardService:
 
         program = assignment.program
 
+        workout_structure = program.workout_structure or []
+        exercise_ids = {
+            ex_data["exercise_id"]
+            for day_data in workout_structure
+            for ex_data in day_data.get("exercises", [])
+            if ex_data.get("exercise_id")
+        }
+        exercises_by_id: Dict[int, Exercise] = {}
+        if exercise_ids:
+            result = await db.execute(select(Exercise).where(Exercise.id.in_(exercise_ids)))
+            exercises_by_id = {ex.id: ex for ex in result.scalars().all()}
+
         workout_days: List[WorkoutDayTemplate] = []
-        if program.workout_structure:
-            for day_data in program.workout_structure:
+        if workout_structure:
+            for day_data in workout_structure:
                 exercises: List[WorkoutExerciseTemplate] = []
                 for ex_data in day_data.get("exercises", []):
-                    exercise_details = None
-                    if ex_data.get("exercise_id"):
-                        exercise_details = (
-                            await db.execute(
-                                select(Exercise).where(Exercise.id == ex_data["exercise_id"])
-                            )
-                        ).scalar_one_or_none()
+                    exercise_details = exercises_by_id.get(ex_data.get("exercise_id"))
 
                     exercises.append(
                         WorkoutExerciseTemplate(
                             exercise_id=ex_data.get("exercise_id"),
-                            exercise_name=ex_data.get("name", "Unknown Exercise"),
+                            exercise_name=ex_data.get("name")
+                            or (exercise_details.name if exercise_details else "Unknown Exercise"),
                             sets=ex_data.get("sets", 1),
                             reps=ex_data.get("reps", "1"),
                             weight=ex_data.get("weight"),
                             rest_seconds=ex_data.get("rest_seconds", 60),
                             notes=ex_data.get("notes"),
-                            muscle_groups=exercise_details.muscle_groups
+                            muscle_groups=_json_list(exercise_details.muscle_groups)
+                            if exercise_details
+                            else [],
+                            equipment=_json_list(exercise_details.equipment)
                             if exercise_details
                             else [],
-                            equipment=exercise_details.equipment if exercise_details else [],
                             instructions=exercise_details.instructions
                             if exercise_details
                             else None,
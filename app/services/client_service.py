@@ -1,11 +1,14 @@
 from typing import List, Optional
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, or_, select
+from sqlalchemy import func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.client import Client
+from app.models.notification import Notification
+from app.models.weekly_exercise import WeeklyExerciseAssignment
 from app.schemas.client import ClientCreate, ClientUpdate
+from app.services.schedule_document_service import ScheduleDocumentService
 
 
 class ClientService:
@@ -61,6 +64,18 @@ class ClientService:
         for field, value in client_update.dict(exclude_unset=True).items():
             setattr(client, field, value)
 
+        if {"first_name", "last_name"} & client_update.dict(exclude_unset=True).keys():
+            # Stored weekly schedules show the client's name.
+            await ScheduleDocumentService.invalidate(
+                db, WeeklyExerciseAssignment.client_id == client_id
+            )
+            # So do notifications, which keep a copy of it.
+            await db.execute(
+                update(Notification)
+                .where(Notification.related_client_id == client_id)
+                .values(client_name=f"{client.first_name} {client.last_name}")
+                .execution_options(synchronize_session=False)
+            )
         await db.commit()
         await db.refresh(client)
         return client
@@ -5,7 +5,13 @@ from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.program import Exercise
+from app.models.weekly_exercise import WeeklyExerciseAssignment
 from app.schemas.exercise import ExerciseCreate, ExerciseFilter, ExerciseUpdate
+from app.services import program_structure_cache
+from app.services.schedule_document_service import ScheduleDocumentService
+
+# Exercise fields copied into stored weekly schedules.
+_SHOWN_IN_SCHEDULES = {"name", "description", "video_url", "instructions", "muscle_groups"}
 
 
 class ExerciseService:
@@ -46,6 +52,17 @@ class ExerciseService:
         result = await db.execute(select(Exercise).where(Exercise.id == exercise_id))
         return result.scalar_one_or_none()
 
+    @staticmethod
+    async def get_exercises_by_ids(
+        db: AsyncSession, exercise_ids: List[int]
+    ) -> List[Exercise]:
+        """Exercises for `exercise_ids` in request order, missing ids skipped."""
+        if not exercise_ids:
+            return []
+        result = await db.execute(select(Exercise).where(Exercise.id.in_(set(exercise_ids))))
+        by_id = {ex.id: ex for ex in result.scalars().all()}
+        return [by_id[eid] for eid in exercise_ids if eid in by_id]
+
     @staticmethod
     async def get_exercises(
         db: AsyncSession,
@@ -110,7 +127,14 @@ class ExerciseService:
                 value = value.value if hasattr(value, "value") else value
             setattr(exercise, field, value)
 
+        if _SHOWN_IN_SCHEDULES & exercise_data.dict(exclude_unset=True).keys():
+            await ScheduleDocumentService.invalidate(
+                db, WeeklyExerciseAssignment.exercise_id == exercise_id
+            )
         await db.commit()
+        if "name" in exercise_data.dict(exclude_unset=True):
+            # Expanded program structures embed exercise names.
+            program_structure_cache.invalidate()
         await db.refresh(exercise)
         return exercise
 
@@ -121,8 +145,12 @@ class ExerciseService:
         exercise = await ExerciseService.get_exercise(db, exercise_id)
         if not exercise or exercise.created_by != user_id:
             return False
+        await ScheduleDocumentService.invalidate(
+            db, WeeklyExerciseAssignment.exercise_id == exercise_id
+        )
         await db.delete(exercise)
         await db.commit()
+        program_structure_cache.invalidate()
         return True
 
     @staticmethod
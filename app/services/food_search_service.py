@@ -0,0 +1,324 @@
+"""Food lookup for meal logging: barcode scans, type-ahead and facets.
+
+- A barcode scan is one probe of the unique `ix_foods_barcode` index.
+- Type-ahead matches every query word against the start of a word in the
+  food's name or brand ("gre yog" finds "Greek Yogurt"), with a one-edit
+  fuzzy fallback for longer words nothing starts with ("yougurt").
+  On Postgres that runs on the trigram and prefix indexes from
+  `app.models.nutrition`. Elsewhere a `PrefixTrie` over every name/brand
+  word is built at startup, checked against the catalog's version (count,
+  max id, max updated_at) on each search and rebuilt when stale, so only the
+  page of results is read from the database.
+- Each search also returns per-category match counts for filtering.
+
+Bulk loading goes through `import_foods`, which streams a CSV in chunks —
+COPY into a temp table plus one upsert per chunk on Postgres, executemany
+upserts elsewhere — keyed on barcode:
+
+    python -m app.services.food_search_service foods.csv [--chunk-size N]
+"""
+import argparse
+import csv
+import heapq
+import re
+import sys
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, TextIO, Tuple
+
+from sqlalchemy import Engine, and_, case, func, literal, literal_column, or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.http_cache import fetch_version, table_version
+from app.core.readiness import on_warmup
+from app.models.nutrition import FOOD_SEARCH_DOCUMENT, Food
+from app.utils.prefix_trie import PrefixTrie
+
+_WORD = re.compile(r"[0-9a-z]+")
+# Words at least this long fall back to fuzzy matching when nothing starts with them
+FUZZY_MIN_LENGTH = 4
+# Single-word queries shorter than this use the name-prefix index (too few trigrams)
+TRIGRAM_MIN_LENGTH = 3
+
+IMPORT_COLUMNS = (
+    "name",
+    "brand",
+    "category",
+    "calories_per_100g",
+    "protein_per_100g",
+    "carbs_per_100g",
+    "fat_per_100g",
+    "fiber_per_100g",
+    "sugar_per_100g",
+    "sodium_per_100g",
+    "serving_size",
+    "barcode",
+)
+_NUMERIC = {column for column in IMPORT_COLUMNS if column.endswith("_per_100g")}
+
+
+def words(text: Optional[str]) -> List[str]:
+    return _WORD.findall((text or "").lower())
+
+
+def _visible(user_id: Optional[int]):
+    return or_(Food.is_public.isnot(False), Food.created_by == user_id)
+
+
+def _facets(counts: Iterable[Tuple[Optional[str], int]]) -> List[Dict[str, Any]]:
+    ordered = sorted(counts, key=lambda item: (-item[1], item[0] is None, item[0] or ""))
+    return [{"category": category, "count": count} for category, count in ordered]
+
+
+# ── In-memory index (non-Postgres) ──────────────────────────────────────────
+
+class _Entry(NamedTuple):
+    name: str  # lower-cased, for ranking
+    category: Optional[str]
+    created_by: Optional[int]
+    is_public: Optional[bool]
+
+
+class FoodIndex:
+    def __init__(self, rows: Iterable[Any], version: Optional[Tuple]) -> None:
+        self.version = version
+        self.entries: Dict[int, _Entry] = {}
+        self.trie: PrefixTrie[int] = PrefixTrie()
+        for row in rows:
+            self.entries[row.id] = _Entry(
+                (row.name or "").lower(), row.category, row.created_by, row.is_public
+            )
+            for word in set(words(row.name) + words(row.brand)):
+                self.trie.insert(word, row.id)
+
+    def match(self, query: str) -> Set[int]:
+        """Ids whose name/brand words cover every query word."""
+        candidates = []
+        for word in words(query):
+            ids = self.trie.prefixed(word)
+            if not ids and len(word) >= FUZZY_MIN_LENGTH:
+                ids = self.trie.similar(word, max_edits=1)
+            if not ids:
+                return set()
+            candidates.append(ids)
+        if not candidates:
+            return set()
+        candidates.sort(key=len)
+        return candidates[0].intersection(*candidates[1:])
+
+
+_index: Optional[FoodIndex] = None
+
+
+async def _load_index(db: AsyncSession, version: Optional[Tuple]) -> FoodIndex:
+    rows = await db.execute(
+        select(Food.id, Food.name, Food.brand, Food.category, Food.created_by, Food.is_public)
+    )
+    return FoodIndex(rows.all(), version)
+
+
+async def current_index(db: AsyncSession) -> FoodIndex:
+    """The process's index, rebuilt first if the catalog changed since."""
+    global _index
+    version = await fetch_version(db, *table_version(Food))
+    if _index is None or _index.version != version:
+        _index = await _load_index(db, version)
+    return _index
+
+
+def invalidate() -> None:
+    global _index
+    _index = None
+
+
+@on_warmup
+async def prime(engine: AsyncEngine) -> None:
+    """Build the in-memory index before serving (Postgres searches in SQL)."""
+    if engine.dialect.name == "postgresql":
+        return
+    async with AsyncSession(engine) as db:
+        await current_index(db)
+
+
+# ── Search ──────────────────────────────────────────────────────────────────
+
+class FoodSearchService:
+    @staticmethod
+    async def get_by_barcode(
+        db: AsyncSession, barcode: str, user_id: Optional[int] = None
+    ) -> Optional[Food]:
+        stmt = select(Food).where(Food.barcode == barcode.strip(), _visible(user_id))
+        return (await db.execute(stmt)).scalar_one_or_none()
+
+    @staticmethod
+    async def search(
+        db: AsyncSession,
+        query: str,
+        user_id: Optional[int] = None,
+        category: Optional[str] = None,
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """`{"items": [Food, ...], "facets": [{"category", "count"}, ...]}`."""
+        if not words(query):
+            return {"items": [], "facets": []}
+        if db.get_bind().dialect.name == "postgresql":
+            return await FoodSearchService._search_sql(db, query, user_id, category, limit)
+        return await FoodSearchService._search_index(db, query, user_id, category, limit)
+
+    @staticmethod
+    async def _search_index(db, query, user_id, category, limit):
+        index = await current_index(db)
+        phrase = " ".join(words(query))
+        facets: Counter = Counter()
+        ranked = []
+        for food_id in index.match(query):
+            entry = index.entries[food_id]
+            if entry.is_public is False and entry.created_by != user_id:
+                continue
+            facets[entry.category] += 1
+            if category is None or entry.category == category:
+                ranked.append((not entry.name.startswith(phrase), len(entry.name), entry.name, food_id))
+        top = [item[-1] for item in heapq.nsmallest(limit, ranked)]
+        foods = {}
+        if top:
+            rows = await db.execute(select(Food).where(Food.id.in_(top)))
+            foods = {food.id: food for food in rows.scalars()}
+        return {
+            "items": [foods[food_id] for food_id in top if food_id in foods],
+            "facets": _facets(facets.items()),
+        }
+
+    @staticmethod
+    async def _search_sql(db, query, user_id, category, limit):
+        terms = words(query)
+        phrase = " ".join(terms)
+        name = func.lower(Food.name)
+        if len(terms) == 1 and len(phrase) < TRIGRAM_MIN_LENGTH:
+            # ix_foods_name_prefix
+            match = name.like(phrase + "%")
+            similarity = literal(0)
+        else:
+            # ix_foods_search_trgm: word starts, or a close word for typos
+            document = literal_column(FOOD_SEARCH_DOCUMENT)
+            match = or_(
+                and_(*(document.op("~")(literal(r"\m" + term)) for term in terms)),
+                literal(phrase).op("<%")(document),
+            )
+            similarity = func.word_similarity(phrase, document)
+        visible = (match, _visible(user_id))
+
+        facet_rows = await db.execute(
+            select(Food.category, func.count()).where(*visible).group_by(Food.category)
+        )
+        stmt = select(Food).where(*visible)
+        if category is not None:
+            stmt = stmt.where(Food.category == category)
+        stmt = stmt.order_by(
+            case((name.like(phrase + "%"), 0), else_=1),
+            similarity.desc(),
+            func.length(Food.name),
+            name,
+            Food.id,
+        ).limit(limit)
+        return {
+            "items": list((await db.execute(stmt)).scalars()),
+            "facets": _facets(tuple(row) for row in facet_rows.all()),
+        }
+
+
+# ── Bulk import ─────────────────────────────────────────────────────────────
+
+def _parse(record: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    row: Dict[str, Any] = {}
+    for column in IMPORT_COLUMNS:
+        value = (record.get(column) or "").strip()
+        if column in _NUMERIC:
+            try:
+                row[column] = float(value) if value else None
+            except ValueError:
+                return None
+        else:
+            row[column] = value or None
+    return row if row["name"] else None
+
+
+def _chunks(reader: Iterable[Dict[str, str]], size: int, stats: Dict[str, int]) -> Iterator[List[Dict]]:
+    chunk: Dict[Any, Dict] = {}
+    for line, record in enumerate(reader):
+        row = _parse(record)
+        if row is None:
+            stats["skipped"] += 1
+            continue
+        # Last row wins for a barcode repeated within one chunk.
+        chunk[row["barcode"] or ("line", line)] = row
+        if len(chunk) >= size:
+            yield list(chunk.values())
+            chunk = {}
+    if chunk:
+        yield list(chunk.values())
+
+
+def _copy_chunk(conn, rows: List[Dict[str, Any]], created_by: Optional[int]) -> None:
+    columns = ", ".join(IMPORT_COLUMNS)
+    updates = ", ".join(f"{c} = excluded.{c}" for c in IMPORT_COLUMNS if c != "barcode")
+    with conn.connection.driver_connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS food_import ON COMMIT DELETE ROWS "
+            f"AS SELECT {columns} FROM foods WITH NO DATA"
+        )
+        with cursor.copy(f"COPY food_import ({columns}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row([row[c] for c in IMPORT_COLUMNS])
+        cursor.execute(
+            f"INSERT INTO foods ({columns}, is_public, created_by, created_at) "
+            f"SELECT {columns}, true, %s, now() FROM food_import "
+            f"ON CONFLICT (barcode) DO UPDATE SET {updates}, updated_at = now()",
+            (created_by,),
+        )
+
+
+def _insert_chunk(conn, rows: List[Dict[str, Any]], created_by: Optional[int]) -> None:
+    stmt = sqlite_insert(Food.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["barcode"],
+        set_={
+            **{c: stmt.excluded[c] for c in IMPORT_COLUMNS if c != "barcode"},
+            "updated_at": func.now(),
+        },
+    )
+    conn.execute(stmt, [{**row, "is_public": True, "created_by": created_by} for row in rows])
+
+
+def import_foods(
+    engine: Engine, stream: TextIO, chunk_size: int = 5000, created_by: Optional[int] = None
+) -> Dict[str, int]:
+    """Upsert foods from CSV (a header row naming `IMPORT_COLUMNS`).
+
+    Rows are keyed on barcode; rows without one are always inserted. Rows
+    without a name or with a non-numeric nutrient are skipped. Each chunk
+    commits on its own. Returns `{"rows": written, "skipped": n}`.
+    """
+    stats = {"rows": 0, "skipped": 0}
+    write = _copy_chunk if engine.dialect.name == "postgresql" else _insert_chunk
+    with engine.connect() as conn:
+        for rows in _chunks(csv.DictReader(stream), chunk_size, stats):
+            with conn.begin():
+                write(conn, rows, created_by)
+            stats["rows"] += len(rows)
+
+    invalidate()
+    return stats
+
+
+if __name__ == "__main__":
+    import app.models  # noqa: F401 — register every mapper before querying
+    from app.core.database import get_sync_engine
+
+    parser = argparse.ArgumentParser(description="Load a food database CSV.")
+    parser.add_argument("path", help="CSV file, or - for stdin")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--created-by", type=int, default=None, help="Owning user id")
+    args = parser.parse_args()
+    with (sys.stdin if args.path == "-" else open(args.path, newline="", encoding="utf-8")) as f:
+        result = import_foods(get_sync_engine(), f, args.chunk_size, args.created_by)
+    print(f"Imported {result['rows']} foods ({result['skipped']} rows skipped)")
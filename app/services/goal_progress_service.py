@@ -0,0 +1,196 @@
+"""Goal progress kept in step with body metrics.
+
+A goal whose `metric` names a `BodyMetric` column ("weight", "waist", ...)
+takes its `current_value` from the client's latest measurement of that
+column on or after the goal's `start_date`. Whenever measurements change,
+`GoalProgressService.sync` rewrites `current_value`, `progress_pct`,
+`is_completed` and `completed_date` of every affected goal in one UPDATE
+with correlated subqueries, inside the caller's transaction. Goals on other
+metrics ("custom") keep their manual `current_value`; `recompute` stores
+their progress when they are edited.
+
+Progress is directional: moving away from the target counts as 0%, and
+reaching or passing it as 100%. A metric-backed goal is completed while its
+latest measurement is at or past the target, dated by the measurement that
+first got it there; a later measurement back on the wrong side reopens it.
+Only goals the trainer marked complete (`completed_manually`) stay
+completed regardless.
+
+Backfill existing goals with:
+
+    python -m app.services.goal_progress_service [--client-id N]
+"""
+import argparse
+import asyncio
+from datetime import date
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import Numeric, and_, case, cast, false, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.body_metric import BodyMetric
+from app.models.goal_milestone import GoalMilestone
+
+# Goal metric name -> the BodyMetric column it follows
+METRIC_COLUMNS = {
+    "weight": BodyMetric.weight,
+    "body_fat": BodyMetric.body_fat_percentage,
+    "body_fat_percentage": BodyMetric.body_fat_percentage,
+    "muscle_mass": BodyMetric.muscle_mass,
+    "waist": BodyMetric.waist,
+    "chest": BodyMetric.chest,
+    "hips": BodyMetric.hips,
+    "arms": BodyMetric.arms,
+    "thighs": BodyMetric.thighs,
+}
+
+
+def compute_progress(goal: GoalMilestone) -> float:
+    """Percent of the way from `start_value` to `target_value`, 0–100."""
+    current, start, target = goal.current_value, goal.start_value, goal.target_value
+    if current is None:
+        return 0.0
+    if target == start:
+        return 100.0 if goal.is_completed or current == target else 0.0
+    ratio = (current - start) / (target - start) * 100
+    return min(max(round(ratio, 1), 0.0), 100.0)
+
+
+def _reached(current):
+    """SQL: `current` is at or past the goal's target."""
+    start, target = GoalMilestone.start_value, GoalMilestone.target_value
+    return or_(
+        and_(target > start, current >= target),
+        and_(target < start, current <= target),
+        and_(target == start, current == target),
+    )
+
+
+def progress_expression(current):
+    """SQL mirror of `compute_progress` for a current-value expression."""
+    start, target = GoalMilestone.start_value, GoalMilestone.target_value
+    completed = func.coalesce(GoalMilestone.is_completed, false())
+    ratio = (current - start) / (target - start) * 100
+    return case(
+        (current.is_(None), 0.0),
+        (target == start, case((or_(completed, current == target), 100.0), else_=0.0)),
+        (ratio >= 100, 100.0),
+        (ratio <= 0, 0.0),
+        else_=func.round(cast(ratio, Numeric), 1),
+    )
+
+
+def _latest(column=None):
+    """Correlated subquery: the goal's latest matching measurement value
+    (or `column` of that measurement)."""
+    value = case(
+        *((GoalMilestone.metric == name, metric) for name, metric in METRIC_COLUMNS.items())
+    )
+    return (
+        select(column if column is not None else value)
+        .where(
+            BodyMetric.client_id == GoalMilestone.client_id,
+            BodyMetric.measured_at >= GoalMilestone.start_date,
+            value.is_not(None),
+        )
+        .order_by(BodyMetric.measured_at.desc(), BodyMetric.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def changed_metrics(metric: BodyMetric, fields: Optional[Iterable[str]] = None) -> set:
+    """Goal metric names affected by `metric` (optionally only by `fields`)."""
+    if fields is not None and "measured_at" not in fields:
+        touched = set(fields)
+    else:
+        touched = {m.key for m in METRIC_COLUMNS.values() if getattr(metric, m.key) is not None}
+    return {name for name, column in METRIC_COLUMNS.items() if column.key in touched}
+
+
+class GoalProgressService:
+
+    @staticmethod
+    async def sync(
+        db: AsyncSession,
+        client_id: Optional[int] = None,
+        metrics: Optional[Iterable[str]] = None,
+        goal_id: Optional[int] = None,
+    ) -> int:
+        """Refresh metric-backed goals from body metrics; returns rows updated.
+
+        Narrow with `client_id`, `metrics` (goal metric names) or `goal_id`.
+        Pending ORM changes are flushed first so the UPDATE sees them. A goal
+        with no measurement since its start date keeps its current value.
+        """
+        names = set(METRIC_COLUMNS) if metrics is None else set(metrics) & set(METRIC_COLUMNS)
+        if not names:
+            return 0
+        await db.flush()
+
+        current = _latest()
+        reached = _reached(current)
+        completed = func.coalesce(GoalMilestone.is_completed, false())
+        manual = and_(GoalMilestone.completed_manually, completed)
+        stmt = (
+            update(GoalMilestone)
+            .where(GoalMilestone.metric.in_(names), current.is_not(None))
+            .values(
+                current_value=current,
+                progress_pct=progress_expression(current),
+                is_completed=or_(manual, reached),
+                completed_date=case(
+                    (manual, GoalMilestone.completed_date),
+                    (and_(completed, reached), func.coalesce(
+                        GoalMilestone.completed_date, _latest(BodyMetric.measured_at)
+                    )),
+                    (reached, _latest(BodyMetric.measured_at)),
+                    else_=None,
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if client_id is not None:
+            stmt = stmt.where(GoalMilestone.client_id == client_id)
+        if goal_id is not None:
+            stmt = stmt.where(GoalMilestone.id == goal_id)
+        return (await db.execute(stmt)).rowcount
+
+    @staticmethod
+    def recompute(goal: GoalMilestone) -> None:
+        """Store progress (and completion) for a goal edited in memory."""
+        goal.progress_pct = compute_progress(goal)
+        if goal.progress_pct >= 100 and goal.current_value is not None and not goal.is_completed:
+            goal.is_completed = True
+            goal.completed_date = goal.completed_date or date.today()
+
+    @staticmethod
+    async def backfill(db: AsyncSession, client_id: Optional[int] = None) -> Dict[str, int]:
+        """Store progress for every goal, then sync the metric-backed ones."""
+        stmt = (
+            update(GoalMilestone)
+            .values(progress_pct=progress_expression(GoalMilestone.current_value))
+            .execution_options(synchronize_session=False)
+        )
+        if client_id is not None:
+            stmt = stmt.where(GoalMilestone.client_id == client_id)
+        goals = (await db.execute(stmt)).rowcount
+        synced = await GoalProgressService.sync(db, client_id)
+        await db.commit()
+        return {"goals": goals, "synced": synced}
+
+
+async def _main(client_id: Optional[int]) -> None:
+    import app.models  # noqa: F401 — register every mapper before querying
+    from app.core.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        result = await GoalProgressService.backfill(db, client_id)
+    print(f"Stored progress for {result['goals']} goals, {result['synced']} synced from body metrics")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill stored goal progress.")
+    parser.add_argument("--client-id", type=int, default=None)
+    args = parser.parse_args()
+    asyncio.run(_main(args.client_id))
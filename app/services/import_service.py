@@ -0,0 +1,453 @@
+"""Bulk imports of clients, exercises and historical workouts.
+
+Onboarding a gym from another tool means thousands of rows; creating them
+one request (and one commit) at a time takes hours. An upload is spooled to
+`IMPORT_UPLOAD_DIR` as it arrives, then read back as a stream — CSV with a
+header row, or NDJSON — in chunks of `CHUNK_SIZE` rows:
+
+- each chunk is validated in one Pydantic call (`TypeAdapter` over the row
+  schemas in `app.schemas.imports`); invalid rows are reported, the rest go on;
+- valid rows are inserted with one executemany per table inside a
+  SAVEPOINT. If the chunk fails in the database, it is retried row by row
+  so only the offending rows are reported;
+- the job's progress commits with the chunk, so a job that stops (crash,
+  deploy, lost connection) resumes after its last committed chunk. Each
+  chunk first claims its rows with a compare-and-set on `rows_processed`,
+  so of two runs of one job (a resume racing the original upload, or a
+  second resume) only one writes each chunk; the other stops with
+  `ImportClaimLost`:
+
+    python -m app.services.import_service JOB_ID
+
+Workout history skips the per-workout trainer notification; assignment
+completion counts and last-workout dates are updated once per chunk.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import bindparam, case, func, insert, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+from app.models import (
+    Client,
+    Exercise,
+    ExerciseLog,
+    ImportJob,
+    ImportKind,
+    ImportStatus,
+    ProgramAssignment,
+    WorkoutLog,
+)
+from app.schemas.imports import ClientImportRow, ExerciseImportRow, WorkoutImportRow
+from app.services.progression_service import ProgressionService
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1000
+# Rows beyond this still count in rows_failed but aren't listed
+MAX_REPORTED_ERRORS = 1000
+FORMATS = ("csv", "ndjson")
+
+Row = Tuple[int, Any]  # (row number, raw record or validated model)
+RowError = Dict[str, Any]
+
+
+class ImportClaimLost(Exception):
+    """Another run of the job claimed the rows this one was about to load."""
+
+
+# ── Reading ──────────────────────────────────────────────────────────────────
+
+def read_rows(path: str, file_format: str, skip: int = 0) -> Iterator[Row]:
+    """(row number, record) per data row, after the first `skip`.
+
+    CSV cells left empty are dropped so schema defaults apply. An NDJSON
+    line that isn't a JSON object yields its error message instead.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if file_format == "csv":
+            records = (
+                {key: value for key, value in record.items() if key and value != ""}
+                for record in csv.DictReader(f)
+            )
+            yield from islice(enumerate(records, start=1), skip, None)
+            return
+        number = 0
+        for line in f:
+            if not line.strip():
+                continue
+            number += 1
+            if number <= skip:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                record = f"Invalid JSON: {e}"
+            if not isinstance(record, (dict, str)):
+                record = "Each line must be a JSON object"
+            yield number, record
+
+
+def _chunks(rows: Iterator[Row], size: int) -> Iterator[List[Row]]:
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _error(row: int, message: str, field: Optional[str] = None) -> RowError:
+    return {"row": row, "errors": [{"field": field, "message": message}]}
+
+
+def validate_rows(adapter: TypeAdapter, chunk: List[Row]) -> Tuple[List[Row], List[RowError]]:
+    """Validate a chunk in one call; returns (valid rows, row errors)."""
+    errors: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    candidates = []
+    for number, record in chunk:
+        if isinstance(record, str):
+            errors[number].append({"field": None, "message": record})
+        else:
+            candidates.append((number, record))
+    try:
+        models = adapter.validate_python([record for _, record in candidates])
+        valid = list(zip((number for number, _ in candidates), models))
+    except ValidationError as e:
+        rejected = set()
+        for err in e.errors():
+            index, *field = err["loc"]
+            rejected.add(index)
+            errors[candidates[index][0]].append(
+                {"field": ".".join(str(part) for part in field) or None, "message": err["msg"]}
+            )
+        kept = [row for index, row in enumerate(candidates) if index not in rejected]
+        models = adapter.validate_python([record for _, record in kept])
+        valid = list(zip((number for number, _ in kept), models))
+    return valid, [{"row": number, "errors": errs} for number, errs in sorted(errors.items())]
+
+
+# ── Writers: (db, trainer_id, valid rows) -> (rows written, row errors) ─────
+
+Writer = Callable[[AsyncSession, int, List[Row]], Any]
+
+
+async def _write_clients(db: AsyncSession, trainer_id: int, rows: List[Row]):
+    await db.execute(
+        insert(Client),
+        [
+            {"trainer_id": trainer_id, "is_active": True, **row.dict(exclude={"custom_password"})}
+            for _, row in rows
+        ],
+    )
+    return len(rows), []
+
+
+async def _write_exercises(db: AsyncSession, trainer_id: int, rows: List[Row]):
+    await db.execute(
+        insert(Exercise),
+        [
+            {
+                **row.dict(exclude={"muscle_groups", "equipment", "difficulty_level"}),
+                "muscle_groups": json.dumps(row.muscle_groups) if row.muscle_groups else None,
+                "equipment": json.dumps(row.equipment) if row.equipment else None,
+                "difficulty_level": row.difficulty_level.value if row.difficulty_level else None,
+                "created_by": trainer_id,
+            }
+            for _, row in rows
+        ],
+    )
+    return len(rows), []
+
+
+async def _resolve_workouts(db: AsyncSession, trainer_id: int, rows: List[Row]):
+    """Map each row to (client_id, assignment_id) with two queries per chunk."""
+    ids = {row.client_id for _, row in rows if row.client_id is not None}
+    emails = {row.client_email.lower() for _, row in rows if row.client_email is not None}
+    clients = (
+        await db.execute(
+            select(Client.id, func.lower(Client.email)).where(
+                Client.trainer_id == trainer_id,
+                or_(Client.id.in_(ids), func.lower(Client.email).in_(emails)),
+            )
+        )
+    ).all()
+    owned = {client_id for client_id, _ in clients}
+    by_email = {email: client_id for client_id, email in clients if email}
+
+    assignments: Dict[int, set] = defaultdict(set)
+    latest: Dict[int, int] = {}
+    if owned:
+        found = await db.execute(
+            select(ProgramAssignment.id, ProgramAssignment.client_id)
+            .where(ProgramAssignment.client_id.in_(owned))
+            .order_by(ProgramAssignment.start_date, ProgramAssignment.id)
+        )
+        for assignment_id, client_id in found.all():
+            assignments[client_id].add(assignment_id)
+            latest[client_id] = assignment_id
+
+    resolved, errors = [], []
+    for number, row in rows:
+        client_id = row.client_id if row.client_id is not None else by_email.get(row.client_email.lower())
+        if client_id not in owned:
+            errors.append(_error(number, "Client not found", "client_id"))
+        elif row.assignment_id is not None and row.assignment_id not in assignments[client_id]:
+            errors.append(_error(number, "Assignment not found for this client", "assignment_id"))
+        elif row.assignment_id is None and client_id not in latest:
+            errors.append(_error(number, "Client has no program assignment", "assignment_id"))
+        else:
+            resolved.append((number, row, client_id, row.assignment_id or latest[client_id]))
+    return resolved, errors
+
+
+async def _write_workouts(db: AsyncSession, trainer_id: int, rows: List[Row]):
+    resolved, errors = await _resolve_workouts(db, trainer_id, rows)
+    if not resolved:
+        return 0, errors
+
+    workout_ids = (
+        await db.execute(
+            insert(WorkoutLog).returning(WorkoutLog.id, sort_by_parameter_order=True),
+            [
+                {
+                    **row.dict(exclude={"client_id", "client_email", "assignment_id", "exercises"}),
+                    "client_id": client_id,
+                    "assignment_id": assignment_id,
+                }
+                for _, row, client_id, assignment_id in resolved
+            ],
+        )
+    ).scalars().all()
+
+    exercise_logs = [
+        {
+            **exercise.dict(exclude={"actual_sets"}),
+            "actual_sets": [set_data.dict() for set_data in exercise.actual_sets],
+            "workout_log_id": workout_id,
+        }
+        for (_, row, _, _), workout_id in zip(resolved, workout_ids)
+        for exercise in row.exercises
+    ]
+    if exercise_logs:
+        log_ids = (
+            await db.execute(
+                insert(ExerciseLog).returning(ExerciseLog.id, sort_by_parameter_order=True),
+                exercise_logs,
+            )
+        ).scalars().all()
+        performed = {
+            workout_id: (client_id, row.workout_date)
+            for (_, row, client_id, _), workout_id in zip(resolved, workout_ids)
+        }
+        entries = []
+        for log_id, log in zip(log_ids, exercise_logs):
+            client_id, performed_at = performed[log["workout_log_id"]]
+            entries.append((log_id, client_id, log.get("exercise_id"), performed_at, log["actual_sets"]))
+        await ProgressionService.index(db, entries)
+
+    # What create_workout_log does per workout, once per assignment.
+    completed: Dict[int, List[datetime]] = defaultdict(list)
+    for _, row, _, assignment_id in resolved:
+        if row.is_completed:
+            completed[assignment_id].append(row.workout_date)
+    if completed:
+        a = ProgramAssignment.__table__
+        last = bindparam("last_workout")
+        await db.execute(
+            update(a)
+            .where(a.c.id == bindparam("assignment"))
+            .values(
+                completed_workouts=func.coalesce(a.c.completed_workouts, 0) + bindparam("count"),
+                last_workout_date=case(
+                    (a.c.last_workout_date.is_(None), last),
+                    (a.c.last_workout_date < last, last),
+                    else_=a.c.last_workout_date,
+                ),
+            ),
+            [
+                {"assignment": aid, "count": len(dates), "last_workout": max(dates)}
+                for aid, dates in completed.items()
+            ],
+        )
+    return len(resolved), errors
+
+
+_KINDS: Dict[str, Tuple[type, Writer]] = {
+    ImportKind.CLIENTS.value: (ClientImportRow, _write_clients),
+    ImportKind.EXERCISES.value: (ExerciseImportRow, _write_exercises),
+    ImportKind.WORKOUTS.value: (WorkoutImportRow, _write_workouts),
+}
+
+
+async def _write_chunk(db: AsyncSession, writer: Writer, trainer_id: int, rows: List[Row]):
+    try:
+        async with db.begin_nested():
+            return await writer(db, trainer_id, rows)
+    except SQLAlchemyError:
+        pass
+    # Something in the chunk broke a constraint: find which rows.
+    written, errors = 0, []
+    for row in rows:
+        try:
+            async with db.begin_nested():
+                count, row_errors = await writer(db, trainer_id, [row])
+        except SQLAlchemyError as e:
+            errors.append(_error(row[0], str(getattr(e, "orig", e))))
+        else:
+            written += count
+            errors.extend(row_errors)
+    return written, errors
+
+
+class ImportService:
+    @staticmethod
+    async def create_job(
+        db: AsyncSession, trainer_id: int, kind: ImportKind, file_format: str, upload: BinaryIO
+    ) -> ImportJob:
+        """Spool `upload` to disk in 1 MiB blocks and record a pending job."""
+        os.makedirs(settings.import_upload_dir, exist_ok=True)
+        path = os.path.join(settings.import_upload_dir, f"{uuid.uuid4().hex}.{file_format}")
+        with open(path, "wb") as out:
+            while block := await _read(upload, 1 << 20):
+                out.write(block)
+        job = ImportJob(
+            trainer_id=trainer_id,
+            kind=kind.value,
+            file_format=file_format,
+            file_path=path,
+            status=ImportStatus.PENDING.value,
+            rows_processed=0,
+            rows_imported=0,
+            rows_failed=0,
+            errors=[],
+        )
+        db.add(job)
+        await db.commit()
+        return job
+
+    @staticmethod
+    async def get_job(
+        db: AsyncSession, job_id: int, trainer_id: Optional[int] = None
+    ) -> Optional[ImportJob]:
+        stmt = select(ImportJob).where(ImportJob.id == job_id)
+        if trainer_id is not None:
+            stmt = stmt.where(ImportJob.trainer_id == trainer_id)
+        return (await db.execute(stmt)).scalar_one_or_none()
+
+    @staticmethod
+    async def get_jobs(db: AsyncSession, trainer_id: int, limit: int = 50) -> List[ImportJob]:
+        stmt = (
+            select(ImportJob)
+            .where(ImportJob.trainer_id == trainer_id)
+            .order_by(ImportJob.id.desc())
+            .limit(limit)
+        )
+        return list((await db.execute(stmt)).scalars().all())
+
+    @staticmethod
+    async def run(db: AsyncSession, job: ImportJob, chunk_size: int = CHUNK_SIZE) -> ImportJob:
+        """Load the job's file from `rows_processed` on; safe to call again
+        on a job that stopped. Raises `ImportClaimLost` when another run of
+        the job got there first (or already finished it)."""
+        model, writer = _KINDS[job.kind]
+        adapter = TypeAdapter(List[model])
+        await _claim(
+            db, job, job.rows_processed, ImportJob.status != ImportStatus.COMPLETED.value,
+            status=ImportStatus.RUNNING.value, failure=None,
+        )
+        await db.commit()
+        set_committed_value(job, "status", ImportStatus.RUNNING.value)
+        set_committed_value(job, "failure", None)
+
+        try:
+            rows = read_rows(job.file_path, job.file_format, skip=job.rows_processed)
+            for chunk in _chunks(rows, chunk_size):
+                # Opens the chunk's transaction on the job row, so the
+                # SAVEPOINTs below nest inside it on every driver.
+                seen = job.rows_processed
+                await _claim(db, job, seen, rows_processed=seen + len(chunk), updated_at=func.now())
+                valid, errors = validate_rows(adapter, chunk)
+                written = 0
+                if valid:
+                    written, write_errors = await _write_chunk(db, writer, job.trainer_id, valid)
+                    errors = sorted(errors + write_errors, key=lambda e: e["row"])
+                set_committed_value(job, "rows_processed", seen + len(chunk))
+                job.rows_imported += written
+                job.rows_failed += len(errors)
+                room = MAX_REPORTED_ERRORS - len(job.errors)
+                if errors and room > 0:
+                    job.errors = job.errors + errors[:room]
+                await db.commit()
+        except ImportClaimLost:
+            raise
+        except Exception as e:
+            logger.exception("Import job %s stopped after %s rows", job.id, job.rows_processed)
+            await db.rollback()
+            job.status = ImportStatus.FAILED.value
+            job.failure = str(e)
+        else:
+            job.status = ImportStatus.COMPLETED.value
+            job.finished_at = datetime.now(timezone.utc)
+        await db.commit()
+        await db.refresh(job)
+        if job.status == ImportStatus.COMPLETED.value and os.path.exists(job.file_path):
+            os.remove(job.file_path)
+        return job
+
+
+async def _claim(db: AsyncSession, job: ImportJob, seen: int, *criteria, **values) -> None:
+    """Write `values` to the job if its `rows_processed` is still `seen`;
+    otherwise roll back and raise `ImportClaimLost`."""
+    job_id = job.id
+    result = await db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id, ImportJob.rows_processed == seen, *criteria)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        await db.rollback()
+        raise ImportClaimLost(f"Import job {job_id} is being loaded by another run")
+
+
+async def _read(upload: Any, size: int) -> bytes:
+    data = upload.read(size)
+    return await data if asyncio.iscoroutine(data) else data
+
+
+async def _main(job_id: int) -> None:
+    import app.models  # noqa: F401 — register every mapper before querying
+    from app.core.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        job = await ImportService.get_job(db, job_id)
+        if job is None:
+            raise SystemExit(f"No import job {job_id}")
+        try:
+            job = await ImportService.run(db, job)
+        except ImportClaimLost as e:
+            raise SystemExit(str(e))
+    print(
+        f"Job {job.id} {job.status}: {job.rows_imported} imported, "
+        f"{job.rows_failed} failed of {job.rows_processed} rows"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run or resume a bulk import job.")
+    parser.add_argument("job_id", type=int)
+    args = parser.parse_args()
+    asyncio.run(_main(args.job_id))
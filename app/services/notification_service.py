@@ -1,9 +1,10 @@
 from datetime import datetime, timedelta
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy import and_, func, select, update
+from sqlalchemy import and_, func, insert, select, update
 from sqlalchemy import delete as sql_delete
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.models.client import Client
 from app.models.notification import Notification, NotificationType
@@ -24,6 +25,7 @@ class NotificationService:
         related_client_id: Optional[int] = None,
         related_appointment_id: Optional[int] = None,
         related_workout_log_id: Optional[int] = None,
+        client_name: Optional[str] = None,
     ) -> Notification:
         notification = Notification(
             user_id=user_id,
@@ -33,12 +35,24 @@ class NotificationService:
             related_client_id=related_client_id,
             related_appointment_id=related_appointment_id,
             related_workout_log_id=related_workout_log_id,
+            client_name=client_name,
         )
         db.add(notification)
         await db.commit()
         await db.refresh(notification)
         return notification
 
+    @staticmethod
+    async def create_notifications(db: AsyncSession, rows: List[dict]) -> int:
+        """Insert many notifications as one batched INSERT (no commit).
+
+        Each row holds Notification column values (user_id,
+        notification_type, title, message and optional related ids).
+        """
+        if rows:
+            await db.execute(insert(Notification), rows)
+        return len(rows)
+
     @staticmethod
     async def get_user_notifications(
         db: AsyncSession,
@@ -166,13 +180,13 @@ class NotificationService:
             message=f"{client_name} completed {workout_name}",
             related_client_id=client.id,
             related_workout_log_id=workout_log.id,
+            client_name=client_name,
         )
 
     # ==================== APPOINTMENT NOTIFICATIONS ====================
 
     @staticmethod
-    async def create_upcoming_appointment_notification(
-        db: AsyncSession,
+    def _build_upcoming_appointment_notification(
         trainer_id: int,
         appointment: Appointment,
         client: Client,
@@ -189,15 +203,31 @@ class NotificationService:
             days = hours_before // 24
             time_desc = "tomorrow" if days == 1 else f"in {days} days"
 
-        return await NotificationService.create_notification(
-            db=db,
+        return Notification(
             user_id=trainer_id,
             notification_type=NotificationType.APPOINTMENT_UPCOMING,
             title=f"Upcoming: {appointment.title}",
             message=f"Appointment with {client_name} {time_desc} at {time_str}",
             related_client_id=client.id,
             related_appointment_id=appointment.id,
+            client_name=client_name,
+        )
+
+    @staticmethod
+    async def create_upcoming_appointment_notification(
+        db: AsyncSession,
+        trainer_id: int,
+        appointment: Appointment,
+        client: Client,
+        hours_before: int = 24,
+    ) -> Notification:
+        notification = NotificationService._build_upcoming_appointment_notification(
+            trainer_id, appointment, client, hours_before
         )
+        db.add(notification)
+        await db.commit()
+        await db.refresh(notification)
+        return notification
 
     @staticmethod
     async def check_and_create_appointment_reminders(
@@ -214,6 +244,7 @@ class NotificationService:
 
             appts_stmt = (
                 select(Appointment)
+                .options(selectinload(Appointment.client))
                 .where(
                     and_(
                         Appointment.trainer_id == trainer_id,
@@ -224,59 +255,126 @@ class NotificationService:
                 )
             )
             appointments = list((await db.execute(appts_stmt)).scalars().all())
+            if not appointments:
+                continue
 
-            for appointment in appointments:
-                existing_stmt = select(Notification).where(
-                    and_(
-                        Notification.user_id == trainer_id,
-                        Notification.related_appointment_id == appointment.id,
-                        Notification.notification_type == NotificationType.APPOINTMENT_UPCOMING,
-                        Notification.created_at >= now - timedelta(hours=1),
+            already_notified = set(
+                (
+                    await db.execute(
+                        select(Notification.related_appointment_id).where(
+                            and_(
+                                Notification.user_id == trainer_id,
+                                Notification.related_appointment_id.in_(
+                                    [a.id for a in appointments]
+                                ),
+                                Notification.notification_type
+                                == NotificationType.APPOINTMENT_UPCOMING,
+                                Notification.created_at >= now - timedelta(hours=1),
+                            )
+                        )
                     )
+                ).scalars().all()
+            )
+
+            for appointment in appointments:
+                if appointment.id in already_notified or not appointment.client:
+                    continue
+                notification = NotificationService._build_upcoming_appointment_notification(
+                    trainer_id, appointment, appointment.client, hours
                 )
-                existing = (await db.execute(existing_stmt)).scalar_one_or_none()
-
-                if not existing and appointment.client:
-                    notification = await NotificationService.create_upcoming_appointment_notification(
-                        db=db,
-                        trainer_id=trainer_id,
-                        appointment=appointment,
-                        client=appointment.client,
-                        hours_before=hours,
-                    )
-                    created_notifications.append(notification)
+                db.add(notification)
+                created_notifications.append(notification)
+
+        if not created_notifications:
+            return created_notifications
 
-        return created_notifications
+        await db.commit()
+        ids = [n.id for n in created_notifications]
+        result = await db.execute(
+            select(Notification)
+            .where(Notification.id.in_(ids))
+            .execution_options(populate_existing=True)
+        )
+        by_id = {n.id: n for n in result.scalars().all()}
+        return [by_id[i] for i in ids]
 
     @staticmethod
-    async def enrich_notification_response(
-        notification: Notification, db: AsyncSession
-    ) -> dict:
-        response = {
-            "id": notification.id,
-            "user_id": notification.user_id,
-            "notification_type": notification.notification_type.value,
-            "title": notification.title,
-            "message": notification.message,
-            "is_read": notification.is_read,
-            "read_at": notification.read_at,
-            "created_at": notification.created_at,
-            "related_client_id": notification.related_client_id,
-            "related_appointment_id": notification.related_appointment_id,
-            "related_workout_log_id": notification.related_workout_log_id,
-            "client_name": None,
-        }
+    async def _resolve_client_names(
+        db: AsyncSession, notifications: List[Notification]
+    ) -> Dict[int, str]:
+        """Client names for notifications that predate the denormalized column.
 
-        if notification.related_client_id:
-            client = (
-                await db.execute(
-                    select(Client).where(Client.id == notification.related_client_id)
+        Collects every related id on the page and resolves each type with one
+        IN query: appointments and workout logs are only consulted to find
+        the client of rows that carry no related_client_id.
+        """
+        pending = [n for n in notifications if not n.client_name]
+        client_of: Dict[Tuple[str, int], int] = {}
+        client_ids = {n.related_client_id for n in pending if n.related_client_id}
+
+        for column, model in (
+            ("related_appointment_id", Appointment),
+            ("related_workout_log_id", WorkoutLog),
+        ):
+            ids = {
+                getattr(n, column)
+                for n in pending
+                if not n.related_client_id and getattr(n, column)
+            }
+            if not ids:
+                continue
+            rows = await db.execute(select(model.id, model.client_id).where(model.id.in_(ids)))
+            for related_id, client_id in rows.all():
+                client_of[(column, related_id)] = client_id
+                client_ids.add(client_id)
+
+        names: Dict[int, str] = {}
+        if client_ids:
+            rows = await db.execute(
+                select(Client.id, Client.first_name, Client.last_name).where(
+                    Client.id.in_(client_ids)
+                )
+            )
+            by_client = {cid: f"{first} {last}" for cid, first, last in rows.all()}
+            for n in pending:
+                client_id = (
+                    n.related_client_id
+                    or client_of.get(("related_appointment_id", n.related_appointment_id))
+                    or client_of.get(("related_workout_log_id", n.related_workout_log_id))
                 )
-            ).scalar_one_or_none()
-            if client:
-                response["client_name"] = f"{client.first_name} {client.last_name}"
+                if client_id in by_client:
+                    names[n.id] = by_client[client_id]
+        return names
 
-        return response
+    @staticmethod
+    async def enrich_notifications(
+        notifications: List[Notification], db: AsyncSession
+    ) -> List[dict]:
+        """Render a page of notifications with at most one query per related type."""
+        names = await NotificationService._resolve_client_names(db, notifications)
+        return [
+            {
+                "id": n.id,
+                "user_id": n.user_id,
+                "notification_type": n.notification_type.value,
+                "title": n.title,
+                "message": n.message,
+                "is_read": n.is_read,
+                "read_at": n.read_at,
+                "created_at": n.created_at,
+                "related_client_id": n.related_client_id,
+                "related_appointment_id": n.related_appointment_id,
+                "related_workout_log_id": n.related_workout_log_id,
+                "client_name": n.client_name or names.get(n.id),
+            }
+            for n in notifications
+        ]
+
+    @staticmethod
+    async def enrich_notification_response(
+        notification: Notification, db: AsyncSession
+    ) -> dict:
+        return (await NotificationService.enrich_notifications([notification], db))[0]
 
     # ==================== DAILY EXERCISE NOTIFICATIONS ====================
 
@@ -297,6 +395,7 @@ class NotificationService:
             title="Daily Workout Completed",
             message=f"{client_name} completed all {exercises_completed} exercises for {day_name}",
             related_client_id=client.id,
+            client_name=client_name,
         )
 
     @staticmethod
@@ -316,4 +415,29 @@ class NotificationService:
             title="Exercise Not Completed",
             message=f"{client_name} could not complete '{exercise_name}': {reason_preview}",
             related_client_id=client.id,
+            client_name=client_name,
         )
+
+    # ==================== ADHERENCE NOTIFICATIONS ====================
+
+    @staticmethod
+    def at_risk_notification(
+        trainer_id: int,
+        client_id: int,
+        client_name: str,
+        recent_miss_rate: float,
+        days_since_workout: int,
+    ) -> dict:
+        """Row for `create_notifications`: a client newly scored high-risk."""
+        if days_since_workout >= 1:
+            last = f"last workout {days_since_workout} day{'s' if days_since_workout != 1 else ''} ago"
+        else:
+            last = "worked out today"
+        return {
+            "user_id": trainer_id,
+            "notification_type": NotificationType.CLIENT_AT_RISK,
+            "title": "Client At Risk",
+            "message": f"{client_name} missed {recent_miss_rate:.0%} of exercises in the last 2 weeks; {last}",
+            "related_client_id": client_id,
+            "client_name": client_name,
+        }
@@ -0,0 +1,239 @@
+"""Nutrition plans and their macro totals.
+
+A plan's `meal_plan` references catalog foods by id with an amount in grams,
+either as one day's meals (`{"meals": [...]}`, repeated daily) or as
+explicit days (`{"days": [{"day": 1, "meals": [...]}, ...]}`). Totals are
+computed for the whole plan at once: the referenced foods' per-100g values
+are read with one IN query, then every item is scaled and summed into its
+meal and day as arrays — with NumPy when it's installed, otherwise in one
+batched pass over the items.
+
+Computed breakdowns are stamped with the plan's `updated_at` and the food
+catalog's `table_version(Food)` (see `app.utils.stamped_cache`). The catalog
+version is read from the database, so an import or edit made through any
+process is seen by all of them.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.http_cache import fetch_version, table_version
+from app.models.nutrition import Food, NutritionPlan
+from app.schemas.nutrition import NutritionPlanCreate, NutritionPlanUpdate
+from app.utils.stamped_cache import StampedCache
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional, batched Python is used instead
+    np = None
+
+NUTRIENTS = ("calories", "protein", "carbs", "fat", "fiber", "sugar", "sodium")
+_PER_100G = [getattr(Food, f"{name}_per_100g") for name in NUTRIENTS]
+# Plan targets, by nutrient
+_TARGETS = {
+    "calories": "daily_calories",
+    "protein": "protein_grams",
+    "carbs": "carbs_grams",
+    "fat": "fat_grams",
+    "fiber": "fiber_grams",
+}
+
+MAX_ENTRIES = 512
+
+_cache: StampedCache[Dict[str, Any]] = StampedCache(MAX_ENTRIES)
+stats = _cache.stats
+
+
+class _Layout:
+    """A meal plan flattened to parallel item/meal/day sequences."""
+
+    def __init__(self, meal_plan: Optional[Dict[str, Any]]) -> None:
+        meal_plan = meal_plan or {}
+        days = meal_plan.get("days")
+        if days is None:
+            days = [{"day": 1, "meals": meal_plan.get("meals") or []}]
+        self.days: List[int] = []
+        self.meals: List[Dict[str, Any]] = []  # name/time per meal
+        self.meal_day: List[int] = []  # day index per meal
+        self.item_food: List[int] = []
+        self.item_grams: List[float] = []
+        self.item_meal: List[int] = []  # meal index per item
+        for day in sorted(days, key=lambda d: d.get("day", 1)):
+            self.days.append(day.get("day", 1))
+            for meal in day.get("meals") or []:
+                self.meals.append({"name": meal.get("name", ""), "time": meal.get("time")})
+                self.meal_day.append(len(self.days) - 1)
+                for food in meal.get("foods") or []:
+                    self.item_food.append(food["food_id"])
+                    self.item_grams.append(float(food.get("grams", 100)))
+                    self.item_meal.append(len(self.meals) - 1)
+
+
+def _sum_numpy(layout: _Layout, per_100g: Dict[int, Sequence[float]]):
+    zeros = (0.0,) * len(NUTRIENTS)
+    values = np.array([per_100g.get(fid, zeros) for fid in layout.item_food], dtype=float)
+    values = values.reshape(len(layout.item_food), len(NUTRIENTS))
+    amounts = values * (np.array(layout.item_grams) / 100.0)[:, None]
+    meal_totals = np.zeros((len(layout.meals), len(NUTRIENTS)))
+    np.add.at(meal_totals, np.array(layout.item_meal, dtype=int), amounts)
+    day_totals = np.zeros((len(layout.days), len(NUTRIENTS)))
+    np.add.at(day_totals, np.array(layout.meal_day, dtype=int), meal_totals)
+    return meal_totals.tolist(), day_totals.tolist()
+
+
+def _sum_batched(layout: _Layout, per_100g: Dict[int, Sequence[float]]):
+    zeros = (0.0,) * len(NUTRIENTS)
+    meal_totals = [[0.0] * len(NUTRIENTS) for _ in layout.meals]
+    for fid, grams, meal in zip(layout.item_food, layout.item_grams, layout.item_meal):
+        factor = grams / 100.0
+        row = meal_totals[meal]
+        for i, value in enumerate(per_100g.get(fid, zeros)):
+            row[i] += value * factor
+    day_totals = [[0.0] * len(NUTRIENTS) for _ in layout.days]
+    for meal, day in zip(meal_totals, layout.meal_day):
+        row = day_totals[day]
+        for i, value in enumerate(meal):
+            row[i] += value
+    return meal_totals, day_totals
+
+
+def _totals(values: Sequence[float]) -> Dict[str, float]:
+    return {name: round(value, 1) for name, value in zip(NUTRIENTS, values)}
+
+
+def compute_macros(
+    plan: NutritionPlan, per_100g: Dict[int, Sequence[float]]
+) -> Dict[str, Any]:
+    """The plan's per-meal, per-day and average totals (no I/O)."""
+    layout = _Layout(plan.meal_plan)
+    summed = _sum_numpy if np is not None else _sum_batched
+    meal_totals, day_totals = summed(layout, per_100g) if layout.item_food else (
+        [[0.0] * len(NUTRIENTS) for _ in layout.meals],
+        [[0.0] * len(NUTRIENTS) for _ in layout.days],
+    )
+
+    targets = {
+        nutrient: getattr(plan, column)
+        for nutrient, column in _TARGETS.items()
+        if getattr(plan, column)
+    }
+    days = []
+    for index, day in enumerate(layout.days):
+        totals = _totals(day_totals[index])
+        days.append(
+            {
+                "day": day,
+                "totals": totals,
+                "meals": [
+                    {**layout.meals[m], "totals": _totals(meal_totals[m])}
+                    for m, meal_day in enumerate(layout.meal_day)
+                    if meal_day == index
+                ],
+                "target_pct": {
+                    nutrient: round(totals[nutrient] / target * 100, 1)
+                    for nutrient, target in targets.items()
+                },
+            }
+        )
+    count = max(len(layout.days), 1)
+    average = [sum(day[i] for day in day_totals) / count for i in range(len(NUTRIENTS))]
+    return {
+        "plan_id": plan.id,
+        "days": days,
+        "daily_average": _totals(average),
+        "missing_food_ids": sorted(set(layout.item_food) - per_100g.keys()),
+    }
+
+
+async def food_values(db: AsyncSession, food_ids) -> Dict[int, Tuple[float, ...]]:
+    """Per-100g values for each id, in `NUTRIENTS` order (NULL as 0)."""
+    food_ids = set(food_ids)
+    if not food_ids:
+        return {}
+    rows = await db.execute(select(Food.id, *_PER_100G).where(Food.id.in_(food_ids)))
+    return {row[0]: tuple(value or 0.0 for value in row[1:]) for row in rows.all()}
+
+
+def invalidate(plan_id: Optional[int] = None) -> None:
+    """Forget one plan's breakdown, or everything when no id is given."""
+    _cache.invalidate(plan_id)
+
+
+class NutritionService:
+    @staticmethod
+    async def create_plan(
+        db: AsyncSession, plan_data: NutritionPlanCreate, trainer_id: int
+    ) -> NutritionPlan:
+        values = plan_data.dict()
+        if plan_data.meal_plan is not None:
+            values["meal_plan"] = plan_data.meal_plan.dict(exclude_none=True)
+        plan = NutritionPlan(trainer_id=trainer_id, **values)
+        db.add(plan)
+        await db.commit()
+        await db.refresh(plan)
+        return plan
+
+    @staticmethod
+    async def get_plan(
+        db: AsyncSession, plan_id: int, trainer_id: Optional[int] = None
+    ) -> Optional[NutritionPlan]:
+        stmt = select(NutritionPlan).where(NutritionPlan.id == plan_id)
+        if trainer_id is not None:
+            stmt = stmt.where(NutritionPlan.trainer_id == trainer_id)
+        return (await db.execute(stmt)).scalar_one_or_none()
+
+    @staticmethod
+    async def get_plans(
+        db: AsyncSession,
+        trainer_id: int,
+        client_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[NutritionPlan]:
+        stmt = select(NutritionPlan).where(
+            NutritionPlan.trainer_id == trainer_id, NutritionPlan.is_active.is_(True)
+        )
+        if client_id is not None:
+            stmt = stmt.where(NutritionPlan.client_id == client_id)
+        stmt = stmt.order_by(NutritionPlan.id).offset(skip).limit(limit)
+        return list((await db.execute(stmt)).scalars().all())
+
+    @staticmethod
+    async def update_plan(
+        db: AsyncSession, plan_id: int, plan_data: NutritionPlanUpdate, trainer_id: int
+    ) -> Optional[NutritionPlan]:
+        plan = await NutritionService.get_plan(db, plan_id, trainer_id)
+        if not plan:
+            return None
+        for field, value in plan_data.dict(exclude_unset=True).items():
+            if field == "meal_plan" and value is not None:
+                value = plan_data.meal_plan.dict(exclude_none=True)
+            setattr(plan, field, value)
+        await db.commit()
+        invalidate(plan_id)
+        await db.refresh(plan)
+        return plan
+
+    @staticmethod
+    async def delete_plan(db: AsyncSession, plan_id: int, trainer_id: int) -> bool:
+        plan = await NutritionService.get_plan(db, plan_id, trainer_id)
+        if not plan:
+            return False
+        plan.is_active = False
+        await db.commit()
+        invalidate(plan_id)
+        return True
+
+    @staticmethod
+    async def get_macros(db: AsyncSession, plan: NutritionPlan) -> Dict[str, Any]:
+        """The plan's macro breakdown: the catalog version, plus one food
+        query on a miss."""
+        stamp = (plan.updated_at, await fetch_version(db, *table_version(Food)))
+        cached = _cache.get(plan.id, stamp)
+        if cached is not None:
+            return cached
+
+        layout_foods = _Layout(plan.meal_plan).item_food
+        breakdown = compute_macros(plan, await food_values(db, layout_foods))
+        return _cache.put(plan.id, stamp, breakdown)
@@ -0,0 +1,232 @@
+"""Progressive overload: next week's prescriptions from the last session.
+
+Weekly rows are generated with the workout structure's static sets, reps
+and weight. As each week comes up (`rollover`, run by the weekly-horizon
+job for the whole roster), its pending rows are re-prescribed from the
+client's latest session of the exercise (`exercise_latest_performances`),
+by the exercise's `progression` rule in the structure, else
+PROGRESSION_DEFAULT_RULE:
+
+  double  with a rep range such as "8-12", once every set at the top weight
+          reached 12 (and as many sets were done as prescribed), add
+          `increment_kg`; otherwise repeat that weight
+  rpe     move the top weight ~4% per point the session's RPE was under
+          (or over) `target_rpe`
+  e1rm    `percent_e1rm` (or the structure's "80%" weight) of the best e1RM;
+          without one, the Epley weight for the bottom of the rep range
+  none    keep the structure's prescription
+
+Loads are rounded to `increment_kg` and written as "62.5kg". Rows with no
+loaded history for the exercise are left as generated, and so are rows
+that no longer carry the structure's prescription: already progressed, or
+edited by the trainer. The run is three statements whatever the roster
+size (rows with their latest performance, the programs' structures, one
+executemany UPDATE) plus the affected schedule documents' rebuild.
+
+    python -m app.services.overload_service [--client-id N]
+"""
+import argparse
+import asyncio
+import logging
+import math
+import re
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.program import Program
+from app.models.program_assignment import AssignmentStatus, ProgramAssignment
+from app.models.weekly_exercise import WeeklyExerciseAssignment, WeeklyExerciseStatus
+from app.models.workout_tracking import ExerciseLatestPerformance
+
+logger = logging.getLogger(__name__)
+
+WINDOW_DAYS = 7  # Rows due this many days from the run are "next week"
+PERCENT_PER_RPE = 0.04
+
+_RANGE = re.compile(r"^\s*(\d+)\s*(?:-\s*(\d+))?\s*$")
+_PERCENT = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*%\s*$")
+
+# (sets, top_weight_kg, reps_at_top, best_e1rm, rpe) from exercise_latest_performances
+Performance = Tuple[int, float, int, float, Optional[int]]
+
+
+@dataclass(frozen=True)
+class Rule:
+    kind: str
+    increment_kg: float
+    target_rpe: float
+    percent_e1rm: Optional[float] = None
+
+    @classmethod
+    def for_exercise(cls, exercise_data: dict) -> "Rule":
+        """The structure entry's `progression`, filled in from settings."""
+        own = exercise_data.get("progression") or {}
+        return cls(
+            kind=own.get("rule") or settings.progression_default_rule,
+            increment_kg=own.get("increment_kg") or settings.progression_increment_kg,
+            target_rpe=own.get("target_rpe") or settings.progression_target_rpe,
+            percent_e1rm=own.get("percent_e1rm"),
+        )
+
+
+def rep_range(reps: str) -> Optional[Tuple[int, int]]:
+    """(low, high) for "8-12", (10, 10) for "10"; None for "to failure"."""
+    match = _RANGE.match(str(reps))
+    if not match:
+        return None
+    low = int(match.group(1))
+    return low, int(match.group(2) or low)
+
+
+def planned(exercise_data: dict) -> Tuple[int, str, str]:
+    """(sets, reps, weight) as `build_weekly_exercises` writes them."""
+    return (
+        exercise_data.get("sets", 3),
+        exercise_data.get("reps", "10"),
+        exercise_data.get("weight", "bodyweight"),
+    )
+
+
+def _kg(value: float) -> str:
+    return f"{round(value, 2):g}kg"
+
+
+def prescribe(exercise_data: dict, performance: Performance, rule: Rule) -> Optional[str]:
+    """The next weight for a structure entry after `performance` (no I/O);
+    None when the rule doesn't apply."""
+    sets, top, reps_at_top, e1rm, rpe = performance
+    step = rule.increment_kg
+    planned_sets, reps, weight = planned(exercise_data)
+    target = rep_range(reps)
+
+    if rule.kind == "double":
+        if target is None:
+            return None
+        done = reps_at_top >= target[1] and sets >= planned_sets
+        load = round(top / step) * step + (step if done else 0)
+    elif rule.kind == "rpe":
+        change = PERCENT_PER_RPE * (rule.target_rpe - rpe) if rpe is not None else 0.0
+        load = round(top * (1 + change) / step) * step
+    elif rule.kind == "e1rm":
+        percent = rule.percent_e1rm
+        if percent is None and _PERCENT.match(str(weight)):
+            percent = float(_PERCENT.match(str(weight)).group(1))
+        if percent is not None:
+            raw = e1rm * percent / 100
+        elif target is not None:
+            raw = e1rm / (1 + target[0] / 30) if target[0] > 1 else e1rm
+        else:
+            return None
+        load = math.floor(raw / step) * step
+    else:
+        return None
+    return _kg(max(load, step))
+
+
+def _structure_entry(structure, day_number: int, exercise_order: int) -> Optional[dict]:
+    # Entries sharing a day number continue its exercise order (as generated)
+    exercises = [
+        exercise
+        for day in structure or ()
+        if day.get("day", 1) == day_number
+        for exercise in day.get("exercises", [])
+    ]
+    return exercises[exercise_order - 1] if 0 < exercise_order <= len(exercises) else None
+
+
+class OverloadService:
+
+    @staticmethod
+    async def rollover(
+        db: AsyncSession, on: Optional[date] = None, client_id: Optional[int] = None
+    ) -> int:
+        """Re-prescribe the pending rows due in the week from `on` (default
+        today) — one client's, or every active assignment's — and rebuild
+        their schedule documents. Leaves the commit to the caller; returns
+        the number of rows changed."""
+        on = on or date.today()
+        w, latest, pa = WeeklyExerciseAssignment, ExerciseLatestPerformance, ProgramAssignment
+        stmt = (
+            select(
+                w.id,
+                w.client_id,
+                w.due_date,
+                w.day_number,
+                w.exercise_order,
+                w.sets,
+                w.reps,
+                w.weight,
+                pa.program_id,
+                latest.sets.label("sets_done"),
+                latest.top_weight_kg,
+                latest.reps_at_top,
+                latest.best_e1rm,
+                latest.rpe,
+            )
+            .join(pa, pa.id == w.program_assignment_id)
+            .join(latest, and_(latest.client_id == w.client_id, latest.exercise_id == w.exercise_id))
+            .where(
+                pa.status == AssignmentStatus.ACTIVE,
+                w.status == WeeklyExerciseStatus.PENDING,
+                w.due_date >= on,
+                w.due_date < on + timedelta(days=WINDOW_DAYS),
+            )
+        )
+        if client_id is not None:
+            stmt = stmt.where(w.client_id == client_id)
+        rows = (await db.execute(stmt)).all()
+        if not rows:
+            return 0
+
+        structures = dict(
+            (
+                await db.execute(
+                    select(Program.id, Program.workout_structure).where(
+                        Program.id.in_({row.program_id for row in rows})
+                    )
+                )
+            ).all()
+        )
+        updates: List[Dict] = []
+        due: Dict[int, List[date]] = {}
+        for row in rows:
+            entry = _structure_entry(structures.get(row.program_id), row.day_number, row.exercise_order)
+            # Already progressed, or edited by the trainer
+            if entry is None or (row.sets, row.reps, row.weight) != planned(entry):
+                continue
+            weight = prescribe(entry, tuple(row[-5:]), Rule.for_exercise(entry))
+            if weight is None or weight == row.weight:
+                continue
+            updates.append({"id": row.id, "weight": weight})
+            due.setdefault(row.client_id, []).append(row.due_date)
+
+        if updates:
+            await db.execute(update(WeeklyExerciseAssignment), updates)
+            from app.services.schedule_document_service import ScheduleDocumentService
+
+            days = [day for days in due.values() for day in days]
+            await ScheduleDocumentService.refresh(db, due, min(days), max(days))
+            logger.info(f"Progressed {len(updates)} weekly exercise prescriptions")
+        return len(updates)
+
+
+async def _main(client_id: Optional[int]) -> None:
+    import app.models  # noqa: F401 — register every mapper before querying
+    from app.core.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        progressed = await OverloadService.rollover(db, client_id=client_id)
+        await db.commit()
+    print(f"Progressed {progressed} prescriptions")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Progress next week's prescriptions")
+    parser.add_argument("--client-id", type=int)
+    args = parser.parse_args()
+    asyncio.run(_main(args.client_id))
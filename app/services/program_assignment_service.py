@@ -5,7 +5,7 @@ from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.client import Client
-from app.models.program import Exercise, Program
+from app.models.program import Program
 from app.models.program_assignment import AssignmentStatus, ProgramAssignment
 from app.schemas.program_assignment import (
     BulkAssignmentCreate,
@@ -13,6 +13,7 @@ from app.schemas.program_assignment import (
     ProgramAssignmentUpdate,
     ProgressUpdate,
 )
+from app.services import program_structure_cache
 
 logger = logging.getLogger(__name__)
 
@@ -84,9 +85,11 @@ class ProgramAssignmentService:
         try:
             from app.services.weekly_exercise_service import WeeklyExerciseService
 
-            await WeeklyExerciseService.generate_weekly_exercises_from_assignment(
-                db, assignment
-            )
+            if await WeeklyExerciseService.generate_weekly_exercises_from_assignment(
+                db, assignment, program=program
+            ):
+                # generated_weeks was written; re-read the row's server values.
+                await db.refresh(assignment)
         except Exception as e:
             logger.warning(
                 f"Failed to generate weekly exercises for assignment {assignment.id}: {e}"
@@ -195,74 +198,93 @@ class ProgramAssignmentService:
         if not program:
             raise ValueError("Program not found or access denied")
 
-        assignments: List[ProgramAssignment] = []
-        errors: List[str] = []
+        from app.services.schedule_document_service import ScheduleDocumentService
+        from app.services.weekly_exercise_service import WeeklyExerciseService
 
-        for client_id in bulk_data.client_ids:
-            try:
-                client = (
-                    await db.execute(
-                        select(Client).where(
-                            and_(Client.id == client_id, Client.trainer_id == trainer_id)
-                        )
+        client_ids = list(dict.fromkeys(bulk_data.client_ids))
+        clients = {
+            c.id: c
+            for c in (
+                await db.execute(
+                    select(Client).where(
+                        and_(Client.id.in_(client_ids), Client.trainer_id == trainer_id)
                     )
-                ).scalar_one_or_none()
-                if not client:
-                    errors.append(f"Client {client_id} not found or access denied")
-                    continue
-
-                existing = (
+                )
+            ).scalars().all()
+        }
+        already_active: set[int] = set()
+        if clients:
+            already_active = set(
+                (
                     await db.execute(
-                        select(ProgramAssignment).where(
+                        select(ProgramAssignment.client_id).where(
                             and_(
-                                ProgramAssignment.client_id == client_id,
+                                ProgramAssignment.client_id.in_(list(clients)),
                                 ProgramAssignment.status == AssignmentStatus.ACTIVE,
                             )
                         )
                     )
-                ).scalar_one_or_none()
-                if existing:
-                    errors.append(
-                        f"Client {client.first_name} {client.last_name} already has an active program assignment"
-                    )
-                    continue
-
-                total_sessions = None
-                if program.duration_weeks and program.sessions_per_week:
-                    total_sessions = program.duration_weeks * program.sessions_per_week
-
-                assignment = ProgramAssignment(
-                    program_id=bulk_data.program_id,
-                    client_id=client_id,
-                    trainer_id=trainer_id,
-                    start_date=bulk_data.start_date,
-                    custom_notes=bulk_data.custom_notes,
-                    total_sessions=total_sessions,
-                )
-                db.add(assignment)
-                await db.flush()
+                ).scalars().all()
+            )
 
-                try:
-                    from app.services.weekly_exercise_service import WeeklyExerciseService
+        total_sessions = None
+        if program.duration_weeks and program.sessions_per_week:
+            total_sessions = program.duration_weeks * program.sessions_per_week
 
-                    await WeeklyExerciseService.generate_weekly_exercises_from_assignment(
-                        db, assignment
-                    )
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to generate weekly exercises for assignment {assignment.id}: {e}"
-                    )
+        assignments: List[ProgramAssignment] = []
+        errors: List[str] = []
+        seen: set[int] = set()
 
-                assignments.append(assignment)
-            except Exception as e:
-                errors.append(f"Error assigning to client {client_id}: {e}")
+        for client_id in bulk_data.client_ids:
+            client = clients.get(client_id)
+            if not client:
+                errors.append(f"Client {client_id} not found or access denied")
                 continue
+            if client_id in already_active or client_id in seen:
+                errors.append(
+                    f"Client {client.first_name} {client.last_name} already has an active program assignment"
+                )
+                continue
+            seen.add(client_id)
+
+            assignment = ProgramAssignment(
+                program_id=bulk_data.program_id,
+                client_id=client_id,
+                trainer_id=trainer_id,
+                start_date=bulk_data.start_date,
+                custom_notes=bulk_data.custom_notes,
+                total_sessions=total_sessions,
+            )
+            db.add(assignment)
+            assignments.append(assignment)
 
         if assignments:
             try:
-                await db.commit()
+                # One flush assigns every id; the weekly rows then go out
+                # with the same commit instead of one commit per client.
+                await db.flush()
+                generated = []
                 for assignment in assignments:
-                    await db.refresh(assignment)
+                    generated += await WeeklyExerciseService.generate_weekly_exercises_from_assignment(
+                        db, assignment, program=program, commit=False, materialize=False
+                    )
+                if generated:
+                    due_dates = [ex.due_date for ex in generated]
+                    await ScheduleDocumentService.refresh(
+                        db,
+                        [a.client_id for a in assignments],
+                        min(due_dates),
+                        max(due_dates),
+                    )
+                await db.commit()
+                ids = [a.id for a in assignments]
+                result = await db.execute(
+                    select(ProgramAssignment)
+                    .where(ProgramAssignment.id.in_(ids))
+                    .execution_options(populate_existing=True)
+                )
+                by_id = {a.id: a for a in result.scalars().all()}
+                assignments = [by_id[i] for i in ids]
             except Exception as e:
                 await db.rollback()
                 raise ValueError(f"Failed to save assignments: {e}")
@@ -291,33 +313,7 @@ class ProgramAssignmentService:
     ) -> List[Dict[str, Any]]:
         if not workout_structure:
             return workout_structure
-
-        exercise_ids: set[int] = set()
-        for day in workout_structure:
-            for exercise in day.get("exercises", []):
-                if "exercise_id" in exercise:
-                    exercise_ids.add(exercise["exercise_id"])
-
-        if exercise_ids:
-            stmt = select(Exercise.id, Exercise.name).where(Exercise.id.in_(exercise_ids))
-            rows = (await db.execute(stmt)).all()
-            exercise_name_map = {row.id: row.name for row in rows}
-        else:
-            exercise_name_map = {}
-
-        enhanced_structure: List[Dict[str, Any]] = []
-        for day in workout_structure:
-            enhanced_day = day.copy()
-            if "exercises" in enhanced_day:
-                enhanced_exercises = []
-                for exercise in enhanced_day["exercises"]:
-                    enhanced_exercise = exercise.copy()
-                    if "exercise_id" in enhanced_exercise:
-                        eid = enhanced_exercise["exercise_id"]
-                        enhanced_exercise["exercise_name"] = exercise_name_map.get(
-                            eid, f"Exercise {eid}"
-                        )
-                    enhanced_exercises.append(enhanced_exercise)
-                enhanced_day["exercises"] = enhanced_exercises
-            enhanced_structure.append(enhanced_day)
-        return enhanced_structure
+        names = await program_structure_cache.exercise_names(
+            db, program_structure_cache.exercise_ids(workout_structure)
+        )
+        return program_structure_cache.expand(workout_structure, names)
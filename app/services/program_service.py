@@ -1,12 +1,53 @@
 import json
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from sqlalchemy import and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from app.models.program import Program
+from app.models.program_assignment import ProgramAssignment
+from app.models.weekly_exercise import WeeklyExerciseAssignment
 from app.schemas.program import ProgramCreate, ProgramUpdate
+from app.services import program_structure_cache
+from app.services.schedule_document_service import ScheduleDocumentService
+from app.utils.fields import FieldSet, select_columns
+
+# Fields a program listing can return with `?fields=` (the `Program` schema).
+PROGRAM_FIELDS = {
+    column: getattr(Program, column)
+    for column in (
+        "id",
+        "trainer_id",
+        "name",
+        "description",
+        "program_type",
+        "difficulty_level",
+        "duration_weeks",
+        "sessions_per_week",
+        "workout_structure",
+        "tags",
+        "equipment_needed",
+        "is_template",
+        "is_active",
+        "created_at",
+        "updated_at",
+    )
+}
+# What `ProgramList` renders; the default listing loads nothing else, so the
+# workout_structure JSON and long text columns stay in the database.
+_LIST_COLUMNS = (
+    Program.id,
+    Program.name,
+    Program.program_type,
+    Program.difficulty_level,
+    Program.duration_weeks,
+    Program.sessions_per_week,
+    Program.is_template,
+    Program.is_active,
+    Program.created_at,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -60,18 +101,52 @@ class ProgramService:
         difficulty_level: Optional[str] = None,
         is_template: Optional[bool] = None,
     ) -> List[Program]:
-        stmt = select(Program).where(
-            and_(Program.trainer_id == trainer_id, Program.is_active.is_(True))
+        stmt = ProgramService._listing(
+            select(Program).options(load_only(*_LIST_COLUMNS)),
+            trainer_id,
+            program_type,
+            difficulty_level,
+            is_template,
+        )
+        result = await db.execute(stmt.offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def get_program_fields(
+        db: AsyncSession,
+        trainer_id: int,
+        fields: FieldSet,
+        skip: int = 0,
+        limit: int = 100,
+        program_type: Optional[str] = None,
+        difficulty_level: Optional[str] = None,
+        is_template: Optional[bool] = None,
+    ) -> List[Dict[str, Any]]:
+        """The listing as plain dicts holding only `fields` (sparse fieldset)."""
+        stmt = ProgramService._listing(
+            select(*select_columns(fields, PROGRAM_FIELDS)),
+            trainer_id,
+            program_type,
+            difficulty_level,
+            is_template,
         )
+        rows = [dict(row) for row in (await db.execute(stmt.offset(skip).limit(limit))).mappings()]
+        for row in rows:
+            # Stored as JSON text; the Program schema exposes a list.
+            if row.get("equipment_needed"):
+                row["equipment_needed"] = json.loads(row["equipment_needed"])
+        return rows
+
+    @staticmethod
+    def _listing(stmt, trainer_id, program_type, difficulty_level, is_template):
+        stmt = stmt.where(and_(Program.trainer_id == trainer_id, Program.is_active.is_(True)))
         if program_type:
             stmt = stmt.where(Program.program_type == program_type)
         if difficulty_level:
             stmt = stmt.where(Program.difficulty_level == difficulty_level)
         if is_template is not None:
             stmt = stmt.where(Program.is_template == is_template)
-
-        result = await db.execute(stmt.offset(skip).limit(limit))
-        return list(result.scalars().all())
+        return stmt.order_by(Program.id)
 
     @staticmethod
     async def update_program(
@@ -92,7 +167,16 @@ class ProgramService:
                 value = json.dumps(value)
             setattr(program, field, value)
 
+        if "name" in program_data.dict(exclude_unset=True):
+            # Stored weekly schedules show the program name.
+            await ScheduleDocumentService.invalidate(
+                db,
+                WeeklyExerciseAssignment.program_assignment_id.in_(
+                    select(ProgramAssignment.id).where(ProgramAssignment.program_id == program_id)
+                ),
+            )
         await db.commit()
+        program_structure_cache.invalidate(program_id)
         await db.refresh(program)
         return program
 
@@ -0,0 +1,122 @@
+"""Expanded program structures, memoized per program version.
+
+An assignment listing shows each program's `workout_structure` with exercise
+names filled in. Hundreds of assignments usually share a handful of programs,
+so the expansion is done once per program version and reused across
+assignments and across requests. Exercise names for every program missing
+from the cache are resolved with a single IN query.
+
+Entries are stamped with the program's `updated_at` and the exercise
+library's `table_version(Exercise)` (see `app.utils.stamped_cache`), read
+once per listing, so an exercise renamed or deleted through any process
+misses in every one.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.http_cache import fetch_version, table_version
+from app.core.readiness import on_warmup
+from app.models.program import Exercise, Program
+from app.models.program_assignment import AssignmentStatus, ProgramAssignment
+from app.utils.stamped_cache import StampedCache
+
+MAX_ENTRIES = 1024
+
+Structure = List[Dict[str, Any]]
+
+_cache: StampedCache[Structure] = StampedCache(MAX_ENTRIES)
+stats = _cache.stats
+
+
+def exercise_ids(structure: Optional[Structure]) -> set:
+    return {
+        exercise["exercise_id"]
+        for day in structure or []
+        for exercise in day.get("exercises", [])
+        if "exercise_id" in exercise
+    }
+
+
+def expand(structure: Optional[Structure], names: Dict[int, str]) -> Structure:
+    """Copy `structure` with `exercise_name` set on every referenced exercise."""
+    if not structure:
+        return structure or []
+    expanded: Structure = []
+    for day in structure:
+        day = day.copy()
+        if "exercises" in day:
+            exercises = []
+            for exercise in day["exercises"]:
+                exercise = exercise.copy()
+                if "exercise_id" in exercise:
+                    eid = exercise["exercise_id"]
+                    exercise["exercise_name"] = names.get(eid, f"Exercise {eid}")
+                exercises.append(exercise)
+            day["exercises"] = exercises
+        expanded.append(day)
+    return expanded
+
+
+async def exercise_names(db: AsyncSession, ids: Iterable[int]) -> Dict[int, str]:
+    ids = set(ids)
+    if not ids:
+        return {}
+    rows = await db.execute(select(Exercise.id, Exercise.name).where(Exercise.id.in_(ids)))
+    return {row.id: row.name for row in rows.all()}
+
+
+async def get_structures(db: AsyncSession, programs: Iterable[Program]) -> Dict[int, Structure]:
+    """Expanded structure per program id: the exercise library's version,
+    plus one query for all misses."""
+    programs = list(programs)
+    if not programs:
+        return {}
+    library = await fetch_version(db, *table_version(Exercise))
+    result: Dict[int, Structure] = {}
+    missing: Dict[int, Program] = {}
+    for program in programs:
+        if program.id in result or program.id in missing:
+            continue
+        cached = _cache.get(program.id, (program.updated_at, library))
+        if cached is not None:
+            result[program.id] = cached
+        else:
+            missing[program.id] = program
+
+    if missing:
+        names = await exercise_names(
+            db, set().union(*(exercise_ids(p.workout_structure) for p in missing.values()))
+        )
+        for program_id, program in missing.items():
+            result[program_id] = _cache.put(
+                program_id, (program.updated_at, library), expand(program.workout_structure, names)
+            )
+    return result
+
+
+def invalidate(program_id: Optional[int] = None) -> None:
+    """Forget one program's expansion, or everything when no id is given."""
+    _cache.invalidate(program_id)
+
+
+@on_warmup
+async def prime(engine: AsyncEngine) -> None:
+    """Expand every program that has an active assignment before serving."""
+    async with AsyncSession(engine) as db:
+        programs = (
+            await db.execute(
+                select(Program)
+                .where(
+                    Program.id.in_(
+                        select(ProgramAssignment.program_id).where(
+                            ProgramAssignment.status == AssignmentStatus.ACTIVE
+                        )
+                    )
+                )
+                .order_by(Program.updated_at.desc().nulls_last())
+                .limit(MAX_ENTRIES)
+            )
+        ).scalars().all()
+        await get_structures(db, programs)
@@ -0,0 +1,328 @@
+"""Strength progression per exercise: estimated 1RM, best set and volume.
+
+`ExerciseLog.actual_sets` is free-text JSON ("60kg", "135 lbs", "8-12"), so
+each log's loaded sets are parsed once, when the log is written, into
+`exercise_log_sets` (reps, kg and an Epley e1RM per set), indexed by
+(client, exercise, time). Only logs that reference a catalog exercise are
+indexed; bodyweight and percentage loads carry no absolute weight.
+
+A chart is one statement of window functions over those rows:
+
+  sessions    sets grouped by day: best e1RM, the set that produced it
+              (row_number over the day) and tonnage
+  timeline    running best e1RM over all history, and whether each
+              session beat every earlier one (a PR)
+  buckets     with `points`, ntile() spreads the sessions in range over at
+              most that many buckets; each reports its best session
+
+Writers call `index()`: workout logging and imports for new logs,
+`update_exercise_log` (with `replace=True`) when sets change. It also
+recomputes `exercise_latest_performances`, each (client, exercise)'s most
+recent session, which next week's prescriptions build on
+(`app.services.overload_service`). Existing logs are indexed with:
+
+    python -m app.services.progression_service [--client-id N]
+"""
+import argparse
+import asyncio
+from datetime import date, datetime, time, timedelta
+from typing import Any, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import Date, case, delete, distinct, func, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.program import Exercise
+from app.models.workout_tracking import (
+    ExerciseLatestPerformance,
+    ExerciseLog,
+    ExerciseLogSet,
+    WorkoutLog,
+)
+from app.schemas.analytics import ExerciseProgression, ExerciseProgressionSummary, ProgressionPoint
+from app.utils.units import loaded_sets
+
+CHUNK = 500  # Exercise logs per backfill batch
+
+# (exercise_log_id, client_id, exercise_id, performed_at, actual_sets)
+LogEntry = Tuple[int, int, Optional[int], datetime, Any]
+
+
+def epley(reps: int, kg: float) -> float:
+    return kg if reps == 1 else kg * (1 + reps / 30)
+
+
+def set_rows(entries: Iterable[LogEntry]) -> List[dict]:
+    return [
+        {
+            "exercise_log_id": log_id,
+            "set_number": position,
+            "client_id": client_id,
+            "exercise_id": exercise_id,
+            "performed_at": performed_at,
+            "reps": reps,
+            "weight_kg": round(kg, 2),
+            "e1rm": round(epley(reps, kg), 2),
+        }
+        for log_id, client_id, exercise_id, performed_at, actual_sets in entries
+        if exercise_id is not None
+        for position, reps, kg in loaded_sets(actual_sets)
+    ]
+
+
+class ProgressionService:
+
+    @staticmethod
+    async def index(db: AsyncSession, entries: Iterable[LogEntry], replace: bool = False) -> int:
+        """Write the parsed sets of these exercise logs (no commit).
+
+        `replace` first clears what was indexed for them, for edited logs.
+        The clients' latest performances of the exercises are recomputed.
+        """
+        entries = list(entries)
+        if replace and entries:
+            await db.execute(
+                delete(ExerciseLogSet).where(
+                    ExerciseLogSet.exercise_log_id.in_([entry[0] for entry in entries])
+                )
+            )
+        rows = set_rows(entries)
+        if rows:
+            await db.execute(insert(ExerciseLogSet), rows)
+        await ProgressionService.refresh_latest(
+            db, {(entry[1], entry[2]) for entry in entries if entry[2] is not None}
+        )
+        return len(rows)
+
+    @staticmethod
+    async def refresh_latest(db: AsyncSession, pairs: Optional[Set[Tuple[int, int]]] = None) -> int:
+        """Recompute the latest session of these (client, exercise) pairs, or
+        of all of them, from the indexed sets (no commit)."""
+        if pairs is not None and not pairs:
+            return 0
+        s, latest = ExerciseLogSet, ExerciseLatestPerformance
+        partition = (s.client_id, s.exercise_id)
+        sessions = (
+            select(
+                s.client_id,
+                s.exercise_id,
+                s.exercise_log_id,
+                s.performed_at,
+                s.reps,
+                s.weight_kg,
+                s.e1rm,
+                WorkoutLog.perceived_exertion.label("rpe"),
+                func.max(s.performed_at).over(partition_by=partition).label("last"),
+            )
+            .join(ExerciseLog, ExerciseLog.id == s.exercise_log_id)
+            .join(WorkoutLog, WorkoutLog.id == ExerciseLog.workout_log_id)
+        )
+        clear = delete(latest)
+        if pairs is not None:
+            sessions = sessions.where(tuple_(*partition).in_(pairs))
+            clear = clear.where(tuple_(latest.client_id, latest.exercise_id).in_(pairs))
+        sessions = sessions.subquery()
+
+        last = (
+            select(
+                sessions,
+                func.max(sessions.c.weight_kg)
+                .over(partition_by=(sessions.c.client_id, sessions.c.exercise_id))
+                .label("top"),
+            )
+            .where(sessions.c.performed_at == sessions.c.last)
+            .subquery()
+        )
+        summary = select(
+            last.c.client_id,
+            last.c.exercise_id,
+            func.max(last.c.exercise_log_id),
+            func.max(last.c.performed_at),
+            func.count(),
+            func.max(last.c.top),
+            func.min(case((last.c.weight_kg == last.c.top, last.c.reps))),
+            func.max(last.c.e1rm),
+            func.max(last.c.rpe),
+        ).group_by(last.c.client_id, last.c.exercise_id)
+
+        await db.execute(clear)
+        result = await db.execute(
+            insert(latest).from_select(
+                [
+                    "client_id",
+                    "exercise_id",
+                    "exercise_log_id",
+                    "performed_at",
+                    "sets",
+                    "top_weight_kg",
+                    "reps_at_top",
+                    "best_e1rm",
+                    "rpe",
+                ],
+                summary,
+            )
+        )
+        return result.rowcount
+
+    @staticmethod
+    async def backfill(db: AsyncSession, client_id: Optional[int] = None) -> int:
+        """Re-index every exercise log (one client's), in id order; commits per batch."""
+        indexed, after = 0, 0
+        while True:
+            stmt = (
+                select(
+                    ExerciseLog.id,
+                    WorkoutLog.client_id,
+                    ExerciseLog.exercise_id,
+                    WorkoutLog.workout_date,
+                    ExerciseLog.actual_sets,
+                )
+                .join(WorkoutLog, WorkoutLog.id == ExerciseLog.workout_log_id)
+                .where(ExerciseLog.id > after)
+                .order_by(ExerciseLog.id)
+                .limit(CHUNK)
+            )
+            if client_id is not None:
+                stmt = stmt.where(WorkoutLog.client_id == client_id)
+            batch = [tuple(row) for row in await db.execute(stmt)]
+            if not batch:
+                return indexed
+            indexed += await ProgressionService.index(db, batch, replace=True)
+            await db.commit()
+            after = batch[-1][0]
+
+    @staticmethod
+    async def exercises(db: AsyncSession, client_id: int) -> List[ExerciseProgressionSummary]:
+        """Every exercise the client has loaded sets for, most recent first."""
+        s = ExerciseLogSet
+        stmt = (
+            select(
+                s.exercise_id,
+                Exercise.name,
+                func.count(distinct(func.date(s.performed_at))),
+                func.max(s.e1rm),
+                func.max(s.weight_kg),
+                func.min(s.performed_at),
+                func.max(s.performed_at),
+            )
+            .join(Exercise, Exercise.id == s.exercise_id)
+            .where(s.client_id == client_id)
+            .group_by(s.exercise_id, Exercise.name)
+            .order_by(func.max(s.performed_at).desc())
+        )
+        return [
+            ExerciseProgressionSummary(
+                exercise_id=exercise_id,
+                exercise_name=name,
+                sessions=sessions,
+                best_e1rm=best,
+                top_weight=top,
+                first_session=first.date(),
+                last_session=last.date(),
+            )
+            for exercise_id, name, sessions, best, top, first, last in await db.execute(stmt)
+        ]
+
+    @staticmethod
+    async def series(
+        db: AsyncSession,
+        client_id: int,
+        exercise_id: int,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        points: Optional[int] = None,
+    ) -> ExerciseProgression:
+        """Per-session points in [start, end], or at most `points` buckets."""
+        s = ExerciseLogSet
+        day = func.date(s.performed_at, type_=Date)
+        ranked = select(
+            day.label("day"),
+            s.reps,
+            s.weight_kg,
+            s.e1rm,
+            func.row_number()
+            .over(partition_by=day, order_by=(s.e1rm.desc(), s.weight_kg.desc()))
+            .label("rank"),
+        ).where(s.client_id == client_id, s.exercise_id == exercise_id)
+        if end is not None:
+            ranked = ranked.where(s.performed_at < datetime.combine(end + timedelta(days=1), time.min))
+        ranked = ranked.subquery()
+
+        top = ranked.c.rank == 1
+        sessions = (
+            select(
+                ranked.c.day,
+                func.max(ranked.c.e1rm).label("e1rm"),
+                func.max(case((top, ranked.c.reps))).label("best_reps"),
+                func.max(case((top, ranked.c.weight_kg))).label("best_weight"),
+                func.sum(ranked.c.reps * ranked.c.weight_kg).label("volume"),
+            )
+            .group_by(ranked.c.day)
+            .subquery()
+        )
+
+        # Over all history, so a range still knows the best before it
+        earlier = func.max(sessions.c.e1rm).over(order_by=sessions.c.day, rows=(None, -1))
+        timeline = select(
+            sessions,
+            func.max(sessions.c.e1rm).over(order_by=sessions.c.day, rows=(None, 0)).label("running_best"),
+            case((sessions.c.e1rm > func.coalesce(earlier, 0), 1), else_=0).label("is_pr"),
+        ).subquery()
+
+        order = timeline.c.day
+        bucket = func.ntile(points).over(order_by=order) if points else func.row_number().over(order_by=order)
+        bucketed = select(timeline, bucket.label("bucket"))
+        if start is not None:
+            bucketed = bucketed.where(timeline.c.day >= start)
+        bucketed = bucketed.subquery()
+
+        picked = select(
+            bucketed,
+            func.row_number()
+            .over(partition_by=bucketed.c.bucket, order_by=(bucketed.c.e1rm.desc(), bucketed.c.day.desc()))
+            .label("pick"),
+        ).subquery()
+        best = picked.c.pick == 1
+        stmt = (
+            select(
+                func.max(picked.c.day),
+                func.count(),
+                func.max(picked.c.e1rm),
+                func.max(case((best, picked.c.best_reps))),
+                func.max(case((best, picked.c.best_weight))),
+                func.avg(picked.c.volume),
+                func.max(picked.c.running_best),
+                func.max(picked.c.is_pr),
+            )
+            .group_by(picked.c.bucket)
+            .order_by(picked.c.bucket)
+        )
+        series = [
+            ProgressionPoint(
+                day=last if isinstance(last, date) else date.fromisoformat(last),
+                sessions=count,
+                e1rm=round(e1rm, 1),
+                best_reps=reps,
+                best_weight=weight,
+                volume=round(float(volume), 1),
+                running_best=round(running, 1),
+                is_pr=bool(is_pr),
+            )
+            for last, count, e1rm, reps, weight, volume, running, is_pr in await db.execute(stmt)
+        ]
+        return ExerciseProgression(client_id=client_id, exercise_id=exercise_id, points=series)
+
+
+async def _main(client_id: Optional[int]) -> None:
+    import app.models  # noqa: F401 — register every mapper before querying
+    from app.core.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        indexed = await ProgressionService.backfill(db, client_id)
+    print(f"Indexed {indexed} loaded sets")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index the loaded sets of existing exercise logs.")
+    parser.add_argument("--client-id", type=int, default=None)
+    args = parser.parse_args()
+    asyncio.run(_main(args.client_id))
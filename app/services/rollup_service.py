@@ -0,0 +1,496 @@
+"""Daily and weekly per-client training facts.
+
+`client_daily_rollups` holds one row per client per day with activity:
+workouts completed/skipped, duration, session RPE, tonnage, weekly
+exercises assigned/completed/skipped and the day's weight.
+`client_weekly_rollups` folds those into Monday-keyed weeks. Long-range
+reads (client dashboard, workout stats, completion) sum a few hundred
+rollup rows instead of every raw row since the client started.
+
+The background job (`refresh`) works from a high-water mark: rows of
+workout_logs, exercise_logs, weekly_exercise_assignments and body_metrics
+created or updated since the last run mark their (client, day) dirty, and
+each dirty day is recomputed from raw rows and replaced, along with its
+week. Recomputing a key is idempotent, so overlapping runs and re-runs are
+harmless; `rebuild` recomputes whole clients or date ranges (for deletes,
+which leave no timestamp behind).
+
+Readers take rollups for days before `covered_until` (the day the last run
+started) and raw rows from then on, so today is always live. A back-dated
+edit shows up after the next run, except weekly exercise status changes:
+their rows are keyed by `assigned_date` (the day they were generated), so
+nearly every one is back-dated, and `RollupService.apply_exercise_status`
+recounts their day and week in the caller's transaction instead.
+
+    python -m app.services.rollup_service [--rebuild] [--client-id N]
+"""
+import argparse
+import asyncio
+from collections import defaultdict
+from dataclasses import asdict, dataclass, fields
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import Date, case, delete, func, insert, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.body_metric import BodyMetric
+from app.models.rollup import ClientDailyRollup, ClientWeeklyRollup, RollupState
+from app.models.weekly_exercise import WeeklyExerciseAssignment, WeeklyExerciseStatus
+from app.models.workout_tracking import ExerciseLog, WorkoutLog
+from app.utils.units import set_tonnage
+
+STATE = "client_facts"
+# Rows committed just before the previous mark may carry an earlier
+# timestamp; re-scanning a little overlap is safe because keys are replaced.
+OVERLAP = timedelta(minutes=5)
+CHUNK = 200  # Clients (or keys) per statement
+
+Key = Tuple[int, date]
+
+
+@dataclass
+class Facts:
+    workouts_completed: int = 0
+    workouts_skipped: int = 0
+    duration_minutes: int = 0
+    duration_count: int = 0
+    rpe_sum: int = 0
+    rpe_count: int = 0
+    tonnage: float = 0.0
+    exercises_assigned: int = 0
+    exercises_completed: int = 0
+    exercises_skipped: int = 0
+    weight: Optional[float] = None
+
+    def add(self, other: "Facts") -> "Facts":
+        """Fold in a later period's facts (its weight wins when present)."""
+        for f in fields(self):
+            if f.name == "weight":
+                if other.weight is not None:
+                    self.weight = other.weight
+            else:
+                setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+        return self
+
+    def __bool__(self) -> bool:
+        return any(getattr(self, f.name) for f in fields(self)) or self.weight is not None
+
+
+FACTS = [f.name for f in fields(Facts)]
+# Which raw source fills which facts; readers ask only for what they need.
+PARTS = {
+    "workouts": (
+        "workouts_completed", "workouts_skipped", "duration_minutes",
+        "duration_count", "rpe_sum", "rpe_count",
+    ),
+    "tonnage": ("tonnage",),
+    "exercises": ("exercises_assigned", "exercises_completed", "exercises_skipped"),
+    "weight": ("weight",),
+}
+
+
+def monday(d: date) -> date:
+    return d - timedelta(days=d.weekday())
+
+
+def _day(column):
+    return func.date(column, type_=Date)
+
+
+def _at(d: date) -> datetime:
+    return datetime.combine(d, time.min)
+
+
+def _chunks(items: Sequence, size: int = CHUNK):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# ── Raw facts ────────────────────────────────────────────────────────────────
+
+async def compute(
+    db: AsyncSession,
+    client_ids: Iterable[int],
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    parts: Iterable[str] = tuple(PARTS),
+) -> Dict[Key, Facts]:
+    """Facts per (client, day) from raw rows, for days in [start, end]."""
+    client_ids = list(client_ids)
+    facts: Dict[Key, Facts] = defaultdict(Facts)
+    parts = set(parts)
+
+    def within(column, is_datetime=True):
+        criteria = []
+        if start is not None:
+            criteria.append(column >= (_at(start) if is_datetime else start))
+        if end is not None:
+            next_day = end + timedelta(days=1)
+            criteria.append(column < (_at(next_day) if is_datetime else next_day))
+        return criteria
+
+    wl = WorkoutLog
+    if "workouts" in parts:
+        completed = wl.is_completed.is_(True)
+        stmt = (
+            select(
+                wl.client_id,
+                _day(wl.workout_date),
+                func.count(case((completed, 1))),
+                func.count(case((wl.is_skipped.is_(True), 1))),
+                func.sum(case((completed, wl.total_duration_minutes))),
+                func.count(case((completed, wl.total_duration_minutes))),
+                func.sum(case((completed, wl.perceived_exertion))),
+                func.count(case((completed, wl.perceived_exertion))),
+            )
+            .where(wl.client_id.in_(client_ids), *within(wl.workout_date))
+            .group_by(wl.client_id, _day(wl.workout_date))
+        )
+        for client_id, day, done, skipped, minutes, timed, rpe, rated in await db.execute(stmt):
+            f = facts[(client_id, day)]
+            f.workouts_completed, f.workouts_skipped = done, skipped
+            f.duration_minutes, f.duration_count = int(minutes or 0), timed
+            f.rpe_sum, f.rpe_count = int(rpe or 0), rated
+
+    if "tonnage" in parts:
+        stmt = (
+            select(wl.client_id, _day(wl.workout_date), ExerciseLog.actual_sets)
+            .join(ExerciseLog, ExerciseLog.workout_log_id == wl.id)
+            .where(
+                wl.client_id.in_(client_ids),
+                wl.is_completed.is_(True),
+                ExerciseLog.actual_sets.is_not(None),
+                *within(wl.workout_date),
+            )
+        )
+        for client_id, day, actual_sets in await db.execute(stmt):
+            tonnage = set_tonnage(actual_sets)
+            if tonnage:
+                facts[(client_id, day)].tonnage += tonnage
+
+    if "exercises" in parts:
+        wea = WeeklyExerciseAssignment
+        stmt = (
+            select(
+                wea.client_id,
+                wea.assigned_date,
+                func.count(),
+                func.count(case((wea.status == WeeklyExerciseStatus.COMPLETED, 1))),
+                func.count(case((wea.status == WeeklyExerciseStatus.SKIPPED, 1))),
+            )
+            .where(wea.client_id.in_(client_ids), *within(wea.assigned_date, is_datetime=False))
+            .group_by(wea.client_id, wea.assigned_date)
+        )
+        for client_id, day, assigned, done, skipped in await db.execute(stmt):
+            f = facts[(client_id, day)]
+            f.exercises_assigned, f.exercises_completed, f.exercises_skipped = assigned, done, skipped
+
+    if "weight" in parts:
+        stmt = (
+            select(BodyMetric.client_id, BodyMetric.measured_at, BodyMetric.weight)
+            .where(
+                BodyMetric.client_id.in_(client_ids),
+                BodyMetric.weight.is_not(None),
+                *within(BodyMetric.measured_at, is_datetime=False),
+            )
+            .order_by(BodyMetric.measured_at, BodyMetric.id)
+        )
+        for client_id, day, weight in await db.execute(stmt):
+            facts[(client_id, day)].weight = weight  # The day's last entry wins
+
+    return facts
+
+
+async def _dirty_keys(db: AsyncSession, since: datetime) -> Set[Key]:
+    def changed(model):
+        return or_(model.created_at > since, model.updated_at > since)
+
+    wl, wea = WorkoutLog, WeeklyExerciseAssignment
+    sources = [
+        select(wl.client_id, _day(wl.workout_date)).where(changed(wl)),
+        select(wl.client_id, _day(wl.workout_date))
+        .join(ExerciseLog, ExerciseLog.workout_log_id == wl.id)
+        .where(changed(ExerciseLog)),
+        select(wea.client_id, wea.assigned_date).where(changed(wea)),
+        select(BodyMetric.client_id, BodyMetric.measured_at).where(changed(BodyMetric)),
+    ]
+    keys: Set[Key] = set()
+    for stmt in sources:
+        keys.update(tuple(row) for row in await db.execute(stmt.distinct()))
+    return keys
+
+
+# ── Writing rollups ──────────────────────────────────────────────────────────
+
+async def _replace_days(db: AsyncSession, keys: Set[Key], commit: bool = True) -> int:
+    """Recompute the given (client, day) keys from raw rows; returns rows written."""
+    by_client: Dict[int, List[date]] = defaultdict(list)
+    for client_id, day in keys:
+        by_client[client_id].append(day)
+
+    written = 0
+    for clients in _chunks(sorted(by_client)):
+        days = [d for c in clients for d in by_client[c]]
+        facts = await compute(db, clients, min(days), max(days))
+        chunk_keys = [(c, d) for c in clients for d in by_client[c]]
+        for part in _chunks(chunk_keys, CHUNK * 5):
+            await db.execute(
+                delete(ClientDailyRollup).where(
+                    tuple_(ClientDailyRollup.client_id, ClientDailyRollup.day).in_(part)
+                )
+            )
+        rows = [
+            {"client_id": c, "day": d, **asdict(facts[(c, d)])}
+            for c, d in chunk_keys
+            if facts.get((c, d))
+        ]
+        if rows:
+            await db.execute(insert(ClientDailyRollup), rows)
+        written += len(rows)
+        if commit:
+            await db.commit()
+    return written
+
+
+async def _replace_weeks(db: AsyncSession, weeks: Set[Key], commit: bool = True) -> int:
+    """Refold the given (client, Monday) weeks from daily rollups."""
+    by_client: Dict[int, List[date]] = defaultdict(list)
+    for client_id, week in weeks:
+        by_client[client_id].append(week)
+
+    written = 0
+    dr = ClientDailyRollup
+    for clients in _chunks(sorted(by_client)):
+        mondays = [w for c in clients for w in by_client[c]]
+        stmt = (
+            select(dr)
+            .where(
+                dr.client_id.in_(clients),
+                dr.day >= min(mondays),
+                dr.day < max(mondays) + timedelta(days=7),
+            )
+            .order_by(dr.day)
+        )
+        folded: Dict[Key, Facts] = defaultdict(Facts)
+        for row in (await db.execute(stmt)).scalars():
+            folded[(row.client_id, monday(row.day))].add(Facts(**{f: getattr(row, f) for f in FACTS}))
+
+        chunk_keys = [(c, w) for c in clients for w in by_client[c]]
+        for part in _chunks(chunk_keys, CHUNK * 5):
+            await db.execute(
+                delete(ClientWeeklyRollup).where(
+                    tuple_(ClientWeeklyRollup.client_id, ClientWeeklyRollup.week_start).in_(part)
+                )
+            )
+        rows = [
+            {"client_id": c, "week_start": w, **asdict(folded[(c, w)])}
+            for c, w in chunk_keys
+            if folded.get((c, w))
+        ]
+        if rows:
+            await db.execute(insert(ClientWeeklyRollup), rows)
+        written += len(rows)
+        if commit:
+            await db.commit()
+    return written
+
+
+async def _all_keys(
+    db: AsyncSession, client_id: Optional[int], start: Optional[date], end: Optional[date]
+) -> Set[Key]:
+    """Every (client, day) with raw activity or an existing rollup row."""
+    wl, wea, dr = WorkoutLog, WeeklyExerciseAssignment, ClientDailyRollup
+
+    def scoped(stmt, client_col, day_col, is_datetime):
+        if client_id is not None:
+            stmt = stmt.where(client_col == client_id)
+        if start is not None:
+            stmt = stmt.where(day_col >= (_at(start) if is_datetime else start))
+        if end is not None:
+            next_day = end + timedelta(days=1)
+            stmt = stmt.where(day_col < (_at(next_day) if is_datetime else next_day))
+        return stmt.distinct()
+
+    sources = [
+        scoped(select(wl.client_id, _day(wl.workout_date)), wl.client_id, wl.workout_date, True),
+        scoped(select(wea.client_id, wea.assigned_date), wea.client_id, wea.assigned_date, False),
+        scoped(
+            select(BodyMetric.client_id, BodyMetric.measured_at),
+            BodyMetric.client_id, BodyMetric.measured_at, False,
+        ),
+        # Days whose raw rows are gone (deleted) still need their row cleared
+        scoped(select(dr.client_id, dr.day), dr.client_id, dr.day, False),
+    ]
+    keys: Set[Key] = set()
+    for stmt in sources:
+        keys.update(tuple(row) for row in await db.execute(stmt))
+    return keys
+
+
+class RollupService:
+
+    @staticmethod
+    async def refresh(db: AsyncSession, today: Optional[date] = None) -> Dict[str, int]:
+        """Fold everything changed since the last run into the rollups.
+
+        The first run builds them from scratch. Commits as it goes; the
+        state row moves last, so an interrupted run is simply redone.
+        """
+        today = today or date.today()
+        mark = await db.scalar(select(func.now()))
+        state = await db.get(RollupState, STATE)
+        if state is None:
+            keys = await _all_keys(db, None, None, None)
+        else:
+            keys = await _dirty_keys(db, state.high_water_mark - OVERLAP)
+        result = await RollupService._replace(db, keys)
+
+        state = await db.get(RollupState, STATE)
+        if state is None:
+            state = RollupState(name=STATE, high_water_mark=mark, covered_until=today)
+            db.add(state)
+        else:
+            state.high_water_mark, state.covered_until = mark, today
+        await db.commit()
+        return result
+
+    @staticmethod
+    async def rebuild(
+        db: AsyncSession,
+        client_id: Optional[int] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Dict[str, int]:
+        """Recompute one client's (or every client's) days in [start, end]."""
+        keys = await _all_keys(db, client_id, start, end)
+        return await RollupService._replace(db, keys)
+
+    @staticmethod
+    async def _replace(db: AsyncSession, keys: Set[Key]) -> Dict[str, int]:
+        days = await _replace_days(db, keys)
+        weeks = await _replace_weeks(db, {(c, monday(d)) for c, d in keys})
+        return {"keys": len(keys), "days": days, "weeks": weeks}
+
+    @staticmethod
+    async def apply_exercise_status(db: AsyncSession, client_id: int, day: date) -> None:
+        """Recount the weekly exercise facts of (client, day) and its week
+        inside the caller's transaction, after a status change. Days from
+        `covered_until` on are read raw and left alone."""
+        cutoff = await RollupService.covered_until(db)
+        if cutoff is None or day >= cutoff:
+            return
+        await db.flush()
+        facts = (await compute(db, [client_id], day, day, parts=["exercises"])).get((client_id, day), Facts())
+        dr, wr = ClientDailyRollup, ClientWeeklyRollup
+        patched = await db.execute(
+            update(dr)
+            .where(dr.client_id == client_id, dr.day == day)
+            .values(**{name: getattr(facts, name) for name in PARTS["exercises"]})
+        )
+        week = monday(day)
+        in_week = (dr.client_id == client_id, dr.day >= week, dr.day < week + timedelta(days=7))
+        refolded = await db.execute(
+            update(wr)
+            .where(wr.client_id == client_id, wr.week_start == week)
+            .values(**{
+                name: select(func.coalesce(func.sum(getattr(dr, name)), 0)).where(*in_week).scalar_subquery()
+                for name in PARTS["exercises"]
+            })
+        )
+        if patched.rowcount != 1 or refolded.rowcount != 1:
+            # The job never saw the day: build its rows outright
+            await _replace_days(db, {(client_id, day)}, commit=False)
+            await _replace_weeks(db, {(client_id, week)}, commit=False)
+
+    # ── Reading ──────────────────────────────────────────────────────────────
+
+    @staticmethod
+    async def covered_until(db: AsyncSession) -> Optional[date]:
+        """First day not served from rollups (None before the first run)."""
+        return await db.scalar(
+            select(RollupState.covered_until).where(RollupState.name == STATE)
+        )
+
+    @staticmethod
+    async def daily_facts(
+        db: AsyncSession,
+        client_id: int,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        parts: Iterable[str] = tuple(PARTS),
+    ) -> Dict[date, Facts]:
+        """A client's facts by day: rollups before `covered_until`, raw after."""
+        parts = tuple(parts)
+        cutoff = await RollupService.covered_until(db)
+        days: Dict[date, Facts] = {}
+        if cutoff is not None and (start is None or start < cutoff):
+            days.update(await _read(db, ClientDailyRollup, ClientDailyRollup.day, client_id, start, cutoff, parts))
+        live_start = max(start, cutoff) if start and cutoff else (cutoff or start)
+        if end is None or live_start is None or live_start <= end:
+            raw = await compute(db, [client_id], live_start, end, parts)
+            days.update({day: f for (_, day), f in raw.items()})
+        return dict(sorted(days.items()))
+
+    @staticmethod
+    async def weekly_facts(
+        db: AsyncSession,
+        client_id: int,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        parts: Iterable[str] = tuple(PARTS),
+    ) -> Dict[date, Facts]:
+        """A client's facts by Monday. Weeks wholly before `covered_until`
+        come from weekly rollups; the rest are folded from daily facts."""
+        parts = tuple(parts)
+        start = monday(start) if start else None
+        cutoff = await RollupService.covered_until(db)
+        boundary = monday(cutoff) if cutoff else None  # First week not wholly covered
+        weeks: Dict[date, Facts] = {}
+        if boundary is not None and (start is None or start < boundary):
+            weeks.update(
+                await _read(db, ClientWeeklyRollup, ClientWeeklyRollup.week_start, client_id, start, boundary, parts)
+            )
+        rest_start = max(start, boundary) if start and boundary else (boundary or start)
+        if end is None or rest_start is None or rest_start <= end:
+            days: Dict[date, Facts] = {}
+            if cutoff is not None and (rest_start is None or rest_start < cutoff):
+                days.update(
+                    await _read(db, ClientDailyRollup, ClientDailyRollup.day, client_id, rest_start, cutoff, parts)
+                )
+            live_start = max(rest_start, cutoff) if rest_start and cutoff else (cutoff or rest_start)
+            raw = await compute(db, [client_id], live_start, end, parts)
+            days.update({day: f for (_, day), f in raw.items()})
+            for day, f in sorted(days.items()):
+                weeks.setdefault(monday(day), Facts()).add(f)
+        return dict(sorted(weeks.items()))
+
+
+async def _read(db, model, period, client_id, start, before, parts) -> Dict[date, Facts]:
+    names = [name for part in parts for name in PARTS[part]]
+    stmt = select(period, *(getattr(model, n) for n in names)).where(
+        model.client_id == client_id, period < before
+    )
+    if start is not None:
+        stmt = stmt.where(period >= start)
+    return {row[0]: Facts(**dict(zip(names, row[1:]))) for row in await db.execute(stmt)}
+
+
+async def _main(rebuild: bool, client_id: Optional[int]) -> None:
+    import app.models  # noqa: F401 — register every mapper before querying
+    from app.core.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        if rebuild:
+            result = await RollupService.rebuild(db, client_id)
+        else:
+            result = await RollupService.refresh(db)
+    print(f"Rolled up {result['keys']} client-days: {result['days']} daily and {result['weeks']} weekly rows")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh the per-client rollup tables.")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute from scratch instead")
+    parser.add_argument("--client-id", type=int, default=None, help="With --rebuild: one client")
+    args = parser.parse_args()
+    asyncio.run(_main(args.rebuild, args.client_id))
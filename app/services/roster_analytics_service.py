@@ -0,0 +1,232 @@
+"""Roster analytics: adherence and progress for all of a trainer's clients.
+
+Each metric is one grouped query over the whole roster, not one query per
+client, so the cost is a fixed handful of statements however many clients a
+trainer has:
+
+  clients         the roster, with each client's latest workout (an index
+                  seek per client on workout_logs(client_id, workout_date))
+  completion      weekly exercises due in the window (up to today), by
+                  status
+  streak          days with a completed exercise, grouped into runs of
+                  consecutive days (gaps and islands); the run ending today
+  weight trend    least-squares sums of (day, weight); slope in kg/week
+  PRs             personal records in the window
+
+Sorting and filtering on the computed metrics happen here, after the merge.
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import Date, Integer, cast, func, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.body_metric import BodyMetric
+from app.models.client import Client
+from app.models.performance_record import PerformanceRecord
+from app.models.weekly_exercise import WeeklyExerciseAssignment, WeeklyExerciseStatus
+from app.models.workout_tracking import WorkoutLog
+from app.schemas.analytics import ClientAnalytics, RosterAnalytics
+
+SORT_KEYS = {
+    "name": lambda c: (c.last_name.lower(), c.first_name.lower()),
+    "completion_rate": lambda c: c.completion_rate,
+    "current_streak": lambda c: c.current_streak,
+    "last_workout": lambda c: c.last_workout_date,
+    "weight_trend": lambda c: c.weight_trend,
+    "pr_count": lambda c: c.pr_count,
+}
+# Streaks are counted back at most this far, which bounds the scan
+STREAK_LOOKBACK_DAYS = 90
+
+
+def _days_since(column, origin: date, dialect: str):
+    """SQL: whole days from `origin` to the date part of `column`."""
+    if dialect == "postgresql":
+        return cast(column, Date) - cast(literal(origin), Date)
+    return cast(func.julianday(func.date(column)) - func.julianday(origin.isoformat()), Integer)
+
+
+class RosterAnalyticsService:
+
+    @staticmethod
+    async def _clients(db: AsyncSession, trainer_id: int, include_inactive: bool, search: Optional[str]):
+        last_workout = (
+            select(func.max(WorkoutLog.workout_date))
+            .where(WorkoutLog.client_id == Client.id, WorkoutLog.is_completed.is_(True))
+            .scalar_subquery()
+        )
+        stmt = select(
+            Client.id, Client.first_name, Client.last_name, Client.is_active, last_workout
+        ).where(Client.trainer_id == trainer_id)
+        if not include_inactive:
+            stmt = stmt.where(Client.is_active.is_(True))
+        if search:
+            pattern = f"%{search.lower()}%"
+            stmt = stmt.where(
+                or_(func.lower(Client.first_name).like(pattern), func.lower(Client.last_name).like(pattern))
+            )
+        return (await db.execute(stmt)).all()
+
+    @staticmethod
+    async def _completion(db: AsyncSession, trainer_id: int, start: date, end: date) -> Dict[int, tuple]:
+        status = WeeklyExerciseAssignment.status
+        stmt = (
+            select(
+                WeeklyExerciseAssignment.client_id,
+                func.count(),
+                func.sum(cast(status == WeeklyExerciseStatus.COMPLETED, Integer)),
+                func.sum(cast(status == WeeklyExerciseStatus.SKIPPED, Integer)),
+            )
+            .where(
+                WeeklyExerciseAssignment.trainer_id == trainer_id,
+                WeeklyExerciseAssignment.due_date.between(start, end),
+            )
+            .group_by(WeeklyExerciseAssignment.client_id)
+        )
+        return {
+            client_id: (total, int(done or 0), int(skipped or 0))
+            for client_id, total, done, skipped in await db.execute(stmt)
+        }
+
+    @staticmethod
+    async def _streaks(db: AsyncSession, trainer_id: int, today: date, dialect: str) -> Dict[int, int]:
+        completed = WeeklyExerciseAssignment.completed_date
+        day = _days_since(completed, today, dialect)  # 0 today, -1 yesterday, ...
+        days = (
+            select(WeeklyExerciseAssignment.client_id, day.label("day"))
+            .where(
+                WeeklyExerciseAssignment.trainer_id == trainer_id,
+                WeeklyExerciseAssignment.status == WeeklyExerciseStatus.COMPLETED,
+                completed >= datetime.combine(today - timedelta(days=STREAK_LOOKBACK_DAYS - 1), datetime.min.time()),
+                completed < datetime.combine(today + timedelta(days=1), datetime.min.time()),
+            )
+            .distinct()
+            .subquery()
+        )
+        # Consecutive days share day - row_number()
+        runs = select(
+            days.c.client_id,
+            days.c.day,
+            (days.c.day - func.row_number().over(partition_by=days.c.client_id, order_by=days.c.day)).label("run"),
+        ).subquery()
+        stmt = (
+            select(runs.c.client_id, func.count())
+            .group_by(runs.c.client_id, runs.c.run)
+            .having(func.max(runs.c.day) == 0)
+        )
+        return dict((await db.execute(stmt)).all())
+
+    @staticmethod
+    async def _weight_trends(
+        db: AsyncSession, trainer_id: int, start: date, end: date, dialect: str
+    ) -> Dict[int, float]:
+        x = _days_since(BodyMetric.measured_at, start, dialect)
+        y = BodyMetric.weight
+        stmt = (
+            select(
+                BodyMetric.client_id,
+                func.count(y),
+                func.sum(x),
+                func.sum(y),
+                func.sum(x * x),
+                func.sum(x * y),
+            )
+            .join(Client, Client.id == BodyMetric.client_id)
+            .where(
+                Client.trainer_id == trainer_id,
+                BodyMetric.measured_at.between(start, end),
+                y.is_not(None),
+            )
+            .group_by(BodyMetric.client_id)
+        )
+        trends = {}
+        for client_id, *sums in await db.execute(stmt):
+            n, sx, sy, sxx, sxy = (float(v) for v in sums)  # Postgres sums integers as numeric
+            denominator = n * sxx - sx * sx
+            if n >= 2 and denominator:
+                trends[client_id] = round((n * sxy - sx * sy) / denominator * 7, 2)
+        return trends
+
+    @staticmethod
+    async def _pr_counts(db: AsyncSession, trainer_id: int, start: date, end: date) -> Dict[int, int]:
+        stmt = (
+            select(PerformanceRecord.client_id, func.count())
+            .where(
+                PerformanceRecord.trainer_id == trainer_id,
+                PerformanceRecord.is_pr == 1,
+                PerformanceRecord.recorded_at.between(start, end),
+            )
+            .group_by(PerformanceRecord.client_id)
+        )
+        return dict((await db.execute(stmt)).all())
+
+    @staticmethod
+    async def summary(
+        db: AsyncSession,
+        trainer_id: int,
+        week_start: date,
+        weeks: int = 8,
+        sort: str = "name",
+        descending: bool = False,
+        include_inactive: bool = False,
+        search: Optional[str] = None,
+        min_completion: Optional[float] = None,
+        max_completion: Optional[float] = None,
+        inactive_days: Optional[int] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> RosterAnalytics:
+        """Per-client analytics over the `weeks` weeks ending with `week_start`'s week.
+
+        `inactive_days` keeps clients with no completed workout in that many
+        days (or none at all). Clients missing the sort value sort last.
+        """
+        start = week_start - timedelta(weeks=weeks - 1)
+        end = week_start + timedelta(days=6)
+        today = date.today()
+        dialect = db.get_bind().dialect.name
+
+        roster = await RosterAnalyticsService._clients(db, trainer_id, include_inactive, search)
+        if not roster:
+            return RosterAnalytics(window_start=start, window_end=end, total=0, clients=[])
+        completion = await RosterAnalyticsService._completion(db, trainer_id, start, min(end, today))
+        streaks = await RosterAnalyticsService._streaks(db, trainer_id, today, dialect)
+        trends = await RosterAnalyticsService._weight_trends(db, trainer_id, start, end, dialect)
+        prs = await RosterAnalyticsService._pr_counts(db, trainer_id, start, end)
+
+        clients: List[ClientAnalytics] = []
+        for client_id, first_name, last_name, is_active, last_workout in roster:
+            total, done, skipped = completion.get(client_id, (0, 0, 0))
+            rate = round(done / total * 100, 1) if total else 0.0
+            idle = (today - last_workout.date()).days if last_workout else None
+            if min_completion is not None and rate < min_completion:
+                continue
+            if max_completion is not None and rate > max_completion:
+                continue
+            if inactive_days is not None and idle is not None and idle < inactive_days:
+                continue
+            clients.append(
+                ClientAnalytics(
+                    client_id=client_id,
+                    first_name=first_name,
+                    last_name=last_name,
+                    is_active=bool(is_active),
+                    assigned=total,
+                    completed=done,
+                    skipped=skipped,
+                    completion_rate=rate,
+                    current_streak=streaks.get(client_id, 0),
+                    last_workout_date=last_workout,
+                    days_since_last_workout=idle,
+                    weight_trend=trends.get(client_id),
+                    pr_count=prs.get(client_id, 0),
+                )
+            )
+
+        key = SORT_KEYS[sort]
+        present = [c for c in clients if key(c) is not None]
+        present.sort(key=key, reverse=descending)
+        ordered = present + [c for c in clients if key(c) is None]
+        page = ordered[offset:offset + limit if limit is not None else None]
+        return RosterAnalytics(window_start=start, window_end=end, total=len(ordered), clients=page)
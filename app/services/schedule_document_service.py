@@ -0,0 +1,212 @@
+"""Materialized weekly schedules for the current-week view.
+
+Opening the app asks for the client's current week, far more often than the
+underlying rows change. Each (client, Monday) gets a `WeeklyScheduleDocument`
+holding the week's `WeeklyExerciseWithDetails` payloads in schedule order,
+so the read is one primary-key lookup and the payload goes out as stored.
+
+Maintenance:
+
+- Generating weekly exercises (`refresh`) rebuilds every week they cover,
+  in the generator's transaction.
+- A status update (`apply_status`) patches the one entry in place.
+- Renaming an exercise, program, client or trainer (`invalidate`) drops
+  the documents that embed the name; they are rebuilt on their next read.
+- `python -m app.services.schedule_document_service [--client-id N]`
+  rebuilds from scratch, e.g. after a bulk data fix.
+"""
+import argparse
+import asyncio
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.weekly_exercise import (
+    WeeklyExerciseAssignment,
+    WeeklyExerciseStatus,
+    WeeklyScheduleDocument,
+)
+from app.services.weekly_exercise_service import (
+    WeeklyExerciseService,
+    detail_select,
+    enrich_exercise,
+)
+
+Payload = List[Dict[str, Any]]
+
+
+def monday(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def _payload(exercise: WeeklyExerciseAssignment) -> Dict[str, Any]:
+    return enrich_exercise(exercise).model_dump(mode="json")
+
+
+class ScheduleDocumentService:
+    @staticmethod
+    async def build(
+        db: AsyncSession, client_ids: Iterable[int], first_week: date, last_week: date
+    ) -> Dict[Tuple[int, date], Payload]:
+        """Payloads for every (client, week) in the range that has rows."""
+        w = WeeklyExerciseAssignment
+        stmt = detail_select().where(
+            w.client_id.in_(set(client_ids)),
+            w.due_date >= monday(first_week),
+            w.due_date <= monday(last_week) + timedelta(days=6),
+        )
+        documents: Dict[Tuple[int, date], Payload] = defaultdict(list)
+        for exercise in (await db.execute(stmt)).scalars():
+            documents[(exercise.client_id, monday(exercise.due_date))].append(
+                _payload(exercise)
+            )
+        return documents
+
+    @staticmethod
+    async def refresh(
+        db: AsyncSession, client_ids: Iterable[int], first_week: date, last_week: date
+    ) -> int:
+        """Rebuild the clients' documents for the weeks in range.
+
+        Flushes pending weekly rows first and leaves the commit to the
+        caller. Weeks that no longer have rows lose their document. Returns
+        the number of documents written.
+        """
+        client_ids = set(client_ids)
+        if not client_ids:
+            return 0
+        await db.flush()
+        documents = await ScheduleDocumentService.build(db, client_ids, first_week, last_week)
+        d = WeeklyScheduleDocument
+        await db.execute(
+            delete(d).where(
+                d.client_id.in_(client_ids),
+                d.week_start >= monday(first_week),
+                d.week_start <= monday(last_week),
+            )
+        )
+        db.add_all(
+            WeeklyScheduleDocument(client_id=client_id, week_start=week_start, exercises=payload)
+            for (client_id, week_start), payload in documents.items()
+        )
+        return len(documents)
+
+    @staticmethod
+    async def get_week(db: AsyncSession, client_id: int, week_start: date) -> Payload:
+        """The client's week, built and stored on first read.
+
+        A first read is also when a week past the generated horizon gets
+        its weekly rows (`WeeklyExerciseService.extend_horizons`).
+        """
+        key = (client_id, monday(week_start))
+        document = await db.get(WeeklyScheduleDocument, key)
+        if document is not None:
+            return document.exercises
+
+        sunday = key[1] + timedelta(days=6)
+        if await WeeklyExerciseService.extend_horizons(db, client_id=client_id, on=sunday):
+            await db.flush()
+            document = await db.get(WeeklyScheduleDocument, key)
+        if document is not None:
+            payload = document.exercises
+        else:
+            documents = await ScheduleDocumentService.build(db, [client_id], key[1], key[1])
+            payload = documents.get(key, [])
+            db.add(WeeklyScheduleDocument(client_id=client_id, week_start=key[1], exercises=payload))
+        try:
+            await db.commit()
+        except IntegrityError:
+            # A concurrent read built it first; ours is identical.
+            await db.rollback()
+        return payload
+
+    @staticmethod
+    async def apply_status(db: AsyncSession, exercise: WeeklyExerciseAssignment) -> None:
+        """Patch one row's status fields into its stored week, if built.
+
+        Runs in the caller's transaction, so the document commits (or rolls
+        back) with the status change itself.
+        """
+        if exercise.due_date is None:
+            return
+        document = await db.get(
+            WeeklyScheduleDocument, (exercise.client_id, monday(exercise.due_date))
+        )
+        if document is None:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        patched = []
+        for entry in document.exercises:
+            if entry["id"] == exercise.id:
+                entry = {
+                    **entry,
+                    "status": exercise.status.value,
+                    "completion_percentage": exercise.completion_percentage,
+                    "client_feedback": exercise.client_feedback,
+                    "updated_at": now,
+                }
+                if exercise.status == WeeklyExerciseStatus.COMPLETED:
+                    entry["completed_date"] = now
+            patched.append(entry)
+        # A new list, so the JSON column registers the change.
+        document.exercises = patched
+
+    @staticmethod
+    async def invalidate(db: AsyncSession, *criteria) -> None:
+        """Drop the documents of every client with a weekly row matching
+        `criteria` (e.g. `WeeklyExerciseAssignment.exercise_id == 7`)."""
+        w = WeeklyExerciseAssignment
+        await db.execute(
+            delete(WeeklyScheduleDocument).where(
+                WeeklyScheduleDocument.client_id.in_(select(w.client_id).where(*criteria))
+            )
+        )
+
+    @staticmethod
+    async def rebuild(db: AsyncSession, client_id: Optional[int] = None) -> int:
+        """Rebuild every document (or one client's) from the weekly rows.
+
+        Commits per client so a large rebuild doesn't hold one transaction.
+        Returns the number of documents written.
+        """
+        w = WeeklyExerciseAssignment
+        stmt = (
+            select(w.client_id, func.min(w.due_date), func.max(w.due_date))
+            .where(w.due_date.isnot(None))
+            .group_by(w.client_id)
+        )
+        if client_id is not None:
+            stmt = stmt.where(w.client_id == client_id)
+        ranges = (await db.execute(stmt)).all()
+
+        stale = delete(WeeklyScheduleDocument)
+        if client_id is not None:
+            stale = stale.where(WeeklyScheduleDocument.client_id == client_id)
+        await db.execute(stale)
+        await db.commit()
+
+        written = 0
+        for cid, first, last in ranges:
+            written += await ScheduleDocumentService.refresh(db, [cid], first, last)
+            await db.commit()
+        return written
+
+
+async def _main(client_id: Optional[int]) -> None:
+    import app.models  # noqa: F401 — register every mapper before querying
+    from app.core.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        written = await ScheduleDocumentService.rebuild(db, client_id)
+    print(f"Rebuilt {written} weekly schedule documents")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild materialized weekly schedules.")
+    parser.add_argument("--client-id", type=int, default=None, help="Only this client")
+    args = parser.parse_args()
+    asyncio.run(_main(args.client_id))
@@ -0,0 +1,240 @@
+"""Training load: acute:chronic workload ratio, monotony and strain.
+
+A session's load is its duration × RPE (session RPE, arbitrary units); a
+day's load sums that day's completed workouts, and rest days count as 0.
+From the daily series, for every day:
+
+  acute      mean daily load over the last 7 days
+  chronic    mean daily load over the last 28 days
+  ACWR       acute / chronic
+  monotony   7-day mean / 7-day standard deviation
+  strain     7-day total × monotony
+
+The series for one client, or a whole roster, is read with one grouped
+query. Every window is a difference of prefix sums (of loads and of squared
+loads), so a series of any length is one pass — NumPy when it's installed,
+otherwise `itertools.accumulate`.
+
+Computed series are memoized per (client, window), stamped with the count
+and latest write of the client's workout logs inside the window (see
+`app.utils.stamped_cache`). Any insert, edit or delete there changes the
+stamp, so a cache hit costs one aggregate query.
+"""
+import math
+from datetime import date, datetime, time, timedelta
+from itertools import accumulate
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.client import Client
+from app.models.workout_tracking import WorkoutLog
+from app.schemas.analytics import (
+    ClientLoadSummary,
+    ClientTrainingLoad,
+    LoadPoint,
+    RosterTrainingLoad,
+)
+from app.utils.stamped_cache import StampedCache
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional, prefix sums in Python instead
+    np = None
+
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+# ACWR bands, upper bounds; above the last is "danger"
+ZONES = (("low", 0.8), ("optimal", 1.3), ("high", 1.5))
+MAX_ENTRIES = 4096
+
+_Window = Tuple[date, date]
+_Stamp = Tuple[int, Optional[datetime]]
+
+_cache: StampedCache[List[LoadPoint]] = StampedCache(MAX_ENTRIES)
+stats = _cache.stats
+
+
+def zone(acwr: Optional[float]) -> Optional[str]:
+    if acwr is None:
+        return None
+    for name, upper in ZONES:
+        if acwr < upper:
+            return name
+    return "danger"
+
+
+# ── Rolling windows (no I/O) ─────────────────────────────────────────────────
+
+def _windows_numpy(dense: Sequence[float]):
+    values = np.asarray(dense, dtype=float)
+    sums = np.concatenate(([0.0], np.cumsum(values)))
+    squares = np.concatenate(([0.0], np.cumsum(values * values)))
+    end = np.arange(CHRONIC_DAYS, len(values) + 1)  # Exclusive ends of full windows
+    acute = sums[end] - sums[end - ACUTE_DAYS]
+    chronic = sums[end] - sums[end - CHRONIC_DAYS]
+    acute_sq = squares[end] - squares[end - ACUTE_DAYS]
+    return values[end - 1].tolist(), acute.tolist(), chronic.tolist(), acute_sq.tolist()
+
+
+def _windows_python(dense: Sequence[float]):
+    sums = list(accumulate(dense, initial=0.0))
+    squares = list(accumulate((v * v for v in dense), initial=0.0))
+    ends = range(CHRONIC_DAYS, len(dense) + 1)
+    return (
+        [dense[e - 1] for e in ends],
+        [sums[e] - sums[e - ACUTE_DAYS] for e in ends],
+        [sums[e] - sums[e - CHRONIC_DAYS] for e in ends],
+        [squares[e] - squares[e - ACUTE_DAYS] for e in ends],
+    )
+
+
+def compute_series(loads: Dict[date, float], start: date, end: date) -> List[LoadPoint]:
+    """One point per day in [start, end] from daily loads (which should
+    cover the 27 days before `start` too; missing days are rest days)."""
+    first = start - timedelta(days=CHRONIC_DAYS - 1)
+    dense = [0.0] * ((end - first).days + 1)
+    for day, load in loads.items():
+        if first <= day <= end:
+            dense[(day - first).days] = float(load)
+
+    windows = _windows_numpy if np is not None else _windows_python
+    points = []
+    for offset, (load, week, month, week_sq) in enumerate(zip(*windows(dense))):
+        acute, chronic = week / ACUTE_DAYS, month / CHRONIC_DAYS
+        # Clamp the rounding noise of E[x²] − E[x]² on a flat week
+        sd = math.sqrt(max(week_sq / ACUTE_DAYS - acute * acute, 0.0))
+        acwr = round(acute / chronic, 2) if chronic > 0 else None
+        monotony = acute / sd if acute > 0 and sd > 1e-9 else None
+        points.append(
+            LoadPoint(
+                day=start + timedelta(days=offset),
+                load=round(load, 1),
+                acute=round(acute, 1),
+                chronic=round(chronic, 1),
+                acwr=acwr,
+                monotony=round(monotony, 2) if monotony is not None else None,
+                strain=round(week * monotony, 1) if monotony is not None else None,
+                zone=zone(acwr),
+            )
+        )
+    return points
+
+
+# ── Queries ──────────────────────────────────────────────────────────────────
+
+def _range(start: date, end: date):
+    first = start - timedelta(days=CHRONIC_DAYS - 1)
+    return (
+        WorkoutLog.workout_date >= datetime.combine(first, time.min),
+        WorkoutLog.workout_date < datetime.combine(end + timedelta(days=1), time.min),
+    )
+
+
+async def _stamps(db: AsyncSession, client_ids: List[int], start: date, end: date) -> Dict[int, _Stamp]:
+    stmt = (
+        select(
+            WorkoutLog.client_id,
+            func.count(),
+            func.max(func.coalesce(WorkoutLog.updated_at, WorkoutLog.created_at)),
+        )
+        .where(WorkoutLog.client_id.in_(client_ids), *_range(start, end))
+        .group_by(WorkoutLog.client_id)
+    )
+    return {client_id: (count, latest) for client_id, count, latest in await db.execute(stmt)}
+
+
+async def _daily_loads(
+    db: AsyncSession, client_ids: List[int], start: date, end: date
+) -> Dict[int, Dict[date, float]]:
+    day = func.date(WorkoutLog.workout_date)
+    stmt = (
+        select(
+            WorkoutLog.client_id,
+            day,
+            func.sum(WorkoutLog.total_duration_minutes * WorkoutLog.perceived_exertion),
+        )
+        .where(
+            WorkoutLog.client_id.in_(client_ids),
+            WorkoutLog.is_completed.is_(True),
+            *_range(start, end),
+        )
+        .group_by(WorkoutLog.client_id, day)
+    )
+    loads: Dict[int, Dict[date, float]] = {client_id: {} for client_id in client_ids}
+    for client_id, on, load in await db.execute(stmt):
+        if load:
+            # SQLite's date() is text; Postgres returns a date
+            loads[client_id][on if isinstance(on, date) else date.fromisoformat(on)] = float(load)
+    return loads
+
+
+class TrainingLoadService:
+
+    @staticmethod
+    async def series(
+        db: AsyncSession, client_ids: List[int], start: date, end: date
+    ) -> Dict[int, List[LoadPoint]]:
+        """Daily points in [start, end] per client: two queries at most,
+        one when every client is cached and unchanged."""
+        stamps = await _stamps(db, client_ids, start, end)
+        result: Dict[int, List[LoadPoint]] = {}
+        missing: List[int] = []
+        for client_id in client_ids:
+            cached = _cache.get((client_id, start, end), stamps.get(client_id, (0, None)))
+            if cached is not None:
+                result[client_id] = cached
+            else:
+                missing.append(client_id)
+
+        if missing:
+            loads = await _daily_loads(db, missing, start, end)
+            for client_id in missing:
+                result[client_id] = _cache.put(
+                    (client_id, start, end),
+                    stamps.get(client_id, (0, None)),
+                    compute_series(loads[client_id], start, end),
+                )
+        return result
+
+    @staticmethod
+    async def client_series(db: AsyncSession, client_id: int, end: date, days: int) -> ClientTrainingLoad:
+        start = end - timedelta(days=days - 1)
+        points = (await TrainingLoadService.series(db, [client_id], start, end))[client_id]
+        return ClientTrainingLoad(client_id=client_id, start=start, end=end, points=points)
+
+    @staticmethod
+    async def roster(
+        db: AsyncSession,
+        trainer_id: int,
+        day: date,
+        zone: Optional[str] = None,
+        include_inactive: bool = False,
+    ) -> RosterTrainingLoad:
+        """Every client's load on `day`, highest ACWR first (no ratio last)."""
+        stmt = select(Client.id, Client.first_name, Client.last_name).where(Client.trainer_id == trainer_id)
+        if not include_inactive:
+            stmt = stmt.where(Client.is_active.is_(True))
+        roster = (await db.execute(stmt)).all()
+        if not roster:
+            return RosterTrainingLoad(day=day, total=0, clients=[])
+
+        series = await TrainingLoadService.series(db, [row.id for row in roster], day, day)
+        clients = [
+            ClientLoadSummary(
+                client_id=row.id, first_name=row.first_name, last_name=row.last_name,
+                latest=series[row.id][-1],
+            )
+            for row in roster
+        ]
+        if zone is not None:
+            clients = [c for c in clients if c.latest.zone == zone]
+        clients.sort(key=lambda c: (c.latest.acwr is None, -(c.latest.acwr or 0), c.last_name.lower()))
+        return RosterTrainingLoad(day=day, total=len(clients), clients=clients)
+
+
+def invalidate(client_id: Optional[int] = None) -> None:
+    """Forget one client's series (every window), or everything when no id
+    is given; for edits inside the timestamp's resolution."""
+    _cache.invalidate(client_id)
@@ -7,7 +7,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import get_password_hash, verify_password
 from app.models.user import User
+from app.models.weekly_exercise import WeeklyExerciseAssignment
 from app.schemas.user import UserCreate, UserUpdate
+from app.services.schedule_document_service import ScheduleDocumentService
 
 
 class UserService:
@@ -71,6 +73,11 @@ class UserService:
         for field, value in user_update.dict(exclude_unset=True).items():
             setattr(user, field, value)
 
+        if {"first_name", "last_name"} & user_update.dict(exclude_unset=True).keys():
+            # Stored weekly schedules show the trainer's name.
+            await ScheduleDocumentService.invalidate(
+                db, WeeklyExerciseAssignment.trainer_id == user_id
+            )
         await db.commit()
         await db.refresh(user)
         return user
@@ -1,80 +1,282 @@
+import json
 import logging
 from datetime import date, timedelta
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from sqlalchemy import delete as sql_delete
-from sqlalchemy import select
+from sqlalchemy import inspect, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.sql import func
 
-from app.models.program import Program
-from app.models.program_assignment import ProgramAssignment
+from app.core.config import settings
+from app.models.client import Client
+from app.models.program import Exercise, Program
+from app.models.program_assignment import AssignmentStatus, ProgramAssignment
+from app.models.user import User
 from app.models.weekly_exercise import WeeklyExerciseAssignment, WeeklyExerciseStatus
+from app.schemas.weekly_exercise import WeeklyExerciseWithDetails
+from app.utils.fields import FieldSet, select_columns
 
 logger = logging.getLogger(__name__)
 
+_w, _e = WeeklyExerciseAssignment, Exercise
+# Schedule row fields (`?fields=` on the schedule view), in response order.
+SCHEDULE_FIELDS = {
+    "id": _w.id,
+    "exercise_id": _w.exercise_id,
+    "exercise_name": func.coalesce(_e.name, "Unknown Exercise").label("exercise_name"),
+    "exercise_description": func.coalesce(_e.description, "").label("exercise_description"),
+    "exercise_video_url": func.coalesce(_e.video_url, "").label("exercise_video_url"),
+    "exercise_instructions": func.coalesce(_e.instructions, "").label("exercise_instructions"),
+    "sets": _w.sets,
+    "reps": _w.reps,
+    "weight": _w.weight,
+    "rest_seconds": _w.rest_seconds,
+    "exercise_notes": _w.exercise_notes,
+    "status": _w.status,
+    "completion_percentage": _w.completion_percentage,
+    "due_date": _w.due_date,
+    "exercise_order": _w.exercise_order,
+    "day_number": _w.day_number,
+    "client_feedback": _w.client_feedback,
+    "trainer_feedback": _w.trainer_feedback,
+    "muscle_groups": _e.muscle_groups,
+}
+# Fields that need the exercise-library join.
+_EXERCISE_FIELDS = frozenset(
+    {
+        "exercise_name",
+        "exercise_description",
+        "exercise_video_url",
+        "exercise_instructions",
+        "muscle_groups",
+    }
+)
+# Exercise-library columns for the normalized schedule's `exercises` map,
+# keyed like the row fields so a client can merge an entry into its rows.
+EXERCISE_DETAIL_FIELDS = {
+    name: column for name, column in SCHEDULE_FIELDS.items() if name in _EXERCISE_FIELDS
+}
+
+
+def parse_muscle_groups(raw) -> list:
+    if not raw:
+        return []
+    if isinstance(raw, str):
+        try:
+            return json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            return []
+    return raw
+
+
+def detail_select():
+    """Weekly rows with what the detail view shows, in schedule order.
+
+    The relations are all many-to-one, so they're joined into the one
+    statement, loading only the exercise text, the names and the program
+    name.
+    """
+    w = WeeklyExerciseAssignment
+    return (
+        select(w)
+        .options(
+            joinedload(w.exercise).load_only(
+                Exercise.name,
+                Exercise.description,
+                Exercise.video_url,
+                Exercise.instructions,
+                Exercise.muscle_groups,
+            ),
+            joinedload(w.client).load_only(Client.first_name, Client.last_name),
+            joinedload(w.trainer).load_only(User.first_name, User.last_name),
+            joinedload(w.program_assignment)
+            .load_only(ProgramAssignment.program_id)
+            .joinedload(ProgramAssignment.program)
+            .load_only(Program.name),
+        )
+        .order_by(w.due_date, w.day_number, w.exercise_order)
+    )
+
+
+def enrich_exercise(exercise: WeeklyExerciseAssignment) -> WeeklyExerciseWithDetails:
+    """A row from `detail_select()` as the detail view's payload."""
+    muscle_groups = (
+        parse_muscle_groups(exercise.exercise.muscle_groups)
+        if exercise.exercise
+        else []
+    )
+    program_name = (
+        exercise.program_assignment.program.name
+        if exercise.program_assignment and exercise.program_assignment.program
+        else ""
+    )
+    payload = {
+        **exercise.__dict__,
+        "exercise_name": exercise.exercise.name if exercise.exercise else "Unknown Exercise",
+        "exercise_description": exercise.exercise.description if exercise.exercise else "",
+        "exercise_video_url": exercise.exercise.video_url if exercise.exercise else "",
+        "exercise_instructions": exercise.exercise.instructions if exercise.exercise else "",
+        "muscle_groups": muscle_groups,
+        "program_name": program_name,
+        "client_name": (
+            f"{exercise.client.first_name} {exercise.client.last_name}"
+            if exercise.client
+            else ""
+        ),
+        "trainer_name": (
+            f"{exercise.trainer.first_name} {exercise.trainer.last_name}"
+            if exercise.trainer
+            else ""
+        ),
+    }
+    return WeeklyExerciseWithDetails(**payload)
+
+
+def program_start(program_assignment: ProgramAssignment) -> date:
+    """Day one of the assignment: its start date, else the day it was assigned."""
+    if program_assignment.start_date:
+        return program_assignment.start_date.date()
+    # assigned_date is a server default, unloaded until the row is re-read.
+    assigned = inspect(program_assignment).dict.get("assigned_date")
+    return assigned.date() if assigned else date.today()
+
+
+def horizon_week(
+    program: Program, program_assignment: ProgramAssignment, on: Optional[date] = None
+) -> int:
+    """Last program week that should exist as rows on `on` (default today):
+    the week `on` falls in plus `weekly_horizon_weeks - 1` more."""
+    on = on or date.today()
+    current = max((on - program_start(program_assignment)).days // 7 + 1, 1)
+    return min(program.duration_weeks or 4, current + settings.weekly_horizon_weeks - 1)
+
+
+def build_weekly_exercises(
+    program: Program,
+    program_assignment: ProgramAssignment,
+    first_week: int = 1,
+    last_week: Optional[int] = None,
+) -> List[WeeklyExerciseAssignment]:
+    """Expand program weeks `first_week..last_week` (default: to the end)
+    of a workout structure into per-week rows (no I/O)."""
+    weekly_exercises: List[WeeklyExerciseAssignment] = []
+    start_date = program_start(program_assignment)
+
+    program_weeks = program.duration_weeks or 4
+    sessions_per_week = program.sessions_per_week or len(program.workout_structure)
+    last_week = min(last_week or program_weeks, program_weeks)
+
+    for week in range(first_week, last_week + 1):
+        # Entries sharing a day number continue its exercise order.
+        day_orders: Dict[int, int] = {}
+        for day_data in program.workout_structure:
+            day_number = day_data.get("day", 1)
+
+            days_offset = ((week - 1) * 7) + (
+                (day_number - 1) * (7 // max(sessions_per_week, 1))
+            )
+            workout_date = start_date + timedelta(days=days_offset)
+
+            for exercise_data in day_data.get("exercises", []):
+                day_orders[day_number] = day_orders.get(day_number, 0) + 1
+                weekly_exercises.append(
+                    WeeklyExerciseAssignment(
+                        program_assignment_id=program_assignment.id,
+                        client_id=program_assignment.client_id,
+                        trainer_id=program_assignment.trainer_id,
+                        exercise_id=exercise_data.get("exercise_id"),
+                        assigned_date=date.today(),
+                        due_date=workout_date,
+                        week_number=week,
+                        day_number=day_number,
+                        exercise_order=day_orders[day_number],
+                        sets=exercise_data.get("sets", 3),
+                        reps=exercise_data.get("reps", "10"),
+                        weight=exercise_data.get("weight", "bodyweight"),
+                        rest_seconds=exercise_data.get("rest_seconds", 60),
+                        exercise_notes=exercise_data.get("notes", ""),
+                        status=WeeklyExerciseStatus.PENDING,
+                    )
+                )
+    return weekly_exercises
+
+
+async def claim_weeks(
+    db: AsyncSession, program_assignment: ProgramAssignment, last_week: int
+) -> bool:
+    """Move the assignment's `generated_weeks` to `last_week` if it still
+    holds the value read with it (compare-and-set). False when another
+    worker or request generated those weeks first; the caller then skips
+    the assignment instead of inserting the weeks twice."""
+    pa = ProgramAssignment
+    seen = program_assignment.generated_weeks or 0
+    result = await db.execute(
+        update(pa)
+        .where(pa.id == program_assignment.id, pa.generated_weeks == seen)
+        .values(generated_weeks=last_week)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        return False
+    set_committed_value(program_assignment, "generated_weeks", last_week)
+    return True
+
 
 class WeeklyExerciseService:
     @staticmethod
     async def generate_weekly_exercises_from_assignment(
-        db: AsyncSession, program_assignment: ProgramAssignment
+        db: AsyncSession,
+        program_assignment: ProgramAssignment,
+        program: Optional[Program] = None,
+        commit: bool = True,
+        materialize: bool = True,
     ) -> List[WeeklyExerciseAssignment]:
+        """Create the weekly rows for an assignment's first weeks.
+
+        Only weeks up to `horizon_week()` are written; `extend_horizons`
+        adds the rest as they come up. Pass `program` when the caller
+        already holds it, and `commit=False` to leave the rows pending in
+        the caller's transaction. The weeks' schedule documents are rebuilt
+        too unless `materialize=False` (a caller generating for many
+        clients refreshes them once).
+        """
         try:
-            program = (
-                await db.execute(
-                    select(Program).where(Program.id == program_assignment.program_id)
-                )
-            ).scalar_one_or_none()
+            if program is None:
+                program = (
+                    await db.execute(
+                        select(Program).where(Program.id == program_assignment.program_id)
+                    )
+                ).scalar_one_or_none()
             if not program or not program.workout_structure:
                 logger.warning(
                     f"No program or workout structure found for assignment {program_assignment.id}"
                 )
                 return []
 
-            weekly_exercises: List[WeeklyExerciseAssignment] = []
-            start_date = (
-                program_assignment.start_date.date()
-                if program_assignment.start_date
-                else date.today()
-            )
+            last_week = horizon_week(program, program_assignment)
+            if commit:
+                # Committed assignments are visible to extend_horizons runs.
+                if not await claim_weeks(db, program_assignment, last_week):
+                    return []
+            else:
+                # The caller's uncommitted assignments aren't; the slot's
+                # unique index still rejects a double generation.
+                program_assignment.generated_weeks = last_week
+            weekly_exercises = build_weekly_exercises(program, program_assignment, 1, last_week)
+            db.add_all(weekly_exercises)
+            if materialize and weekly_exercises:
+                from app.services.schedule_document_service import ScheduleDocumentService
 
-            program_weeks = program.duration_weeks or 4
-            sessions_per_week = program.sessions_per_week or len(program.workout_structure)
-
-            for week in range(1, program_weeks + 1):
-                for day_data in program.workout_structure:
-                    day_number = day_data.get("day", 1)
-
-                    days_offset = ((week - 1) * 7) + (
-                        (day_number - 1) * (7 // max(sessions_per_week, 1))
-                    )
-                    workout_date = start_date + timedelta(days=days_offset)
-
-                    for exercise_index, exercise_data in enumerate(
-                        day_data.get("exercises", [])
-                    ):
-                        weekly_exercise = WeeklyExerciseAssignment(
-                            program_assignment_id=program_assignment.id,
-                            client_id=program_assignment.client_id,
-                            trainer_id=program_assignment.trainer_id,
-                            exercise_id=exercise_data.get("exercise_id"),
-                            assigned_date=date.today(),
-                            due_date=workout_date,
-                            week_number=week,
-                            day_number=day_number,
-                            exercise_order=exercise_index + 1,
-                            sets=exercise_data.get("sets", 3),
-                            reps=exercise_data.get("reps", "10"),
-                            weight=exercise_data.get("weight", "bodyweight"),
-                            rest_seconds=exercise_data.get("rest_seconds", 60),
-                            exercise_notes=exercise_data.get("notes", ""),
-                            status=WeeklyExerciseStatus.PENDING,
-                        )
-                        db.add(weekly_exercise)
-                        weekly_exercises.append(weekly_exercise)
+                due_dates = [ex.due_date for ex in weekly_exercises]
+                await ScheduleDocumentService.refresh(
+                    db, [program_assignment.client_id], min(due_dates), max(due_dates)
+                )
 
-            await db.commit()
+            if commit:
+                await db.commit()
             logger.info(
                 f"Generated {len(weekly_exercises)} weekly exercise assignments for "
                 f"program assignment {program_assignment.id}"
@@ -82,8 +284,107 @@ class WeeklyExerciseService:
             return weekly_exercises
         except Exception as e:
             logger.error(f"Error generating weekly exercises: {e}")
-            await db.rollback()
+            if commit:
+                await db.rollback()
+            return []
+
+    @staticmethod
+    async def extend_horizons(
+        db: AsyncSession,
+        client_id: Optional[int] = None,
+        on: Optional[date] = None,
+        materialize: bool = True,
+    ) -> int:
+        """Generate the weeks active assignments have come up to.
+
+        Covers every assignment short of `horizon_week(on)` — one client's,
+        or all of them for the background job. Each range is claimed with
+        `claim_weeks` first, so concurrent runs (every worker's job, reads
+        extending a week) never generate it twice. Rebuilds the affected
+        schedule documents unless `materialize=False`. Leaves the commit
+        to the caller; returns the number of rows added.
+        """
+        pa = ProgramAssignment
+        stmt = (
+            select(pa)
+            .options(joinedload(pa.program))
+            .join(Program, Program.id == pa.program_id)
+            .where(
+                pa.status == AssignmentStatus.ACTIVE,
+                pa.generated_weeks < func.coalesce(Program.duration_weeks, 4),
+            )
+        )
+        if client_id is not None:
+            stmt = stmt.where(pa.client_id == client_id)
+
+        added: List[WeeklyExerciseAssignment] = []
+        for assignment in (await db.execute(stmt)).scalars():
+            program = assignment.program
+            if not program.workout_structure:
+                continue
+            last_week = horizon_week(program, assignment, on)
+            first_week = assignment.generated_weeks + 1
+            if last_week < first_week or not await claim_weeks(db, assignment, last_week):
+                continue
+            rows = build_weekly_exercises(program, assignment, first_week, last_week)
+            db.add_all(rows)
+            added += rows
+
+        if added and materialize:
+            from app.services.schedule_document_service import ScheduleDocumentService
+
+            due_dates = [row.due_date for row in added]
+            await ScheduleDocumentService.refresh(
+                db, {row.client_id for row in added}, min(due_dates), max(due_dates)
+            )
+        if added:
+            logger.info(f"Extended weekly exercises by {len(added)} rows")
+        return len(added)
+
+    @staticmethod
+    async def preview_week(
+        db: AsyncSession, program_assignment_id: int, trainer_id: int, week_number: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Any program week as it will be generated, computed from the
+        workout structure without writing rows. None if the assignment
+        isn't the trainer's."""
+        pa = ProgramAssignment
+        assignment = (
+            await db.execute(
+                select(pa)
+                .options(joinedload(pa.program))
+                .where(pa.id == program_assignment_id, pa.trainer_id == trainer_id)
+            )
+        ).scalar_one_or_none()
+        if assignment is None:
+            return None
+        program = assignment.program
+        if not program or not program.workout_structure:
             return []
+        rows = build_weekly_exercises(program, assignment, week_number, week_number)
+        details = await WeeklyExerciseService.get_exercise_details(
+            db, (row.exercise_id for row in rows)
+        )
+        preview = []
+        for row in rows:
+            detail = details.get(row.exercise_id, {})
+            preview.append(
+                {
+                    "exercise_id": row.exercise_id,
+                    "exercise_name": detail.get("exercise_name", "Unknown Exercise"),
+                    "muscle_groups": parse_muscle_groups(detail.get("muscle_groups")),
+                    "week_number": row.week_number,
+                    "day_number": row.day_number,
+                    "due_date": row.due_date,
+                    "exercise_order": row.exercise_order,
+                    "sets": row.sets,
+                    "reps": row.reps,
+                    "weight": row.weight,
+                    "rest_seconds": row.rest_seconds,
+                    "exercise_notes": row.exercise_notes,
+                }
+            )
+        return preview
 
     @staticmethod
     async def get_client_weekly_exercises(
@@ -92,18 +393,7 @@ class WeeklyExerciseService:
         week_start: Optional[date] = None,
         status: Optional[WeeklyExerciseStatus] = None,
     ) -> List[WeeklyExerciseAssignment]:
-        stmt = (
-            select(WeeklyExerciseAssignment)
-            .options(
-                selectinload(WeeklyExerciseAssignment.exercise),
-                selectinload(WeeklyExerciseAssignment.client),
-                selectinload(WeeklyExerciseAssignment.trainer),
-                selectinload(WeeklyExerciseAssignment.program_assignment).selectinload(
-                    ProgramAssignment.program
-                ),
-            )
-            .where(WeeklyExerciseAssignment.client_id == client_id)
-        )
+        stmt = detail_select().where(WeeklyExerciseAssignment.client_id == client_id)
         if week_start:
             week_end = week_start + timedelta(days=6)
             stmt = stmt.where(
@@ -112,14 +402,61 @@ class WeeklyExerciseService:
             )
         if status:
             stmt = stmt.where(WeeklyExerciseAssignment.status == status)
-        stmt = stmt.order_by(
-            WeeklyExerciseAssignment.due_date,
-            WeeklyExerciseAssignment.day_number,
-            WeeklyExerciseAssignment.exercise_order,
-        )
         result = await db.execute(stmt)
         return list(result.scalars().all())
 
+    @staticmethod
+    async def get_week_schedule_rows(
+        db: AsyncSession,
+        client_id: int,
+        week_start: date,
+        fields: FieldSet = None,
+        normalized: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """One client's week as plain rows joined to the exercise library.
+
+        A single Core select (no ORM hydration or relationship loads) for
+        the schedule view, ordered by day then exercise order. With a sparse
+        `fields` set only those columns (plus the day and status the view
+        groups by) are read, and the exercise join is dropped when no
+        exercise column is wanted. `normalized` rows carry `exercise_id`
+        instead of the exercise columns; see `get_exercise_details`.
+        """
+        w = WeeklyExerciseAssignment
+        columns = select_columns(fields, SCHEDULE_FIELDS, "day_number", "status")
+        if normalized:
+            columns = [c for c in columns if c.key not in _EXERCISE_FIELDS]
+            if fields is not None and "exercise_id" not in fields:
+                columns.append(w.exercise_id)
+        stmt = select(*columns)
+        if not normalized and (fields is None or fields & _EXERCISE_FIELDS):
+            stmt = stmt.outerjoin(Exercise, Exercise.id == w.exercise_id)
+        else:
+            stmt = stmt.select_from(w)
+        stmt = stmt.where(
+            w.client_id == client_id,
+            w.due_date >= week_start,
+            w.due_date <= week_start + timedelta(days=6),
+        ).order_by(w.day_number, w.exercise_order, w.id)
+        return [dict(row) for row in (await db.execute(stmt)).mappings()]
+
+    @staticmethod
+    async def get_exercise_details(
+        db: AsyncSession, exercise_ids: Iterable[int], fields: FieldSet = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """Exercise-library columns for each id, read once however many
+        scheduled rows reference it."""
+        ids = {exercise_id for exercise_id in exercise_ids if exercise_id is not None}
+        columns = select_columns(fields, EXERCISE_DETAIL_FIELDS)
+        if not ids or not columns:
+            return {}
+        stmt = select(Exercise.id, *columns).where(Exercise.id.in_(ids))
+        details = {}
+        for row in (await db.execute(stmt)).mappings():
+            detail = dict(row)
+            details[detail.pop("id")] = detail
+        return details
+
     @staticmethod
     async def get_current_week_exercises(
         db: AsyncSession, client_id: int
@@ -158,6 +495,12 @@ class WeeklyExerciseService:
                 exercise.completed_date = func.now()
                 exercise.completion_percentage = 100
 
+            from app.services.rollup_service import RollupService
+            from app.services.schedule_document_service import ScheduleDocumentService
+
+            await ScheduleDocumentService.apply_status(db, exercise)
+            # Readers take this day from the rollups once the job has covered it
+            await RollupService.apply_exercise_status(db, exercise.client_id, exercise.assigned_date)
             await db.commit()
             return exercise
         except Exception as e:
@@ -169,11 +512,21 @@ class WeeklyExerciseService:
     async def delete_weekly_exercises_for_assignment(
         db: AsyncSession, program_assignment_id: int
     ) -> bool:
+        from app.services.schedule_document_service import ScheduleDocumentService
+
+        w = WeeklyExerciseAssignment
         try:
-            stmt = sql_delete(WeeklyExerciseAssignment).where(
-                WeeklyExerciseAssignment.program_assignment_id == program_assignment_id
-            )
-            await db.execute(stmt)
+            spans = (
+                await db.execute(
+                    select(w.client_id, func.min(w.due_date), func.max(w.due_date))
+                    .where(w.program_assignment_id == program_assignment_id)
+                    .group_by(w.client_id)
+                )
+            ).all()
+            await db.execute(sql_delete(w).where(w.program_assignment_id == program_assignment_id))
+            for client_id, first, last in spans:
+                if first is not None:
+                    await ScheduleDocumentService.refresh(db, [client_id], first, last)
             await db.commit()
             return True
         except Exception as e:
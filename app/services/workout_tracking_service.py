@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,6 +11,45 @@ from app.schemas.client_schemas import (
     WorkoutLogCreate,
     WorkoutLogResponse,
 )
+from app.services import training_load_service
+from app.services.progression_service import ProgressionService
+from app.utils.fields import FieldSet, select_columns
+
+# Column order mirrors WorkoutLogResponse / ExerciseLogResponse.
+_WORKOUT_COLUMNS = (
+    WorkoutLog.id,
+    WorkoutLog.assignment_id,
+    WorkoutLog.client_id,
+    WorkoutLog.workout_date,
+    WorkoutLog.day_number,
+    WorkoutLog.workout_name,
+    WorkoutLog.total_duration_minutes,
+    WorkoutLog.perceived_exertion,
+    WorkoutLog.client_notes,
+    WorkoutLog.trainer_feedback,
+    WorkoutLog.is_completed,
+    WorkoutLog.is_skipped,
+    WorkoutLog.skip_reason,
+    WorkoutLog.created_at,
+)
+# `?fields=` on workout histories: any workout column, plus "exercises" for
+# the embedded exercise logs (the second query only runs when it's asked for).
+WORKOUT_FIELDS = tuple(column.key for column in _WORKOUT_COLUMNS) + ("exercises",)
+_EXERCISE_COLUMNS = (
+    ExerciseLog.id,
+    ExerciseLog.exercise_name,
+    ExerciseLog.exercise_id,
+    ExerciseLog.exercise_order,
+    ExerciseLog.planned_sets,
+    ExerciseLog.planned_reps,
+    ExerciseLog.planned_weight,
+    ExerciseLog.planned_rest_seconds,
+    ExerciseLog.actual_sets,
+    ExerciseLog.difficulty_rating,
+    ExerciseLog.exercise_notes,
+    ExerciseLog.form_rating,
+    ExerciseLog.created_at,
+)
 
 
 class WorkoutTrackingService:
@@ -62,6 +101,15 @@ class WorkoutTrackingService:
             )
             db.add(exercise_log)
             exercise_logs.append(exercise_log)
+        if exercise_logs:
+            await db.flush()
+            await ProgressionService.index(
+                db,
+                (
+                    (log.id, client_id, log.exercise_id, workout_log.workout_date, log.actual_sets)
+                    for log in exercise_logs
+                ),
+            )
 
         if workout_data.is_completed:
             assignment.completed_workouts += 1
@@ -74,16 +122,11 @@ class WorkoutTrackingService:
 
     async def get_workout_log(
         self, db: AsyncSession, workout_id: int, client_id: int
-    ) -> Optional[WorkoutLogResponse]:
-        stmt = (
-            select(WorkoutLog)
-            .options(selectinload(WorkoutLog.exercise_logs))
-            .where(WorkoutLog.id == workout_id, WorkoutLog.client_id == client_id)
+    ) -> Optional[Dict[str, Any]]:
+        payloads = await self.workout_payloads(
+            db, WorkoutLog.id == workout_id, WorkoutLog.client_id == client_id
         )
-        workout_log = (await db.execute(stmt)).scalar_one_or_none()
-        if not workout_log:
-            return None
-        return self._format_workout_response(workout_log, workout_log.exercise_logs)
+        return payloads[0] if payloads else None
 
     async def get_workout_logs_for_assignment(
         self,
@@ -91,27 +134,65 @@ class WorkoutTrackingService:
         assignment_id: int,
         client_id: int,
         limit: int = 50,
-    ) -> List[WorkoutLogResponse]:
-        assignment = (
+        fields: FieldSet = None,
+    ) -> List[Dict[str, Any]]:
+        assignment_id = (
             await db.execute(
-                select(ProgramAssignment).where(
+                select(ProgramAssignment.id).where(
                     ProgramAssignment.id == assignment_id,
                     ProgramAssignment.client_id == client_id,
                 )
             )
         ).scalar_one_or_none()
-        if not assignment:
+        if not assignment_id:
             return []
+        return await self.workout_payloads(
+            db, WorkoutLog.assignment_id == assignment_id, limit=limit, fields=fields
+        )
 
+    async def workout_payloads(
+        self,
+        db: AsyncSession,
+        *criteria,
+        limit: Optional[int] = None,
+        fields: FieldSet = None,
+    ) -> List[Dict[str, Any]]:
+        """`WorkoutLogResponse`-shaped dicts built from Core rows, newest first.
+
+        Two statements regardless of size (workouts, then their exercise logs)
+        and no ORM identity-map work; hand the result to
+        `app.core.responses.render` to skip response-model re-validation.
+        A sparse `fields` set narrows the workout columns and skips the
+        exercise-log query unless "exercises" is in it.
+        """
+        columns = select_columns(fields, {c.key: c for c in _WORKOUT_COLUMNS})
         stmt = (
-            select(WorkoutLog)
-            .options(selectinload(WorkoutLog.exercise_logs))
-            .where(WorkoutLog.assignment_id == assignment_id)
-            .order_by(WorkoutLog.workout_date.desc())
-            .limit(limit)
+            select(*columns)
+            .where(*criteria)
+            .order_by(WorkoutLog.workout_date.desc(), WorkoutLog.id.desc())
+        )
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        workouts = [dict(row) for row in (await db.execute(stmt)).mappings()]
+        if not workouts or (fields is not None and "exercises" not in fields):
+            return workouts
+
+        by_id: Dict[int, Dict[str, Any]] = {}
+        for workout in workouts:
+            workout["exercises"] = []
+            by_id[workout["id"]] = workout
+
+        exercise_stmt = (
+            select(ExerciseLog.workout_log_id, *_EXERCISE_COLUMNS)
+            .where(ExerciseLog.workout_log_id.in_(list(by_id)))
+            .order_by(ExerciseLog.exercise_order, ExerciseLog.id)
         )
-        workout_logs = list((await db.execute(stmt)).scalars().all())
-        return [self._format_workout_response(log, log.exercise_logs) for log in workout_logs]
+        for row in (await db.execute(exercise_stmt)).mappings():
+            exercise = dict(row)
+            workout_id = exercise.pop("workout_log_id")
+            exercise["actual_sets"] = exercise["actual_sets"] or []
+            by_id[workout_id]["exercises"].append(exercise)
+        return workouts
 
     async def update_workout_log(
         self,
@@ -144,6 +225,7 @@ class WorkoutTrackingService:
                 setattr(workout_log, field, value)
 
         await db.commit()
+        training_load_service.invalidate(client_id)
         await db.refresh(workout_log)
 
         # Reload with exercise logs eagerly
@@ -163,21 +245,28 @@ class WorkoutTrackingService:
         update_data: dict,
     ) -> Optional[ExerciseLogResponse]:
         stmt = (
-            select(ExerciseLog)
+            select(ExerciseLog, WorkoutLog.workout_date)
             .join(WorkoutLog)
             .where(
                 ExerciseLog.id == exercise_log_id,
                 WorkoutLog.client_id == client_id,
             )
         )
-        exercise_log = (await db.execute(stmt)).scalar_one_or_none()
-        if not exercise_log:
+        row = (await db.execute(stmt)).one_or_none()
+        if not row:
             return None
+        exercise_log, workout_date = row
 
         allowed_fields = {"actual_sets", "difficulty_rating", "exercise_notes", "form_rating"}
         for field, value in update_data.items():
             if field in allowed_fields and hasattr(exercise_log, field):
                 setattr(exercise_log, field, value)
+        if "actual_sets" in update_data:
+            await ProgressionService.index(
+                db,
+                [(exercise_log.id, client_id, exercise_log.exercise_id, workout_date, exercise_log.actual_sets)],
+                replace=True,
+            )
 
         await db.commit()
         await db.refresh(exercise_log)
@@ -0,0 +1,67 @@
+"""Sparse fieldsets: `?fields=id,name,...` on heavy list endpoints.
+
+A route declares which top-level fields a client may ask for; the
+dependency parses the query parameter into a frozenset (or None when the
+parameter is absent, meaning "everything"). Handlers pass the set down so
+the SQL selects only the matching columns — JSON and long text columns are
+then only read when they were requested — and render the trimmed rows with
+`app.core.responses.render`, since a partial row no longer satisfies the
+route's response model.
+"""
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional
+
+from fastapi import HTTPException, Query, status
+
+FieldSet = Optional[FrozenSet[str]]
+
+
+def parse_fields(
+    raw: Optional[str], allowed: Iterable[str], always: Iterable[str] = ("id",)
+) -> FieldSet:
+    """Validate a comma-separated field list; `always` fields are implied."""
+    if raw is None:
+        return None
+    allowed = frozenset(allowed)
+    requested = frozenset(name.strip() for name in raw.split(",") if name.strip())
+    unknown = requested - allowed
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "message": f"Unknown fields: {', '.join(sorted(unknown))}",
+                "allowed": sorted(allowed),
+            },
+        )
+    return requested | frozenset(always)
+
+
+def sparse_fields(
+    allowed: Iterable[str], always: Iterable[str] = ("id",)
+) -> Callable[..., FieldSet]:
+    """Dependency factory for a route's `fields` query parameter."""
+    allowed = tuple(allowed)
+    always = tuple(always)
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None,
+            description=f"Comma-separated subset of: {', '.join(allowed)}",
+        ),
+    ) -> FieldSet:
+        return parse_fields(fields, allowed, always)
+
+    return dependency
+
+
+def select_columns(fields: FieldSet, columns: Mapping[str, Any], *required: str) -> List[Any]:
+    """The column expressions for `fields` (all of them when None), plus any
+    `required` ones the handler needs internally, in declaration order."""
+    wanted = None if fields is None else fields | set(required)
+    return [column for name, column in columns.items() if wanted is None or name in wanted]
+
+
+def trim(row: Dict[str, Any], fields: FieldSet) -> Dict[str, Any]:
+    """Drop keys that were only selected for the handler's own use."""
+    if fields is None:
+        return row
+    return {key: value for key, value in row.items() if key in fields}
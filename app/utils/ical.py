@@ -0,0 +1,99 @@
+"""Minimal iCalendar (RFC 5545) writer for read-only calendar feeds.
+
+Produces text one component at a time so a feed can be streamed straight
+from a database cursor instead of being assembled in memory. Only what the
+appointment feeds need: VCALENDAR framing and VEVENTs with text escaping and
+75-octet line folding.
+"""
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+CRLF = "\r\n"
+PRODID = "-//FitnessCoach//Appointments//EN"
+
+
+def escape_text(value: str) -> str:
+    """Escape a TEXT value (backslash, semicolon, comma, newline)."""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line: str) -> str:
+    """Fold a content line into chunks of at most 75 octets, CRLF-terminated.
+
+    Splits on character boundaries so multi-byte UTF-8 sequences are never
+    cut; continuation lines start with a single space.
+    """
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + CRLF
+    parts, current, size, limit = [], [], 0, 75
+    for char in line:
+        width = len(char.encode("utf-8"))
+        if size + width > limit:
+            parts.append("".join(current))
+            current, size, limit = [], 0, 74  # the leading space counts
+        current.append(char)
+        size += width
+    parts.append("".join(current))
+    return (CRLF + " ").join(parts) + CRLF
+
+
+def format_local(value: datetime) -> str:
+    """Floating date-time: appointment times are wall-clock, not UTC."""
+    return value.strftime("%Y%m%dT%H%M%S")
+
+
+def format_utc(value: datetime) -> str:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+def calendar_header(name: str) -> str:
+    return "".join(
+        fold(line)
+        for line in (
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:{PRODID}",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{escape_text(name)}",
+        )
+    )
+
+
+def calendar_footer() -> str:
+    return fold("END:VCALENDAR")
+
+
+def event(
+    uid: str,
+    start: datetime,
+    end: datetime,
+    summary: str,
+    stamp: datetime,
+    status: Optional[str] = None,
+    location: Optional[str] = None,
+    description: Optional[str] = None,
+) -> str:
+    lines: Iterable[Optional[str]] = (
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{format_utc(stamp)}",
+        f"LAST-MODIFIED:{format_utc(stamp)}",
+        f"DTSTART:{format_local(start)}",
+        f"DTEND:{format_local(end)}",
+        f"SUMMARY:{escape_text(summary)}",
+        f"STATUS:{status}" if status else None,
+        f"LOCATION:{escape_text(location)}" if location else None,
+        f"DESCRIPTION:{escape_text(description)}" if description else None,
+        "END:VEVENT",
+    )
+    return "".join(fold(line) for line in lines if line is not None)
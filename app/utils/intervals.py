@@ -0,0 +1,65 @@
+"""Static interval tree for half-open ``[start, end)`` ranges.
+
+Built once from a batch of intervals (e.g. a trainer's appointments inside a
+booking window) and then queried for every candidate slot, so checking N
+occurrences against M existing bookings costs O(M log M + N log M + hits)
+instead of N database round trips or an N×M scan.
+
+The tree is stored implicitly over the start-sorted arrays: the node for a
+slice ``[lo, hi)`` is its midpoint, and ``_max_end[mid]`` is the largest end
+inside that slice, which lets a query skip whole subtrees that finish before
+the probe starts.
+"""
+from typing import Any, Generic, Iterable, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class IntervalTree(Generic[T]):
+    __slots__ = ("_starts", "_ends", "_values", "_max_end")
+
+    def __init__(self, intervals: Iterable[Tuple[Any, Any, T]]):
+        ordered = sorted(intervals, key=lambda item: item[0])
+        self._starts = [item[0] for item in ordered]
+        self._ends = [item[1] for item in ordered]
+        self._values = [item[2] for item in ordered]
+        self._max_end: List[Any] = list(self._ends)
+        if ordered:
+            self._build(0, len(ordered))
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def _build(self, lo: int, hi: int) -> Any:
+        mid = (lo + hi) // 2
+        best = self._ends[mid]
+        if lo < mid:
+            best = max(best, self._build(lo, mid))
+        if mid + 1 < hi:
+            best = max(best, self._build(mid + 1, hi))
+        self._max_end[mid] = best
+        return best
+
+    def overlapping(self, start: Any, end: Any) -> List[T]:
+        """Values whose interval overlaps ``[start, end)``, in start order."""
+        found: List[Tuple[int, T]] = []
+        stack = [(0, len(self._starts))] if self._starts else []
+        while stack:
+            lo, hi = stack.pop()
+            mid = (lo + hi) // 2
+            # Everything in this slice ends before the probe starts.
+            if self._max_end[mid] <= start:
+                continue
+            if lo < mid:
+                stack.append((lo, mid))
+            # The right half starts no earlier than this node, so once this
+            # node starts at or after the probe's end neither can overlap.
+            if self._starts[mid] < end:
+                if self._ends[mid] > start:
+                    found.append((mid, self._values[mid]))
+                if mid + 1 < hi:
+                    stack.append((mid + 1, hi))
+        return [value for _, value in sorted(found, key=lambda item: item[0])]
+
+    def overlaps(self, start: Any, end: Any) -> bool:
+        return bool(self.overlapping(start, end))
@@ -0,0 +1,99 @@
+"""Character trie mapping words to the values that contain them.
+
+Built once from a batch of ``(word, value)`` pairs (e.g. every token of every
+food name) and then queried per keystroke: ``prefixed("chi")`` returns the
+values of every word starting with "chi" in O(len(prefix) + subtree) instead
+of a ``LIKE '%chi%'`` scan. Short prefixes have the largest subtrees, so
+their results are memoized until the next insert.
+
+``similar(word, max_edits)`` walks the trie with a Levenshtein row per node
+and prunes any branch whose row minimum already exceeds ``max_edits``, which
+finds "chiken" → "chicken" without comparing against every word.
+"""
+from typing import Dict, Generic, Hashable, Iterable, List, Set, Tuple, TypeVar
+
+T = TypeVar("T", bound=Hashable)
+
+# Prefixes up to this length keep their collected values.
+MEMO_LENGTH = 2
+
+
+class _Node:
+    __slots__ = ("children", "values")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_Node"] = {}
+        self.values: Set = set()
+
+
+class PrefixTrie(Generic[T]):
+    __slots__ = ("_root", "_memo", "_words")
+
+    def __init__(self, pairs: Iterable[Tuple[str, T]] = ()):
+        self._root = _Node()
+        self._memo: Dict[str, Set[T]] = {}
+        self._words = 0
+        for word, value in pairs:
+            self.insert(word, value)
+
+    def __len__(self) -> int:
+        return self._words
+
+    def insert(self, word: str, value: T) -> None:
+        node = self._root
+        for char in word:
+            node = node.children.setdefault(char, _Node())
+        if not node.values:
+            self._words += 1
+        node.values.add(value)
+        if self._memo:
+            self._memo.clear()
+
+    def _find(self, prefix: str):
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def prefixed(self, prefix: str) -> Set[T]:
+        """Values of every word starting with `prefix`. Treat as read-only."""
+        memoized = self._memo.get(prefix)
+        if memoized is not None:
+            return memoized
+        node = self._find(prefix)
+        found: Set[T] = set()
+        if node is not None:
+            stack = [node]
+            while stack:
+                node = stack.pop()
+                found.update(node.values)
+                stack.extend(node.children.values())
+        if len(prefix) <= MEMO_LENGTH:
+            self._memo[prefix] = found
+        return found
+
+    def similar(self, word: str, max_edits: int = 1) -> Set[T]:
+        """Values of every word within `max_edits` edits of `word`."""
+        found: Set[T] = set()
+        first_row = list(range(len(word) + 1))
+        stack: List[Tuple[_Node, str, List[int]]] = [
+            (child, char, first_row) for char, child in self._root.children.items()
+        ]
+        while stack:
+            node, char, previous = stack.pop()
+            row = [previous[0] + 1]
+            for column in range(1, len(word) + 1):
+                row.append(
+                    min(
+                        row[column - 1] + 1,
+                        previous[column] + 1,
+                        previous[column - 1] + (word[column - 1] != char),
+                    )
+                )
+            if row[-1] <= max_edits:
+                found.update(node.values)
+            if min(row) <= max_edits:
+                stack.extend((child, c, row) for c, child in node.children.items())
+        return found
@@ -0,0 +1,57 @@
+"""Bounded LRU of computed values, each stored with the stamp it was built at.
+
+A stamp is whatever cheaply identifies the inputs' version — a row's
+`updated_at`, a table version, a count and latest write — and is read by the
+caller before the lookup. An entry only hits while its stamp still matches,
+so a changed input misses without explicit invalidation and the stale entry
+is replaced in place; `invalidate()` is left for changes the stamp can't see
+(edits inside the timestamp's resolution, related rows). The least recently
+used entries are dropped past `max_entries`.
+
+The cache is per process. Values are shared between callers, who must treat
+them as read-only.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class StampedCache(Generic[V]):
+    __slots__ = ("max_entries", "stats", "_entries")
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+        self._entries: "OrderedDict[Hashable, Tuple[Any, V]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, stamp: Any) -> Optional[V]:
+        """The value stored for `key` at `stamp`, or None (counted as a miss)."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[1]
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, key: Hashable, stamp: Any, value: V) -> V:
+        self._entries[key] = (stamp, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, owner: Optional[Hashable] = None) -> None:
+        """Forget `owner`'s entries — the key itself, or the first element of
+        tuple keys — or everything when no owner is given."""
+        if owner is None:
+            self._entries.clear()
+            return
+        for key in [
+            k for k in self._entries if k == owner or (isinstance(k, tuple) and k and k[0] == owner)
+        ]:
+            del self._entries[key]
@@ -0,0 +1,57 @@
+"""Numeric loads from the free-text set data in workout logs.
+
+`ExerciseLog.actual_sets` holds JSON like
+``[{"set": 1, "reps": 10, "weight": "60kg", "completed": true}]`` where the
+weight is whatever the client typed: "60kg", "60 kg", "135lbs", "60",
+"bodyweight", "80%". These helpers turn that into kilograms (None when the
+load is not an absolute weight) and reps into an int.
+"""
+import re
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+KG_PER_LB = 0.45359237
+
+_LOAD = re.compile(r"^\s*(\d+(?:[.,]\d+)?)\s*(kg|kgs|kilos?|lb|lbs|pounds?)?\s*$", re.IGNORECASE)
+_REPS = re.compile(r"^\s*(\d+)")
+
+
+def parse_weight_kg(value: Any) -> Optional[float]:
+    """Kilograms for a load such as 60, "60kg" or "135 lbs"; None otherwise."""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _LOAD.match(str(value))
+    if not match:
+        return None
+    amount = float(match.group(1).replace(",", "."))
+    unit = (match.group(2) or "kg").lower()
+    return amount * KG_PER_LB if unit.startswith(("lb", "pound")) else amount
+
+
+def parse_reps(value: Any) -> Optional[int]:
+    """Reps as an int: 8, "8" and "8-12" (the low end) all give 8."""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    match = _REPS.match(str(value))
+    return int(match.group(1)) if match else None
+
+
+def loaded_sets(actual_sets: Optional[Iterable[dict]]) -> Iterator[Tuple[int, int, float]]:
+    """(position from 1, reps, kg) for each completed set with an absolute load."""
+    for position, entry in enumerate(actual_sets or (), start=1):
+        if not isinstance(entry, dict) or entry.get("completed") is False:
+            continue
+        reps = parse_reps(entry.get("reps"))
+        kg = parse_weight_kg(entry.get("weight"))
+        if reps and kg:
+            yield position, reps, kg
+
+
+def set_tonnage(actual_sets: Optional[Iterable[dict]]) -> float:
+    """Sum of reps × kg over the completed sets that have an absolute load."""
+    return sum((reps * kg for _, reps, kg in loaded_sets(actual_sets)), 0.0)
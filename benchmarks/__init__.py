@@ -0,0 +1,2 @@
+"""Load benchmarks for the API: a deterministic seeder, scripted scenarios
+and a runner that reports latency percentiles and queries per request."""
@@ -0,0 +1,170 @@
+"""Benchmark: scoring every active assignment for churn risk.
+
+    python -m benchmarks.adherence [--assignments 10000] [--repeat 3]
+    python -m benchmarks.adherence --database-url postgresql+psycopg://.../fitness_bench
+
+Seeds N clients (one active assignment each, 500 per trainer) with six
+weeks of weekly exercises, three per week: most clients steady, some
+missing half their recent exercises, one in ten stopped two weeks ago.
+Reports AdherenceService.score_all:
+  first     the first run, which notifies every high-risk client
+  rescore   later runs over unchanged data (no new notifications)
+and the statements each run issues, which don't grow with N.
+
+Like benchmarks.run, the target database's schema is dropped and recreated.
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.database import Base
+from app.models import Client, Exercise, Program, ProgramAssignment, User, WeeklyExerciseAssignment
+from app.models.program import DifficultyLevel, ProgramType
+from app.models.weekly_exercise import WeeklyExerciseStatus
+from app.services.adherence_service import AdherenceService
+from benchmarks.run import DEFAULT_DATABASE_URL
+
+PER_TRAINER = 500
+WEEKS = 6
+TODAY = date(2025, 3, 3)
+CHUNK = 5000
+
+
+def _status(profile: int, days_ago: int, n: int) -> WeeklyExerciseStatus:
+    recent = days_ago <= 14
+    if profile == 9 and recent:  # Stopped
+        return WeeklyExerciseStatus.SKIPPED if n % 2 else WeeklyExerciseStatus.PENDING
+    if profile >= 7 and recent and n % 2:  # Wobbly
+        return WeeklyExerciseStatus.SKIPPED
+    return WeeklyExerciseStatus.COMPLETED
+
+
+async def seed(conn, assignments: int) -> None:
+    exercise_id = (
+        await conn.execute(
+            insert(Exercise).values(name="Squat", is_public=True).returning(Exercise.id)
+        )
+    ).scalar_one()
+    started = datetime.combine(TODAY - timedelta(days=WEEKS * 7), datetime.min.time())
+    for first in range(0, assignments, PER_TRAINER):
+        count = min(PER_TRAINER, assignments - first)
+        trainer_id = (
+            await conn.execute(
+                insert(User)
+                .values(email=f"adherence{first}@bench.local", first_name="Adherence", last_name="Bench", hashed_password="x")
+                .returning(User.id)
+            )
+        ).scalar_one()
+        program_id = (
+            await conn.execute(
+                insert(Program)
+                .values(
+                    trainer_id=trainer_id,
+                    name="Base",
+                    program_type=ProgramType.STRENGTH,
+                    difficulty_level=DifficultyLevel.BEGINNER,
+                    duration_weeks=12,
+                    sessions_per_week=3,
+                    workout_structure=[],
+                )
+                .returning(Program.id)
+            )
+        ).scalar_one()
+        client_ids = (
+            await conn.execute(
+                insert(Client).returning(Client.id, sort_by_parameter_order=True),
+                [
+                    {"trainer_id": trainer_id, "first_name": "Client", "last_name": str(first + i)}
+                    for i in range(count)
+                ],
+            )
+        ).scalars().all()
+        profiles = [(first + i) % 10 for i in range(count)]
+        assignment_ids = (
+            await conn.execute(
+                insert(ProgramAssignment).returning(ProgramAssignment.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "program_id": program_id,
+                        "client_id": client_id,
+                        "trainer_id": trainer_id,
+                        "start_date": started,
+                        "last_workout_date": datetime.combine(
+                            TODAY - timedelta(days=15 if profile == 9 else 2), datetime.min.time()
+                        ),
+                    }
+                    for client_id, profile in zip(client_ids, profiles)
+                ],
+            )
+        ).scalars().all()
+
+        rows = []
+        for assignment_id, client_id, profile in zip(assignment_ids, client_ids, profiles):
+            for n in range(WEEKS * 3):
+                days_ago = WEEKS * 7 - (n // 3) * 7 - (n % 3) * 2 - 1
+                status = _status(profile, days_ago, n)
+                day = TODAY - timedelta(days=days_ago)
+                rows.append(
+                    {
+                        "program_assignment_id": assignment_id,
+                        "client_id": client_id,
+                        "trainer_id": trainer_id,
+                        "exercise_id": exercise_id,
+                        "assigned_date": started.date(),
+                        "due_date": day,
+                        "week_number": n // 3 + 1,
+                        "day_number": n % 3 + 1,
+                        "sets": 3,
+                        "reps": "10",
+                        "status": status,
+                        "completed_date": (
+                            datetime.combine(day, datetime.min.time())
+                            if status is WeeklyExerciseStatus.COMPLETED
+                            else None
+                        ),
+                    }
+                )
+        for offset in range(0, len(rows), CHUNK):
+            await conn.execute(insert(WeeklyExerciseAssignment), rows[offset : offset + CHUNK])
+
+
+async def run(database_url: str, assignments: int, repeat: int) -> Dict:
+    engine = create_async_engine(database_url)
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(1))
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        async with engine.begin() as conn:
+            await seed(conn, assignments)
+
+        results: Dict[str, Dict] = {}
+        async with AsyncSession(engine) as db:
+            for name in ["first"] + ["rescore"] * repeat:
+                statements.clear()
+                started = time.perf_counter()
+                outcome = await AdherenceService.score_all(db, TODAY)
+                elapsed = (time.perf_counter() - started) * 1000
+                if name in results:
+                    results[name]["ms"] = round(min(results[name]["ms"], elapsed), 1)
+                    continue
+                results[name] = {**outcome, "statements": len(statements), "ms": round(elapsed, 1)}
+        return {"database": engine.url.get_backend_name(), "assignments": assignments, "runs": results}
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--assignments", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.database_url, args.assignments, args.repeat)), indent=2))
@@ -0,0 +1,62 @@
+"""Compare two benchmark result files.
+
+    python -m benchmarks.compare baseline.json candidate.json
+
+Prints per-scenario p50/p95/p99 and queries/request with the relative change.
+Exits non-zero when any scenario's p95 regressed by more than --threshold
+percent or its query count went up.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional
+
+METRICS = ["p50_ms", "p95_ms", "p99_ms", "queries_per_request"]
+
+
+def _delta(old: Optional[float], new: Optional[float]) -> str:
+    if old is None or new is None:
+        return "n/a"
+    if old == 0:
+        return "+0.0%" if new == 0 else "new"
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+def compare(baseline: Dict, candidate: Dict, threshold: float) -> List[str]:
+    """Print the comparison table; return the regressions found."""
+    regressions: List[str] = []
+    print(f"{'scenario':<20} {'metric':<20} {'baseline':>10} {'candidate':>10} {'change':>8}")
+    for name, new in candidate["scenarios"].items():
+        old = baseline["scenarios"].get(name)
+        if old is None:
+            print(f"{name:<20} (not in baseline)")
+            continue
+        for metric in METRICS:
+            print(
+                f"{name:<20} {metric:<20} {old.get(metric)!s:>10} "
+                f"{new.get(metric)!s:>10} {_delta(old.get(metric), new.get(metric)):>8}"
+            )
+        if old["p95_ms"] and (new["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 > threshold:
+            regressions.append(f"{name}: p95 {old['p95_ms']}ms -> {new['p95_ms']}ms")
+        if (old.get("queries_per_request") or 0) < (new.get("queries_per_request") or 0):
+            regressions.append(
+                f"{name}: queries/request {old['queries_per_request']} -> {new['queries_per_request']}"
+            )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="allowed p95 slowdown in percent")
+    args = parser.parse_args()
+    with open(args.baseline) as fh:
+        baseline = json.load(fh)
+    with open(args.candidate) as fh:
+        candidate = json.load(fh)
+    found = compare(baseline, candidate, args.threshold)
+    for line in found:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    sys.exit(1 if found else 0)
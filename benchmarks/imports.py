@@ -0,0 +1,179 @@
+"""Throughput benchmark: importing workout history.
+
+    python -m benchmarks.imports [--workouts 100000] [--exercises 2] [--chunk-size 1000]
+    python -m benchmarks.imports --database-url postgresql+psycopg://.../fitness_bench
+
+Seeds one trainer with 20 clients (each with a program assignment), writes
+N workouts (each with E exercise logs) as NDJSON and reports rows/sec for:
+  per-workout  WorkoutTrackingService.create_workout_log, one workout per
+               commit (what the API did), on a sample of `--baseline` rows
+  import       ImportService.run over the whole file: batched validation,
+               executemany per chunk inside a savepoint
+
+Like benchmarks.run, the target database's schema is dropped and recreated.
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models import Client, ImportKind, Program, ProgramAssignment, User, WorkoutLog
+from app.models.program import DifficultyLevel, ProgramType
+from app.schemas.client_schemas import WorkoutLogCreate
+from app.services.import_service import CHUNK_SIZE, ImportService
+from app.services.workout_tracking_service import WorkoutTrackingService
+from benchmarks.run import DEFAULT_DATABASE_URL
+
+CLIENTS = 20
+ANCHOR = datetime(2025, 1, 6, 7, 0)
+
+
+async def seed(conn) -> Dict:
+    trainer_id = (
+        await conn.execute(
+            insert(User)
+            .values(email="import@bench.local", first_name="Import", last_name="Bench", hashed_password="x")
+            .returning(User.id)
+        )
+    ).scalar_one()
+    program_id = (
+        await conn.execute(
+            insert(Program)
+            .values(
+                trainer_id=trainer_id,
+                name="History",
+                program_type=ProgramType.STRENGTH,
+                difficulty_level=DifficultyLevel.BEGINNER,
+                duration_weeks=52,
+                sessions_per_week=3,
+                workout_structure=[],
+            )
+            .returning(Program.id)
+        )
+    ).scalar_one()
+    assignments = {}
+    for i in range(CLIENTS):
+        client_id = (
+            await conn.execute(
+                insert(Client)
+                .values(trainer_id=trainer_id, first_name="Client", last_name=str(i))
+                .returning(Client.id)
+            )
+        ).scalar_one()
+        assignments[client_id] = (
+            await conn.execute(
+                insert(ProgramAssignment)
+                .values(program_id=program_id, client_id=client_id, trainer_id=trainer_id)
+                .returning(ProgramAssignment.id)
+            )
+        ).scalar_one()
+    return {"trainer_id": trainer_id, "assignments": assignments}
+
+
+def workout_rows(assignments: Dict[int, int], workouts: int, exercises: int):
+    clients = list(assignments)
+    for i in range(workouts):
+        client_id = clients[i % len(clients)]
+        yield {
+            "client_id": client_id,
+            "assignment_id": assignments[client_id],
+            "workout_date": (ANCHOR - timedelta(hours=i)).isoformat(),
+            "day_number": i % 3 + 1,
+            "total_duration_minutes": 60,
+            "perceived_exertion": 7,
+            "exercises": [
+                {
+                    "exercise_name": f"Lift {e}",
+                    "exercise_order": e + 1,
+                    "actual_sets": [{"set": s + 1, "reps": 8, "weight": "60kg"} for s in range(3)],
+                }
+                for e in range(exercises)
+            ],
+        }
+
+
+async def per_workout(engine, rows: List[Dict]) -> float:
+    service = WorkoutTrackingService()
+    started = time.perf_counter()
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        for row in rows:
+            client_id = row.pop("client_id")
+            await service.create_workout_log(db, WorkoutLogCreate(**row), client_id)
+    return time.perf_counter() - started
+
+
+async def run(database_url: str, workouts: int, exercises: int, chunk_size: int, baseline: int) -> Dict:
+    engine = create_async_engine(database_url)
+    upload_dir = tempfile.mkdtemp(prefix="import-bench-")
+    settings.import_upload_dir = upload_dir
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        async with engine.begin() as conn:
+            seeded = await seed(conn)
+
+        sample = list(workout_rows(seeded["assignments"], baseline, exercises))
+        baseline_s = await per_workout(engine, sample)
+
+        path = os.path.join(upload_dir, "history.ndjson")
+        with open(path, "w", encoding="utf-8") as f:
+            for row in workout_rows(seeded["assignments"], workouts, exercises):
+                f.write(json.dumps(row) + "\n")
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            with open(path, "rb") as upload:
+                job = await ImportService.create_job(
+                    db, seeded["trainer_id"], ImportKind.WORKOUTS, "ndjson", upload
+                )
+            started = time.perf_counter()
+            job = await ImportService.run(db, job, chunk_size=chunk_size)
+            import_s = time.perf_counter() - started
+            stored = await db.scalar(select(func.count(WorkoutLog.id)))
+
+        assert job.rows_imported == workouts, job.errors[:5]
+        return {
+            "database": engine.url.get_backend_name(),
+            "workouts": workouts,
+            "exercise_logs_per_workout": exercises,
+            "chunk_size": chunk_size,
+            "per-workout": {
+                "rows": baseline,
+                "seconds": round(baseline_s, 3),
+                "rows_per_sec": round(baseline / baseline_s, 1),
+            },
+            "import": {
+                "rows": job.rows_imported,
+                "seconds": round(import_s, 3),
+                "rows_per_sec": round(job.rows_imported / import_s, 1),
+                "workout_logs_stored": stored,
+            },
+        }
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--workouts", type=int, default=100_000)
+    parser.add_argument("--exercises", type=int, default=2)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--baseline", type=int, default=1000, help="Rows for the per-workout sample")
+    args = parser.parse_args()
+    print(
+        json.dumps(
+            asyncio.run(
+                run(args.database_url, args.workouts, args.exercises, args.chunk_size, args.baseline)
+            ),
+            indent=2,
+        )
+    )
@@ -0,0 +1,151 @@
+"""Scripted request mixes for the benchmark runner.
+
+A scenario turns the seed manifest into a stream of requests. `build(i)`
+returns the i-th request; `reset(conn, i)` (optional) undoes its writes
+outside the timed section so every iteration sees the same data.
+"""
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.security import create_access_token
+from app.models import ProgramAssignment, WeeklyExerciseAssignment
+from app.services import training_load_service
+from app.services.client_auth_service import client_auth_service
+from benchmarks.seed import BenchConfig, Manifest
+
+BULK_ASSIGN_BATCH = 10
+
+
+@dataclass
+class Request:
+    method: str
+    url: str
+    headers: Dict[str, str]
+    json: Any = None
+    params: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class Scenario:
+    name: str
+    route: str
+    build: Callable[[int], Request]
+    reset: Optional[Callable[[AsyncConnection, int], Awaitable[None]]] = None
+
+
+def _trainer_headers(email: str) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {create_access_token(subject=email)}"}
+
+
+def build_scenarios(manifest: Manifest, config: BenchConfig) -> List[Scenario]:
+    trainer_ids = list(manifest.programs)
+    trainer_headers = {
+        tid: _trainer_headers(email)
+        for tid, email in zip(trainer_ids, manifest.trainer_emails)
+    }
+    client_headers = {
+        assignment_id: {
+            "Authorization": "Bearer "
+            + client_auth_service.create_client_access_token(assignment_id, client_id)
+        }
+        for client_id, assignment_id, _ in manifest.assigned_clients
+    }
+    clients = manifest.assigned_clients
+    week_start = (config.anchor - timedelta(weeks=1)).isoformat()
+
+    def client_dashboard(i: int) -> Request:
+        _, assignment_id, _ = clients[i % len(clients)]
+        return Request("GET", "/api/v1/client/dashboard", client_headers[assignment_id])
+
+    def trainer_dashboard(i: int) -> Request:
+        tid = trainer_ids[i % len(trainer_ids)]
+        return Request("GET", "/api/v1/dashboard/trainer-stats", trainer_headers[tid])
+
+    def weekly_schedule(i: int) -> Request:
+        client_id, _, tid = clients[i % len(clients)]
+        return Request(
+            "GET",
+            f"/api/v1/weekly-exercises/client/{client_id}/schedule",
+            trainer_headers[tid],
+            params={"week_start": week_start},
+        )
+
+    def roster_analytics(i: int) -> Request:
+        tid = trainer_ids[i % len(trainer_ids)]
+        return Request(
+            "GET",
+            "/api/v1/weekly-exercises/trainer/clients-summary",
+            trainer_headers[tid],
+            params={"week_start": week_start, "sort": "completion_rate", "order": "desc"},
+        )
+
+    def training_load(i: int) -> Request:
+        tid = trainer_ids[i % len(trainer_ids)]
+        return Request(
+            "GET",
+            "/api/v1/progress/training-load",
+            trainer_headers[tid],
+            params={"day": config.anchor.isoformat()},
+        )
+
+    async def forget_training_load(conn: AsyncConnection, i: int) -> None:
+        training_load_service.invalidate()
+
+    def notification_inbox(i: int) -> Request:
+        tid = trainer_ids[i % len(trainer_ids)]
+        return Request(
+            "GET", "/api/v1/notifications/", trainer_headers[tid], params={"limit": 50}
+        )
+
+    def bulk_assign(i: int) -> Request:
+        tid = trainer_ids[i % len(trainer_ids)]
+        spare = manifest.spare_clients[tid][:BULK_ASSIGN_BATCH]
+        return Request(
+            "POST",
+            f"/api/v1/programs/{manifest.programs[tid][0]}/assign",
+            trainer_headers[tid],
+            json={"client_ids": spare},
+        )
+
+    async def undo_bulk_assign(conn: AsyncConnection, i: int) -> None:
+        tid = trainer_ids[i % len(trainer_ids)]
+        spare = manifest.spare_clients[tid][:BULK_ASSIGN_BATCH]
+        await conn.execute(
+            delete(WeeklyExerciseAssignment).where(WeeklyExerciseAssignment.client_id.in_(spare))
+        )
+        await conn.execute(
+            delete(ProgramAssignment).where(ProgramAssignment.client_id.in_(spare))
+        )
+
+    return [
+        Scenario("client_dashboard", "GET /api/v1/client/dashboard", client_dashboard),
+        Scenario("trainer_dashboard", "GET /api/v1/dashboard/trainer-stats", trainer_dashboard),
+        Scenario(
+            "weekly_schedule",
+            "GET /api/v1/weekly-exercises/client/{client_id}/schedule",
+            weekly_schedule,
+        ),
+        Scenario(
+            "roster_analytics",
+            "GET /api/v1/weekly-exercises/trainer/clients-summary",
+            roster_analytics,
+        ),
+        Scenario("training_load", "GET /api/v1/progress/training-load", training_load),
+        Scenario(
+            "training_load_cold",
+            "GET /api/v1/progress/training-load",
+            training_load,
+            reset=forget_training_load,
+        ),
+        Scenario("notification_inbox", "GET /api/v1/notifications/", notification_inbox),
+        Scenario(
+            "bulk_assign",
+            "POST /api/v1/programs/{program_id}/assign",
+            bulk_assign,
+            reset=undo_bulk_assign,
+        ),
+    ]
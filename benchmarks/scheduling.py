@@ -0,0 +1,175 @@
+"""Micro-benchmark: appointment conflict checks for a trainer with a long history.
+
+    python -m benchmarks.scheduling [--appointments 10000] [--weeks 12] [--repeat 50]
+    python -m benchmarks.scheduling --database-url postgresql+psycopg://.../fitness_bench
+
+Seeds one trainer with N past appointments (back-to-back working days, no
+overlaps, so the Postgres exclusion constraint accepts them) and times, for
+a single booking and for a weekly series:
+  legacy-or    the old three-branch OR overlap query, once per occurrence
+  windowed     AppointmentService.find_conflicts: one windowed query for the
+               whole series, answered per occurrence by an interval tree
+and the free-slot search (AppointmentService.find_free_slots) over the last
+three months of that history.
+
+Like benchmarks.run, the target database's schema is dropped and recreated.
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from sqlalchemy import and_, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.database import Base
+from app.models import Appointment, Client, User
+from app.models.schedule import AppointmentStatus
+from app.services.appointment_service import (
+    AppointmentService,
+    Slot,
+    WorkingHours,
+    weekly_occurrences,
+)
+from benchmarks.run import DEFAULT_DATABASE_URL
+
+SLOTS_PER_DAY = 8
+ANCHOR = datetime(2025, 1, 6, 7, 0)
+
+
+async def seed_history(conn, appointments: int) -> int:
+    trainer_id = (
+        await conn.execute(
+            insert(User)
+            .values(email="sched@bench.local", first_name="Sched", last_name="Bench", hashed_password="x")
+            .returning(User.id)
+        )
+    ).scalar_one()
+    client_id = (
+        await conn.execute(
+            insert(Client)
+            .values(trainer_id=trainer_id, first_name="Bench", last_name="Client")
+            .returning(Client.id)
+        )
+    ).scalar_one()
+
+    rows = []
+    for i in range(appointments):
+        day, slot = divmod(i, SLOTS_PER_DAY)
+        start = ANCHOR - timedelta(days=day + 1) + timedelta(hours=slot)
+        rows.append(
+            {
+                "trainer_id": trainer_id,
+                "client_id": client_id,
+                "title": "Session",
+                "appointment_type": "Personal Training",
+                "status": "completed" if i % 10 else "cancelled",
+                "start_time": start,
+                "end_time": start + timedelta(hours=1),
+                "duration_minutes": 60,
+                "created_at": start,
+                "updated_at": start,
+            }
+        )
+    for offset in range(0, len(rows), 1000):
+        await conn.execute(insert(Appointment), rows[offset : offset + 1000])
+    return trainer_id
+
+
+async def legacy_conflicts(db: AsyncSession, trainer_id: int, slots: List[Slot]) -> int:
+    """The pre-interval-index check: one three-branch OR query per slot."""
+    found = 0
+    for start, end in slots:
+        stmt = select(Appointment.id).where(
+            and_(
+                Appointment.trainer_id == trainer_id,
+                Appointment.status != AppointmentStatus.CANCELLED.value,
+                or_(
+                    and_(Appointment.start_time <= start, Appointment.end_time > start),
+                    and_(Appointment.start_time < end, Appointment.end_time >= end),
+                    and_(Appointment.start_time >= start, Appointment.end_time <= end),
+                ),
+            )
+        )
+        found += len((await db.execute(stmt)).all())
+    return found
+
+
+async def windowed_conflicts(db: AsyncSession, trainer_id: int, slots: List[Slot]) -> int:
+    return len(await AppointmentService(db).find_conflicts(trainer_id, slots))
+
+
+async def _time(fn: Callable, repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {"median_ms": round(samples[len(samples) // 2], 3), "min_ms": round(samples[0], 3)}
+
+
+async def run(database_url: str, appointments: int, weeks: int, repeat: int) -> Dict:
+    engine = create_async_engine(database_url)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        async with engine.begin() as conn:
+            trainer_id = await seed_history(conn, appointments)
+
+        # A new weekly series starting inside the seeded history's last week,
+        # so the first occurrences really do clash.
+        first = ANCHOR - timedelta(days=2) + timedelta(hours=1, minutes=30)
+        cases = {
+            "single": weekly_occurrences(first, first + timedelta(hours=1), 1),
+            f"series_{weeks}w": weekly_occurrences(first, first + timedelta(hours=1), weeks),
+        }
+        results: Dict[str, Dict] = {}
+        async with AsyncSession(engine) as db:
+            for name, slots in cases.items():
+                legacy = await legacy_conflicts(db, trainer_id, slots)
+                windowed = await windowed_conflicts(db, trainer_id, slots)
+                assert legacy == windowed, f"{name}: legacy found {legacy}, windowed {windowed}"
+                results[name] = {
+                    "occurrences": len(slots),
+                    "conflicts": windowed,
+                    "legacy-or": {
+                        "queries": len(slots),
+                        **await _time(lambda: legacy_conflicts(db, trainer_id, slots), repeat),
+                    },
+                    "windowed": {
+                        "queries": 1,
+                        **await _time(lambda: windowed_conflicts(db, trainer_id, slots), repeat),
+                    },
+                }
+            hours = WorkingHours.from_settings()
+            window = (ANCHOR - timedelta(days=91), ANCHOR)
+
+            async def availability():
+                return await AppointmentService(db).find_free_slots(
+                    trainer_id, *window, duration=timedelta(hours=1), hours=hours
+                )
+
+            windows, slots = await availability()
+            results["availability_3m"] = {
+                "free_windows": len(windows),
+                "slots": len(slots),
+                "queries": 1,
+                **await _time(availability, repeat),
+            }
+        return {"database": engine.url.get_backend_name(), "appointments": appointments, "cases": results}
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--appointments", type=int, default=10_000)
+    parser.add_argument("--weeks", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.database_url, args.appointments, args.weeks, args.repeat)), indent=2))
@@ -0,0 +1,313 @@
+"""Deterministic data generator for the benchmark database.
+
+`seed()` fills an empty schema with `trainers × clients_per_trainer` clients,
+each on an active program with `years` of workout history, body metrics,
+weekly exercises and trainer notifications. The same `BenchConfig` always
+produces the same rows (ids included), so runs are comparable.
+
+Rows are written with Core `insert()` executemany in chunks rather than
+through the ORM unit of work; primary keys are assigned here, and on
+PostgreSQL the id sequences are moved past them afterwards.
+"""
+import json
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.models import (
+    AssignmentStatus,
+    BodyMetric,
+    Client,
+    DifficultyLevel,
+    Exercise,
+    ExerciseLog,
+    Notification,
+    NotificationType,
+    Program,
+    ProgramAssignment,
+    ProgramType,
+    User,
+    UserRole,
+    WeeklyExerciseAssignment,
+    WeeklyExerciseStatus,
+    WorkoutLog,
+)
+
+CHUNK = 2000
+EXERCISE_LIBRARY = 60
+PROGRAMS_PER_TRAINER = 3
+DAYS_PER_PROGRAM = 3
+EXERCISES_PER_DAY = 4
+MUSCLE_GROUPS = ["chest", "back", "legs", "shoulders", "arms", "core", "glutes"]
+EQUIPMENT = ["barbell", "dumbbell", "kettlebell", "machine", "cable", "bodyweight"]
+
+
+@dataclass
+class BenchConfig:
+    trainers: int = 2
+    clients_per_trainer: int = 25
+    years: float = 1.0
+    workouts_per_week: int = 3
+    # Clients seeded without an assignment, used by the bulk-assign scenario.
+    spare_clients_per_trainer: int = 20
+    seed: int = 42
+    # Last day of generated history; fixed so that reruns match.
+    anchor: date = date(2025, 1, 6)
+
+
+@dataclass
+class Manifest:
+    """Ids the scenarios need; everything else is derived from the config."""
+
+    trainer_emails: List[str] = field(default_factory=list)
+    # trainer id -> program ids
+    programs: Dict[int, List[int]] = field(default_factory=dict)
+    # (client id, active assignment id, trainer id)
+    assigned_clients: List[tuple] = field(default_factory=list)
+    # trainer id -> client ids without an assignment
+    spare_clients: Dict[int, List[int]] = field(default_factory=dict)
+    rows: Dict[str, int] = field(default_factory=dict)
+
+
+class _Writer:
+    def __init__(self, conn: AsyncConnection):
+        self.conn = conn
+        self.next_id: Dict[str, int] = {}
+        self.pending: Dict[str, List[dict]] = {}
+        self.counts: Dict[str, int] = {}
+        self.models = {}
+
+    def add(self, model, **values) -> int:
+        table = model.__tablename__
+        self.models[table] = model
+        row_id = self.next_id.get(table, 1)
+        self.next_id[table] = row_id + 1
+        rows = self.pending.setdefault(table, [])
+        rows.append({"id": row_id, **values})
+        return row_id
+
+    async def flush(self, *models) -> None:
+        for model in models:
+            table = model.__tablename__
+            rows = self.pending.pop(table, [])
+            for start in range(0, len(rows), CHUNK):
+                await self.conn.execute(insert(model), rows[start:start + CHUNK])
+            self.counts[table] = self.counts.get(table, 0) + len(rows)
+
+    async def flush_if_large(self, *models) -> None:
+        if any(len(self.pending.get(m.__tablename__, [])) >= CHUNK for m in models):
+            await self.flush(*models)
+
+
+async def seed(conn: AsyncConnection, config: BenchConfig) -> Manifest:
+    rng = random.Random(config.seed)
+    w = _Writer(conn)
+    manifest = Manifest()
+    start = config.anchor - timedelta(days=int(config.years * 365))
+    weeks = max(1, int(config.years * 52))
+
+    exercise_ids = [
+        w.add(
+            Exercise,
+            name=f"Exercise {i + 1}",
+            description="Benchmark exercise",
+            muscle_groups=json.dumps(rng.sample(MUSCLE_GROUPS, 2)),
+            equipment=json.dumps(rng.sample(EQUIPMENT, 1)),
+            difficulty_level=rng.choice(["beginner", "intermediate", "advanced"]),
+            is_public=True,
+        )
+        for i in range(EXERCISE_LIBRARY)
+    ]
+    exercise_names = {eid: f"Exercise {eid}" for eid in exercise_ids}
+    await w.flush(Exercise)
+
+    structures: Dict[int, list] = {}
+    for t in range(config.trainers):
+        email = f"bench-trainer-{t + 1}@example.com"
+        trainer_id = w.add(
+            User,
+            email=email,
+            first_name="Bench",
+            last_name=f"Trainer {t + 1}",
+            hashed_password="!",
+            role=UserRole.TRAINER,
+            is_active=True,
+        )
+        manifest.trainer_emails.append(email)
+        manifest.programs[trainer_id] = []
+        for p in range(PROGRAMS_PER_TRAINER):
+            structure = [
+                {
+                    "day": day + 1,
+                    "name": f"Day {day + 1}",
+                    "exercises": [
+                        {
+                            "exercise_id": eid,
+                            "name": exercise_names[eid],
+                            "sets": rng.randint(3, 5),
+                            "reps": str(rng.choice([5, 8, 10, 12])),
+                            "weight": f"{rng.randint(10, 120)}kg",
+                            "rest_seconds": rng.choice([60, 90, 120]),
+                        }
+                        for eid in rng.sample(exercise_ids, EXERCISES_PER_DAY)
+                    ],
+                }
+                for day in range(DAYS_PER_PROGRAM)
+            ]
+            program_id = w.add(
+                Program,
+                trainer_id=trainer_id,
+                name=f"Bench Program {t + 1}.{p + 1}",
+                description="Generated for benchmarks",
+                program_type=rng.choice(list(ProgramType)),
+                difficulty_level=rng.choice(list(DifficultyLevel)),
+                duration_weeks=4,
+                sessions_per_week=DAYS_PER_PROGRAM,
+                workout_structure=structure,
+            )
+            structures[program_id] = structure
+            manifest.programs[trainer_id].append(program_id)
+    await w.flush(User, Program)
+
+    history_models = (
+        WorkoutLog, ExerciseLog, BodyMetric, WeeklyExerciseAssignment, Notification
+    )
+    for trainer_id, program_ids in manifest.programs.items():
+        for c in range(config.clients_per_trainer):
+            client_id = w.add(
+                Client,
+                trainer_id=trainer_id,
+                first_name=f"Client {c + 1}",
+                last_name=f"T{trainer_id}",
+                email=f"bench-client-{trainer_id}-{c + 1}@example.com",
+                weight=round(rng.uniform(55, 110), 1),
+                height=round(rng.uniform(155, 200), 1),
+                is_active=True,
+            )
+            program_id = rng.choice(program_ids)
+            structure = structures[program_id]
+            assignment_start = datetime.combine(config.anchor - timedelta(weeks=2), datetime.min.time())
+            assignment_id = w.add(
+                ProgramAssignment,
+                program_id=program_id,
+                client_id=client_id,
+                trainer_id=trainer_id,
+                start_date=assignment_start,
+                status=AssignmentStatus.ACTIVE,
+                total_sessions=4 * DAYS_PER_PROGRAM,
+                total_workouts=4 * DAYS_PER_PROGRAM,
+                completed_workouts=rng.randint(0, 4 * DAYS_PER_PROGRAM),
+            )
+            manifest.assigned_clients.append((client_id, assignment_id, trainer_id))
+            await w.flush(Client, ProgramAssignment)
+
+            weight = rng.uniform(60, 100)
+            for week in range(weeks):
+                week_start = start + timedelta(weeks=week)
+                w.add(
+                    BodyMetric,
+                    client_id=client_id,
+                    measured_at=week_start,
+                    weight=round(weight, 1),
+                    body_fat_percentage=round(rng.uniform(10, 30), 1),
+                )
+                weight += rng.uniform(-0.6, 0.4)
+                for session in range(config.workouts_per_week):
+                    day_data = structure[session % len(structure)]
+                    workout_at = datetime.combine(
+                        week_start + timedelta(days=session * 2), datetime.min.time()
+                    ) + timedelta(hours=rng.randint(6, 20))
+                    log_id = w.add(
+                        WorkoutLog,
+                        assignment_id=assignment_id,
+                        client_id=client_id,
+                        workout_date=workout_at,
+                        day_number=day_data["day"],
+                        workout_name=day_data["name"],
+                        total_duration_minutes=rng.randint(35, 90),
+                        perceived_exertion=rng.randint(5, 10),
+                        is_completed=True,
+                    )
+                    for order, ex in enumerate(day_data["exercises"], start=1):
+                        w.add(
+                            ExerciseLog,
+                            workout_log_id=log_id,
+                            exercise_id=ex["exercise_id"],
+                            exercise_name=ex["name"],
+                            exercise_order=order,
+                            planned_sets=ex["sets"],
+                            planned_reps=ex["reps"],
+                            planned_weight=ex["weight"],
+                            actual_sets=[
+                                {"set": s + 1, "reps": int(ex["reps"]), "weight": ex["weight"], "completed": True}
+                                for s in range(ex["sets"])
+                            ],
+                        )
+                    if week_start >= config.anchor - timedelta(days=30):
+                        w.add(
+                            Notification,
+                            user_id=trainer_id,
+                            notification_type=NotificationType.WORKOUT_COMPLETED,
+                            title="Workout completed",
+                            message=f"Client {c + 1} completed {day_data['name']}",
+                            related_client_id=client_id,
+                            related_workout_log_id=log_id,
+                            client_name=f"Client {c + 1} T{trainer_id}",
+                            is_read=rng.random() < 0.5,
+                        )
+
+            # Current program block: four weeks of planned exercises.
+            for week in range(1, 5):
+                for day_data in structure:
+                    due = assignment_start.date() + timedelta(
+                        days=(week - 1) * 7 + (day_data["day"] - 1) * 2
+                    )
+                    for order, ex in enumerate(day_data["exercises"], start=1):
+                        done = due < config.anchor
+                        w.add(
+                            WeeklyExerciseAssignment,
+                            program_assignment_id=assignment_id,
+                            client_id=client_id,
+                            trainer_id=trainer_id,
+                            exercise_id=ex["exercise_id"],
+                            assigned_date=assignment_start.date(),
+                            due_date=due,
+                            week_number=week,
+                            day_number=day_data["day"],
+                            exercise_order=order,
+                            sets=ex["sets"],
+                            reps=ex["reps"],
+                            weight=ex["weight"],
+                            rest_seconds=ex["rest_seconds"],
+                            status=WeeklyExerciseStatus.COMPLETED if done else WeeklyExerciseStatus.PENDING,
+                            completion_percentage=100 if done else 0,
+                        )
+            await w.flush_if_large(*history_models)
+
+        manifest.spare_clients[trainer_id] = [
+            w.add(
+                Client,
+                trainer_id=trainer_id,
+                first_name=f"Spare {s + 1}",
+                last_name=f"T{trainer_id}",
+                is_active=True,
+            )
+            for s in range(config.spare_clients_per_trainer)
+        ]
+        await w.flush(Client)
+
+    await w.flush(*history_models)
+    if conn.dialect.name == "postgresql":
+        for table in w.next_id:
+            await conn.execute(
+                text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"(SELECT COALESCE(MAX(id), 1) FROM {table}))"
+                )
+            )
+    manifest.rows = dict(sorted(w.counts.items()))
+    return manifest
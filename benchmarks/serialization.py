@@ -0,0 +1,140 @@
+"""Micro-benchmark: cost of rendering a 50-workout history response.
+
+    python -m benchmarks.serialization [--workouts 50] [--repeat 200]
+
+Compares, for the same payload:
+  pydantic+fastapi  hand-built response models re-validated against the
+                    response_model, jsonable_encoder, stdlib json (the old path)
+  pydantic+orjson   the same models dumped once and encoded with orjson
+  rows+orjson       plain dicts shaped from SQL rows, encoded with orjson
+                    (what `app.core.responses.render` does)
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.responses import dumps
+from app.schemas.client_schemas import ExerciseLogResponse, WorkoutLogResponse
+
+EXERCISES_PER_WORKOUT = 5
+SETS_PER_EXERCISE = 4
+
+
+def build_rows(workouts: int) -> List[Dict]:
+    start = datetime(2025, 1, 6, 7, 0)
+    rows = []
+    for w in range(workouts):
+        at = start - timedelta(days=2 * w)
+        rows.append(
+            {
+                "id": w + 1,
+                "assignment_id": 1,
+                "client_id": 1,
+                "workout_date": at,
+                "day_number": w % 3 + 1,
+                "workout_name": f"Day {w % 3 + 1}",
+                "total_duration_minutes": 60,
+                "perceived_exertion": 7,
+                "client_notes": "Felt strong",
+                "trainer_feedback": None,
+                "is_completed": True,
+                "is_skipped": False,
+                "skip_reason": None,
+                "created_at": at,
+                "exercises": [
+                    {
+                        "id": w * EXERCISES_PER_WORKOUT + e + 1,
+                        "exercise_name": f"Exercise {e + 1}",
+                        "exercise_id": e + 1,
+                        "exercise_order": e + 1,
+                        "planned_sets": SETS_PER_EXERCISE,
+                        "planned_reps": "8",
+                        "planned_weight": "60kg",
+                        "planned_rest_seconds": 90,
+                        "actual_sets": [
+                            {"set": s + 1, "reps": 8, "weight": "60kg", "completed": True}
+                            for s in range(SETS_PER_EXERCISE)
+                        ],
+                        "difficulty_rating": 6,
+                        "exercise_notes": None,
+                        "form_rating": 8,
+                        "created_at": at,
+                    }
+                    for e in range(EXERCISES_PER_WORKOUT)
+                ],
+            }
+        )
+    return rows
+
+
+def _as_models(rows: List[Dict]) -> List[WorkoutLogResponse]:
+    # Mirrors the attribute-by-attribute copy the handlers used to do.
+    return [
+        WorkoutLogResponse(
+            **{k: v for k, v in row.items() if k != "exercises"},
+            exercises=[ExerciseLogResponse(**ex) for ex in row["exercises"]],
+        )
+        for row in rows
+    ]
+
+
+def run(workouts: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    rows = build_rows(workouts)
+    field = create_response_field(name="Response_history", type_=List[WorkoutLogResponse])
+    loop = asyncio.new_event_loop()
+
+    def pydantic_fastapi() -> bytes:
+        content = loop.run_until_complete(
+            serialize_response(field=field, response_content=_as_models(rows))
+        )
+        return JSONResponse(content).body
+
+    def pydantic_orjson() -> bytes:
+        return dumps([m.model_dump() for m in _as_models(rows)])
+
+    def rows_orjson() -> bytes:
+        return dumps(rows)
+
+    cases: Dict[str, Callable[[], bytes]] = {
+        "pydantic+fastapi": pydantic_fastapi,
+        "pydantic+orjson": pydantic_orjson,
+        "rows+orjson": rows_orjson,
+    }
+    reference = json.loads(pydantic_fastapi())
+    results: Dict[str, Dict[str, float]] = {}
+    try:
+        for name, fn in cases.items():
+            assert json.loads(fn()) == reference, f"{name} output differs"
+            samples = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                body = fn()
+                samples.append((time.perf_counter() - started) * 1000)
+            samples.sort()
+            results[name] = {
+                "median_ms": round(samples[len(samples) // 2], 4),
+                "min_ms": round(samples[0], 4),
+                "bytes": len(body),
+            }
+    finally:
+        loop.close()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workouts", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    results = run(args.workouts, args.repeat)
+    baseline = results["pydantic+fastapi"]["median_ms"]
+    for name, r in results.items():
+        print(f"{name:<18} median {r['median_ms']:>8.3f}ms  min {r['min_ms']:>8.3f}ms  "
+              f"x{baseline / r['median_ms']:.1f}  {r['bytes']} bytes")
@@ -0,0 +1,106 @@
+"""Startup cost: what `import app.main` pays before the first request.
+
+    python -m benchmarks.startup [--top 15] [--budget-ms 1500] [--output startup.json]
+
+Runs `python -X importtime -c "import app.main"` in a fresh interpreter (so
+nothing is already in sys.modules), parses the per-module timings from
+stderr and reports the total plus the slowest modules by cumulative time.
+With --budget-ms it exits 1 when the import exceeds the budget, so CI can
+catch a heavy import sneaking onto the startup path.
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S.*)$")
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """One entry per `import time:` line: module, self/cumulative µs, depth."""
+    modules = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules.append(
+            {
+                "module": name.strip(),
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                # importtime indents nested imports by two spaces per level.
+                "depth": (len(indent) - 1) // 2,
+            }
+        )
+    return modules
+
+
+def report(modules: List[Dict], top: int) -> Dict:
+    total_us = sum(m["cumulative_us"] for m in modules if m["depth"] == 0)
+    slowest = sorted(modules, key=lambda m: m["cumulative_us"], reverse=True)[:top]
+    app_us = sum(m["self_us"] for m in modules if m["module"].startswith("app"))
+    return {
+        "import_ms": round(total_us / 1000, 1),
+        "app_self_ms": round(app_us / 1000, 1),
+        "modules": len(modules),
+        "slowest": [
+            {
+                "module": m["module"],
+                "cumulative_ms": round(m["cumulative_us"] / 1000, 1),
+                "self_ms": round(m["self_us"] / 1000, 1),
+            }
+            for m in slowest
+        ],
+    }
+
+
+def measure(target: str = "app.main", top: int = 15) -> Dict:
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = round((time.perf_counter() - started) * 1000, 1)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {target} failed:\n{proc.stderr[-2000:]}")
+    result = report(parse_importtime(proc.stderr), top)
+    result["target"] = target
+    result["process_wall_ms"] = wall_ms
+    return result
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", default="app.main")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    result = measure(args.target, args.top)
+    text = json.dumps(result, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    print(text)
+
+    if args.budget_ms is not None and result["import_ms"] > args.budget_ms:
+        print(
+            f"import {args.target} took {result['import_ms']}ms "
+            f"(budget {args.budget_ms}ms)",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Shared fixtures for the API test suite.
+
+These tests use SQLite (aiosqlite) in-memory-per-file to exercise the async
+SQLAlchemy session pipeline end-to-end. Rate limiting is disabled in tests
+via the limiter's enabled flag so the auth-endpoint suite doesn't trip the
+per-IP cap.
+
+The test engine is instrumented like the runtime engine, so every response
+carries `X-DB-Query-Count`; the `query_budget` fixture uses it to hold routes
+to the statement budgets declared in `tests/query_budgets.py`.
+
+SQLite cannot batch ORM inserts that need generated keys back, so a flush of
+n new rows is n INSERTs here but one multi-row INSERT on PostgreSQL. Budgets
+are counted the PostgreSQL way: a run of identical consecutive INSERTs counts
+once.
+"""
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient, Response
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base, get_db
+from app.core.instrumentation import instrument_engine
+from app.core.rate_limit import limiter
+from app.main import app
+from app.services import food_search_service, nutrition_service, program_structure_cache
+from tests.query_budgets import QUERY_BUDGETS, budget_key
+
+TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+
+test_engine = create_async_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+instrument_engine(test_engine)
+TestingSessionLocal = async_sessionmaker(
+    bind=test_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+)
+
+
+async def _override_get_db():
+    async with TestingSessionLocal() as session:
+        yield session
+
+
+_statement_log: Optional[List[str]] = None
+
+
+@event.listens_for(test_engine.sync_engine, "before_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    if _statement_log is not None:
+        _statement_log.append(statement)
+
+
+@contextmanager
+def _recording() -> Iterator[List[str]]:
+    global _statement_log
+    _statement_log = log = []
+    try:
+        yield log
+    finally:
+        _statement_log = None
+
+
+def batched_count(statements: List[str]) -> int:
+    """Statement count with consecutive identical INSERTs collapsed into one."""
+    count, previous = 0, None
+    for statement in statements:
+        if not (statement == previous and statement.lstrip().upper().startswith("INSERT")):
+            count += 1
+        previous = statement
+    return count
+
+
+app.dependency_overrides[get_db] = _override_get_db
+limiter.enabled = False  # don't trip the per-IP cap during tests
+
+
+@pytest_asyncio.fixture
+async def setup_database():
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    # Ids restart with every fresh schema; don't serve the last test's programs.
+    program_structure_cache.invalidate()
+    nutrition_service.invalidate()
+    food_search_service.invalidate()
+    yield
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest_asyncio.fixture
+async def client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+@pytest_asyncio.fixture
+async def db_session(setup_database):
+    """A session on the test database for seeding rows directly."""
+    async with TestingSessionLocal() as session:
+        yield session
+
+
+class QueryBudget:
+    """Issue a request and fail if it runs more statements than its route's
+    declared budget."""
+
+    def __init__(self, client: AsyncClient):
+        self.client = client
+
+    async def request(
+        self, method: str, url: str, route: Optional[str] = None, **kwargs
+    ) -> Response:
+        with _recording() as statements:
+            response = await self.client.request(method, url, **kwargs)
+        assert response.status_code < 400, (
+            f"{method} {url} -> {response.status_code}: {response.text[:300]}"
+        )
+        assert int(response.headers["X-DB-Query-Count"]) == len(statements)
+        key = budget_key(method, route or url)
+        budget = QUERY_BUDGETS[key]
+        used = batched_count(statements)
+        assert used <= budget, f"{key} ran {used} statements (budget {budget})"
+        return response
+
+
+@pytest.fixture
+def query_budget(client) -> QueryBudget:
+    return QueryBudget(client)
+
+
+@pytest.fixture
+def count_statements():
+    """Count (batched) statements run in a block: `with count_statements() as c:`
+    then `c()` after the block."""
+
+    @contextmanager
+    def _count():
+        with _recording() as statements:
+            yield lambda: batched_count(statements)
+
+    return _count
@@ -0,0 +1,80 @@
+"""Seeding helpers shared by the test modules.
+
+Each helper adds its rows to the given session and flushes, so ids are set
+but nothing is committed; the caller commits once its scenario is built.
+"""
+import json
+
+from app.core.security import create_access_token
+from app.models import Client, Exercise, Program, User
+from app.models.program import DifficultyLevel, ProgramType
+from app.services.client_auth_service import client_auth_service
+
+# Row counts a scaling scenario seeds: one, and enough to expose per-row queries.
+SCALES = [1, 100]
+
+
+async def make_trainer(db):
+    trainer = User(
+        email="budget-trainer@example.com",
+        first_name="Budget",
+        last_name="Trainer",
+        hashed_password="x",
+    )
+    db.add(trainer)
+    await db.flush()
+    return trainer, {"Authorization": f"Bearer {create_access_token(subject=trainer.email)}"}
+
+
+async def make_clients(db, trainer, n):
+    clients = [
+        Client(trainer_id=trainer.id, first_name="Client", last_name=str(i))
+        for i in range(n)
+    ]
+    db.add_all(clients)
+    await db.flush()
+    return clients
+
+
+async def make_exercises(db, n):
+    exercises = [
+        Exercise(
+            name=f"Exercise {i}",
+            muscle_groups=json.dumps(["chest"]),
+            equipment=json.dumps(["barbell"]),
+            is_public=True,
+        )
+        for i in range(n)
+    ]
+    db.add_all(exercises)
+    await db.flush()
+    return exercises
+
+
+async def make_program(db, trainer, exercises=()):
+    program = Program(
+        trainer_id=trainer.id,
+        name="Budget Program",
+        program_type=ProgramType.STRENGTH,
+        difficulty_level=DifficultyLevel.BEGINNER,
+        duration_weeks=1,
+        sessions_per_week=1,
+        workout_structure=[
+            {
+                "day": 1,
+                "name": "Day 1",
+                "exercises": [
+                    {"exercise_id": ex.id, "sets": 3, "reps": "10"} for ex in exercises
+                ],
+            }
+        ],
+    )
+    db.add(program)
+    await db.flush()
+    return program
+
+
+def client_headers_for(assignment):
+    """Bearer headers for the client portal, scoped to one assignment."""
+    token = client_auth_service.create_client_access_token(assignment.id, assignment.client_id)
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,176 @@
+"""Statement budgets per API route.
+
+Every route under /api/v1 must appear here (see
+`test_every_route_has_a_budget`). A budget is the most statements one
+request may run, independent of how many rows it touches; the bearer-token
+lookup counts as one, and so does the version query of routes with a
+conditional-GET dependency (`app.core.http_cache`). When adding a route, add its budget in the same change.
+"""
+from typing import Dict
+
+
+def budget_key(method: str, path: str) -> str:
+    """`"GET /api/v1/clients/{client_id}"` — method plus route template."""
+    return f"{method.upper()} {path}"
+
+
+QUERY_BUDGETS: Dict[str, int] = {
+    # auth
+    "POST /api/v1/auth/register": 4,
+    "POST /api/v1/auth/login": 3,
+    "POST /api/v1/auth/refresh": 2,
+    "GET /api/v1/auth/me": 1,
+    "PUT /api/v1/auth/me": 3,
+    "POST /api/v1/auth/change-password": 2,
+    "POST /api/v1/auth/deactivate": 2,
+    "POST /api/v1/auth/verify-token": 1,
+    # clients
+    "POST /api/v1/clients/with-account": 7,
+    "POST /api/v1/clients/{client_id}/create-account": 6,
+    "POST /api/v1/clients/": 4,
+    "GET /api/v1/clients/": 3,
+    "GET /api/v1/clients/count": 2,
+    "GET /api/v1/clients/{client_id}": 2,
+    # A rename also clears stored schedules and rewrites notification names.
+    "PUT /api/v1/clients/{client_id}": 6,
+    "DELETE /api/v1/clients/{client_id}": 4,
+    # programs
+    "POST /api/v1/programs/": 4,
+    "GET /api/v1/programs/": 3,
+    "GET /api/v1/programs/search": 3,
+    "GET /api/v1/programs/{program_id}": 3,
+    "PUT /api/v1/programs/{program_id}": 4,
+    "DELETE /api/v1/programs/{program_id}": 4,
+    "POST /api/v1/programs/{program_id}/duplicate": 4,
+    "POST /api/v1/programs/{program_id}/assign": 11,
+    "GET /api/v1/programs/clients/{client_id}/active-assignment": 3,
+    # assignments
+    "POST /api/v1/assignments/": 12,
+    # The exercise library's version stamps the cached program structures.
+    "GET /api/v1/assignments/": 6,
+    "GET /api/v1/assignments/{assignment_id}": 5,
+    "PUT /api/v1/assignments/{assignment_id}": 4,
+    "DELETE /api/v1/assignments/{assignment_id}": 3,
+    # exercises
+    "POST /api/v1/exercises/": 3,
+    "GET /api/v1/exercises/": 3,
+    "GET /api/v1/exercises/public": 2,
+    "GET /api/v1/exercises/muscle-groups": 2,
+    "GET /api/v1/exercises/equipment-types": 2,
+    "GET /api/v1/exercises/{exercise_id}": 2,
+    "PUT /api/v1/exercises/{exercise_id}": 4,
+    "DELETE /api/v1/exercises/{exercise_id}": 3,
+    "POST /api/v1/exercises/bulk": 2,
+    # weekly exercises
+    # A week's first read may extend the generated horizon and build its document.
+    "GET /api/v1/weekly-exercises/client/{client_id}/current-week": 9,
+    "GET /api/v1/weekly-exercises/client/{client_id}/week": 9,
+    # A status change on a day the rollups cover recounts its day and week.
+    "PUT /api/v1/weekly-exercises/{exercise_id}/status": 12,
+    "GET /api/v1/weekly-exercises/client/{client_id}/schedule": 4,
+    "GET /api/v1/weekly-exercises/assignment/{assignment_id}/preview": 3,
+    # Roster analytics: user, roster, then one grouped query per metric.
+    "GET /api/v1/weekly-exercises/trainer/clients-summary": 6,
+    # notifications
+    "GET /api/v1/notifications/": 5,
+    "GET /api/v1/notifications/unread-count": 2,
+    "POST /api/v1/notifications/mark-read": 3,
+    "POST /api/v1/notifications/mark-all-read": 3,
+    "DELETE /api/v1/notifications/{notification_id}": 3,
+    "POST /api/v1/notifications/check-appointments": 8,
+    "POST /api/v1/notifications/test/create-sample": 6,
+    # appointments
+    "GET /api/v1/appointments/today": 3,
+    "GET /api/v1/appointments/my": 3,
+    "GET /api/v1/appointments/availability": 3,
+    "GET /api/v1/appointments/feed-url": 2,
+    "GET /api/v1/appointments/feed/{token}.ics": 2,
+    "GET /api/v1/appointments/": 3,
+    "POST /api/v1/appointments/": 5,
+    "POST /api/v1/appointments/recurring": 4,
+    "GET /api/v1/appointments/{appointment_id}": 2,
+    "PUT /api/v1/appointments/{appointment_id}": 5,
+    "PATCH /api/v1/appointments/{appointment_id}/status": 5,
+    "DELETE /api/v1/appointments/{appointment_id}": 3,
+    # progress: body metrics
+    # Writes re-sync the client's metric-backed goals in one UPDATE.
+    "GET /api/v1/progress/clients/{client_id}/body-metrics": 4,
+    "POST /api/v1/progress/clients/{client_id}/body-metrics": 5,
+    "PUT /api/v1/progress/clients/{client_id}/body-metrics/{metric_id}": 6,
+    "DELETE /api/v1/progress/clients/{client_id}/body-metrics/{metric_id}": 5,
+    "GET /api/v1/progress/my/body-metrics": 3,
+    # progress: workout stats and completion
+    # Read rollups up to the last job run, raw rows after; completion
+    # adds weekly rollups for whole weeks, however many are asked for.
+    "GET /api/v1/progress/clients/{client_id}/workout-stats": 6,
+    "GET /api/v1/progress/my/workout-stats": 6,
+    "GET /api/v1/progress/clients/{client_id}/completion": 7,
+    "GET /api/v1/progress/my/completion": 7,
+    # progress: training load
+    # A workout-stamp aggregate, then the daily loads of stale clients only.
+    "GET /api/v1/progress/training-load": 4,
+    "GET /api/v1/progress/clients/{client_id}/training-load": 4,
+    "GET /api/v1/progress/my/training-load": 4,
+    # progress: strength progression (one windowed statement over parsed sets)
+    "GET /api/v1/progress/clients/{client_id}/progression": 3,
+    "GET /api/v1/progress/clients/{client_id}/progression/{exercise_id}": 3,
+    # progress: adherence scores written by the scoring job
+    "GET /api/v1/progress/at-risk": 2,
+    # progress: performance records
+    "GET /api/v1/progress/clients/{client_id}/performance-records": 3,
+    "POST /api/v1/progress/clients/{client_id}/performance-records": 4,
+    "PUT /api/v1/progress/clients/{client_id}/performance-records/{record_id}": 5,
+    "DELETE /api/v1/progress/clients/{client_id}/performance-records/{record_id}": 4,
+    "GET /api/v1/progress/my/performance-records": 3,
+    # progress: goals
+    # Creating (or redefining) a metric-backed goal syncs it from body metrics.
+    "GET /api/v1/progress/clients/{client_id}/goals": 3,
+    "POST /api/v1/progress/clients/{client_id}/goals": 5,
+    "PUT /api/v1/progress/clients/{client_id}/goals/{goal_id}": 6,
+    "DELETE /api/v1/progress/clients/{client_id}/goals/{goal_id}": 4,
+    "GET /api/v1/progress/my/goals": 3,
+    # progress: session notes
+    "GET /api/v1/progress/clients/{client_id}/notes": 3,
+    "POST /api/v1/progress/clients/{client_id}/notes": 4,
+    "PUT /api/v1/progress/clients/{client_id}/notes/{note_id}": 5,
+    "DELETE /api/v1/progress/clients/{client_id}/notes/{note_id}": 4,
+    "GET /api/v1/progress/my/notes": 3,
+    # client portal (client-token auth)
+    "POST /api/v1/client/login": 3,
+    "GET /api/v1/client/dashboard": 15,
+    "GET /api/v1/client/program": 4,
+    # One INSERT each for the workout, its exercise logs and their parsed
+    # sets, then the latest-performance recompute (DELETE + INSERT ... SELECT).
+    "POST /api/v1/client/workout": 12,
+    "GET /api/v1/client/workouts": 4,
+    "GET /api/v1/client/workout/{workout_id}": 3,
+    "PUT /api/v1/client/workout/{workout_id}": 5,
+    "GET /api/v1/client/progress/summary": 6,
+    "GET /api/v1/client/me": 2,
+    # client dashboard (user-account auth)
+    "GET /api/v1/client-dashboard/profile": 2,
+    "GET /api/v1/client-dashboard/programs": 4,
+    "GET /api/v1/client-dashboard/dashboard-stats": 6,
+    "GET /api/v1/client-dashboard/appointments": 3,
+    "GET /api/v1/dashboard/trainer-stats": 8,
+    # nutrition
+    "POST /api/v1/nutrition/plans": 3,
+    "GET /api/v1/nutrition/plans": 2,
+    "GET /api/v1/nutrition/plans/{plan_id}": 2,
+    "PUT /api/v1/nutrition/plans/{plan_id}": 4,
+    "DELETE /api/v1/nutrition/plans/{plan_id}": 3,
+    # Bearer, the plan, the catalog version, (the foods on a miss).
+    "GET /api/v1/nutrition/plans/{plan_id}/macros": 4,
+    # Off Postgres: catalog version, (index rebuild when stale), the page.
+    "GET /api/v1/nutrition/foods/search": 4,
+    "GET /api/v1/nutrition/foods/barcode/{barcode}": 2,
+    # imports — per chunk of up to CHUNK_SIZE rows; the scenarios fit one.
+    # Workouts: job insert and start, chunk open, savepoint and release,
+    # client + assignment lookups, workout, exercise-log and assignment
+    # writes, progress, completion, reload.
+    "POST /api/v1/imports/{kind}": 14,
+    "GET /api/v1/imports/": 2,
+    "GET /api/v1/imports/{job_id}": 2,
+    "POST /api/v1/imports/{job_id}/resume": 12,
+    "GET /api/v1/health": 0,
+}
@@ -0,0 +1,135 @@
+"""Adherence scoring: one pass over every active assignment, edge-triggered alerts."""
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.models import AdherenceScore, Notification, ProgramAssignment
+from app.models.notification import NotificationType
+from app.models.weekly_exercise import WeeklyExerciseAssignment, WeeklyExerciseStatus
+from app.services import adherence_service
+from app.services.adherence_service import AdherenceService
+from tests.conftest import TestingSessionLocal
+from tests.factories import make_clients, make_exercises, make_program, make_trainer
+
+TODAY = date(2025, 3, 3)
+DONE, SKIPPED, PENDING = WeeklyExerciseStatus.COMPLETED, WeeklyExerciseStatus.SKIPPED, WeeklyExerciseStatus.PENDING
+
+
+def _history(days_ago_to_status):
+    """Exercise due `days_ago` days before TODAY → status."""
+    return {TODAY - timedelta(days=days_ago): status for days_ago, status in days_ago_to_status}
+
+
+# Every other day for 6 weeks: the last 2 weeks are the recent window
+STEADY = [(d, DONE) for d in range(1, 42, 2)]
+# Consistent, then nothing done in the last 2 weeks
+SLIPPING = [(d, DONE) for d in range(15, 42, 2)] + [(d, SKIPPED) for d in range(1, 14, 4)] + [
+    (d, PENDING) for d in range(3, 14, 4)
+]
+# Half of the recent exercises missed
+WOBBLY = [(d, DONE) for d in range(15, 42, 2)] + [
+    (d, DONE if i % 2 else SKIPPED) for i, d in enumerate(range(1, 14, 2))
+]
+
+
+async def _seed(db):
+    trainer, headers = await make_trainer(db)
+    clients = await make_clients(db, trainer, 4)
+    (exercise,) = await make_exercises(db, 1)
+    program = await make_program(db, trainer, [exercise])
+    start = datetime.combine(TODAY - timedelta(days=60), datetime.min.time())
+    plans = [(STEADY, 1), (SLIPPING, 20), (WOBBLY, 3), (SLIPPING, 20)]
+    assignments = []
+    for client, (history, last_workout) in zip(clients, plans):
+        assignment = ProgramAssignment(
+            program_id=program.id, client_id=client.id, trainer_id=trainer.id, start_date=start,
+            last_workout_date=datetime.combine(TODAY - timedelta(days=last_workout), datetime.min.time()),
+        )
+        db.add(assignment)
+        await db.flush()
+        assignments.append(assignment)
+        for i, (day, status) in enumerate(sorted(_history(history).items())):
+            db.add(WeeklyExerciseAssignment(
+                program_assignment_id=assignment.id, client_id=client.id, trainer_id=trainer.id,
+                exercise_id=exercise.id, due_date=day, week_number=i // 3 + 1, day_number=1,
+                exercise_order=i + 1, sets=3, reps="10", status=status,
+                assigned_date=start.date(),  # Generated up front, not on the day it's due
+                completed_date=datetime.combine(day, datetime.min.time()) if status is DONE else None,
+            ))
+    # Inactive clients aren't scored
+    clients[3].is_active = False
+    await db.commit()
+    return trainer, headers, clients, assignments
+
+
+@pytest.mark.asyncio
+async def test_scores_levels_and_edge_triggered_notifications(db_session, query_budget):
+    trainer, headers, clients, assignments = await _seed(db_session)
+
+    async with TestingSessionLocal() as db:
+        assert await AdherenceService.score_all(db, TODAY) == {"scored": 3, "high": 1, "notified": 1}
+        scores = {
+            row.client_id: row
+            for row in (await db.execute(select(AdherenceScore))).scalars()
+        }
+        notifications = (await db.execute(select(Notification))).scalars().all()
+    steady, slipping, wobbly = (scores[c.id] for c in clients[:3])
+    assert (steady.level, slipping.level, wobbly.level) == ("low", "high", "medium")
+    assert (steady.recent_miss_rate, steady.days_since_workout, steady.days_since_completion) == (0.0, 1, 1)
+    assert (slipping.recent_miss_rate, slipping.miss_rate_trend, slipping.days_since_completion) == (1.0, 1.0, 15)
+    assert wobbly.recent_miss_rate == pytest.approx(4 / 7)
+    assert steady.score < wobbly.score < slipping.score
+
+    (alert,) = notifications
+    assert (alert.user_id, alert.related_client_id) == (trainer.id, clients[1].id)
+    assert alert.notification_type == NotificationType.CLIENT_AT_RISK
+    assert alert.message == "Client 1 missed 100% of exercises in the last 2 weeks; last workout 20 days ago"
+
+    # Still high on the next run: no second alert
+    async with TestingSessionLocal() as db:
+        assert await AdherenceService.score_all(db, TODAY) == {"scored": 3, "high": 1, "notified": 0}
+        assert len((await db.execute(select(Notification))).scalars().all()) == 1
+
+    async def at_risk(**params):
+        response = await query_budget.request(
+            "GET", "/api/v1/progress/at-risk", headers=headers, params=params
+        )
+        return [(risk["client_id"], risk["level"]) for risk in response.json()]
+
+    assert await at_risk() == [(clients[1].id, "high"), (clients[2].id, "medium")]
+    assert await at_risk(min_level="high") == [(clients[1].id, "high")]
+    assert await at_risk(min_level="low", limit=2) == [(clients[1].id, "high"), (clients[2].id, "medium")]
+    assert len(await at_risk(min_level="low")) == 3
+    bad = await query_budget.client.get(
+        "/api/v1/progress/at-risk", headers=headers, params={"min_level": "extreme"}
+    )
+    assert bad.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_run_is_skipped_while_another_worker_scores(db_session, monkeypatch):
+    await _seed(db_session)
+
+    async def held(db):
+        return False
+
+    monkeypatch.setattr(AdherenceService, "_lock", staticmethod(held))
+    async with TestingSessionLocal() as db:
+        assert await AdherenceService.score_all(db, TODAY) is None
+        assert (await db.execute(select(AdherenceScore))).scalars().all() == []
+        assert (await db.execute(select(Notification))).scalars().all() == []
+
+
+def test_numpy_and_python_scores_agree(monkeypatch):
+    columns = {
+        "recent_miss_rate": [0.0, 1.0, 0.5, 0.25],
+        "miss_rate_trend": [-0.5, 1.0, 0.5, 0.0],
+        "days_since_workout": [1, 28, 3, 10],
+        "days_since_completion": [1, 42, 2, 0],
+    }
+    expected = adherence_service.score(columns)
+    monkeypatch.setattr(adherence_service, "np", None)
+    assert adherence_service.score(columns) == pytest.approx(expected)
+    assert [adherence_service.level(s) for s in expected] == ["low", "high", "medium", "low"]
+    assert adherence_service.score({name: [] for name in adherence_service.FEATURES}) == []
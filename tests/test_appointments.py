@@ -0,0 +1,309 @@
+"""Appointment conflict detection, recurring booking and availability."""
+import random
+from datetime import datetime, time, timedelta
+
+import pytest
+
+from app.core.security import create_access_token
+from app.models import Appointment, Client, User
+from app.services.appointment_service import WorkingHours, free_windows, slot_starts
+from app.utils.intervals import IntervalTree
+
+MONDAY_9AM = datetime(2031, 3, 3, 9, 0)
+
+
+def test_interval_tree_matches_brute_force():
+    rng = random.Random(7)
+    for _ in range(200):
+        intervals = []
+        for i in range(rng.randint(0, 60)):
+            start = rng.randint(0, 500)
+            intervals.append((start, start + rng.randint(1, 40), i))
+        tree = IntervalTree(intervals)
+        for _ in range(10):
+            start = rng.randint(-20, 520)
+            end = start + rng.randint(1, 50)
+            expected = [v for s, e, v in sorted(intervals, key=lambda x: x[0]) if s < end and e > start]
+            assert sorted(tree.overlapping(start, end)) == sorted(expected)
+    # Half-open: touching intervals don't overlap.
+    assert not IntervalTree([(0, 10, "a")]).overlaps(10, 20)
+
+
+async def _trainer_with_client(db):
+    trainer = User(
+        email="calendar@example.com", first_name="Cal", last_name="Endar", hashed_password="x"
+    )
+    db.add(trainer)
+    await db.flush()
+    client = Client(trainer_id=trainer.id, first_name="Ada", last_name="Client")
+    db.add(client)
+    await db.flush()
+    headers = {"Authorization": f"Bearer {create_access_token(subject=trainer.email)}"}
+    return trainer, client, headers
+
+
+def _booking(client, start, hours=1, **extra):
+    return {
+        "client_id": client.id,
+        "title": "Session",
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(hours=hours)).isoformat(),
+        **extra,
+    }
+
+
+@pytest.mark.asyncio
+async def test_single_booking_rejects_overlaps_only(db_session, query_budget, client):
+    trainer, ada, headers = await _trainer_with_client(db_session)
+    await db_session.commit()
+
+    first = await query_budget.request(
+        "POST", "/api/v1/appointments/", headers=headers, json=_booking(ada, MONDAY_9AM)
+    )
+    clash = await client.post(
+        "/api/v1/appointments/",
+        headers=headers,
+        json=_booking(ada, MONDAY_9AM + timedelta(minutes=30)),
+    )
+    assert clash.status_code == 409
+    (conflict,) = clash.json()["detail"]["conflicts"]
+    assert conflict["conflicting_appointment_id"] == first.json()["id"]
+
+    # Back-to-back is fine; cancelled bookings don't hold their slot.
+    await query_budget.request(
+        "POST",
+        "/api/v1/appointments/",
+        headers=headers,
+        json=_booking(ada, MONDAY_9AM + timedelta(hours=1)),
+    )
+    await client.patch(
+        f"/api/v1/appointments/{first.json()['id']}/status",
+        headers=headers,
+        json={"status": "cancelled"},
+    )
+    await query_budget.request(
+        "POST", "/api/v1/appointments/", headers=headers, json=_booking(ada, MONDAY_9AM)
+    )
+
+
+@pytest.mark.asyncio
+async def test_reschedule_checks_conflicts_except_itself(db_session, query_budget, client):
+    trainer, ada, headers = await _trainer_with_client(db_session)
+    await db_session.commit()
+    ids = [
+        (
+            await client.post(
+                "/api/v1/appointments/",
+                headers=headers,
+                json=_booking(ada, MONDAY_9AM + timedelta(hours=2 * i)),
+            )
+        ).json()["id"]
+        for i in range(2)
+    ]
+
+    moved = _booking(ada, MONDAY_9AM + timedelta(minutes=30))
+    url = f"/api/v1/appointments/{ids[0]}"
+    await query_budget.request(
+        "PUT", url, route="/api/v1/appointments/{appointment_id}", headers=headers, json=moved
+    )
+    onto_other = await client.put(
+        url, headers=headers, json=_booking(ada, MONDAY_9AM + timedelta(hours=2))
+    )
+    assert onto_other.status_code == 409
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("weeks", [1, 52])
+async def test_recurring_series_is_one_batch(db_session, query_budget, weeks):
+    trainer, ada, headers = await _trainer_with_client(db_session)
+    await db_session.commit()
+
+    response = await query_budget.request(
+        "POST",
+        "/api/v1/appointments/recurring",
+        headers=headers,
+        json=_booking(ada, MONDAY_9AM, weeks=weeks),
+    )
+    created = response.json()["created"]
+    assert len(created) == weeks
+    assert created[-1]["start_time"] == (MONDAY_9AM + timedelta(weeks=weeks - 1)).isoformat()
+    assert response.json()["conflicts"] == []
+
+
+@pytest.mark.asyncio
+async def test_recurring_series_reports_every_conflict(db_session, query_budget, client):
+    trainer, ada, headers = await _trainer_with_client(db_session)
+    taken = [MONDAY_9AM + timedelta(weeks=2), MONDAY_9AM + timedelta(weeks=5, minutes=45)]
+    db_session.add_all(
+        Appointment(
+            trainer_id=trainer.id,
+            client_id=ada.id,
+            title="Existing",
+            appointment_type="Personal Training",
+            start_time=start,
+            end_time=start + timedelta(hours=1),
+        )
+        for start in taken
+    )
+    await db_session.commit()
+
+    rejected = await client.post(
+        "/api/v1/appointments/recurring", headers=headers, json=_booking(ada, MONDAY_9AM, weeks=8)
+    )
+    assert rejected.status_code == 409
+    assert [c["index"] for c in rejected.json()["detail"]["conflicts"]] == [2, 5]
+    listed = await client.get("/api/v1/appointments/", headers=headers)
+    assert len(listed.json()) == 2  # nothing from the rejected series was booked
+
+    partial = await query_budget.request(
+        "POST",
+        "/api/v1/appointments/recurring",
+        headers=headers,
+        json=_booking(ada, MONDAY_9AM, weeks=8, skip_conflicts=True),
+    )
+    assert len(partial.json()["created"]) == 6
+    assert [c["index"] for c in partial.json()["conflicts"]] == [2, 5]
+
+
+@pytest.mark.asyncio
+async def test_recurring_series_validates_shape(db_session, client):
+    trainer, ada, headers = await _trainer_with_client(db_session)
+    await db_session.commit()
+    too_long = await client.post(
+        "/api/v1/appointments/recurring",
+        headers=headers,
+        json=_booking(ada, MONDAY_9AM, hours=30, weeks=2),
+    )
+    assert too_long.status_code == 400
+    too_many = await client.post(
+        "/api/v1/appointments/recurring", headers=headers, json=_booking(ada, MONDAY_9AM, weeks=53)
+    )
+    assert too_many.status_code == 422
+
+
+def test_free_windows_sweep_pads_merges_and_skips_days_off():
+    hours = WorkingHours(
+        day_start=time(9), day_end=time(17), weekdays=frozenset({0, 1}), buffer=timedelta(minutes=15)
+    )
+    monday = MONDAY_9AM
+    busy = [
+        (monday + timedelta(hours=1), monday + timedelta(hours=2)),  # 10-11
+        (monday + timedelta(hours=2, minutes=20), monday + timedelta(hours=3)),  # merges via buffer
+        (monday + timedelta(hours=7, minutes=30), monday + timedelta(days=1, hours=1)),  # overnight
+    ]
+    windows = free_windows(
+        busy, monday - timedelta(hours=9), monday + timedelta(days=3), hours, timedelta(minutes=30)
+    )
+    assert windows == [
+        (monday, monday + timedelta(minutes=45)),
+        (monday + timedelta(hours=3, minutes=15), monday + timedelta(hours=7, minutes=15)),
+        (monday + timedelta(days=1, hours=1, minutes=15), monday + timedelta(days=1, hours=8)),
+    ]  # Wednesday is not a working day
+    starts = slot_starts(windows[:1], timedelta(minutes=30), timedelta(minutes=15), limit=10)
+    assert [s for s, _ in starts] == [monday, monday + timedelta(minutes=15)]
+
+
+@pytest.mark.asyncio
+async def test_availability_finds_common_free_time(db_session, query_budget):
+    trainer, ada, headers = await _trainer_with_client(db_session)
+    other_trainer = User(email="other@example.com", first_name="O", last_name="T", hashed_password="x")
+    db_session.add(other_trainer)
+    await db_session.flush()
+
+    def _appt(trainer_id, start):
+        return Appointment(
+            trainer_id=trainer_id,
+            client_id=ada.id,
+            title="Busy",
+            appointment_type="Personal Training",
+            start_time=start,
+            end_time=start + timedelta(hours=1),
+        )
+
+    db_session.add_all(
+        [
+            _appt(trainer.id, MONDAY_9AM + timedelta(hours=1)),  # 10-11 with us
+            _appt(other_trainer.id, MONDAY_9AM + timedelta(hours=5)),  # 14-15 elsewhere
+        ]
+    )
+    await db_session.commit()
+
+    params = {
+        "date_from": MONDAY_9AM.date().isoformat(),
+        "date_to": MONDAY_9AM.date().isoformat(),
+        "duration_minutes": 60,
+        "day_start": "09:00",
+        "day_end": "17:00",
+        "buffer_minutes": 15,
+    }
+    alone = await query_budget.request(
+        "GET", "/api/v1/appointments/availability", headers=headers, params=params
+    )
+    assert [w["start_time"][11:16] for w in alone.json()["windows"]] == ["11:15"]
+
+    together = await query_budget.request(
+        "GET",
+        "/api/v1/appointments/availability",
+        headers=headers,
+        params={**params, "client_ids": [ada.id], "step_minutes": 30},
+    )
+    windows = [(w["start_time"][11:16], w["end_time"][11:16]) for w in together.json()["windows"]]
+    assert windows == [("11:15", "13:45"), ("15:15", "17:00")]
+    assert together.json()["slots"][0]["start_time"][11:16] == "11:30"
+
+
+@pytest.mark.asyncio
+async def test_calendar_feed_streams_ics_and_revalidates(db_session, query_budget, client):
+    trainer, ada, headers = await _trainer_with_client(db_session)
+    await db_session.commit()
+    booked = await client.post(
+        "/api/v1/appointments/",
+        headers=headers,
+        json=_booking(
+            ada,
+            MONDAY_9AM,
+            description="Legs; squats, lunges\nbring shoes",
+            location="Studio Ü, " + "very long street name " * 5,
+        ),
+    )
+
+    link = (
+        await query_budget.request("GET", "/api/v1/appointments/feed-url", headers=headers)
+    ).json()
+    assert link["scope"] == f"trainer:{trainer.id}"
+    feed_url = link["url"].removeprefix("http://test")
+    route = "/api/v1/appointments/feed/{token}.ics"
+
+    feed = await query_budget.request("GET", feed_url, route=route)
+    assert feed.headers["content-type"].startswith("text/calendar")
+    body = feed.text
+    assert body.startswith("BEGIN:VCALENDAR\r\n") and body.endswith("END:VCALENDAR\r\n")
+    assert f"UID:appointment-{booked.json()['id']}@fitnesscoach" in body
+    assert "DTSTART:20310303T090000\r\n" in body
+    assert "SUMMARY:Session - Ada Client" in body
+    assert r"DESCRIPTION:Legs\; squats\, lunges\nbring shoes" in body
+    assert all(len(line.encode()) <= 75 for line in body.split("\r\n"))
+    assert "\r\n " in body  # the long location was folded
+
+    etag = feed.headers["etag"]
+    assert "last-modified" not in feed.headers
+    cached = await query_budget.request(
+        "GET", feed_url, route=route, headers={"If-None-Match": etag}
+    )
+    assert cached.status_code == 304 and cached.content == b""
+    # A date can't see deletions or renames, so it never earns a 304 on its own.
+    dated = await client.get(
+        feed_url, headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}
+    )
+    assert dated.status_code == 200 and "BEGIN:VEVENT" in dated.text
+
+    await client.delete(f"/api/v1/appointments/{booked.json()['id']}", headers=headers)
+    changed = await client.get(feed_url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and "BEGIN:VEVENT" not in changed.text
+
+    # Feed tokens only open feeds, and access tokens don't open feeds.
+    token = feed_url.rsplit("/", 1)[1].removesuffix(".ics")
+    me = await client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"})
+    assert me.status_code == 401
+    access = headers["Authorization"].removeprefix("Bearer ")
+    assert (await client.get(f"/api/v1/appointments/feed/{access}.ics")).status_code == 404
@@ -0,0 +1,71 @@
+"""Smoke test for the benchmark suite at a tiny scale, so it can't bit-rot."""
+import pytest
+
+from benchmarks.adherence import run as run_adherence
+from benchmarks.run import percentile, run_scenario
+from benchmarks.scenarios import build_scenarios
+from benchmarks.seed import BenchConfig, seed
+from benchmarks.scheduling import run as run_scheduling
+from benchmarks.serialization import run as run_serialization
+from benchmarks.startup import parse_importtime, report
+from tests.conftest import TEST_DATABASE_URL, test_engine
+
+TINY = BenchConfig(trainers=1, clients_per_trainer=2, years=0.1, spare_clients_per_trainer=3)
+
+
+def test_percentile_interpolates():
+    values = [1.0, 2.0, 3.0, 4.0]
+    assert percentile(values, 0) == 1.0
+    assert percentile(values, 50) == 2.5
+    assert percentile(values, 100) == 4.0
+    assert percentile([], 95) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_every_scenario_runs_against_seeded_data(setup_database, client):
+    async with test_engine.begin() as conn:
+        manifest = await seed(conn, TINY)
+    assert manifest.rows["workout_logs"] == 2 * 5 * TINY.workouts_per_week
+    assert len(manifest.assigned_clients) == 2
+
+    for scenario in build_scenarios(manifest, TINY):
+        result = await run_scenario(client, scenario, test_engine, requests=2, warmup=1)
+        assert result["requests"] == 2
+        assert result["queries_per_request"] > 0
+
+
+def test_serialization_paths_produce_identical_json():
+    # run() asserts every path matches the FastAPI reference output.
+    results = run_serialization(workouts=3, repeat=1)
+    assert len({r["bytes"] for r in results.values()}) == 1
+
+
+def test_importtime_report_totals_top_level_imports():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 |   app.core.config\n"
+        "import time:       400 |        500 | app.main\n"
+        "import time:        50 |         50 | orjson\n"
+    )
+    modules = parse_importtime(stderr)
+    assert [m["depth"] for m in modules] == [1, 0, 0]
+    result = report(modules, top=1)
+    assert result["import_ms"] == 0.6
+    assert result["app_self_ms"] == 0.5
+    assert result["slowest"][0]["module"] == "app.main"
+
+
+@pytest.mark.asyncio
+async def test_scheduling_paths_find_the_same_conflicts(setup_database):
+    # run() asserts the legacy OR query and the windowed check agree.
+    result = await run_scheduling(TEST_DATABASE_URL, appointments=200, weeks=4, repeat=1)
+    assert result["cases"]["series_4w"]["windowed"]["queries"] == 1
+    assert result["cases"]["series_4w"]["conflicts"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_adherence_scoring_is_set_based(setup_database):
+    result = await run_adherence(TEST_DATABASE_URL, assignments=40, repeat=1)
+    first, rescore = result["runs"]["first"], result["runs"]["rescore"]
+    assert (first["scored"], first["high"], first["notified"], rescore["notified"]) == (40, 4, 4, 0)
+    assert first["statements"] <= 6
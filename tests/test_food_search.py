@@ -0,0 +1,114 @@
+"""Food lookup: bulk import, barcode scans, type-ahead and facets."""
+import io
+
+import pytest
+from sqlalchemy import create_engine, func, select
+
+from app.models import Food
+from app.services.food_search_service import import_foods
+from app.utils.prefix_trie import PrefixTrie
+from tests.conftest import TestingSessionLocal
+from tests.factories import make_trainer
+
+SEARCH = "/api/v1/nutrition/foods/search"
+BARCODE = "/api/v1/nutrition/foods/barcode/{barcode}"
+
+CSV = """name,brand,category,calories_per_100g,protein_per_100g,barcode
+Greek Yogurt,Fage,Dairy,97,9,5200000000001
+Greek Yogurt Honey,Fage,Dairy,120,8,5200000000002
+Chicken Breast,,Meat,165,31,
+Chickpeas,Goya,Legumes,164,8.9,0041331000001
+Green Beans,,Vegetables,31,1.8,
+,Nameless,Other,10,1,
+Broken,,Other,lots,1,
+Greek Yogurt,Fage,Dairy,99,10,5200000000001
+"""
+
+
+def _import(text, chunk_size=3):
+    engine = create_engine("sqlite:///./test.db")
+    try:
+        return import_foods(engine, io.StringIO(text), chunk_size=chunk_size)
+    finally:
+        engine.dispose()
+
+
+def test_prefix_trie_prefix_and_fuzzy_matches():
+    trie = PrefixTrie([("chicken", 1), ("chickpeas", 2), ("cheese", 3), ("chicken", 4)])
+    assert len(trie) == 3
+    assert trie.prefixed("chick") == {1, 2, 4}
+    assert trie.prefixed("c") == {1, 2, 3, 4}
+    assert trie.prefixed("x") == set()
+    assert trie.similar("chiken") == {1, 4}
+    assert trie.similar("chese") == {3}
+    trie.insert("cherry", 5)
+    assert trie.prefixed("c") == {1, 2, 3, 4, 5}
+
+
+@pytest.mark.asyncio
+async def test_import_upserts_on_barcode(db_session):
+    assert _import(CSV) == {"rows": 6, "skipped": 2}
+
+    async with TestingSessionLocal() as db:
+        assert await db.scalar(select(func.count(Food.id))) == 5
+        yogurt = (
+            await db.execute(select(Food).where(Food.barcode == "5200000000001"))
+        ).scalar_one()
+    # The later row for the same barcode won.
+    assert yogurt.calories_per_100g == 99 and yogurt.protein_per_100g == 10
+
+    # Re-importing updates in place.
+    _import("name,category,barcode\nGreek Yogurt Plain,Dairy,5200000000001\n")
+    async with TestingSessionLocal() as db:
+        assert await db.scalar(select(func.count(Food.id))) == 5
+
+
+@pytest.mark.asyncio
+async def test_search_and_barcode_lookup(db_session, query_budget):
+    trainer, headers = await make_trainer(db_session)
+    await db_session.commit()
+    _import(CSV)
+
+    async def search(**params):
+        response = await query_budget.request("GET", SEARCH, headers=headers, params=params)
+        return response, response.json()
+
+    # First search builds the index: version, load, page.
+    response, found = await search(q="gre yog")
+    assert response.headers["x-db-query-count"] == "4"
+    assert [food["name"] for food in found["items"]] == ["Greek Yogurt", "Greek Yogurt Honey"]
+    assert found["facets"] == [{"category": "Dairy", "count": 2}]
+
+    # Warm: the version check and the page.
+    response, found = await search(q="gre")
+    assert response.headers["x-db-query-count"] == "3"
+    assert {food["name"] for food in found["items"]} == {
+        "Greek Yogurt",
+        "Greek Yogurt Honey",
+        "Green Beans",
+    }
+    assert found["facets"] == [
+        {"category": "Dairy", "count": 2},
+        {"category": "Vegetables", "count": 1},
+    ]
+    _, filtered = await search(q="gre", category="Vegetables")
+    assert [food["name"] for food in filtered["items"]] == ["Green Beans"]
+    assert len(filtered["facets"]) == 2
+
+    # Brand words match, and a typo in a longer word still does.
+    _, found = await search(q="goya")
+    assert [food["name"] for food in found["items"]] == ["Chickpeas"]
+    _, found = await search(q="chiken")
+    assert [food["name"] for food in found["items"]] == ["Chicken Breast"]
+
+    # A new food is picked up by the version check.
+    _import("name,category\nGreek Salad,Prepared\n")
+    _, found = await search(q="greek")
+    assert "Greek Salad" in {food["name"] for food in found["items"]}
+
+    scanned = await query_budget.request(
+        "GET", BARCODE.format(barcode="0041331000001"), route=BARCODE, headers=headers
+    )
+    assert scanned.json()["name"] == "Chickpeas"
+    missing = await query_budget.client.get(BARCODE.format(barcode="000"), headers=headers)
+    assert missing.status_code == 404
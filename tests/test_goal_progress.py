@@ -0,0 +1,145 @@
+"""Goal progress: synced from body metrics in one UPDATE, stored, backfilled."""
+from datetime import date
+
+import pytest
+
+from app.models import BodyMetric, GoalMilestone
+from app.services.goal_progress_service import GoalProgressService
+from tests.conftest import TestingSessionLocal
+from tests.factories import make_clients, make_trainer
+
+GOALS = "/api/v1/progress/clients/{client_id}/goals"
+METRICS = "/api/v1/progress/clients/{client_id}/body-metrics"
+METRIC = "/api/v1/progress/clients/{client_id}/body-metrics/{metric_id}"
+
+
+def _goal(metric="weight", start=90.0, target=80.0, **kw):
+    return {
+        "title": f"{metric} goal",
+        "goal_type": "weight_loss",
+        "metric": metric,
+        "unit": "kg",
+        "start_value": start,
+        "target_value": target,
+        "start_date": "2025-01-01",
+        **kw,
+    }
+
+
+async def _goals(query_budget, client_id, headers):
+    response = await query_budget.request(
+        "GET", GOALS.format(client_id=client_id), route=GOALS, headers=headers
+    )
+    return {g["metric"]: g for g in response.json()}
+
+
+@pytest.mark.asyncio
+async def test_measurements_sync_matching_goals(db_session, query_budget):
+    trainer, headers = await make_trainer(db_session)
+    (client,) = await make_clients(db_session, trainer, 1)
+    await db_session.commit()
+    url = GOALS.format(client_id=client.id)
+    for goal in (_goal(), _goal("waist", 100.0, 90.0), _goal("custom", 10.0, 20.0, current_value=15.0)):
+        await query_budget.request("POST", url, route=GOALS, headers=headers, json=goal)
+
+    async def measure(**values):
+        response = await query_budget.request(
+            "POST", METRICS.format(client_id=client.id), route=METRICS, headers=headers, json=values
+        )
+        return response.json()["id"]
+
+    await measure(measured_at="2024-12-01", weight=70.0)  # before the goal started
+    latest = await measure(measured_at="2025-02-01", weight=85.0)
+    await measure(measured_at="2025-01-15", weight=88.0)  # older than the latest
+    goals = await _goals(query_budget, client.id, headers)
+    assert (goals["weight"]["current_value"], goals["weight"]["progress_pct"]) == (85.0, 50.0)
+    assert (goals["waist"]["current_value"], goals["waist"]["progress_pct"]) == (None, 0.0)
+    assert (goals["custom"]["current_value"], goals["custom"]["progress_pct"]) == (15.0, 50.0)
+
+    await query_budget.request(
+        "PUT",
+        METRIC.format(client_id=client.id, metric_id=latest),
+        route=METRIC,
+        headers=headers,
+        json={"weight": 79.5, "waist": 104.0},
+    )
+    goals = await _goals(query_budget, client.id, headers)
+    assert goals["weight"]["progress_pct"] == 100.0
+    assert goals["weight"]["is_completed"] is True
+    assert goals["weight"]["completed_date"] == "2025-02-01"
+    # Moving away from the target is no progress
+    assert (goals["waist"]["current_value"], goals["waist"]["progress_pct"]) == (104.0, 0.0)
+
+    await query_budget.request(
+        "DELETE", METRIC.format(client_id=client.id, metric_id=latest), route=METRIC, headers=headers
+    )
+    goals = await _goals(query_budget, client.id, headers)
+    assert goals["weight"]["current_value"] == 88.0
+    # Completion follows the latest measurement...
+    assert (goals["weight"]["is_completed"], goals["weight"]["completed_date"]) == (False, None)
+
+    # ...unless the trainer marked the goal complete
+    await query_budget.request(
+        "PUT",
+        GOALS.format(client_id=client.id) + f"/{goals['waist']['id']}",
+        route=GOALS + "/{goal_id}",
+        headers=headers,
+        json={"is_completed": True, "completed_date": "2025-02-10"},
+    )
+    await measure(measured_at="2025-03-01", waist=106.0)
+    goals = await _goals(query_budget, client.id, headers)
+    assert goals["waist"]["current_value"] == 106.0
+    assert (goals["waist"]["is_completed"], goals["waist"]["completed_date"]) == (True, "2025-02-10")
+
+
+@pytest.mark.asyncio
+async def test_new_goal_reads_existing_measurements(db_session, query_budget):
+    trainer, headers = await make_trainer(db_session)
+    (client,) = await make_clients(db_session, trainer, 1)
+    db_session.add(BodyMetric(client_id=client.id, measured_at=date(2025, 3, 1), weight=86.0))
+    await db_session.commit()
+
+    url = GOALS.format(client_id=client.id)
+    created = (
+        await query_budget.request("POST", url, route=GOALS, headers=headers, json=_goal())
+    ).json()
+    assert (created["current_value"], created["progress_pct"]) == (86.0, 40.0)
+
+    goal_url = f"{url}/{created['id']}"
+    updated = await query_budget.request(
+        "PUT", goal_url, route=GOALS + "/{goal_id}", headers=headers, json={"start_date": "2025-04-01"}
+    )
+    assert updated.json()["current_value"] == 86.0  # no newer measurement: value stands
+    updated = await query_budget.request(
+        "PUT", goal_url, route=GOALS + "/{goal_id}", headers=headers, json={"current_value": 88.0}
+    )
+    assert (updated.json()["current_value"], updated.json()["progress_pct"]) == (88.0, 20.0)
+
+
+@pytest.mark.asyncio
+async def test_backfill_stores_progress_for_existing_goals(db_session):
+    trainer, _ = await make_trainer(db_session)
+    ada, bob = await make_clients(db_session, trainer, 2)
+    for client in (ada, bob):
+        db_session.add_all([
+            GoalMilestone(client_id=client.id, trainer_id=trainer.id, title="Cut", goal_type="weight_loss",
+                          metric="weight", start_value=90.0, target_value=80.0, start_date=date(2025, 1, 1)),
+            GoalMilestone(client_id=client.id, trainer_id=trainer.id, title="Reps", goal_type="strength",
+                          metric="custom", start_value=0.0, target_value=8.0, current_value=6.0,
+                          start_date=date(2025, 1, 1)),
+            BodyMetric(client_id=client.id, measured_at=date(2025, 2, 1), weight=82.0),
+        ])
+    await db_session.commit()
+
+    async with TestingSessionLocal() as db:
+        assert await GoalProgressService.backfill(db, ada.id) == {"goals": 2, "synced": 1}
+        assert await GoalProgressService.backfill(db) == {"goals": 4, "synced": 2}
+
+    async with TestingSessionLocal() as db:
+        goals = (await db.execute(GoalMilestone.__table__.select())).all()
+    assert sorted((g.metric, g.current_value, g.progress_pct) for g in goals) == [
+        ("custom", 6.0, 75.0),
+        ("custom", 6.0, 75.0),
+        ("weight", 82.0, 80.0),
+        ("weight", 82.0, 80.0),
+    ]
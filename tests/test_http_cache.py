@@ -0,0 +1,113 @@
+"""Conditional GET: ETags from version functions, 304 before the handler."""
+from datetime import date
+
+import pytest
+
+from app.core import http_cache
+from app.models import BodyMetric, Client
+from tests.factories import make_clients, make_exercises, make_program, make_trainer
+
+PROGRAMS = "/api/v1/programs/"
+
+
+@pytest.mark.asyncio
+async def test_unchanged_list_is_a_304_without_the_handler_query(db_session, query_budget, client):
+    trainer, headers = await make_trainer(db_session)
+    program = await make_program(db_session, trainer)
+    await db_session.commit()
+
+    first = await query_budget.request("GET", PROGRAMS, headers=headers)
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"') and first.headers["cache-control"] == "private, no-cache"
+
+    cached = await query_budget.request(
+        "GET", PROGRAMS, headers={**headers, "If-None-Match": etag}
+    )
+    assert cached.status_code == 304 and cached.content == b""
+    # Bearer lookup plus the version query; the program list never ran.
+    assert cached.headers["x-db-query-count"] == "2"
+    assert http_cache.hit_ratio("programs") > 0
+
+    # Other query strings are other representations.
+    paged = await client.get(
+        PROGRAMS, headers={**headers, "If-None-Match": etag}, params={"limit": 1}
+    )
+    assert paged.status_code == 200
+
+    # An edit, an insert and a delete each change the version.
+    seen = {etag}
+    await client.put(f"/api/v1/programs/{program.id}", headers=headers, json={"name": "Renamed"})
+    await client.post(
+        PROGRAMS,
+        headers=headers,
+        json={
+            "name": "Second",
+            "program_type": "strength",
+            "difficulty_level": "beginner",
+            "duration_weeks": 4,
+            "sessions_per_week": 3,
+            "workout_structure": [],
+        },
+    )
+    for step in ("edit+insert", "delete"):
+        response = await client.get(PROGRAMS, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 200, step
+        etag = response.headers["etag"]
+        assert etag not in seen
+        seen.add(etag)
+        if step == "edit+insert":
+            await client.delete(f"/api/v1/programs/{program.id}", headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_body_metric_edits_invalidate_and_foreign_clients_are_not_cached(
+    db_session, query_budget, client
+):
+    trainer, headers = await make_trainer(db_session)
+    (ada,) = await make_clients(db_session, trainer, 1)
+    db_session.add(BodyMetric(client_id=ada.id, measured_at=date(2025, 1, 6), weight=80))
+    stranger = Client(trainer_id=trainer.id + 1000, first_name="Not", last_name="Mine")
+    db_session.add(stranger)
+    await db_session.commit()
+    url = f"/api/v1/progress/clients/{ada.id}/body-metrics"
+    route = "/api/v1/progress/clients/{client_id}/body-metrics"
+
+    first = await query_budget.request("GET", url, route=route, headers=headers)
+    metric_id = first.json()[0]["id"]
+    await client.put(f"{url}/{metric_id}", headers=headers, json={"weight": 79.5})
+    after_edit = await query_budget.request(
+        "GET", url, route=route, headers={**headers, "If-None-Match": first.headers["etag"]}
+    )
+    assert after_edit.status_code == 200 and after_edit.json()[0]["weight"] == 79.5
+
+    foreign = await client.get(
+        f"/api/v1/progress/clients/{stranger.id}/body-metrics",
+        headers={**headers, "If-None-Match": "*"},
+    )
+    assert foreign.status_code == 404 and "etag" not in foreign.headers
+
+
+@pytest.mark.asyncio
+async def test_weekly_schedule_and_exercise_library_revalidate(db_session, query_budget, client):
+    trainer, headers = await make_trainer(db_session)
+    (ada,) = await make_clients(db_session, trainer, 1)
+    (exercise,) = await make_exercises(db_session, 1)
+    await db_session.commit()
+
+    schedule = "/api/v1/weekly-exercises/client/{client_id}/schedule"
+    for url, route in (
+        (schedule.format(client_id=ada.id), schedule),
+        ("/api/v1/exercises/", None),
+        ("/api/v1/exercises/public", None),
+    ):
+        first = await query_budget.request("GET", url, route=route, headers=headers)
+        cached = await query_budget.request(
+            "GET", url, route=route, headers={**headers, "If-None-Match": first.headers["etag"]}
+        )
+        assert cached.status_code == 304, url
+
+    # Renaming an exercise changes the library's version.
+    before = (await client.get("/api/v1/exercises/", headers=headers)).headers["etag"]
+    await client.put(f"/api/v1/exercises/{exercise.id}", headers=headers, json={"name": "Renamed"})
+    renamed = await client.get("/api/v1/exercises/", headers={**headers, "If-None-Match": before})
+    assert renamed.status_code == 200
@@ -0,0 +1,214 @@
+"""Bulk imports: chunked validation and writes, per-row errors, resumable jobs."""
+import json
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+from app.models import Client, ExerciseLog, ImportJob, ProgramAssignment, WorkoutLog
+from app.services import import_service
+from app.services.import_service import ImportService
+from tests.conftest import TestingSessionLocal
+from tests.factories import make_clients, make_program, make_trainer
+
+IMPORT = "/api/v1/imports/{kind}"
+RESUME = "/api/v1/imports/{job_id}/resume"
+
+
+@pytest.fixture(autouse=True)
+def _upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "import_upload_dir", str(tmp_path))
+
+
+async def _count(model, *criteria):
+    async with TestingSessionLocal() as db:
+        return await db.scalar(select(func.count(model.id)).where(*criteria))
+
+
+class _Upload:
+    def __init__(self, text):
+        self._data = text.encode()
+
+    async def read(self, size):
+        block, self._data = self._data[:size], self._data[size:]
+        return block
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("rows", [1, 100])
+async def test_client_csv_import_reports_bad_rows(db_session, query_budget, rows):
+    trainer, headers = await make_trainer(db_session)
+    await db_session.commit()
+    lines = ["first_name,last_name,email,height,gender"]
+    lines += [f"Ada,{i},ada{i}@example.com,170,female" for i in range(rows)]
+    lines += ["Bad,Email,not-an-email,170,", "Too,Tall,,900,", ",Nameless,,,"]
+
+    response = await query_budget.request(
+        "POST",
+        IMPORT.format(kind="clients"),
+        route=IMPORT,
+        headers=headers,
+        files={"file": ("clients.csv", "\n".join(lines).encode(), "text/csv")},
+    )
+    job = response.json()
+    assert job["status"] == "completed"
+    assert (job["rows_processed"], job["rows_imported"], job["rows_failed"]) == (rows + 3, rows, 3)
+    assert [(e["row"], e["errors"][0]["field"]) for e in job["errors"]] == [
+        (rows + 1, "email"),
+        (rows + 2, "height"),
+        (rows + 3, "first_name"),
+    ]
+    assert await _count(Client, Client.trainer_id == trainer.id) == rows
+
+    listed = await query_budget.request("GET", "/api/v1/imports/", headers=headers)
+    assert [j["id"] for j in listed.json()] == [job["id"]]
+
+
+@pytest.mark.asyncio
+async def test_workout_history_ndjson_import(db_session, query_budget):
+    trainer, headers = await make_trainer(db_session)
+    ada, bob = await make_clients(db_session, trainer, 2)
+    ada.email = "ada@example.com"
+    program = await make_program(db_session, trainer)
+    assignment = ProgramAssignment(program_id=program.id, client_id=ada.id, trainer_id=trainer.id)
+    db_session.add(assignment)
+    await db_session.commit()
+
+    squat = {"exercise_name": "Squat", "actual_sets": [{"set": 1, "reps": 5, "weight": "100kg"}]}
+    lines = [
+        json.dumps({"client_email": "ADA@example.com", "workout_date": "2025-03-03T08:00:00",
+                    "day_number": 1, "exercises": [squat, {"exercise_name": "Row"}]}),
+        json.dumps({"client_id": ada.id, "workout_date": "2025-03-05T08:00:00", "day_number": 2}),
+        "{not json",
+        json.dumps({"client_id": bob.id, "workout_date": "2025-03-05T08:00:00", "day_number": 1}),
+        json.dumps({"client_id": 999_999, "workout_date": "2025-03-05T08:00:00", "day_number": 1}),
+        "",
+        json.dumps({"client_id": ada.id, "day_number": 1}),
+    ]
+    response = await query_budget.request(
+        "POST",
+        IMPORT.format(kind="workouts"),
+        route=IMPORT,
+        headers=headers,
+        files={"file": ("history.ndjson", "\n".join(lines).encode(), "application/x-ndjson")},
+    )
+    job = response.json()
+    assert (job["rows_processed"], job["rows_imported"], job["rows_failed"]) == (6, 2, 4)
+    assert [(e["row"], e["errors"][0]["message"]) for e in job["errors"]][:3] == [
+        (3, job["errors"][0]["errors"][0]["message"]),
+        (4, "Client has no program assignment"),
+        (5, "Client not found"),
+    ]
+    assert job["errors"][0]["errors"][0]["message"].startswith("Invalid JSON")
+    assert job["errors"][3]["row"] == 6 and job["errors"][3]["errors"][0]["field"] == "workout_date"
+
+    assert await _count(WorkoutLog, WorkoutLog.client_id == ada.id) == 2
+    assert await _count(ExerciseLog) == 2
+    async with TestingSessionLocal() as db:
+        refreshed = await db.get(ProgramAssignment, assignment.id)
+        assert refreshed.completed_workouts == 2
+        assert refreshed.last_workout_date.isoformat() == "2025-03-05T08:00:00"
+
+
+@pytest.mark.asyncio
+async def test_stopped_job_resumes_after_last_chunk(db_session, query_budget, monkeypatch):
+    trainer, headers = await make_trainer(db_session)
+    await db_session.commit()
+    csv_text = "name,muscle_groups\n" + "\n".join(f"Lift {i},chest;triceps" for i in range(25))
+
+    write_exercises = import_service._KINDS["exercises"][1]
+    calls = []
+
+    async def flaky(db, trainer_id, rows):
+        calls.append(len(rows))
+        if len(calls) == 2:
+            raise RuntimeError("connection lost")
+        return await write_exercises(db, trainer_id, rows)
+
+    monkeypatch.setitem(import_service._KINDS, "exercises", (import_service.ExerciseImportRow, flaky))
+    async with TestingSessionLocal() as db:
+        job = await ImportService.create_job(
+            db, trainer.id, import_service.ImportKind.EXERCISES, "csv", _Upload(csv_text)
+        )
+        job = await ImportService.run(db, job, chunk_size=10)
+    assert (job.status, job.rows_processed, job.rows_imported) == ("failed", 10, 10)
+    assert job.failure == "connection lost"
+
+    response = await query_budget.request(
+        "POST", RESUME.format(job_id=job.id), route=RESUME, headers=headers
+    )
+    resumed = response.json()
+    assert (resumed["status"], resumed["rows_processed"], resumed["rows_imported"]) == (
+        "completed",
+        25,
+        25,
+    )
+    async with TestingSessionLocal() as db:
+        names = (await db.execute(select(import_service.Exercise.name))).scalars().all()
+        muscles = await db.scalar(select(import_service.Exercise.muscle_groups).limit(1))
+    assert sorted(names) == sorted(f"Lift {i}" for i in range(25))
+    assert json.loads(muscles) == ["chest", "triceps"]
+    assert await _count(ImportJob) == 1
+
+    again = await query_budget.client.post(RESUME.format(job_id=job.id), headers=headers)
+    assert again.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_of_a_job_load_each_chunk_once(db_session, query_budget):
+    trainer, headers = await make_trainer(db_session)
+    await db_session.commit()
+    csv_text = "name\n" + "\n".join(f"Lift {i}" for i in range(25))
+    async with TestingSessionLocal() as db:
+        job = await ImportService.create_job(
+            db, trainer.id, import_service.ImportKind.EXERCISES, "csv", _Upload(csv_text)
+        )
+
+    # A second run read the job before this one loaded it: its claim fails.
+    async with TestingSessionLocal() as stale_db:
+        stale = await ImportService.get_job(stale_db, job.id)
+        response = await query_budget.request(
+            "POST", RESUME.format(job_id=job.id), route=RESUME, headers=headers
+        )
+        assert response.json()["rows_imported"] == 25
+        with pytest.raises(import_service.ImportClaimLost):
+            await ImportService.run(stale_db, stale, chunk_size=10)
+
+    async with TestingSessionLocal() as db:
+        stale = await ImportService.get_job(db, job.id)
+        set_committed_value(stale, "rows_processed", 10)  # Read mid-run
+        with pytest.raises(import_service.ImportClaimLost):
+            await ImportService.run(db, stale, chunk_size=10)
+    assert await _count(import_service.Exercise) == 25
+    async with TestingSessionLocal() as db:
+        assert (await ImportService.get_job(db, job.id)).status == "completed"
+
+
+@pytest.mark.asyncio
+async def test_database_error_is_narrowed_to_its_row(db_session, monkeypatch):
+    trainer, _ = await make_trainer(db_session)
+    await db_session.commit()
+    write_exercises = import_service._KINDS["exercises"][1]
+
+    async def strict(db, trainer_id, rows):
+        written = await write_exercises(db, trainer_id, rows)
+        if any(row.name == "Duplicate" for _, row in rows):
+            raise IntegrityError("INSERT INTO exercises", {}, Exception("UNIQUE constraint failed"))
+        return written
+
+    monkeypatch.setitem(import_service._KINDS, "exercises", (import_service.ExerciseImportRow, strict))
+    async with TestingSessionLocal() as db:
+        job = await ImportService.create_job(
+            db, trainer.id, import_service.ImportKind.EXERCISES, "csv",
+            _Upload("name\nBench\nDuplicate\nDeadlift\n"),
+        )
+        job = await ImportService.run(db, job)
+    assert (job.rows_imported, job.rows_failed) == (2, 1)
+    assert job.errors == [
+        {"row": 2, "errors": [{"field": None, "message": "UNIQUE constraint failed"}]}
+    ]
+    async with TestingSessionLocal() as db:
+        names = (await db.execute(select(import_service.Exercise.name))).scalars().all()
+    assert sorted(names) == ["Bench", "Deadlift"]
@@ -1,66 +1,101 @@
 """Integration tests for the FitnessCoach API.
 
-These tests use SQLite (aiosqlite) in-memory-per-file to exercise the async
-SQLAlchemy session pipeline end-to-end. Rate limiting is disabled in tests
-via the limiter's enabled flag so the auth-endpoint suite doesn't trip the
-per-IP cap.
+Engine, session override and the `client` / `setup_database` fixtures live in
+`tests/conftest.py`.
 """
 import asyncio
 
 import pytest
-import pytest_asyncio
-from httpx import ASGITransport, AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from app.core.database import Base, get_db
-from app.core.rate_limit import limiter
-from app.main import app
 
-TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+@pytest.mark.asyncio
+async def test_read_root(client):
+    response = await client.get("/")
+    assert response.status_code == 200
+    assert response.json()["message"] == "Welcome to FitnessCoach API"
+
+
+@pytest.mark.asyncio
+async def test_health_check(client):
+    response = await client.get("/api/v1/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
 
-test_engine = create_async_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = async_sessionmaker(
-    bind=test_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
-)
 
+@pytest.mark.asyncio
+async def test_ready_flips_only_after_warmup(client, setup_database):
+    from app.core import readiness
+    from tests.conftest import test_engine
 
-async def _override_get_db():
-    async with TestingSessionLocal() as session:
-        yield session
+    primed = []
 
+    async def prime(engine):
+        primed.append(engine)
 
-app.dependency_overrides[get_db] = _override_get_db
-limiter.enabled = False  # don't trip the per-IP cap during tests
+    readiness._hooks.append(prime)
+    try:
+        readiness.state.ready = False
+        response = await client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "starting"
 
+        await readiness.warm_up(test_engine)
+        response = await client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+        assert response.json()["pool_connections"] >= 1
+        assert primed == [test_engine]
+    finally:
+        readiness._hooks.remove(prime)
+        readiness.state = readiness.ReadinessState()
 
-@pytest_asyncio.fixture
-async def setup_database():
-    async with test_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    yield
-    async with test_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
 
+class _FlakyEngine:
+    """Pool of `size` whose connect() fails for the first `failures` calls."""
 
-@pytest_asyncio.fixture
-async def client():
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as ac:
-        yield ac
+    def __init__(self, size, failures):
+        self.pool = type("Pool", (), {"size": lambda _: size})()
+        self.failures, self.open = failures, 0
 
+    def connect(self):
+        engine = self
 
-@pytest.mark.asyncio
-async def test_read_root(client):
-    response = await client.get("/")
-    assert response.status_code == 200
-    assert response.json()["message"] == "Welcome to FitnessCoach API"
+        class _Conn:
+            async def __aenter__(self):
+                await asyncio.sleep(0)
+                if engine.failures:
+                    engine.failures -= 1
+                    raise ConnectionError("database starting up")
+                engine.open += 1
+                return self
+
+            async def __aexit__(self, *exc):
+                engine.open -= 1
+
+            async def execute(self, statement):
+                return None
+
+        return _Conn()
 
 
 @pytest.mark.asyncio
-async def test_health_check(client):
-    response = await client.get("/api/v1/health")
-    assert response.status_code == 200
-    assert response.json()["status"] == "healthy"
+async def test_warmup_releases_connections_and_retries():
+    from app.core import readiness
+
+    try:
+        engine = _FlakyEngine(size=3, failures=1)
+        # One failed connect must not leave the others parked at the barrier.
+        with pytest.raises(ConnectionError):
+            await asyncio.wait_for(readiness._prefill_pool(engine), timeout=1)
+        assert engine.open == 0
+
+        engine = _FlakyEngine(size=3, failures=4)
+        state = await readiness.warm_up(engine, attempts=2, backoff_s=0)
+        assert not state.ready and "pool" in state.errors
+        state = await readiness.warm_up(engine, backoff_s=0)
+        assert state.ready and state.connections == 3 and "pool" not in state.errors
+    finally:
+        readiness.state = readiness.ReadinessState()
 
 
 @pytest.mark.asyncio
@@ -196,3 +231,30 @@ async def test_create_client(client, setup_database):
     body = response.json()
     assert body["first_name"] == "John"
     assert body["last_name"] == "Client"
+
+
+@pytest.mark.asyncio
+async def test_request_reports_query_count_and_metrics(client, setup_database):
+    user_data = {
+        "email": "metrics@example.com",
+        "password": "TestPass123",
+        "first_name": "Metrics",
+        "last_name": "User",
+    }
+    await client.post("/api/v1/auth/register", json=user_data)
+    login = await client.post(
+        "/api/v1/auth/login",
+        json={"email": "metrics@example.com", "password": "TestPass123"},
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    response = await client.get("/api/v1/clients/", headers=headers)
+    assert response.status_code == 200
+    assert int(response.headers["X-DB-Query-Count"]) >= 2
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+
+    metrics = await client.get("/metrics")
+    assert metrics.status_code == 200
+    assert metrics.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'db_queries_total{route="/api/v1/clients/"}' in metrics.text
+    assert "# TYPE http_request_duration_seconds histogram" in metrics.text
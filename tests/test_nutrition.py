@@ -0,0 +1,151 @@
+"""Nutrition plans: macro totals computed over the food catalog."""
+import pytest
+from sqlalchemy import update
+
+from app.models import Food
+from app.services import nutrition_service
+from tests.conftest import TestingSessionLocal
+from tests.factories import make_trainer
+
+PLANS = "/api/v1/nutrition/plans"
+MACROS = "/api/v1/nutrition/plans/{plan_id}/macros"
+
+
+async def _foods(db, count):
+    foods = [
+        Food(
+            name=f"Food {i}",
+            calories_per_100g=100 + i,
+            protein_per_100g=10,
+            carbs_per_100g=20,
+            fat_per_100g=5,
+            fiber_per_100g=None,
+        )
+        for i in range(count)
+    ]
+    db.add_all(foods)
+    await db.flush()
+    return foods
+
+
+def _week(foods):
+    """7 days x 5 meals, each meal two foods."""
+    return {
+        "days": [
+            {
+                "day": day,
+                "meals": [
+                    {
+                        "name": f"Meal {meal}",
+                        "foods": [
+                            {"food_id": foods[(day + meal) % len(foods)].id, "grams": 150},
+                            {"food_id": foods[meal].id, "grams": 50},
+                        ],
+                    }
+                    for meal in range(5)
+                ],
+            }
+            for day in range(1, 8)
+        ]
+    }
+
+
+@pytest.mark.asyncio
+async def test_week_plan_macros_are_constant_queries_and_cached(
+    db_session, query_budget, monkeypatch
+):
+    trainer, headers = await make_trainer(db_session)
+    foods = await _foods(db_session, 12)
+    await db_session.commit()
+
+    created = await query_budget.request(
+        "POST",
+        PLANS,
+        headers=headers,
+        json={"name": "Cut", "daily_calories": 2000, "protein_grams": 150, "meal_plan": _week(foods)},
+    )
+    plan_id = created.json()["id"]
+    url = MACROS.format(plan_id=plan_id)
+
+    response = await query_budget.request("GET", url, route=MACROS, headers=headers)
+    # Bearer lookup, the plan, the catalog version, and one query for all
+    # 70 food references.
+    assert response.headers["x-db-query-count"] == "4"
+    macros = response.json()
+    assert len(macros["days"]) == 7
+    assert sum(len(day["meals"]) for day in macros["days"]) == 35
+
+    day_1 = macros["days"][0]
+    first_meal = day_1["meals"][0]["totals"]
+    # food 1 x 150 g + food 0 x 50 g
+    assert first_meal["calories"] == pytest.approx(101 * 1.5 + 100 * 0.5)
+    assert first_meal["protein"] == pytest.approx(20.0) and first_meal["fiber"] == 0
+    assert day_1["totals"]["protein"] == pytest.approx(100.0)
+    assert day_1["target_pct"]["protein"] == pytest.approx(66.7)
+    assert set(day_1["target_pct"]) == {"calories", "protein"}
+    assert macros["missing_food_ids"] == []
+
+    # Unchanged plan and catalog: served from memory.
+    response = await query_budget.request("GET", url, route=MACROS, headers=headers)
+    assert response.headers["x-db-query-count"] == "3"
+    assert response.json() == macros
+
+    # A catalog edit made elsewhere (another worker, an import) is picked up.
+    async with TestingSessionLocal() as db:
+        await db.execute(update(Food).where(Food.id == foods[1].id).values(calories_per_100g=201))
+        await db.commit()
+    macros = (await query_budget.request("GET", url, route=MACROS, headers=headers)).json()
+    assert macros["days"][0]["meals"][0]["totals"]["calories"] == pytest.approx(201 * 1.5 + 100 * 0.5)
+
+    # The batched fallback agrees with the vectorized path.
+    monkeypatch.setattr(nutrition_service, "np", None)
+    nutrition_service.invalidate()
+    fallback = await query_budget.request("GET", url, route=MACROS, headers=headers)
+    assert fallback.json() == macros
+
+
+@pytest.mark.asyncio
+async def test_plan_edits_recompute_macros(db_session, query_budget):
+    trainer, headers = await make_trainer(db_session)
+    (oats,) = await _foods(db_session, 1)
+    await db_session.commit()
+
+    created = await query_budget.request(
+        "POST",
+        PLANS,
+        headers=headers,
+        json={
+            "name": "Maintenance",
+            "meal_plan": {"meals": [{"name": "Breakfast", "foods": [{"food_id": oats.id}]}]},
+        },
+    )
+    plan_id = created.json()["id"]
+    url = MACROS.format(plan_id=plan_id)
+    first = (await query_budget.request("GET", url, route=MACROS, headers=headers)).json()
+    assert first["daily_average"]["calories"] == 100
+
+    await query_budget.request(
+        "PUT",
+        f"{PLANS}/{plan_id}",
+        route=PLANS + "/{plan_id}",
+        headers=headers,
+        json={
+            "meal_plan": {
+                "meals": [
+                    {"name": "Breakfast", "foods": [{"food_id": oats.id, "grams": 200}]},
+                    {"name": "Snack", "foods": [{"food_id": 999_999}]},
+                ]
+            }
+        },
+    )
+    second = (await query_budget.request("GET", url, route=MACROS, headers=headers)).json()
+    assert second["daily_average"]["calories"] == 200
+    assert second["missing_food_ids"] == [999_999]
+
+    listed = await query_budget.request("GET", PLANS, headers=headers)
+    assert [plan["id"] for plan in listed.json()] == [plan_id]
+    await query_budget.request(
+        "DELETE", f"{PLANS}/{plan_id}", route=PLANS + "/{plan_id}", headers=headers
+    )
+    listed = await query_budget.request("GET", PLANS, headers=headers)
+    assert listed.json() == []
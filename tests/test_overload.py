@@ -0,0 +1,159 @@
+"""Progressive overload: the coming week's loads from each client's latest session."""
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.models import (
+    ExerciseLatestPerformance,
+    Program,
+    ProgramAssignment,
+    WeeklyExerciseAssignment,
+    WeeklyScheduleDocument,
+)
+from app.models.program import DifficultyLevel, ProgramType
+from app.schemas.client_schemas import WorkoutLogCreate
+from app.services.overload_service import OverloadService, Rule, prescribe
+from app.services.weekly_exercise_service import WeeklyExerciseService
+from app.services.workout_tracking_service import workout_tracking_service
+from tests.conftest import TestingSessionLocal
+from tests.factories import make_clients, make_exercises, make_trainer
+
+MONDAY = date(2025, 3, 3)
+
+
+def _sets(weight, *reps):
+    return [{"set": i + 1, "reps": r, "weight": weight} for i, r in enumerate(reps)]
+
+
+async def _roster(db):
+    trainer, _ = await make_trainer(db)
+    ada, bo = await make_clients(db, trainer, 2)
+    squat, bench, press = await make_exercises(db, 3)
+    program = Program(
+        trainer_id=trainer.id,
+        name="Overload",
+        program_type=ProgramType.STRENGTH,
+        difficulty_level=DifficultyLevel.BEGINNER,
+        duration_weeks=4,
+        sessions_per_week=1,
+        workout_structure=[
+            {
+                "day": 1,
+                "name": "Day 1",
+                "exercises": [
+                    {"exercise_id": squat.id, "sets": 3, "reps": "8-12", "weight": "60kg"},
+                    {"exercise_id": bench.id, "sets": 3, "reps": "5", "weight": "80%",
+                     "progression": {"rule": "e1rm"}},
+                    {"exercise_id": press.id, "sets": 3, "reps": "8", "weight": "40kg",
+                     "progression": {"rule": "rpe", "target_rpe": 8, "increment_kg": 2}},
+                ],
+            }
+        ],
+    )
+    db.add(program)
+    await db.flush()
+    assignments = []
+    for client in (ada, bo):
+        assignment = ProgramAssignment(
+            program_id=program.id, client_id=client.id, trainer_id=trainer.id,
+            start_date=datetime.combine(MONDAY, datetime.min.time()),
+        )
+        db.add(assignment)
+        await db.flush()
+        await WeeklyExerciseService.generate_weekly_exercises_from_assignment(
+            db, assignment, program, commit=False
+        )
+        assignments.append(assignment)
+    await db.commit()
+
+    sessions = {
+        # Every squat set reached 12: add a step. Bench e1RM 116.7, RPE 6 on the press.
+        ada: (6, [(squat, _sets("60kg", 12, 12, 12)), (bench, _sets("100kg", 5, 5, 5)),
+                  (press, _sets("40kg", 8, 8, 8))]),
+        # Two squat sets short of 12: repeat the weight, which is already prescribed
+        bo: (9, [(squat, _sets("60kg", 12, 10, 9)), (press, _sets("40kg", 8, 8, 6))]),
+    }
+    for assignment, (client, (rpe, logged)) in zip(assignments, sessions.items()):
+        # An older, heavier session doesn't count: only the latest does
+        for days_ago, exercises in ((10, [(squat, _sets("80kg", 12, 12, 12))]), (4, logged)):
+            await workout_tracking_service.create_workout_log(
+                db,
+                WorkoutLogCreate(
+                    assignment_id=assignment.id,
+                    day_number=1,
+                    workout_date=datetime.combine(MONDAY - timedelta(days=days_ago), datetime.min.time()),
+                    perceived_exertion=rpe,
+                    exercises=[
+                        {"exercise_name": "Lift", "exercise_id": ex.id, "actual_sets": sets}
+                        for ex, sets in exercises
+                    ],
+                ),
+                client.id,
+            )
+    return (ada, bo), (squat, bench, press)
+
+
+async def _weights(db, client, week):
+    rows = await db.execute(
+        select(WeeklyExerciseAssignment.weight)
+        .where(WeeklyExerciseAssignment.client_id == client.id, WeeklyExerciseAssignment.week_number == week)
+        .order_by(WeeklyExerciseAssignment.exercise_order)
+    )
+    return rows.scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_rollover_progresses_the_coming_week(db_session):
+    (ada, bo), (squat, bench, press) = await _roster(db_session)
+
+    async with TestingSessionLocal() as db:
+        latest = await db.get(ExerciseLatestPerformance, (ada.id, squat.id))
+        assert (latest.sets, latest.top_weight_kg, latest.reps_at_top, latest.rpe) == (3, 60.0, 12, 6)
+        assert (await db.get(ExerciseLatestPerformance, (bo.id, squat.id))).reps_at_top == 9
+
+        assert await OverloadService.rollover(db, on=MONDAY) == 4
+        await db.commit()
+        # 116.7 × 80% = 93.3 → 92.5kg; 40kg × (1 + 4% × 2) = 43.2 → 44kg in 2kg steps
+        assert await _weights(db, ada, 1) == ["62.5kg", "92.5kg", "44kg"]
+        # Squat held at 60kg; RPE 9 over a target of 8: 38.4 → 38kg
+        assert await _weights(db, bo, 1) == ["60kg", "80%", "38kg"]
+        # Later weeks wait for their own rollover
+        assert await _weights(db, ada, 2) == ["60kg", "80%", "40kg"]
+
+        document = await db.get(WeeklyScheduleDocument, (ada.id, MONDAY))
+        assert [entry["weight"] for entry in document.exercises] == ["62.5kg", "92.5kg", "44kg"]
+
+        # Progressed rows (and trainer edits) are left alone on the next run
+        row = await db.scalar(
+            select(WeeklyExerciseAssignment).where(
+                WeeklyExerciseAssignment.client_id == bo.id,
+                WeeklyExerciseAssignment.week_number == 2,
+                WeeklyExerciseAssignment.exercise_id == press.id,
+            )
+        )
+        row.weight = "35kg"
+        await db.commit()
+        assert await OverloadService.rollover(db, on=MONDAY) == 0
+        assert await OverloadService.rollover(db, on=MONDAY + timedelta(weeks=1)) == 3
+        await db.commit()
+        assert await _weights(db, ada, 2) == ["62.5kg", "92.5kg", "44kg"]
+        assert await _weights(db, bo, 2) == ["60kg", "80%", "35kg"]
+
+
+def test_rules():
+    entry = {"sets": 3, "reps": "8-12", "weight": "60kg"}
+    double = Rule("double", 2.5, 8.0)
+    assert prescribe(entry, (3, 60.0, 12, 84.0, None), double) == "62.5kg"
+    assert prescribe(entry, (2, 60.0, 12, 84.0, None), double) == "60kg"  # A set short
+    assert prescribe(entry, (3, 61.23, 11, 84.0, None), double) == "60kg"  # Rounded to the step
+    assert prescribe({**entry, "reps": "AMRAP"}, (3, 60.0, 12, 84.0, None), double) is None
+
+    rpe = Rule("rpe", 2.5, 8.0)
+    assert prescribe(entry, (3, 100.0, 8, 126.7, 10), rpe) == "92.5kg"
+    assert prescribe(entry, (3, 100.0, 8, 126.7, None), rpe) == "100kg"
+
+    # Epley weight for the bottom of the range, or a set percentage
+    assert prescribe(entry, (3, 100.0, 8, 120.0, None), Rule("e1rm", 2.5, 8.0)) == "92.5kg"
+    assert prescribe(entry, (3, 100.0, 8, 120.0, None), Rule("e1rm", 2.5, 8.0, 70)) == "82.5kg"
+    assert prescribe(entry, (3, 100.0, 8, 126.7, None), Rule("none", 2.5, 8.0)) is None
@@ -0,0 +1,126 @@
+"""Strength progression: sets parsed once at write time, charted with window functions."""
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import delete, select
+
+from app.models import ExerciseLogSet, ProgramAssignment
+from app.services.progression_service import ProgressionService
+from app.services.workout_tracking_service import workout_tracking_service
+from tests.conftest import TestingSessionLocal
+from tests.factories import (
+    client_headers_for,
+    make_clients,
+    make_exercises,
+    make_program,
+    make_trainer,
+)
+
+SESSIONS = {
+    # 3 × 110kg (e1RM 121.0) beats 5 × 100kg (116.7)
+    date(2025, 1, 6): [{"set": 1, "reps": 5, "weight": "100kg"}, {"set": 2, "reps": 3, "weight": "110 kg"}],
+    # 5 × 225 lbs (102.06kg, e1RM 119.1); bodyweight and unfinished sets don't count
+    date(2025, 1, 13): [
+        {"set": 1, "reps": 5, "weight": "225 lbs"},
+        {"set": 2, "reps": 10, "weight": "bodyweight"},
+        {"set": 3, "reps": 1, "weight": "130kg", "completed": False},
+    ],
+    # A single at 125kg: a PR
+    date(2025, 1, 20): [{"set": 1, "reps": 1, "weight": "125"}],
+}
+
+
+async def _logged(db, query_budget):
+    trainer, headers = await make_trainer(db)
+    (client,) = await make_clients(db, trainer, 1)
+    squat, press = await make_exercises(db, 2)
+    program = await make_program(db, trainer, [squat])
+    assignment = ProgramAssignment(program_id=program.id, client_id=client.id, trainer_id=trainer.id)
+    db.add(assignment)
+    await db.commit()
+
+    for day, sets in SESSIONS.items():
+        await query_budget.request(
+            "POST", "/api/v1/client/workout", headers=client_headers_for(assignment),
+            json={
+                "assignment_id": assignment.id,
+                "day_number": 1,
+                "workout_date": datetime.combine(day, datetime.min.time()).isoformat(),
+                "exercises": [
+                    {"exercise_name": "Squat", "exercise_id": squat.id, "actual_sets": sets},
+                    {"exercise_name": "Warm-up walk", "actual_sets": [{"set": 1, "reps": 1, "weight": "5kg"}]},
+                ],
+            },
+        )
+    return trainer, headers, client, squat
+
+
+@pytest.mark.asyncio
+async def test_logging_indexes_sets_and_charts_progression(db_session, query_budget):
+    trainer, headers, client, squat = await _logged(db_session, query_budget)
+    async with TestingSessionLocal() as db:
+        rows = (await db.execute(select(ExerciseLogSet).order_by(ExerciseLogSet.performed_at))).scalars().all()
+    assert [(r.reps, r.weight_kg, r.e1rm) for r in rows] == [
+        (5, 100.0, 116.67), (3, 110.0, 121.0), (5, 102.06, 119.07), (1, 125.0, 125.0),
+    ]
+
+    base = f"/api/v1/progress/clients/{client.id}/progression"
+    listing = await query_budget.request(
+        "GET", base, route="/api/v1/progress/clients/{client_id}/progression", headers=headers
+    )
+    (summary,) = listing.json()
+    assert (summary["exercise_id"], summary["sessions"], summary["best_e1rm"]) == (squat.id, 3, 125.0)
+    assert summary["last_session"] == "2025-01-20"
+
+    async def chart(**params):
+        response = await query_budget.request(
+            "GET", f"{base}/{squat.id}", route="/api/v1/progress/clients/{client_id}/progression/{exercise_id}",
+            headers=headers, params=params,
+        )
+        return response.json()["points"]
+
+    points = await chart()
+    assert [(p["day"], p["e1rm"], p["best_reps"], p["best_weight"]) for p in points] == [
+        ("2025-01-06", 121.0, 3, 110.0), ("2025-01-13", 119.1, 5, 102.06), ("2025-01-20", 125.0, 1, 125.0),
+    ]
+    assert [p["volume"] for p in points] == [830.0, 510.3, 125.0]
+    assert [(p["running_best"], p["is_pr"]) for p in points] == [(121.0, True), (121.0, False), (125.0, True)]
+
+    # A range still knows the best before it
+    (later, last) = await chart(start="2025-01-13")
+    assert (later["running_best"], later["is_pr"], last["is_pr"]) == (121.0, False, True)
+    assert [p["day"] for p in await chart(end="2025-01-13")] == ["2025-01-06", "2025-01-13"]
+
+    # Downsampled: the first bucket reports its best session
+    first, second = await chart(points=2)
+    assert (first["day"], first["sessions"], first["e1rm"], first["best_reps"]) == ("2025-01-13", 2, 121.0, 3)
+    assert first["volume"] == pytest.approx((830.0 + 510.3) / 2, abs=0.1)
+    assert (second["sessions"], second["e1rm"]) == (1, 125.0)
+
+    missing = await query_budget.client.get(
+        "/api/v1/progress/clients/999999/progression", headers=headers
+    )
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_edits_and_backfill_keep_the_index_current(db_session, query_budget):
+    trainer, headers, client, squat = await _logged(db_session, query_budget)
+
+    async with TestingSessionLocal() as db:
+        first = await db.scalar(select(ExerciseLogSet).order_by(ExerciseLogSet.performed_at).limit(1))
+        await workout_tracking_service.update_exercise_log(
+            db, first.exercise_log_id, client.id,
+            {"actual_sets": [{"set": 1, "reps": 2, "weight": "150kg"}]},
+        )
+        rows = (await db.execute(
+            select(ExerciseLogSet).where(ExerciseLogSet.exercise_log_id == first.exercise_log_id)
+        )).scalars().all()
+        assert [(r.reps, r.weight_kg, r.e1rm) for r in rows] == [(2, 150.0, 160.0)]
+
+        await db.execute(delete(ExerciseLogSet))
+        await db.commit()
+        assert await ProgressionService.backfill(db) == 3
+        series = await ProgressionService.series(db, client.id, squat.id)
+    assert [p.e1rm for p in series.points] == [160.0, 119.1, 125.0]
+    assert [p.is_pr for p in series.points] == [True, False, False]
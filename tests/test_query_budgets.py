@@ -0,0 +1,506 @@
+"""Per-route statement budgets.
+
+Each scenario seeds the same route with one and with a hundred child rows
+and holds both requests to the route's budget in `tests/query_budgets.py`,
+so a loop that issues one query per row fails here instead of in production.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.routing import APIRoute
+from sqlalchemy import update
+
+from app.api.api import api_router
+from app.models import (
+    Appointment,
+    Exercise,
+    ExerciseLog,
+    Notification,
+    NotificationType,
+    ProgramAssignment,
+    WorkoutLog,
+)
+from app.schemas.exercise import ExerciseUpdate
+from app.services.exercise_service import ExerciseService
+from app.services.notification_service import NotificationService
+from app.services.weekly_exercise_service import build_weekly_exercises
+from tests.factories import (
+    SCALES,
+    client_headers_for,
+    make_clients,
+    make_exercises,
+    make_program,
+    make_trainer,
+)
+from tests.query_budgets import QUERY_BUDGETS, budget_key
+
+# Reminder scan: per window one appointment query plus its client
+# selectinload and one dedupe query, then the insert and one reload.
+REMINDER_SCAN_BUDGET = 10
+
+
+def test_every_route_has_a_budget():
+    declared = {
+        budget_key(method, "/api/v1" + route.path)
+        for route in api_router.routes
+        if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+    assert declared - set(QUERY_BUDGETS) == set(), "routes without a query budget"
+    assert set(QUERY_BUDGETS) - declared == set(), "budgets for routes that no longer exist"
+
+
+# ── Scenarios ────────────────────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n", SCALES)
+async def test_client_dashboard_is_constant(db_session, query_budget, n):
+    trainer, _ = await make_trainer(db_session)
+    (client,) = await make_clients(db_session, trainer, 1)
+    program = await make_program(db_session, trainer)
+    assignments = [
+        ProgramAssignment(program_id=program.id, client_id=client.id, trainer_id=trainer.id)
+        for _ in range(n)
+    ]
+    db_session.add_all(assignments)
+    await db_session.flush()
+    db_session.add_all(
+        WorkoutLog(
+            client_id=client.id,
+            assignment_id=a.id,
+            day_number=1,
+            workout_date=datetime.utcnow(),
+        )
+        for a in assignments
+    )
+    await db_session.commit()
+
+    response = await query_budget.request(
+        "GET", "/api/v1/client/dashboard", headers=client_headers_for(assignments[0])
+    )
+    assert len(response.json()["active_programs"]) == n
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n", SCALES)
+async def test_client_program_is_constant(db_session, query_budget, n):
+    trainer, _ = await make_trainer(db_session)
+    (client,) = await make_clients(db_session, trainer, 1)
+    exercises = await make_exercises(db_session, n)
+    program = await make_program(db_session, trainer, exercises)
+    assignment = ProgramAssignment(
+        program_id=program.id, client_id=client.id, trainer_id=trainer.id
+    )
+    db_session.add(assignment)
+    await db_session.commit()
+
+    response = await query_budget.request(
+        "GET", "/api/v1/client/program", headers=client_headers_for(assignment)
+    )
+    day = response.json()["workout_structure"][0]
+    assert len(day["exercises"]) == n
+    assert day["exercises"][0]["exercise_name"] == "Exercise 0"
+    assert day["exercises"][0]["muscle_groups"] == ["chest"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n", SCALES)
+async def test_bulk_assign_is_constant(db_session, query_budget, n):
+    trainer, headers = await make_trainer(db_session)
+    clients = await make_clients(db_session, trainer, n)
+    exercises = await make_exercises(db_session, 3)
+    program = await make_program(db_session, trainer, exercises)
+    await db_session.commit()
+
+    response = await query_budget.request(
+        "POST",
+        f"/api/v1/programs/{program.id}/assign",
+        route="/api/v1/programs/{program_id}/assign",
+        headers=headers,
+        json={"client_ids": [c.id for c in clients]},
+    )
+    assert len(response.json()) == n
+
+
+@pytest.mark.asyncio
+async def test_bulk_assign_reports_duplicates_and_foreign_clients(db_session, client):
+    trainer, headers = await make_trainer(db_session)
+    (mine,) = await make_clients(db_session, trainer, 1)
+    program = await make_program(db_session, trainer)
+    await db_session.commit()
+
+    response = await client.post(
+        f"/api/v1/programs/{program.id}/assign",
+        headers=headers,
+        json={"client_ids": [mine.id, mine.id, 999]},
+    )
+    assert response.status_code < 400
+    assert len(response.json()) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n", SCALES)
+async def test_appointment_reminders_are_constant(db_session, count_statements, n):
+    trainer, _ = await make_trainer(db_session)
+    clients = await make_clients(db_session, trainer, n)
+    start = datetime.utcnow() + timedelta(hours=24)
+    db_session.add_all(
+        Appointment(
+            trainer_id=trainer.id,
+            client_id=c.id,
+            title="Session",
+            appointment_type="personal_training",
+            status="scheduled",
+            start_time=start,
+            end_time=start + timedelta(hours=1),
+        )
+        for c in clients
+    )
+    await db_session.commit()
+
+    with count_statements() as used:
+        created = await NotificationService.check_and_create_appointment_reminders(
+            db_session, trainer.id
+        )
+    assert len(created) == n
+    assert created[0].created_at is not None
+    assert used() <= REMINDER_SCAN_BUDGET
+
+    # Reminders already sent in the last hour are not repeated.
+    assert await NotificationService.check_and_create_appointment_reminders(
+        db_session, trainer.id
+    ) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n", SCALES)
+async def test_exercises_bulk_is_constant(db_session, query_budget, n):
+    _, headers = await make_trainer(db_session)
+    exercises = await make_exercises(db_session, n)
+    await db_session.commit()
+
+    ids = [ex.id for ex in reversed(exercises)]
+    response = await query_budget.request(
+        "POST", "/api/v1/exercises/bulk", headers=headers, json=ids
+    )
+    assert [ex["id"] for ex in response.json()] == ids
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n", SCALES)
+async def test_trainer_assignments_list_is_constant(db_session, query_budget, n):
+    trainer, headers = await make_trainer(db_session)
+    clients = await make_clients(db_session, trainer, n)
+    program = await make_program(db_session, trainer, await make_exercises(db_session, 3))
+    db_session.add_all(
+        ProgramAssignment(program_id=program.id, client_id=c.id, trainer_id=trainer.id)
+        for c in clients
+    )
+    await db_session.commit()
+
+    response = await query_budget.request("GET", "/api/v1/assignments/", headers=headers)
+    assert len(response.json()) == n
+
+
+@pytest.mark.asyncio
+async def test_assignment_structures_are_cached_across_requests(db_session, client):
+    trainer, headers = await make_trainer(db_session)
+    clients = await make_clients(db_session, trainer, 3)
+    exercises = await make_exercises(db_session, 2)
+    programs = [await make_program(db_session, trainer, exercises) for _ in range(2)]
+    db_session.add_all(
+        ProgramAssignment(program_id=programs[i % 2].id, client_id=c.id, trainer_id=trainer.id)
+        for i, c in enumerate(clients)
+    )
+    await db_session.commit()
+
+    cold = await client.get("/api/v1/assignments/", headers=headers)
+    warm = await client.get("/api/v1/assignments/", headers=headers)
+    assert warm.json() == cold.json()
+    # The warm request skips the exercise-name lookup entirely.
+    assert int(warm.headers["X-DB-Query-Count"]) == int(cold.headers["X-DB-Query-Count"]) - 1
+
+    await ExerciseService.update_exercise(
+        db_session, exercises[0].id, ExerciseUpdate(name="Renamed")
+    )
+    renamed = await client.get("/api/v1/assignments/", headers=headers)
+    names = {
+        ex["exercise_name"]
+        for a in renamed.json()
+        for day in a["workout_structure"]
+        for ex in day["exercises"]
+    }
+    assert names == {"Renamed", exercises[1].name}
+
+    # A rename made by another worker never touches this process's cache;
+    # the library version still moves, so the next listing misses.
+    await db_session.execute(
+        update(Exercise)
+        .where(Exercise.id == exercises[1].id)
+        # Past the first rename's stamp: SQLite's now() has one-second resolution.
+        .values(name="Elsewhere", updated_at=datetime.utcnow() + timedelta(minutes=1))
+    )
+    await db_session.commit()
+    elsewhere = await client.get("/api/v1/assignments/", headers=headers)
+    names = {
+        ex["exercise_name"]
+        for a in elsewhere.json()
+        for day in a["workout_structure"]
+        for ex in day["exercises"]
+    }
+    assert names == {"Renamed", "Elsewhere"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n", SCALES)
+async def test_notification_list_is_constant(db_session, query_budget, n):
+    trainer, headers = await make_trainer(db_session)
+    clients = await make_clients(db_session, trainer, n)
+    # Rows written before client_name was denormalized: resolved in one batch.
+    db_session.add_all(
+        Notification(
+            user_id=trainer.id,
+            notification_type=NotificationType.WORKOUT_COMPLETED,
+            title="Workout done",
+            message="A client finished a workout",
+            related_client_id=c.id,
+        )
+        for c in clients
+    )
+    await db_session.commit()
+
+    response = await query_budget.request(
+        "GET", "/api/v1/notifications/", headers=headers, params={"limit": 100}
+    )
+    names = {item["client_name"] for item in response.json()["notifications"]}
+    assert names == {f"{c.first_name} {c.last_name}" for c in clients}
+
+
+@pytest.mark.asyncio
+async def test_renaming_a_client_rewrites_its_notifications(db_session, query_budget, client):
+    trainer, headers = await make_trainer(db_session)
+    renamed, other = await make_clients(db_session, trainer, 2)
+    db_session.add_all(
+        Notification(
+            user_id=trainer.id,
+            notification_type=NotificationType.WORKOUT_COMPLETED,
+            title="Workout done",
+            message="A client finished a workout",
+            related_client_id=c.id,
+            client_name=f"{c.first_name} {c.last_name}",
+        )
+        for c in (renamed, other)
+    )
+    await db_session.commit()
+
+    await query_budget.request(
+        "PUT",
+        f"/api/v1/clients/{renamed.id}",
+        route="/api/v1/clients/{client_id}",
+        headers=headers,
+        json={"last_name": "Renamed"},
+    )
+    response = await client.get("/api/v1/notifications/", headers=headers)
+    names = {item["client_name"] for item in response.json()["notifications"]}
+    assert names == {f"{renamed.first_name} Renamed", f"{other.first_name} {other.last_name}"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n", SCALES)
+async def test_notification_enrichment_batches_each_related_type(db_session, count_statements, n):
+    trainer, _ = await make_trainer(db_session)
+    clients = await make_clients(db_session, trainer, n)
+    program = await make_program(db_session, trainer)
+    assignments = [
+        ProgramAssignment(program_id=program.id, client_id=c.id, trainer_id=trainer.id)
+        for c in clients
+    ]
+    db_session.add_all(assignments)
+    start = datetime(2025, 1, 6, 9, 0)
+    appointments = [
+        Appointment(
+            trainer_id=trainer.id,
+            client_id=c.id,
+            title="Session",
+            appointment_type="personal_training",
+            status="scheduled",
+            start_time=start,
+            end_time=start + timedelta(hours=1),
+        )
+        for c in clients
+    ]
+    db_session.add_all(appointments)
+    await db_session.flush()
+    logs = [
+        WorkoutLog(client_id=a.client_id, assignment_id=a.id, day_number=1, workout_date=start)
+        for a in assignments
+    ]
+    db_session.add_all(logs)
+    await db_session.flush()
+
+    def _notification(**related):
+        return Notification(
+            user_id=trainer.id,
+            notification_type=NotificationType.WORKOUT_COMPLETED,
+            title="t",
+            message="m",
+            **related,
+        )
+
+    notifications = (
+        [_notification(related_appointment_id=a.id) for a in appointments]
+        + [_notification(related_workout_log_id=log.id) for log in logs]
+        + [_notification(related_client_id=c.id, client_name="Stored Name") for c in clients]
+    )
+    db_session.add_all(notifications)
+    await db_session.commit()
+
+    with count_statements() as used:
+        rendered = await NotificationService.enrich_notifications(notifications, db_session)
+    # One lookup each for appointments, workout logs and clients; denormalized
+    # rows need none.
+    assert used() == 3
+    expected = [f"{c.first_name} {c.last_name}" for c in clients]
+    assert [r["client_name"] for r in rendered] == expected * 2 + ["Stored Name"] * n
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n", SCALES)
+async def test_client_workout_history_is_constant(db_session, query_budget, n):
+    trainer, _ = await make_trainer(db_session)
+    (client,) = await make_clients(db_session, trainer, 1)
+    program = await make_program(db_session, trainer)
+    assignment = ProgramAssignment(program_id=program.id, client_id=client.id, trainer_id=trainer.id)
+    db_session.add(assignment)
+    await db_session.flush()
+    logs = [
+        WorkoutLog(
+            client_id=client.id,
+            assignment_id=assignment.id,
+            day_number=1,
+            workout_date=datetime(2025, 1, 1) + timedelta(days=i),
+        )
+        for i in range(n)
+    ]
+    db_session.add_all(logs)
+    await db_session.flush()
+    db_session.add_all(
+        ExerciseLog(workout_log_id=log.id, exercise_name=f"Move {k}", exercise_order=k)
+        for log in logs
+        for k in (2, 1)
+    )
+    await db_session.commit()
+
+    response = await query_budget.request(
+        "GET",
+        "/api/v1/client/workouts",
+        headers=client_headers_for(assignment),
+        params={"limit": 100},
+    )
+    history = response.json()
+    assert len(history) == n
+    assert history[0]["workout_date"] == (datetime(2025, 1, 1) + timedelta(days=n - 1)).isoformat()
+    assert [ex["exercise_order"] for ex in history[0]["exercises"]] == [1, 2]
+    assert history[0]["exercises"][0]["actual_sets"] == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n", SCALES)
+async def test_weekly_schedule_is_constant(db_session, query_budget, n):
+    trainer, headers = await make_trainer(db_session)
+    (client,) = await make_clients(db_session, trainer, 1)
+    exercises = await make_exercises(db_session, n)
+    program = await make_program(db_session, trainer, exercises)
+    program.duration_weeks = 1
+    assignment = ProgramAssignment(
+        program_id=program.id,
+        client_id=client.id,
+        trainer_id=trainer.id,
+        start_date=datetime(2025, 1, 6),
+        generated_weeks=program.duration_weeks,
+    )
+    db_session.add(assignment)
+    await db_session.flush()
+    db_session.add_all(build_weekly_exercises(program, assignment))
+    await db_session.commit()
+
+    response = await query_budget.request(
+        "GET",
+        f"/api/v1/weekly-exercises/client/{client.id}/schedule",
+        route="/api/v1/weekly-exercises/client/{client_id}/schedule",
+        headers=headers,
+        params={"week_start": "2025-01-06"},
+    )
+    schedule = response.json()
+    assert schedule["total_exercises"] == n
+    first = schedule["days"]["day_1"][0]
+    assert first["exercise_name"] == "Exercise 0"
+    assert first["status"] == "pending"
+    assert first["muscle_groups"] == ["chest"]
+
+    normalized = await query_budget.request(
+        "GET",
+        f"/api/v1/weekly-exercises/client/{client.id}/schedule",
+        route="/api/v1/weekly-exercises/client/{client_id}/schedule",
+        headers=headers,
+        params={"week_start": "2025-01-06", "normalized": "true"},
+    )
+    body = normalized.json()
+    row = body["days"]["day_1"][0]
+    assert "exercise_name" not in row and row["sets"] == first["sets"]
+    assert body["exercises"][str(row["exercise_id"])] == {
+        key: first[key]
+        for key in (
+            "exercise_name",
+            "exercise_description",
+            "exercise_video_url",
+            "exercise_instructions",
+            "muscle_groups",
+        )
+    }
+    assert len(body["exercises"]) == n
+
+    # A field list without exercise_id still leaves rows joinable to the map
+    trimmed = await query_budget.request(
+        "GET",
+        f"/api/v1/weekly-exercises/client/{client.id}/schedule",
+        route="/api/v1/weekly-exercises/client/{client_id}/schedule",
+        headers=headers,
+        params={"week_start": "2025-01-06", "normalized": "true", "fields": "exercise_name,sets"},
+    )
+    body = trimmed.json()
+    row = body["days"]["day_1"][0]
+    assert set(row) == {"id", "exercise_id", "sets"}
+    assert body["exercises"][str(row["exercise_id"])] == {"exercise_name": "Exercise 0"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n", SCALES)
+async def test_weekly_exercise_details_are_one_statement(db_session, query_budget, n):
+    trainer, headers = await make_trainer(db_session)
+    (client,) = await make_clients(db_session, trainer, 1)
+    program = await make_program(db_session, trainer, await make_exercises(db_session, n))
+    assignment = ProgramAssignment(
+        program_id=program.id,
+        client_id=client.id,
+        trainer_id=trainer.id,
+        start_date=datetime(2025, 1, 6),
+        generated_weeks=program.duration_weeks,
+    )
+    db_session.add(assignment)
+    await db_session.flush()
+    db_session.add_all(build_weekly_exercises(program, assignment))
+    await db_session.commit()
+
+    response = await query_budget.request(
+        "GET",
+        f"/api/v1/weekly-exercises/client/{client.id}/week",
+        route="/api/v1/weekly-exercises/client/{client_id}/week",
+        headers=headers,
+        params={"week_start": "2025-01-06"},
+    )
+    rows = response.json()
+    assert len(rows) == n
+    assert rows[0]["exercise_name"] == "Exercise 0"
+    assert rows[0]["program_name"] == program.name
+    assert rows[0]["client_name"] == f"{client.first_name} {client.last_name}"
@@ -0,0 +1,134 @@
+"""Response payloads: the orjson renderer must produce the same JSON
+pydantic/FastAPI would; compression and sparse fieldsets shrink them."""
+import gzip
+import json
+from datetime import date, datetime, timezone
+
+import pytest
+
+from app.core import compression
+from app.core.compression import choose_encoding
+from app.core.responses import dumps, render
+from app.models import AssignmentStatus
+from app.schemas.client_schemas import WorkoutLogResponse
+
+
+def _workout(created_at: datetime) -> dict:
+    return {
+        "id": 1,
+        "assignment_id": 2,
+        "client_id": 3,
+        "workout_date": datetime(2025, 1, 6, 7, 30, 0, 125000),
+        "day_number": 1,
+        "workout_name": "Día 1",
+        "total_duration_minutes": None,
+        "perceived_exertion": 7,
+        "client_notes": None,
+        "trainer_feedback": None,
+        "is_completed": True,
+        "is_skipped": False,
+        "skip_reason": None,
+        "exercises": [],
+        "created_at": created_at,
+    }
+
+
+def test_row_payload_matches_response_model_json():
+    for created_at in (datetime(2025, 1, 6, 8, 0), datetime(2025, 1, 6, 8, 0, tzinfo=timezone.utc)):
+        row = _workout(created_at)
+        expected = json.loads(WorkoutLogResponse(**row).model_dump_json())
+        assert json.loads(dumps(row)) == expected
+
+
+def test_render_handles_models_enums_and_dates():
+    body = json.loads(
+        render(
+            {
+                "status": AssignmentStatus.ACTIVE,
+                "week_start": date(2025, 1, 6),
+                "days": {1: ["a"]},
+                "workout": WorkoutLogResponse(**_workout(datetime(2025, 1, 6))),
+            }
+        ).body
+    )
+    assert body["status"] == "active"
+    assert body["week_start"] == "2025-01-06"
+    assert body["days"] == {"1": ["a"]}
+    assert body["workout"]["workout_date"] == "2025-01-06T07:30:00.125000"
+
+
+def test_choose_encoding_honours_q_values(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert choose_encoding("gzip, deflate, br") == "gzip"
+    assert choose_encoding("gzip;q=0, identity") is None
+    assert choose_encoding("*") == "gzip"
+    assert choose_encoding("") is None
+    monkeypatch.setattr(compression, "brotli", object())
+    assert choose_encoding("gzip, br") == "br"
+    assert choose_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+
+
+@pytest.mark.asyncio
+async def test_large_json_is_compressed_and_small_json_is_not(db_session, client):
+    from tests.factories import make_exercises, make_trainer
+
+    trainer, headers = await make_trainer(db_session)
+    await make_exercises(db_session, 30)
+    await db_session.commit()
+
+    # Send the raw bytes to the test so gzip framing can be checked.
+    raw = {**headers, "Accept-Encoding": "gzip"}
+    async with client.stream("GET", "/api/v1/exercises/", headers=raw) as big:
+        body = b"".join([chunk async for chunk in big.aiter_raw()])
+    assert big.headers["content-encoding"] == "gzip"
+    assert big.headers["vary"] == "Accept-Encoding"
+    assert big.headers["etag"].startswith('W/"')
+    assert len(json.loads(gzip.decompress(body))) == 30
+
+    small = await client.get("/api/v1/exercises/muscle-groups", headers=raw)
+    assert "content-encoding" not in small.headers
+    plain = await client.get("/api/v1/exercises/", headers={**headers, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+
+
+@pytest.mark.asyncio
+async def test_sparse_fieldsets_select_only_requested_columns(db_session, query_budget, client):
+    from app.models import ExerciseLog, ProgramAssignment, WorkoutLog
+    from tests.factories import (
+        client_headers_for,
+        make_clients,
+        make_exercises,
+        make_program,
+        make_trainer,
+    )
+
+    trainer, headers = await make_trainer(db_session)
+    (ada,) = await make_clients(db_session, trainer, 1)
+    program = await make_program(db_session, trainer, await make_exercises(db_session, 2))
+    assignment = ProgramAssignment(program_id=program.id, client_id=ada.id, trainer_id=trainer.id)
+    db_session.add(assignment)
+    await db_session.flush()
+    log = WorkoutLog(client_id=ada.id, assignment_id=assignment.id, day_number=1)
+    db_session.add(log)
+    await db_session.flush()
+    db_session.add(ExerciseLog(workout_log_id=log.id, exercise_name="Squat", exercise_order=1))
+    await db_session.commit()
+
+    programs = await query_budget.request(
+        "GET", "/api/v1/programs/", headers=headers, params={"fields": "name,workout_structure"}
+    )
+    (row,) = programs.json()
+    assert set(row) == {"id", "name", "workout_structure"}
+    assert row["workout_structure"][0]["exercises"][0]["sets"] == 3
+
+    bad = await client.get("/api/v1/programs/", headers=headers, params={"fields": "name,secret"})
+    assert bad.status_code == 400 and bad.json()["detail"]["message"] == "Unknown fields: secret"
+
+    client_headers = client_headers_for(assignment)
+    full = await query_budget.request("GET", "/api/v1/client/workouts", headers=client_headers)
+    trimmed = await query_budget.request(
+        "GET", "/api/v1/client/workouts", headers=client_headers, params={"fields": "workout_date"}
+    )
+    assert set(trimmed.json()[0]) == {"id", "workout_date"}
+    # The exercise-log query is skipped when "exercises" isn't requested.
+    assert int(trimmed.headers["x-db-query-count"]) == int(full.headers["x-db-query-count"]) - 1
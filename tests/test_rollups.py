@@ -0,0 +1,188 @@
+"""Rollups: the job folds raw rows into daily/weekly facts and readers agree."""
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from sqlalchemy import delete, select, update
+
+from app.models import (
+    BodyMetric,
+    ClientDailyRollup,
+    ClientWeeklyRollup,
+    ExerciseLog,
+    ProgramAssignment,
+    WeeklyExerciseAssignment,
+    WorkoutLog,
+)
+from app.models.weekly_exercise import WeeklyExerciseStatus
+from app.services.rollup_service import RollupService, monday
+from app.utils.units import parse_reps, parse_weight_kg, set_tonnage
+from tests.conftest import TestingSessionLocal
+from tests.factories import (
+    client_headers_for,
+    make_clients,
+    make_exercises,
+    make_program,
+    make_trainer,
+)
+
+
+async def _history(db):
+    """A client with four weeks of workouts, weekly exercises and weigh-ins."""
+    trainer, headers = await make_trainer(db)
+    (client,) = await make_clients(db, trainer, 1)
+    (exercise,) = await make_exercises(db, 1)
+    program = await make_program(db, trainer, [exercise])
+    assignment = ProgramAssignment(program_id=program.id, client_id=client.id, trainer_id=trainer.id)
+    db.add(assignment)
+    await db.flush()
+
+    today = date.today()
+    for offset in range(1, 28, 2):
+        day = today - timedelta(days=offset)
+        workout = WorkoutLog(
+            client_id=client.id, assignment_id=assignment.id, day_number=1,
+            workout_date=datetime.combine(day, time(9)),
+            is_completed=offset % 3 != 0, is_skipped=offset % 3 == 0,
+            total_duration_minutes=45, perceived_exertion=7,
+        )
+        db.add(workout)
+        await db.flush()
+        db.add(ExerciseLog(
+            workout_log_id=workout.id, exercise_id=exercise.id, exercise_name="Squat",
+            actual_sets=[{"set": 1, "reps": 10, "weight": "60kg", "completed": True},
+                         {"set": 2, "reps": "8", "weight": "bodyweight", "completed": True}],
+        ))
+        db.add(WeeklyExerciseAssignment(
+            program_assignment_id=assignment.id, client_id=client.id, trainer_id=trainer.id,
+            exercise_id=exercise.id, assigned_date=day, week_number=1, day_number=1, exercise_order=offset, sets=3, reps="10",
+            status=WeeklyExerciseStatus.COMPLETED if offset % 3 else WeeklyExerciseStatus.PENDING,
+            completed_date=datetime.combine(day, time(10)) if offset % 3 else None,
+        ))
+        db.add(BodyMetric(client_id=client.id, measured_at=day, weight=80.0 - offset / 10))
+    await db.commit()
+    return trainer, headers, client, assignment, exercise
+
+
+async def _reads(query_budget, headers, client, assignment):
+    stats = await query_budget.request(
+        "GET", f"/api/v1/progress/clients/{client.id}/workout-stats",
+        route="/api/v1/progress/clients/{client_id}/workout-stats", headers=headers,
+    )
+    completion = await query_budget.request(
+        "GET", f"/api/v1/progress/clients/{client.id}/completion",
+        route="/api/v1/progress/clients/{client_id}/completion", headers=headers, params={"weeks": 6},
+    )
+    dashboard = await query_budget.request("GET", "/api/v1/client/dashboard", headers=client_headers_for(assignment))
+    return stats.json(), completion.json(), dashboard.json()["progress_stats"]
+
+
+@pytest.mark.asyncio
+async def test_readers_agree_before_and_after_refresh(db_session, query_budget):
+    trainer, headers, client, assignment, exercise = await _history(db_session)
+    raw = await _reads(query_budget, headers, client, assignment)
+
+    async with TestingSessionLocal() as db:
+        result = await RollupService.refresh(db)
+        daily = (await db.execute(select(ClientDailyRollup).order_by(ClientDailyRollup.day))).scalars().all()
+        weekly = (await db.execute(select(ClientWeeklyRollup))).scalars().all()
+    assert result["days"] == len(daily) == 14
+    first = daily[-1]  # Yesterday: completed, 10 × 60kg (bodyweight sets carry no load)
+    assert (first.workouts_completed, first.duration_minutes, first.rpe_sum, first.tonnage) == (1, 45, 7, 600.0)
+    assert (first.exercises_assigned, first.exercises_completed, first.weight) == (1, 1, 79.9)
+    assert sum(w.workouts_completed for w in weekly) == sum(d.workouts_completed for d in daily) == 9
+    assert {w.week_start for w in weekly} == {monday(d.day) for d in daily}
+
+    assert await _reads(query_budget, headers, client, assignment) == raw
+
+    # Covered days are served from the rollups, today stays live
+    async with TestingSessionLocal() as db:
+        await db.execute(
+            update(ClientDailyRollup).where(ClientDailyRollup.day == first.day).values(exercises_assigned=5)
+        )
+        db.add(WeeklyExerciseAssignment(
+            program_assignment_id=assignment.id, client_id=client.id, trainer_id=trainer.id,
+            exercise_id=exercise.id, assigned_date=date.today(), week_number=1,
+            day_number=1, exercise_order=28, sets=3, reps="10",
+        ))
+        await db.commit()
+    stats, _, _ = await _reads(query_budget, headers, client, assignment)
+    assert stats["total_assigned"] == raw[0]["total_assigned"] + 4 + 1
+
+
+@pytest.mark.asyncio
+async def test_status_change_on_a_covered_day_is_read_at_once(db_session, query_budget):
+    trainer, headers, client, assignment, exercise = await _history(db_session)
+    async with TestingSessionLocal() as db:
+        await RollupService.refresh(db)
+        pending = await db.scalar(
+            select(WeeklyExerciseAssignment.id).where(
+                WeeklyExerciseAssignment.status == WeeklyExerciseStatus.PENDING
+            ).limit(1)
+        )
+    before = await _reads(query_budget, headers, client, assignment)
+
+    await query_budget.request(
+        "PUT", f"/api/v1/weekly-exercises/{pending}/status",
+        route="/api/v1/weekly-exercises/{exercise_id}/status", headers=headers,
+        json={"status": "completed"},
+    )
+    after = await _reads(query_budget, headers, client, assignment)
+    assert after[0]["total_completed"] == before[0]["total_completed"] + 1
+    # As if the job had run
+    async with TestingSessionLocal() as db:
+        await RollupService.rebuild(db, client.id)
+    assert await _reads(query_budget, headers, client, assignment) == after
+
+
+@pytest.mark.asyncio
+async def test_refresh_is_incremental_and_idempotent(db_session):
+    trainer, headers, client, assignment, exercise = await _history(db_session)
+    last_week = date.today() - timedelta(days=8)  # No activity yet
+
+    async with TestingSessionLocal() as db:
+        await RollupService.refresh(db)
+        # A back-dated workout logged after the run
+        db.add(WorkoutLog(
+            client_id=client.id, assignment_id=assignment.id, day_number=2,
+            workout_date=datetime.combine(last_week, time(18)), total_duration_minutes=30,
+        ))
+        await db.commit()
+        result = await RollupService.refresh(db)
+        row = await db.get(ClientDailyRollup, (client.id, last_week))
+        assert (row.workouts_completed, row.duration_minutes) == (1, 30)
+
+        again = await RollupService.refresh(db)
+        db.expire_all()
+        row = await db.get(ClientDailyRollup, (client.id, last_week))
+        assert (row.workouts_completed, row.duration_minutes) == (1, 30)
+        week = await db.get(ClientWeeklyRollup, (client.id, monday(last_week)))
+        assert week.duration_minutes == sum(
+            d.duration_minutes for d in (await db.execute(
+                select(ClientDailyRollup).where(
+                    ClientDailyRollup.day >= monday(last_week),
+                    ClientDailyRollup.day < monday(last_week) + timedelta(days=7),
+                )
+            )).scalars()
+        )
+        assert again["days"] == result["days"]
+
+        # Deletes leave no timestamp; a rebuild clears the day
+        await db.execute(delete(WorkoutLog).where(WorkoutLog.workout_date >= datetime.combine(last_week, time(12)),
+                                                  WorkoutLog.workout_date < datetime.combine(last_week, time(23))))
+        await db.commit()
+        await RollupService.rebuild(db, client.id)
+        db.expire_all()
+        assert await db.get(ClientDailyRollup, (client.id, last_week)) is None
+
+
+def test_units():
+    assert parse_weight_kg("60kg") == parse_weight_kg("60 KG") == parse_weight_kg(60) == 60.0
+    assert parse_weight_kg("100 lbs") == pytest.approx(45.359, abs=1e-3)
+    assert parse_weight_kg("bodyweight") is parse_weight_kg("80%") is parse_weight_kg(True) is None
+    assert parse_reps("8-12") == parse_reps(8) == 8
+    assert parse_reps("AMRAP") is None
+    assert set_tonnage([
+        {"reps": 10, "weight": "50kg"},
+        {"reps": 5, "weight": "100", "completed": False},
+        "junk",
+    ]) == 500.0
@@ -0,0 +1,135 @@
+"""Roster analytics: per-client metrics from grouped queries, sorted and filtered."""
+import itertools
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from app.models import (
+    BodyMetric,
+    PerformanceRecord,
+    ProgramAssignment,
+    WeeklyExerciseAssignment,
+    WorkoutLog,
+)
+from app.models.weekly_exercise import WeeklyExerciseStatus
+from tests.factories import SCALES, make_clients, make_exercises, make_program, make_trainer
+
+SUMMARY = "/api/v1/weekly-exercises/trainer/clients-summary"
+
+
+async def _roster(db, n):
+    trainer, headers = await make_trainer(db)
+    clients = await make_clients(db, trainer, n)
+    (exercise,) = await make_exercises(db, 1)
+    program = await make_program(db, trainer, [exercise])
+    assignments = [
+        ProgramAssignment(program_id=program.id, client_id=c.id, trainer_id=trainer.id) for c in clients
+    ]
+    db.add_all(assignments)
+    await db.flush()
+
+    slots = itertools.count(1)
+
+    def exercise_on(assignment, status, completed_on=None, due_on=None):
+        return WeeklyExerciseAssignment(
+            program_assignment_id=assignment.id,
+            client_id=assignment.client_id,
+            trainer_id=trainer.id,
+            exercise_id=exercise.id,
+            # Generated with the program, well before the window
+            assigned_date=date.today() - timedelta(weeks=12),
+            due_date=due_on or completed_on or date.today(),
+            week_number=1,
+            day_number=1,
+            exercise_order=next(slots),
+            sets=3,
+            reps="10",
+            status=status,
+            completed_date=datetime.combine(completed_on, time(9)) if completed_on else None,
+        )
+
+    return trainer, headers, clients, assignments, exercise_on
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n", SCALES)
+async def test_roster_summary_is_constant(db_session, query_budget, n):
+    trainer, headers, clients, assignments, exercise_on = await _roster(db_session, n)
+    today = date.today()
+    for client, assignment in zip(clients, assignments):
+        db_session.add_all([
+            exercise_on(assignment, WeeklyExerciseStatus.COMPLETED, today),
+            exercise_on(assignment, WeeklyExerciseStatus.PENDING),
+            WorkoutLog(client_id=client.id, assignment_id=assignment.id, day_number=1,
+                       workout_date=datetime.utcnow()),
+            BodyMetric(client_id=client.id, measured_at=today - timedelta(days=7), weight=80.0),
+            BodyMetric(client_id=client.id, measured_at=today, weight=79.0),
+            PerformanceRecord(client_id=client.id, trainer_id=trainer.id, exercise_name="Squat",
+                              value=100, unit="kg", record_type="1RM", recorded_at=today),
+        ])
+    await db_session.commit()
+
+    response = await query_budget.request("GET", SUMMARY, headers=headers)
+    body = response.json()
+    assert body["total"] == n
+    assert {(c["completion_rate"], c["current_streak"], c["weight_trend"], c["pr_count"])
+            for c in body["clients"]} == {(50.0, 1, -1.0, 1)}
+
+
+@pytest.mark.asyncio
+async def test_roster_metrics_sort_and_filter(db_session, query_budget):
+    trainer, headers, clients, assignments, exercise_on = await _roster(db_session, 3)
+    (ada, bob, cat), (ada_a, bob_a, cat_a) = clients, assignments
+    cat.is_active = False
+    today = date.today()
+    done = WeeklyExerciseStatus.COMPLETED
+    db_session.add_all([
+        # Ada: 3 of 4 done on the last three days, lifting and losing weight
+        exercise_on(ada_a, done, today),
+        exercise_on(ada_a, done, today - timedelta(days=1)),
+        exercise_on(ada_a, done, today - timedelta(days=2)),
+        exercise_on(ada_a, WeeklyExerciseStatus.SKIPPED),
+        exercise_on(ada_a, WeeklyExerciseStatus.PENDING, due_on=today + timedelta(days=1)),  # Not due yet
+        WorkoutLog(client_id=ada.id, assignment_id=ada_a.id, day_number=1,
+                   workout_date=datetime.combine(today - timedelta(days=2), time(9))),
+        BodyMetric(client_id=ada.id, measured_at=today - timedelta(days=14), weight=82.0),
+        BodyMetric(client_id=ada.id, measured_at=today - timedelta(days=7), weight=81.0),
+        BodyMetric(client_id=ada.id, measured_at=today, weight=80.0),
+        BodyMetric(client_id=ada.id, measured_at=today - timedelta(weeks=20), weight=95.0),
+        *(
+            PerformanceRecord(client_id=ada.id, trainer_id=trainer.id, exercise_name="Squat", value=v,
+                              unit="kg", record_type="1RM", recorded_at=on)
+            for v, on in [(100, today), (95, today - timedelta(days=10)), (80, today - timedelta(weeks=20))]
+        ),
+        # Bob: 1 of 2 done, three days ago; no workouts logged
+        exercise_on(bob_a, done, today - timedelta(days=3)),
+        exercise_on(bob_a, WeeklyExerciseStatus.PENDING),
+        # Cat is inactive
+        exercise_on(cat_a, done, today),
+    ])
+    await db_session.commit()
+
+    async def summary(**params):
+        response = await query_budget.request("GET", SUMMARY, headers=headers, params=params)
+        return response.json()
+
+    body = await summary(sort="completion_rate", order="desc")
+    assert body["window_end"] == (date.fromisoformat(body["window_start"]) + timedelta(weeks=8, days=-1)).isoformat()
+    first, second = body["clients"]
+    assert first["client_id"] == ada.id
+    assert (first["assigned"], first["completed"], first["skipped"]) == (4, 3, 1)
+    assert (first["completion_rate"], first["current_streak"], first["days_since_last_workout"]) == (75.0, 3, 2)
+    assert (first["weight_trend"], first["pr_count"]) == (-1.0, 2)
+    assert second["client_id"] == bob.id
+    assert (second["completion_rate"], second["current_streak"], second["last_workout_date"]) == (50.0, 0, None)
+
+    # Missing values sort last either way
+    assert [c["client_id"] for c in (await summary(sort="weight_trend", order="desc"))["clients"]] == [ada.id, bob.id]
+    assert (await summary(include_inactive=True))["total"] == 3
+    assert [c["client_id"] for c in (await summary(min_completion=60))["clients"]] == [ada.id]
+    assert [c["client_id"] for c in (await summary(inactive_days=3))["clients"]] == [bob.id]
+    page = await summary(include_inactive=True, limit=1, offset=1)
+    assert (page["total"], [c["client_id"] for c in page["clients"]]) == (3, [bob.id])
+
+    invalid = await query_budget.client.get(SUMMARY, headers=headers, params={"sort": "age"})
+    assert invalid.status_code == 422
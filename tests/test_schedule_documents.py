@@ -0,0 +1,144 @@
+"""Weekly schedules: rolling generation and the materialized week documents."""
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models import ProgramAssignment, WeeklyExerciseAssignment
+from app.services.schedule_document_service import ScheduleDocumentService
+from app.services.weekly_exercise_service import WeeklyExerciseService, claim_weeks
+from tests.conftest import TestingSessionLocal
+from tests.factories import make_clients, make_exercises, make_program, make_trainer
+
+CURRENT_WEEK = "/api/v1/weekly-exercises/client/{client_id}/current-week"
+
+
+@pytest.mark.asyncio
+async def test_current_week_is_one_lookup_and_tracks_changes(db_session, query_budget, client):
+    trainer, headers = await make_trainer(db_session)
+    (ada,) = await make_clients(db_session, trainer, 1)
+    exercises = await make_exercises(db_session, 3)
+    program = await make_program(db_session, trainer, exercises)
+    await db_session.commit()
+    monday = date.today() - timedelta(days=date.today().weekday())
+
+    await query_budget.request(
+        "POST",
+        "/api/v1/assignments/",
+        headers=headers,
+        json={
+            "program_id": program.id,
+            "client_id": ada.id,
+            "start_date": datetime.combine(monday, time()).isoformat(),
+        },
+    )
+
+    async def current_week():
+        response = await query_budget.request(
+            "GET", CURRENT_WEEK.format(client_id=ada.id), route=CURRENT_WEEK, headers=headers
+        )
+        return response, response.json()
+
+    response, week = await current_week()
+    # Bearer lookup plus the document's primary-key lookup.
+    assert response.headers["x-db-query-count"] == "2"
+    assert [row["exercise_name"] for row in week] == ["Exercise 0", "Exercise 1", "Exercise 2"]
+    assert week[0]["program_name"] == "Budget Program" and week[0]["status"] == "pending"
+
+    await query_budget.request(
+        "PUT",
+        f"/api/v1/weekly-exercises/{week[0]['id']}/status",
+        route="/api/v1/weekly-exercises/{exercise_id}/status",
+        headers=headers,
+        json={"status": "completed"},
+    )
+    response, week = await current_week()
+    assert response.headers["x-db-query-count"] == "2"
+    assert week[0]["status"] == "completed" and week[0]["completion_percentage"] == 100
+    assert week[0]["completed_date"] is not None
+
+    # A rename drops the document; the next read rebuilds it.
+    await client.put(
+        f"/api/v1/exercises/{exercises[1].id}", headers=headers, json={"name": "Renamed"}
+    )
+    _, week = await current_week()
+    assert week[1]["exercise_name"] == "Renamed" and week[0]["status"] == "completed"
+
+    async with TestingSessionLocal() as db:
+        assert await ScheduleDocumentService.rebuild(db) == 1
+    _, rebuilt = await current_week()
+    assert rebuilt[0]["status"] == "completed" and rebuilt[1]["exercise_name"] == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_weeks_are_generated_on_a_rolling_horizon(db_session, query_budget, client):
+    trainer, headers = await make_trainer(db_session)
+    (ada,) = await make_clients(db_session, trainer, 1)
+    program = await make_program(db_session, trainer, await make_exercises(db_session, 3))
+    program.duration_weeks = 8
+    await db_session.commit()
+    monday = date.today() - timedelta(days=date.today().weekday())
+
+    created = await client.post(
+        "/api/v1/assignments/",
+        headers=headers,
+        json={
+            "program_id": program.id,
+            "client_id": ada.id,
+            "start_date": datetime.combine(monday, time()).isoformat(),
+        },
+    )
+    assignment_id = created.json()["id"]
+
+    async def generated():
+        async with TestingSessionLocal() as db:
+            rows = await db.scalar(
+                select(func.count(WeeklyExerciseAssignment.id)).where(
+                    WeeklyExerciseAssignment.program_assignment_id == assignment_id
+                )
+            )
+            return rows, (await db.get(ProgramAssignment, assignment_id)).generated_weeks
+
+    # Only the current week and the next (WEEKLY_HORIZON_WEEKS=2) exist.
+    assert await generated() == (6, 2)
+
+    # Reading week 5 extends the horizon through week 6.
+    week_5 = await query_budget.request(
+        "GET",
+        f"/api/v1/weekly-exercises/client/{ada.id}/week",
+        route="/api/v1/weekly-exercises/client/{client_id}/week",
+        headers=headers,
+        params={"week_start": (monday + timedelta(weeks=4)).isoformat()},
+    )
+    assert [row["week_number"] for row in week_5.json()] == [5, 5, 5]
+    assert await generated() == (18, 6)
+
+    # Later weeks can be previewed without writing them.
+    preview = await query_budget.request(
+        "GET",
+        f"/api/v1/weekly-exercises/assignment/{assignment_id}/preview",
+        route="/api/v1/weekly-exercises/assignment/{assignment_id}/preview",
+        headers=headers,
+        params={"week": 8},
+    )
+    assert [row["exercise_name"] for row in preview.json()] == [
+        "Exercise 0",
+        "Exercise 1",
+        "Exercise 2",
+    ]
+    assert preview.json()[0]["due_date"] == (monday + timedelta(weeks=7)).isoformat()
+    assert await generated() == (18, 6)
+
+    # The background job's pass catches up to the program's end.
+    async with TestingSessionLocal() as db:
+        assert await WeeklyExerciseService.extend_horizons(db, on=monday + timedelta(weeks=9)) == 6
+        await db.commit()
+    assert await generated() == (24, 8)
+
+    # A run that read the assignment before that pass loses the claim.
+    async with TestingSessionLocal() as db:
+        stale = await db.get(ProgramAssignment, assignment_id)
+        set_committed_value(stale, "generated_weeks", 6)
+        assert not await claim_weeks(db, stale, 8)
+    assert await generated() == (24, 8)
@@ -0,0 +1,126 @@
+"""Training load: ACWR, monotony and strain from the session-RPE series."""
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app.models import ProgramAssignment, WorkoutLog
+from app.services import training_load_service
+from app.services.training_load_service import compute_series
+from tests.conftest import TestingSessionLocal
+from tests.factories import SCALES, make_clients, make_exercises, make_program, make_trainer
+
+DAY = date(2025, 3, 31)
+
+
+def _points(loads, start=DAY, end=DAY):
+    return [p.dict() for p in compute_series(loads, start, end)]
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_compute_series(monkeypatch, numpy):
+    if not numpy:
+        monkeypatch.setattr(training_load_service, "np", None)
+    elif training_load_service.np is None:
+        pytest.skip("NumPy not installed")
+
+    # A steady month: ratio 1, and no variation means no monotony
+    steady = {DAY - timedelta(days=i): 300.0 for i in range(28)}
+    (point,) = _points(steady)
+    assert (point["acute"], point["chronic"], point["acwr"], point["zone"]) == (300.0, 300.0, 1.0, "optimal")
+    assert point["monotony"] is point["strain"] is None
+
+    # The last week doubled on alternate days: loads 600/0 → mean 342.9, sd 296.9
+    spiked = dict(steady)
+    for i in range(7):
+        spiked[DAY - timedelta(days=i)] = 600.0 if i % 2 == 0 else 0.0
+    (point,) = _points(spiked)
+    assert (point["load"], point["acute"], point["chronic"]) == (600.0, 342.9, 310.7)
+    assert (point["acwr"], point["monotony"], point["strain"]) == (1.1, 1.15, 2771.3)
+
+    # Only this week's training: chronic is a quarter of acute
+    (point,) = _points({DAY - timedelta(days=i): 100.0 for i in range(7)})
+    assert (point["acwr"], point["zone"]) == (4.0, "danger")
+
+    series = _points(steady, DAY - timedelta(days=9), DAY)
+    assert [p["day"] for p in series] == [DAY - timedelta(days=9 - i) for i in range(10)]
+    assert series[0]["chronic"] == round(300 * 19 / 28, 1)  # Nothing before the month
+    assert _points({}) == [dict(day=DAY, load=0.0, acute=0.0, chronic=0.0, acwr=None,
+                                monotony=None, strain=None, zone=None)]
+
+
+async def _logged(db, n, days=35):
+    trainer, headers = await make_trainer(db)
+    clients = await make_clients(db, trainer, n)
+    (exercise,) = await make_exercises(db, 1)
+    program = await make_program(db, trainer, [exercise])
+    today = date.today()
+    for client in clients:
+        assignment = ProgramAssignment(program_id=program.id, client_id=client.id, trainer_id=trainer.id)
+        db.add(assignment)
+        await db.flush()
+        db.add_all(
+            WorkoutLog(
+                client_id=client.id, assignment_id=assignment.id, day_number=1,
+                workout_date=datetime.combine(today - timedelta(days=i), time(9)),
+                total_duration_minutes=60, perceived_exertion=5,
+            )
+            for i in range(0, days, 2)
+        )
+    await db.commit()
+    return trainer, headers, clients
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n", SCALES)
+async def test_roster_training_load_is_constant(db_session, query_budget, n):
+    training_load_service.invalidate()
+    trainer, headers, clients = await _logged(db_session, n)
+
+    response = await query_budget.request("GET", "/api/v1/progress/training-load", headers=headers)
+    body = response.json()
+    assert body["total"] == n
+    latest = body["clients"][0]["latest"]
+    assert (latest["load"], latest["acute"], latest["chronic"]) == (300.0, 171.4, 150.0)
+    assert (latest["acwr"], latest["zone"]) == (1.14, "optimal")
+
+    filtered = await query_budget.request(
+        "GET", "/api/v1/progress/training-load", headers=headers, params={"zone": "danger"}
+    )
+    assert filtered.json()["total"] == 0
+    assert training_load_service.stats["hits"] >= n  # The second request was served from cache
+
+
+@pytest.mark.asyncio
+async def test_client_training_load_cache_follows_workouts(db_session, query_budget):
+    training_load_service.invalidate()
+    trainer, headers, (client,) = await _logged(db_session, 1)
+    url = f"/api/v1/progress/clients/{client.id}/training-load"
+    route = "/api/v1/progress/clients/{client_id}/training-load"
+
+    async def latest():
+        response = await query_budget.request("GET", url, route=route, headers=headers, params={"days": 14})
+        points = response.json()["points"]
+        assert len(points) == 14 and points[-1]["day"] == date.today().isoformat()
+        return points[-1], response
+
+    first, response = await latest()
+    again, cached = await latest()
+    assert again == first
+    assert int(cached.headers["X-DB-Query-Count"]) < int(response.headers["X-DB-Query-Count"])
+
+    # An edit moves the stamp, so the next read recomputes
+    async with TestingSessionLocal() as db:
+        await db.execute(
+            update(WorkoutLog)
+            .where(WorkoutLog.client_id == client.id, WorkoutLog.workout_date >= datetime.combine(date.today(), time.min))
+            .values(perceived_exertion=10, updated_at=datetime(2100, 1, 1))
+        )
+        await db.commit()
+    edited, _ = await latest()
+    assert edited["load"] == 600.0 and edited["acute"] > first["acute"]
+
+    missing = await query_budget.client.get(
+        "/api/v1/progress/clients/999999/training-load", headers=headers
+    )
+    assert missing.status_code == 404